@@ -221,8 +221,12 @@ References
 ===============================================================================
 """
 
+from analysis.startup_timing import StartupTimer
+
+# ``python AutoML.py --startup-times`` prints where the startup time goes.
+STARTUP_TIMER = StartupTimer.from_argv()
+
 import re
-import math
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
@@ -239,6 +243,7 @@ from gui.review_toolbox import (
     VersionCompareDialog,
 )
 from dataclasses import asdict
+from functools import partial
 from analysis.mechanisms import DiagnosticMechanism, MechanismLibrary, ANNEX_D_MECHANISMS
 import json
 import csv
@@ -247,13 +252,69 @@ try:
 except Exception:  # openpyxl may not be installed
     load_workbook = None
 from gui.drawing_helper import FTADrawingHelper, fta_drawing_helper
+from gui.requirements_matrix import VirtualMatrixGrid
+from gui.progress import ProgressWindow
 from analysis.risk_assessment import (
     DERIVED_MATURITY_TABLE,
     ASSURANCE_AGGREGATION_AND,
     AND_DECOMPOSITION_TABLE,
     OR_DECOMPOSITION_TABLE,
     boolify,
-    AutoMLHelper,
+)
+from analysis.fault_tree import (
+    FaultTreeNode,
+    cut_sets,
+    failure_probability,
+    helper as AutoML_Helper,
+)
+from analysis.clone_registry import CloneRegistry
+from analysis.reachability import ReachabilityIndex
+from analysis.dirty_tracker import UNKNOWN_SECTION, DirtyTracker, encode_section, text_digest
+from analysis.requirement_index import RequirementIndex
+from analysis.asil_propagation import AsilGraph
+from analysis.search_index import SearchIndex
+from analysis.requirement_import import import_requirements, iter_requirements_file
+from analysis.requirement_matrix import SparseMatrix
+from analysis.version_history import VersionHistory
+from analysis.archive import ArchiveReader, LazyList, missing_sections, sidecar_path, write_archive
+from analysis.project_container import (
+    ARCHIVE_PREFIX,
+    EXTENSION,
+    ContainerData,
+    ContainerReader,
+    DeferredAttribute,
+    DeferredSections,
+    is_container,
+    write_container,
+)
+from analysis.sqlite_store import EXTENSIONS as SQLITE_EXTENSIONS, SqliteProjectStore, is_sqlite
+from analysis.autosave import AutosaveJournal, Autosaver
+from analysis.csv_export import FMEA_COLUMNS, FMEDA_COLUMNS, CsvExportCache, fmea_row, fmeda_row
+from analysis.compression import EXTENSIONS as COMPRESSED_EXTENSIONS, open_file
+from analysis.model_loader import load_model_file
+from analysis.model_io import section_converters
+from analysis.node_codec import RequirementPool
+from analysis.undo import (
+    UndoStack,
+    SetAttributes,
+    MoveNodes,
+    LinkNodes,
+    UnlinkNodes,
+    ListInsert,
+    ListRemove,
+    CommandGroup,
+)
+from analysis.change_journal import (
+    ChangeJournal,
+    NODE_CHANGED,
+    STRUCTURE_CHANGED,
+    DOCUMENT_CHANGED,
+    FMEA_ROW_CHANGED,
+    HAZOP_CHANGED,
+    HARA_CHANGED,
+    REQUIREMENT_CHANGED,
+    SYSML_CHANGED,
+    MODEL_RESET,
 )
 from analysis.models import (
     MissionProfile,
@@ -270,8 +331,10 @@ from analysis.models import (
     RELIABILITY_MODELS,
     component_fit_map,
     ASIL_LEVEL_OPTIONS,
+    REQUIREMENT_TYPE_OPTIONS,
     ASIL_ORDER,
     ASIL_TARGETS,
+    PMHF_TARGETS,
     ASIL_TABLE,
     ASIL_DECOMP_SCHEMES,
     calc_asil,
@@ -288,35 +351,14 @@ from sysml.sysml_repository import SysMLRepository
 from analysis.fmeda_utils import compute_fmeda_metrics
 import copy
 import tkinter.font as tkFont
-from PIL import Image, ImageDraw, ImageFont, ImageTk
 import os
 import types
 os.environ["GS_EXECUTABLE"] = r"C:\Program Files\gs\gs10.04.0\bin\gswin64c.exe"
-import networkx as nx
-import matplotlib.pyplot as plt
-# Import ReportLab for PDF export.
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, PageBreak
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak, SimpleDocTemplate, Image as RLImage
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+# PIL, matplotlib, networkx, reportlab and the email modules are imported by
+# the functions using them so they do not slow down startup.
 from io import BytesIO, StringIO
-from email.utils import make_msgid
 import html
 import datetime
-import PIL.Image as PILImage
-from reportlab.platypus import LongTable
-from email.message import EmailMessage
-import smtplib
-import socket
-
-styles = getSampleStyleSheet()  # Create the stylesheet.
-preformatted_style = ParagraphStyle(name="Preformatted", fontName="Courier", fontSize=10)
-styles.add(preformatted_style)
 
 # Characters used to display pass/fail status in metrics labels.
 from analysis.constants import CHECK_MARK, CROSS_MARK
@@ -330,15 +372,6 @@ from gui.toolboxes import (
     HazardExplorerWindow,
 )
 
-# Target PMHF limits per ASIL level (events per hour)
-PMHF_TARGETS = {
-    "D": 1e-8,
-    "C": 1e-7,
-    "B": 1e-7,
-    "A": 1e-6,
-    "QM": 1.0,
-}
-
 ##########################################
 # VALID_SUBTYPES dictionary
 ##########################################
@@ -718,8 +751,6 @@ dynamic_recommendations = {
     }
 }
 
-AutoML_Helper = AutoMLHelper()
-
 ##########################################
 # Edit Dialog 
 ##########################################
@@ -986,7 +1017,7 @@ class EditNodeDialog(simpledialog.Dialog):
             ttk.Label(master, text="Requirement Type:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
             self.type_var = tk.StringVar()
             self.type_combo = ttk.Combobox(master, textvariable=self.type_var, 
-                                           values=["vehicle", "operational"],
+                                           values=REQUIREMENT_TYPE_OPTIONS,
                                            state="readonly", width=15)
             self.type_combo.grid(row=0, column=1, padx=5, pady=5)
             
@@ -1012,7 +1043,7 @@ class EditNodeDialog(simpledialog.Dialog):
             )
             self.req_asil_combo.grid(row=3, column=1, padx=5, pady=5, sticky="w")
 
-            self.type_var.set(self.initial_req.get("req_type", "vehicle"))
+            self.type_var.set(self.initial_req.get("req_type", REQUIREMENT_TYPE_OPTIONS[0]))
             self.req_entry.insert(0, self.initial_req.get("text", ""))
             self.req_asil_var.set(self.initial_req.get("asil", "QM"))
             return self.req_entry
@@ -1105,7 +1136,9 @@ class EditNodeDialog(simpledialog.Dialog):
                 if req and not any(r["id"] == req_id for r in self.node.safety_requirements):
                     self.node.safety_requirements.append(req)
                     if self.node.node_type.upper() == "BASIC EVENT":
-                        req["asil"] = self.infer_requirement_asil_from_node(self.node)
+                        global_requirements.update_fields(
+                            req_id, asil=self.infer_requirement_asil_from_node(self.node)
+                        )
                     else:
                         pass  # ASIL recalculated when joint review closes
                     self.safety_req_listbox.insert(
@@ -1129,21 +1162,7 @@ class EditNodeDialog(simpledialog.Dialog):
     # --- Traceability helpers ---
     def get_requirement_allocation_names(self, req_id):
         """Return a list of node or FMEA entry names where the requirement appears."""
-        names = []
-        for n in self.app.get_all_nodes(self.app.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.app.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self.app.requirement_index.allocation_names(req_id)
 
     def _collect_goal_names(self, node, acc):
         if node.node_type.upper() == "TOP EVENT":
@@ -1153,27 +1172,7 @@ class EditNodeDialog(simpledialog.Dialog):
 
     def get_requirement_goal_names(self, req_id):
         """Return a list of safety goal names linked to the requirement."""
-        goals = set()
-        for n in self.app.get_all_nodes(self.app.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.app.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        parent_list = e.get("parents") or []
-                    else:
-                        parent_list = getattr(e, "parents", []) or []
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.app.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.app.requirement_index.goal_names(req_id)
 
     def format_requirement_with_trace(self, req):
         """Return requirement text including allocation and safety goal lists."""
@@ -1207,15 +1206,13 @@ class EditNodeDialog(simpledialog.Dialog):
         return asil
 
     def update_requirement_asil(self, req_id):
-        req = global_requirements.get(req_id)
-        if not req:
+        if req_id not in global_requirements:
             return
-        req["asil"] = self.compute_requirement_asil(req_id)
+        global_requirements.update_fields(req_id, asil=self.compute_requirement_asil(req_id))
 
     def update_all_requirement_asil(self):
-        for rid, req in global_requirements.items():
-            if req.get("parent_id"):
-                continue  # keep decomposition ASIL
+        # Decomposed requirements keep their decomposition ASIL.
+        for rid in global_requirements.ids_where("parent_id", ""):
             self.update_requirement_asil(rid)
 
     def update_base_event_requirement_asil(self):
@@ -1229,18 +1226,12 @@ class EditNodeDialog(simpledialog.Dialog):
                     continue
                 asil = self.compute_requirement_asil(rid)
                 req["asil"] = asil
-                if rid in global_requirements:
-                    global_requirements[rid]["asil"] = asil
+                global_requirements.update_fields(rid, asil=asil)
 
     def update_requirement_decomposition(self):
         """Update ASIL values of decomposed child requirements."""
-        parent_map = {}
-        for req in global_requirements.values():
-            pid = req.get("parent_id")
-            if pid:
-                parent_map.setdefault(pid, []).append(req)
-
-        for pid, children in parent_map.items():
+        for pid in global_requirements.decomposed_parents():
+            children = global_requirements.children(pid)
             parent = global_requirements.get(pid)
             if not parent or len(children) < 2:
                 continue
@@ -1249,8 +1240,8 @@ class EditNodeDialog(simpledialog.Dialog):
                 continue
             asil_a, asil_b = schemes[0]
             children_sorted = sorted(children, key=lambda r: r.get("id"))
-            children_sorted[0]["asil"] = asil_a
-            children_sorted[1]["asil"] = asil_b
+            global_requirements.update_fields(children_sorted[0].get("id"), asil=asil_a)
+            global_requirements.update_fields(children_sorted[1].get("id"), asil=asil_b)
 
     def ensure_asil_consistency(self):
         """Sync safety goal ASILs from HARAs and update requirement ASILs."""
@@ -1335,10 +1326,12 @@ class EditNodeDialog(simpledialog.Dialog):
             custom_id = str(uuid.uuid4())
         # Check global registry: if exists, update; otherwise, register new.
         if custom_id in global_requirements:
-            req = global_requirements[custom_id]
-            req["req_type"] = dialog.result["req_type"]
-            req["text"] = dialog.result["text"]
-            req["asil"] = asil_default if self.node.node_type.upper() == "BASIC EVENT" else dialog.result.get("asil", "QM")
+            req = global_requirements.update_fields(
+                custom_id,
+                req_type=dialog.result["req_type"],
+                text=dialog.result["text"],
+                asil=asil_default if self.node.node_type.upper() == "BASIC EVENT" else dialog.result.get("asil", "QM"),
+            )
         else:
             req = {
                 "id": custom_id,
@@ -1558,6 +1551,7 @@ class EditNodeDialog(simpledialog.Dialog):
 
     def apply(self):
         target_node = self.node if self.node.is_primary_instance else self.node.original
+        before = SetAttributes.capture(target_node)
 
         target_node.user_name = self.user_name_entry.get().strip()
         target_node.description = self.desc_text.get("1.0", "end-1c")
@@ -1630,7 +1624,10 @@ class EditNodeDialog(simpledialog.Dialog):
             self.app.root_node,
             self.app.top_events,
         )
-        self.app.update_views()
+        self.app.record_command(
+            SetAttributes.from_change(target_node, before, label="Edit Node", section="top_events")
+        )
+        self.app.notify_change(NODE_CHANGED, "top_events", target_node)
 
 class DecompositionDialog(simpledialog.Dialog):
     def __init__(self, parent, asil):
@@ -1660,8 +1657,21 @@ class DecompositionDialog(simpledialog.Dialog):
 # Main Application (Parent Diagram)
 ##########################################
 class FaultTreeApp:
+    # Sections of container projects built on first use, see apply_model_data.
+    fmedas = DeferredAttribute("fmedas")
+    hazop_docs = DeferredAttribute("hazops")
+    active_hazop = DeferredAttribute("hazops")
+    hazop_entries = DeferredAttribute("hazops")
+    fi2tc_docs = DeferredAttribute("fi2tc_docs")
+    active_fi2tc = DeferredAttribute("fi2tc_docs")
+    fi2tc_entries = DeferredAttribute("fi2tc_docs")
+    tc2fi_docs = DeferredAttribute("tc2fi_docs")
+    active_tc2fi = DeferredAttribute("tc2fi_docs")
+    tc2fi_entries = DeferredAttribute("tc2fi_docs")
+
     def __init__(self, root):
         self.root = root
+        self.deferred_sections = DeferredSections()
         self.top_events = []
         self.selected_node = None
         self.clone_offset_counter = {}
@@ -1708,7 +1718,10 @@ class FaultTreeApp:
         self.review_window = None
         self.current_user = ""
         self.comment_target = None
-        self.versions = []
+        self.versions = VersionHistory()
+        self.model_archive = ArchiveReader()
+        self.missing_archive = []
+        self.project_store = None
         self.diff_nodes = []
         self.fi2tc_entries = []
         self.tc2fi_entries = []
@@ -1759,6 +1772,9 @@ class FaultTreeApp:
         fta_menu.add_command(label="Common Cause Toolbox", command=self.show_common_cause_view)
 
         edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Undo", command=self.undo, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=self.redo, accelerator="Ctrl+Y")
+        edit_menu.add_separator()
         edit_menu.add_command(label="Edit Selected", command=self.edit_selected)
         edit_menu.add_command(label="Remove Connection", command=lambda: self.remove_connection(self.selected_node) if self.selected_node else None)
         edit_menu.add_command(label="Delete Node", command=lambda: self.delete_node_and_subtree(self.selected_node) if self.selected_node else None)
@@ -1787,6 +1803,7 @@ class FaultTreeApp:
         requirements_menu = tk.Menu(menubar, tearoff=0)
         requirements_menu.add_command(label="Requirements Matrix", command=self.show_requirements_matrix)
         requirements_menu.add_command(label="Requirements Editor", command=self.show_requirements_editor)
+        requirements_menu.add_command(label="Import Requirements...", command=self.import_requirements_file)
         requirements_menu.add_command(label="Safety Goals Matrix", command=self.show_safety_goals_matrix)
         requirements_menu.add_command(label="Safety Goals Editor", command=self.show_safety_goals_editor)
         requirements_menu.add_command(label="Export SG Requirements", command=self.export_safety_goal_requirements)
@@ -1866,6 +1883,9 @@ class FaultTreeApp:
         root.bind("<Control-c>", lambda event: self.copy_node())
         root.bind("<Control-x>", lambda event: self.cut_node())
         root.bind("<Control-v>", lambda event: self.paste_node())
+        # Text fields keep their own undo; only undo model edits elsewhere.
+        root.bind("<Control-z>", lambda event: None if self._is_text_input(event.widget) else self.undo())
+        root.bind("<Control-y>", lambda event: None if self._is_text_input(event.widget) else self.redo())
         root.bind("<Control-p>", lambda event: self.save_diagram_png())
         self.main_pane = tk.PanedWindow(root, orient=tk.HORIZONTAL)
         self.main_pane.pack(fill=tk.BOTH, expand=True)
@@ -1880,9 +1900,24 @@ class FaultTreeApp:
         self.analysis_group = ttk.LabelFrame(self.analysis_tab, text="Analyses")
         self.analysis_group.pack(fill=tk.BOTH, expand=True)
 
+        # --- Model search ---
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(self.analysis_group, textvariable=self.search_var)
+        search_entry.pack(fill=tk.X, padx=2, pady=2)
+        search_entry.bind("<KeyRelease>", self._schedule_search)
+        search_entry.bind("<Return>", lambda event: self.jump_to_search_hit(0))
+        self.search_results = tk.Listbox(self.analysis_group, height=8)
+        self.search_results.bind("<Double-1>", lambda event: self.jump_to_search_hit())
+        self.search_results.bind("<Return>", lambda event: self.jump_to_search_hit())
+        self._search_hits = []
+        self._search_job = None
+
         self.analysis_tree = ttk.Treeview(self.analysis_group)
         self.analysis_tree.pack(fill=tk.BOTH, expand=True)
         self.analysis_tree.bind("<Double-1>", self.on_analysis_tree_double_click)
+        self.analysis_tree.bind("<<TreeviewOpen>>", self._on_explorer_open)
+        self._explorer_roots = {}
+        self._explorer_deferred = set()
 
         self.pmhf_var = tk.StringVar(value="")
         self.pmhf_label = ttk.Label(self.analysis_tab, textvariable=self.pmhf_var, foreground="blue")
@@ -1915,16 +1950,55 @@ class FaultTreeApp:
         self.root_node = FaultTreeNode("", "TOP EVENT")
         self.root_node.x, self.root_node.y = 300, 200
         self.top_events = [self.root_node]
+        self.clone_registry = CloneRegistry().rebuild(self.top_events)
+        self.reachability = ReachabilityIndex().rebuild(self.top_events)
         self.fmea_entries = []
         self.fmeas = []  # list of FMEA documents
         self.selected_node = None
         self.dragging_node = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
+        self._drag_moved = False
         self.grid_size = 20
+        self.journal = ChangeJournal()
+        self.journal.subscribe(self._on_model_change)
+        self._pending_refresh = set()
+        # Track changes since the last save so we can prompt on exit
+        self.dirty_tracker = DirtyTracker(self.JOURNALED_SECTIONS)
+        self.journal.subscribe(self._mark_dirty)
+        self.undo_stack = UndoStack()
+        self.requirement_index = RequirementIndex(self._requirement_index_source)
+        self.journal.subscribe(
+            self._on_requirement_trace_change,
+            NODE_CHANGED,
+            STRUCTURE_CHANGED,
+            FMEA_ROW_CHANGED,
+            REQUIREMENT_CHANGED,
+            MODEL_RESET,
+        )
+        global_requirements.add_listener(self._on_requirement_store_change)
+        self.asil_graph = AsilGraph()
+        self.search_index = SearchIndex()
+        self._search_stale = set(self.SEARCH_GROUPS)
+        self._search_fmea_keys = {}
+        self.journal.subscribe(self._on_search_change)
+        self.journal.subscribe(self._on_hara_docs_change, DOCUMENT_CHANGED, MODEL_RESET)
+        self._safety_goal_cache = None
+        self.csv_exports = CsvExportCache()
+        SysMLRepository.get_instance().add_listener(self._on_sysml_change)
         self.update_views()
-        # Track the last saved state so we can prompt on exit
-        self.last_saved_state = json.dumps(self.export_model_data(), sort_keys=True)
+        self.set_last_saved_state()
+        self.model_path = None
+        self.autosaver = Autosaver(AutosaveJournal.for_model(None))
+        self._autosave_work = []
+        self._autosave_parts = {}
+        self._autosave_batch = {}
+        self._autosave_counters = self.dirty_tracker.counters()
+        self._autosave_digests = self.dirty_tracker.saved_digests()
+        self._autosave_versions = self._versions_mark()
+        self._autosave_full = True
+        self.root.after(self.AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+        self.root.after_idle(self.offer_autosave_recovery)
         root.protocol("WM_DELETE_WINDOW", self.confirm_close)
         self.use_case_windows = []
         self.activity_windows = []
@@ -1934,21 +2008,7 @@ class FaultTreeApp:
     # --- Requirement Traceability Helpers used by reviews and matrix view ---
     def get_requirement_allocation_names(self, req_id):
         """Return a list of node or FMEA entry names where the requirement appears."""
-        names = []
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self.requirement_index.allocation_names(req_id)
 
     def _collect_goal_names(self, node, acc):
         if node.node_type.upper() == "TOP EVENT":
@@ -1958,24 +2018,7 @@ class FaultTreeApp:
 
     def get_requirement_goal_names(self, req_id):
         """Return a list of safety goal names linked to the requirement."""
-        goals = set()
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    parent_list = e.get("parents") if isinstance(e, dict) else getattr(e, "parents", None)
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.requirement_index.goal_names(req_id)
 
     def format_requirement_with_trace(self, req):
         """Return requirement text including allocation and safety goal lists."""
@@ -2169,21 +2212,7 @@ class FaultTreeApp:
     # --- Requirement Traceability Helpers used by reviews and matrix view ---
     def get_requirement_allocation_names(self, req_id):
         """Return a list of node or FMEA entry names where the requirement appears."""
-        names = []
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self.requirement_index.allocation_names(req_id)
 
     def _collect_goal_names(self, node, acc):
         if node.node_type.upper() == "TOP EVENT":
@@ -2193,24 +2222,7 @@ class FaultTreeApp:
 
     def get_requirement_goal_names(self, req_id):
         """Return a list of safety goal names linked to the requirement."""
-        goals = set()
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    parent_list = e.get("parents", []) if isinstance(e, dict) else getattr(e, "parents", [])
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.requirement_index.goal_names(req_id)
 
     def format_requirement_with_trace(self, req):
         """Return requirement text including allocation and safety goal lists."""
@@ -2320,21 +2332,7 @@ class FaultTreeApp:
     # --- Requirement Traceability Helpers used by reviews and matrix view ---
     def get_requirement_allocation_names(self, req_id):
         """Return a list of node or FMEA entry names where the requirement appears."""
-        names = []
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self.requirement_index.allocation_names(req_id)
 
     def _collect_goal_names(self, node, acc):
         if node.node_type.upper() == "TOP EVENT":
@@ -2344,24 +2342,7 @@ class FaultTreeApp:
 
     def get_requirement_goal_names(self, req_id):
         """Return a list of safety goal names linked to the requirement."""
-        goals = set()
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    parent_list = e.get("parents", []) if isinstance(e, dict) else getattr(e, "parents", [])
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.requirement_index.goal_names(req_id)
 
     def format_requirement_with_trace(self, req):
         """Return requirement text including allocation and safety goal lists."""
@@ -2495,21 +2476,7 @@ class FaultTreeApp:
     # --- Requirement Traceability Helpers used by reviews and matrix view ---
     def get_requirement_allocation_names(self, req_id):
         """Return a list of node or FMEA entry names where the requirement appears."""
-        names = []
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self.requirement_index.allocation_names(req_id)
 
     def _collect_goal_names(self, node, acc):
         if node.node_type.upper() == "TOP EVENT":
@@ -2519,24 +2486,7 @@ class FaultTreeApp:
 
     def get_requirement_goal_names(self, req_id):
         """Return a list of safety goal names linked to the requirement."""
-        goals = set()
-        for n in self.get_all_nodes(self.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    parent_list = e.get("parents", []) if isinstance(e, dict) else getattr(e, "parents", [])
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.requirement_index.goal_names(req_id)
 
     def format_requirement_with_trace(self, req):
         """Return requirement text including allocation and safety goal lists."""
@@ -2719,7 +2669,8 @@ class FaultTreeApp:
             return
         # Swap with the one above it.
         self.top_events[index], self.top_events[index - 1] = self.top_events[index - 1], self.top_events[index]
-        self.update_views()
+        self.reachability.set_root_order(self.top_events)
+        self.notify_change(STRUCTURE_CHANGED, "top_events")
 
     def move_top_event_down(self):
         sel = self.treeview.selection()
@@ -2739,7 +2690,8 @@ class FaultTreeApp:
             return
         # Swap with the one below it.
         self.top_events[index], self.top_events[index + 1] = self.top_events[index + 1], self.top_events[index]
-        self.update_views()
+        self.reachability.set_root_order(self.top_events)
+        self.notify_change(STRUCTURE_CHANGED, "top_events")
 
     def get_top_level_nodes(self):
         """Return a list of all nodes that have no parent."""
@@ -2782,8 +2734,14 @@ class FaultTreeApp:
         return None
 
     def update_hara_statuses(self):
-        """Update each HARA document's status based on linked reviews."""
+        """Update each HARA document's status based on linked reviews.
+
+        Safety goals of documents whose approval changed are refreshed;
+        those documents are returned.
+        """
+        changed = []
         for doc in self.hara_docs:
+            was_approved = doc.approved
             status = "draft"
             for review in self.reviews:
                 if doc.name in getattr(review, "hara_names", []):
@@ -2794,32 +2752,50 @@ class FaultTreeApp:
                         status = "in review"
             doc.status = status
             doc.approved = status == "closed"
+            if doc.approved != was_approved:
+                changed.append(doc)
+        if changed:
+            self.propagate_hara_change(*changed, requirements=False)
+        return changed
 
     def get_safety_goal_asil(self, sg_name):
         """Return the highest ASIL level for a safety goal name across approved HARAs."""
-        best = "QM"
-        for doc in getattr(self, "hara_docs", []):
-            if not getattr(doc, "approved", False) and getattr(doc, "status", "") != "closed":
-                continue
-            for e in doc.entries:
-                if sg_name and sg_name == e.safety_goal and ASIL_ORDER.get(e.asil, 0) > ASIL_ORDER.get(best, 0):
-                    best = e.asil
+        best = self.asil_graph.goal_asil(sg_name) if sg_name else "QM"
         for te in self.top_events:
             if sg_name and (sg_name == te.user_name or sg_name == te.safety_goal_description):
                 if ASIL_ORDER.get(te.safety_goal_asil or "QM", 0) > ASIL_ORDER.get(best, 0):
                     best = te.safety_goal_asil or "QM"
         return best
 
+    def _safety_goals_by_node(self):
+        """Return the cache of safety goal names per node id.
+
+        The cache is dropped whenever the change journal records a change,
+        so repeated lookups while exporting or computing metrics neither
+        resolve failure mode references nor scan the top events again.
+        """
+        seq = self.journal.last_seq
+        if self._safety_goal_cache is None or self._safety_goal_cache[0] != seq:
+            goals = {
+                te.unique_id: te.safety_goal_description or te.user_name or ""
+                for te in self.top_events
+            }
+            self._safety_goal_cache = (seq, goals, {})
+        return self._safety_goal_cache[1:]
+
     def get_top_event_safety_goals(self, node):
         """Return names of safety goals for top events containing ``node``."""
-        result = []
-        target = self.get_failure_mode_node(node)
-        for te in self.top_events:
-            if any(n.unique_id == target.unique_id for n in self.get_all_nodes(te)):
-                sg = te.safety_goal_description or te.user_name or ""
-                if sg:
-                    result.append(sg)
-        return result
+        goals, by_node = self._safety_goals_by_node()
+        result = by_node.get(node.unique_id)
+        if result is None:
+            target = self.get_failure_mode_node(node)
+            result = [
+                goals[tid]
+                for tid in self.reachability.top_events_of(target.unique_id)
+                if goals.get(tid)
+            ]
+            by_node[node.unique_id] = result
+        return list(result)
 
     def calculate_fmeda_metrics(self, events):
         """Return ASIL and FMEDA metrics for the given events."""
@@ -2936,26 +2912,46 @@ class FaultTreeApp:
 
     def sync_hara_to_safety_goals(self):
         """Propagate HARA values to safety goals when the HARA is approved."""
-        sg_data = {}
-        for doc in getattr(self, "hara_docs", []):
-            if not getattr(doc, "approved", False) and getattr(doc, "status", "") != "closed":
-                continue
-            for e in doc.entries:
-                if not e.safety_goal:
-                    continue
-                data = sg_data.setdefault(e.safety_goal, {"asil": "QM", "severity": 1, "cont": 1})
-                if ASIL_ORDER.get(e.asil, 0) > ASIL_ORDER.get(data["asil"], 0):
-                    data["asil"] = e.asil
-                if e.severity > data["severity"]:
-                    data["severity"] = e.severity
-                if e.controllability > data["cont"]:
-                    data["cont"] = e.controllability
+        self._apply_hara_goals(self.asil_graph.rebuild(getattr(self, "hara_docs", [])))
+
+    def _apply_hara_goals(self, goals):
+        """Copy aggregated HARA values of ``goals`` to their top events."""
         for te in self.top_events:
             name = te.safety_goal_description or (te.user_name or f"SG {te.unique_id}")
-            if name in sg_data:
-                te.safety_goal_asil = sg_data[name]["asil"]
-                te.severity = sg_data[name]["severity"]
-                te.controllability = sg_data[name]["cont"]
+            if name not in goals:
+                continue
+            data = self.asil_graph.goal_data(name)
+            if data is not None:
+                te.safety_goal_asil, te.severity, te.controllability = data
+
+    def propagate_hara_change(self, *docs, requirements=True):
+        """Update safety goals and requirements affected by edits of ``docs``.
+
+        Only goals whose aggregated HARA values changed are written back and,
+        when ``requirements`` is true, only requirements traced to those
+        goals get their ASIL recomputed.  Decomposed requirements keep their
+        decomposition ASIL.  Returns the changed goal names.
+        """
+        goals = set()
+        for doc in docs:
+            if doc is not None:
+                goals |= self.asil_graph.update_doc(doc)
+        if not goals:
+            return goals
+        self._apply_hara_goals(goals)
+        if requirements:
+            direct, _decomposed = self.asil_graph.affected_requirements(
+                goals, self.requirement_index, global_requirements
+            )
+            for rid in direct:
+                self.update_requirement_asil(rid)
+        self.notify_change(NODE_CHANGED, "top_events")
+        return goals
+
+    def _on_hara_docs_change(self, event):
+        if event.kind == MODEL_RESET or event.section == "haras":
+            # Documents were added, removed or replaced.
+            self.asil_graph.rebuild(getattr(self, "hara_docs", []))
 
     def edit_selected(self):
         sel = self.treeview.selection()
@@ -2977,15 +2973,20 @@ class FaultTreeApp:
             target = target.original
 
         EditNodeDialog(self.root, target, self)
-        self.update_views()
 
     def add_top_level_event(self):
         new_event = FaultTreeNode("", "TOP EVENT")
         new_event.x, new_event.y = 300, 200
         new_event.is_top_event = True
+        self.record_command(
+            ListInsert(self.top_events, len(self.top_events), new_event,
+                       label="Add Top Event", section="top_events", structural=True)
+        )
         self.top_events.append(new_event)
+        self.clone_registry.register(new_event)
+        self.reachability.add_root(new_event.unique_id)
         self.root_node = new_event
-        self.update_views()
+        self.notify_change(STRUCTURE_CHANGED, "top_events", new_event)
 
     def edit_project_properties(self):
         prop_win = tk.Toplevel(self.root)
@@ -3062,6 +3063,7 @@ class FaultTreeApp:
         x, y, w, h = bbox[0], bbox[1], bbox[2]-bbox[0], bbox[3]-bbox[1]
         ps = self.canvas.postscript(colormode="color", x=x, y=y, width=w, height=h)
         from io import BytesIO
+        from PIL import Image
         ps_bytes = BytesIO(ps.encode("utf-8"))
         img = Image.open(ps_bytes)
         img.load(scale=3)
@@ -5491,29 +5493,7 @@ class FaultTreeApp:
         return mapping.get(level, str(level))
 
     def calculate_cut_sets(self, node):
-        if not node.children:
-            return [{node.unique_id}]
-        gate = (node.gate_type or "AND").upper() if node.node_type.upper() in ["TOP EVENT", "GATE", "RIGOR LEVEL"] else "AND"
-        child_cut_sets = [self.calculate_cut_sets(child) for child in node.children]
-        if gate == "OR":
-            result = []
-            for cuts in child_cut_sets:
-                result.extend(cuts)
-            return result
-        elif gate == "AND":
-            result = [set()]
-            for cuts in child_cut_sets:
-                temp = []
-                for partial in result:
-                    for cs in cuts:
-                        temp.append(partial.union(cs))
-                result = temp
-            return result
-        else:
-            result = []
-            for cuts in child_cut_sets:
-                result.extend(cuts)
-            return result
+        return cut_sets(node)
 
     def build_hierarchical_argumentation(self, node, indent=0):
         indent_str = "    " * indent
@@ -6182,6 +6162,10 @@ class FaultTreeApp:
         [Event Name, Prototype Assurance Level (PAL), Severity, Controllability, Description, Rationale, Dynamic Recommendations].
         (Not used in the final report if you prefer only the consolidated argumentation.)
         """
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import LongTable, Paragraph, TableStyle
+
         style_sheet = getSampleStyleSheet()
         header_style = ParagraphStyle(
             name="CompactHeader",
@@ -6793,6 +6777,8 @@ class FaultTreeApp:
         self._generate_pdf_report(include_assurance=False)
 
     def capture_event_diagram(self, event_node):
+        from PIL import Image
+
         temp = tk.Toplevel(self.root)
         temp.withdraw()
         canvas = tk.Canvas(temp, bg="white", width=2000, height=2000)
@@ -6949,6 +6935,8 @@ class FaultTreeApp:
                                font=self.diagram_font)
 
     def save_diagram_png(self):
+        from PIL import Image, ImageDraw, ImageFont
+
         margin = 50
         all_nodes = self.get_all_nodes(self.root_node)
         if not all_nodes:
@@ -7048,6 +7036,282 @@ class FaultTreeApp:
         elif kind == "arch":
             self.open_arch_window(idx)
 
+    # ------------------------------------------------------------------
+    # Model search
+    # ------------------------------------------------------------------
+    # Parts of the model indexed for search; each is re-indexed as a whole
+    # when a change cannot be narrowed down to a single object.
+    SEARCH_GROUPS = (
+        "nodes", "requirements", "fmeas", "fmedas", "hazops", "haras", "scenarios", "sysml",
+    )
+    SEARCH_SECTIONS = {
+        "fmeas": "fmeas",
+        "fmedas": "fmedas",
+        "hazops": "hazops",
+        "haras": "haras",
+        "scenario_libraries": "scenarios",
+    }
+    SEARCH_KIND_GROUPS = {
+        HAZOP_CHANGED: "hazops",
+        HARA_CHANGED: "haras",
+        SYSML_CHANGED: "sysml",
+        REQUIREMENT_CHANGED: "requirements",
+    }
+    SEARCH_KIND_LABELS = {
+        "node": "FTA",
+        "requirement": "Requirement",
+        "fmea": "FMEA",
+        "fmeda": "FMEDA",
+        "hazop": "HAZOP",
+        "hara": "HARA",
+        "scenario": "Scenario",
+        "sysml": "Element",
+        "diagram": "Diagram",
+    }
+
+    def _schedule_search(self, _event=None):
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(150, self.run_search)
+
+    def run_search(self):
+        """Show the hits for the text of the explorer search box."""
+        self._search_job = None
+        query = self.search_var.get().strip()
+        self._search_hits = self.search_model(query) if query else []
+        self.search_results.delete(0, tk.END)
+        for hit in self._search_hits:
+            label = self.SEARCH_KIND_LABELS.get(hit.kind, hit.kind)
+            self.search_results.insert(tk.END, f"{hit.label}  ({label})")
+        if self._search_hits:
+            self.search_results.pack(fill=tk.X, padx=2, before=self.analysis_tree)
+        else:
+            self.search_results.pack_forget()
+
+    def search_model(self, query, limit=50, kinds=None):
+        """Return :class:`SearchHit` objects matching ``query`` across the model."""
+        self._refresh_search_index()
+        return self.search_index.search(query, limit, kinds)
+
+    def _refresh_search_index(self):
+        """Re-index the parts of the model changed without finer events."""
+        for group in self.SEARCH_GROUPS:
+            if group in self._search_stale:
+                self.search_index.remove_group(group)
+                getattr(self, f"_index_search_{group}")()
+        self._search_stale.clear()
+
+    def _on_search_change(self, event):
+        kind = event.kind
+        stale = self._search_stale
+        if kind == MODEL_RESET:
+            stale.update(self.SEARCH_GROUPS)
+        elif kind == NODE_CHANGED and isinstance(event.target, FaultTreeNode):
+            if "nodes" not in stale:
+                self._index_search_node(event.target)
+            for key, doc in self._search_fmea_keys.get(event.target.unique_id, ()):
+                if key[0] not in stale:
+                    self._index_search_fmea_entry(key[0], doc, event.target)
+        elif kind in (NODE_CHANGED, STRUCTURE_CHANGED):
+            stale.add("nodes")
+        elif kind == REQUIREMENT_CHANGED and event.target is not None:
+            if "requirements" not in stale:
+                self._index_search_requirement(event.target)
+        elif kind in (FMEA_ROW_CHANGED, DOCUMENT_CHANGED):
+            group = self.SEARCH_SECTIONS.get(event.section)
+            if group:
+                stale.add(group)
+            elif kind == FMEA_ROW_CHANGED:
+                stale.update(("fmeas", "fmedas"))
+        elif kind in self.SEARCH_KIND_GROUPS:
+            stale.add(self.SEARCH_KIND_GROUPS[kind])
+
+    def _index_search_nodes(self):
+        seen = set()
+        for node in self.get_all_nodes_in_model():
+            node = self.resolve_original(node)
+            if node.unique_id not in seen:
+                seen.add(node.unique_id)
+                self._index_search_node(node)
+
+    def _index_search_node(self, node):
+        self.search_index.add(
+            ("node", node.unique_id),
+            "node",
+            node.user_name or f"Node {node.unique_id}",
+            (
+                node.node_type,
+                node.description,
+                node.rationale,
+                node.safety_goal_description,
+                node.safe_state,
+                node.acceptance_criteria,
+            ),
+            ref=node,
+            group="nodes",
+        )
+
+    def _index_search_requirements(self):
+        for rid in global_requirements:
+            self._index_search_requirement(rid)
+
+    def _index_search_requirement(self, rid):
+        key = ("requirement", rid)
+        req = global_requirements.get(rid)
+        if req is None:
+            self.search_index.remove(key)
+            return
+        self.search_index.add(
+            key,
+            "requirement",
+            f"[{rid}] {req.get('text', '')}",
+            (req.get("req_type", ""), req.get("asil", ""), req.get("status", "")),
+            ref=rid,
+            group="requirements",
+        )
+
+    def _index_search_fmeas(self):
+        self._index_search_fmea_docs("fmeas", self.fmeas)
+
+    def _index_search_fmedas(self):
+        self._index_search_fmea_docs("fmedas", self.fmedas)
+
+    def _index_search_fmea_docs(self, group, docs):
+        for uid, keys in list(self._search_fmea_keys.items()):
+            keys[:] = [k for k in keys if k[0][0] != group]
+            if not keys:
+                del self._search_fmea_keys[uid]
+        for doc in docs:
+            for entry in doc.get("entries", []):
+                self._index_search_fmea_entry(group, doc, entry)
+
+    def _index_search_fmea_entry(self, group, doc, entry):
+        key = (group, doc["name"], entry.unique_id)
+        keys = self._search_fmea_keys.setdefault(entry.unique_id, [])
+        if all(k != key for k, _doc in keys):
+            keys.append((key, doc))
+        self.search_index.add(
+            key,
+            group[:-1],
+            f"{doc['name']}: {entry.user_name or entry.description}",
+            (
+                entry.description,
+                entry.fmea_effect,
+                entry.fmea_cause,
+                entry.fmea_component,
+                entry.fmeda_malfunction,
+            ),
+            ref=(doc, entry),
+            group=group,
+        )
+
+    def _index_search_hazops(self):
+        for doc in self.hazop_docs:
+            for i, e in enumerate(doc.entries):
+                self.search_index.add(
+                    ("hazop", doc.name, i),
+                    "hazop",
+                    f"{doc.name}: {e.malfunction}",
+                    (e.function, e.scenario, e.conditions, e.hazard, e.rationale, e.component),
+                    ref=doc,
+                    group="hazops",
+                )
+
+    def _index_search_haras(self):
+        for doc in self.hara_docs:
+            for i, e in enumerate(doc.entries):
+                self.search_index.add(
+                    ("hara", doc.name, i),
+                    "hara",
+                    f"{doc.name}: {e.hazard}",
+                    (e.malfunction, e.safety_goal, e.sev_rationale, e.cont_rationale, e.exp_rationale),
+                    ref=doc,
+                    group="haras",
+                )
+
+    def _index_search_scenarios(self):
+        for li, lib in enumerate(self.scenario_libraries):
+            for si, sc in enumerate(lib.get("scenarios", [])):
+                if isinstance(sc, dict):
+                    name = sc.get("name", "")
+                    texts = [str(v) for k, v in sc.items() if k != "name" and v]
+                else:
+                    name, texts = sc, []
+                self.search_index.add(
+                    ("scenario", li, si),
+                    "scenario",
+                    f"{lib.get('name', '')}: {name}",
+                    texts,
+                    ref=lib,
+                    group="scenarios",
+                )
+
+    def _index_search_sysml(self):
+        repo = SysMLRepository.get_instance()
+        for elem in repo.elements.values():
+            self.search_index.add(
+                ("sysml", elem.elem_id),
+                "sysml",
+                elem.name or elem.elem_type,
+                [elem.elem_type] + [str(v) for v in elem.properties.values()],
+                ref=elem.elem_id,
+                group="sysml",
+            )
+        for diag in repo.diagrams.values():
+            self.search_index.add(
+                ("diagram", diag.diag_id),
+                "diagram",
+                diag.name or diag.diag_type,
+                (diag.diag_type, diag.description),
+                ref=diag.diag_id,
+                group="sysml",
+            )
+
+    def jump_to_search_hit(self, index=None):
+        """Open the view showing the selected search hit."""
+        if index is None:
+            sel = self.search_results.curselection()
+            if not sel:
+                return
+            index = sel[0]
+        if index >= len(self._search_hits):
+            return
+        hit = self._search_hits[index]
+        ref = hit.ref
+        if hit.kind == "node":
+            tops = self.reachability.top_events_of(ref.unique_id)
+            te = next((t for t in self.top_events if tops and t.unique_id == tops[0]), None)
+            if te is None:
+                self.focus_on_node(ref)
+                return
+            self.open_page_diagram(te)
+            self.page_diagram.selected_node = ref
+            self.page_diagram.redraw_canvas()
+        elif hit.kind == "requirement":
+            self.show_requirements_editor(select=ref)
+        elif hit.kind in ("fmea", "fmeda"):
+            self.show_fmea_table(ref[0], fmeda=hit.kind == "fmeda")
+        elif hit.kind == "hazop":
+            self.open_hazop_window()
+            if hasattr(self, "_hazop_window"):
+                self._hazop_window.doc_var.set(ref.name)
+                self._hazop_window.select_doc()
+        elif hit.kind == "hara":
+            self.open_hara_window()
+            if hasattr(self, "_hara_window"):
+                self._hara_window.doc_var.set(ref.name)
+                self._hara_window.select_doc()
+        elif hit.kind == "scenario":
+            self.manage_scenario_libraries()
+        elif hit.kind in ("sysml", "diagram"):
+            for idx, diag in enumerate(self.arch_diagrams):
+                if diag.diag_id == ref or ref in diag.elements or any(
+                    obj.get("element_id") == ref for obj in diag.objects
+                ):
+                    self.open_arch_window(idx)
+                    return
+            messagebox.showinfo("Search", f"{hit.label} is not shown on any diagram.")
+
     def on_ctrl_mousewheel(self, event):
         if event.delta > 0:
             self.zoom_in()
@@ -7112,6 +7376,8 @@ class FaultTreeApp:
         new_root.x, new_root.y = 300, 200
         self.top_events.append(new_root)
         self.root_node = new_root
+        self.clone_registry = CloneRegistry().rebuild(self.top_events)
+        self.reachability = ReachabilityIndex().rebuild(self.top_events)
         self.fmea_entries = []
         self.fmeas = []
         self.fi2tc_docs = []
@@ -7120,7 +7386,13 @@ class FaultTreeApp:
         self.active_tc2fi = None
         self.fi2tc_entries = []
         self.tc2fi_entries = []
-        self.update_views()
+        self.reviews = []
+        self.review_data = None
+        self.versions = VersionHistory()
+        self.model_archive = ArchiveReader()
+        self.missing_archive = []
+        self.undo_stack.clear()
+        self.notify_change(MODEL_RESET)
         self.set_last_saved_state()
         self.canvas.update()
 
@@ -7243,31 +7515,74 @@ class FaultTreeApp:
                     self.open_page_diagram(clicked_node)
                 else:
                     EditNodeDialog(self.root, clicked_node, self)
-            self.update_views()
+            self.refresh_canvas()
 
     def on_canvas_drag(self, event):
         if self.dragging_node:
             x = self.canvas.canvasx(event.x) / self.zoom
             y = self.canvas.canvasy(event.y) / self.zoom
-            new_x = x - self.drag_offset_x
-            new_y = y - self.drag_offset_y
-            dx = new_x - self.dragging_node.x
-            dy = new_y - self.dragging_node.y
-            self.dragging_node.x = new_x
-            self.dragging_node.y = new_y
-            if self.dragging_node.is_primary_instance:
-                self.move_subtree(self.dragging_node, dx, dy)
-            self.sync_nodes_by_id(self.dragging_node)
+            self.drag_node(self.dragging_node, x - self.drag_offset_x, y - self.drag_offset_y)
             self.redraw_canvas()
 
     def on_canvas_release(self, event):
         if self.dragging_node:
-            self.dragging_node.x = round(self.dragging_node.x/self.grid_size)*self.grid_size
-            self.dragging_node.y = round(self.dragging_node.y/self.grid_size)*self.grid_size
+            self.finish_drag(self.dragging_node, self.grid_size)
         self.dragging_node = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
 
+    def _drag_targets(self, node):
+        """Return the nodes moved together with ``node`` when dragging."""
+        if not node.is_primary_instance:
+            return [node]
+        seen = set()
+        result = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if id(n) in seen:
+                continue
+            seen.add(id(n))
+            result.append(n)
+            stack.extend(n.children)
+        return result
+
+    def drag_node(self, node, new_x, new_y):
+        """Move ``node`` (and its subtree for primaries) during a drag.
+
+        Every motion event is recorded as a move which merges into the
+        previous one, so the whole gesture is a single undo step.
+        """
+        nodes = self._drag_targets(node)
+        before = [(n, (n.x, n.y)) for n in nodes]
+        dx = new_x - node.x
+        dy = new_y - node.y
+        node.x = new_x
+        node.y = new_y
+        if node.is_primary_instance:
+            self.move_subtree(node, dx, dy)
+        self.sync_nodes_by_id(node)
+        command = MoveNodes.from_positions(before, section="top_events")
+        if command is not None:
+            self.record_command(command, coalesce=True)
+            self._drag_moved = True
+
+    def finish_drag(self, node, grid_size):
+        """Snap ``node`` to the grid and close the drag's undo step.
+
+        A click without movement records and publishes nothing.
+        """
+        nodes = self._drag_targets(node)
+        before = [(n, (n.x, n.y)) for n in nodes]
+        node.x = round(node.x / grid_size) * grid_size
+        node.y = round(node.y / grid_size) * grid_size
+        command = MoveNodes.from_positions(before, section="top_events")
+        self.record_command(command, coalesce=True)
+        self.undo_stack.close()
+        moved, self._drag_moved = self._drag_moved or command is not None, False
+        if moved:
+            self.notify_change(NODE_CHANGED, "top_events", node, layout=True)
+
     def move_subtree(self, node, dx, dy):
         for child in node.children:
             child.x += dx
@@ -7298,7 +7613,7 @@ class FaultTreeApp:
                     layout(child, depth+1)
                 node.y = (node.children[0].y + node.children[-1].y) / 2
         layout(self.root_node, 0)
-        self.update_views()
+        self.notify_change(NODE_CHANGED, "top_events", layout=True)
 
     def get_all_nodes_table(self,root_node):
         """
@@ -7490,45 +7805,96 @@ class FaultTreeApp:
 
         return rec(node)
 
+    # Explorer categories keyed by the model section they display.
+    EXPLORER_SECTIONS = (
+        ("top_events", "FTAs"),
+        ("fmeas", "FMEAs"),
+        ("fmedas", "FMEDAs"),
+        ("hazops", "HAZOPs"),
+        ("haras", "HARAs"),
+        ("fi2tc_docs", "FI2TC Analyses"),
+        ("tc2fi_docs", "TC2FI Analyses"),
+        ("sysml_repository", "AutoML Diagrams"),
+    )
+
     def update_views(self):
+        """Rebuild the whole explorer and redraw the active diagram."""
         # Compute occurrence counts from the current tree
         self.occurrence_counts = self.compute_occurrence_counts()
 
         if hasattr(self, "analysis_tree"):
             tree = self.analysis_tree
             tree.delete(*tree.get_children())
-
-            fta_root = tree.insert("", "end", text="FTAs", open=True)
-            for idx, te in enumerate(self.top_events):
-                tree.insert(fta_root, "end", text=te.name, tags=("fta", str(te.unique_id)))
-
-            fmea_root = tree.insert("", "end", text="FMEAs", open=True)
-            for idx, fmea in enumerate(self.fmeas):
-                tree.insert(fmea_root, "end", text=fmea['name'], tags=("fmea", str(idx)))
-            fmeda_root = tree.insert("", "end", text="FMEDAs", open=True)
-            for idx, doc in enumerate(self.fmedas):
-                tree.insert(fmeda_root, "end", text=doc['name'], tags=("fmeda", str(idx)))
-            hazop_root = tree.insert("", "end", text="HAZOPs", open=True)
-            for idx, doc in enumerate(self.hazop_docs):
-                tree.insert(hazop_root, "end", text=doc.name, tags=("hazop", str(idx)))
-            hara_root = tree.insert("", "end", text="HARAs", open=True)
-            for idx, doc in enumerate(self.hara_docs):
-                tree.insert(hara_root, "end", text=doc.name, tags=("hara", str(idx)))
-            fi2tc_root = tree.insert("", "end", text="FI2TC Analyses", open=True)
-            for idx, doc in enumerate(self.fi2tc_docs):
-                tree.insert(fi2tc_root, "end", text=doc.name, tags=("fi2tc", str(idx)))
-            tc2fi_root = tree.insert("", "end", text="TC2FI Analyses", open=True)
-            for idx, doc in enumerate(self.tc2fi_docs):
-                tree.insert(tc2fi_root, "end", text=doc.name, tags=("tc2fi", str(idx)))
+            self._explorer_roots = {}
+            for section, label in self.EXPLORER_SECTIONS:
+                # Deferred sections stay collapsed until the user opens them.
+                self._explorer_roots[section] = tree.insert(
+                    "", "end", text=label, open=not self.deferred_sections.pending(section)
+                )
+                self._populate_explorer(section)
+
+        self.refresh_canvas()
+
+    def _explorer_items(self, section):
+        """Return ``(text, tags)`` pairs listed under ``section``."""
+        if section == "top_events":
+            return [(te.name, ("fta", str(te.unique_id))) for te in self.top_events]
+        if section == "fmeas":
+            return [(d["name"], ("fmea", str(i))) for i, d in enumerate(self.fmeas)]
+        if section == "fmedas":
+            return [(d["name"], ("fmeda", str(i))) for i, d in enumerate(self.fmedas)]
+        if section == "hazops":
+            return [(d.name, ("hazop", str(i))) for i, d in enumerate(self.hazop_docs)]
+        if section == "haras":
+            return [(d.name, ("hara", str(i))) for i, d in enumerate(self.hara_docs)]
+        if section == "fi2tc_docs":
+            return [(d.name, ("fi2tc", str(i))) for i, d in enumerate(self.fi2tc_docs)]
+        if section == "tc2fi_docs":
+            return [(d.name, ("tc2fi", str(i))) for i, d in enumerate(self.tc2fi_docs)]
+        if section == "sysml_repository":
             repo = SysMLRepository.get_instance()
             self.arch_diagrams = sorted(
                 repo.diagrams.values(), key=lambda d: d.name or d.diag_id
             )
-            arch_root = tree.insert("", "end", text="AutoML Diagrams", open=True)
-            for idx, diag in enumerate(self.arch_diagrams):
-                name = diag.name or f"Diagram {idx + 1}"
-                tree.insert(arch_root, "end", text=name, tags=("arch", str(idx)))
+            return [
+                (diag.name or f"Diagram {i + 1}", ("arch", str(i)))
+                for i, diag in enumerate(self.arch_diagrams)
+            ]
+        return []
+
+    def _populate_explorer(self, section):
+        tree = self.analysis_tree
+        root_item = self._explorer_roots[section]
+        tree.delete(*tree.get_children(root_item))
+        if self.deferred_sections.pending(section):
+            # Placeholder so the category can be expanded; see _on_explorer_open.
+            tree.insert(root_item, "end", text="...")
+            self._explorer_deferred.add(section)
+            return
+        self._explorer_deferred.discard(section)
+        for text, tags in self._explorer_items(section):
+            tree.insert(root_item, "end", text=text, tags=tags)
+
+    def _on_explorer_open(self, _event):
+        """Build a deferred section when its explorer category is expanded."""
+        item = self.analysis_tree.focus()
+        for section, root_item in self._explorer_roots.items():
+            if root_item == item and section in self._explorer_deferred:
+                self.deferred_sections.load(section)
+                self._populate_explorer(section)
+
+    def refresh_explorer(self, section):
+        """Rebuild only the explorer category showing ``section``."""
+        if not hasattr(self, "analysis_tree"):
+            return
+        roots = getattr(self, "_explorer_roots", {})
+        if section not in roots or not self.analysis_tree.exists(roots[section]):
+            self.update_views()
+            return
+        self._populate_explorer(section)
 
+    def refresh_canvas(self):
+        """Redraw the page diagram or the main canvas."""
         if hasattr(self, "page_diagram") and self.page_diagram is not None:
             if self.page_diagram.canvas.winfo_exists():
                 self.page_diagram.redraw_canvas()
@@ -7540,6 +7906,101 @@ class FaultTreeApp:
             else:
                 self.canvas.delete("all")
 
+    # ------------------------------------------------------------------
+    # Undo/redo
+    # ------------------------------------------------------------------
+    def record_command(self, command, coalesce=False):
+        """Add an already applied ``command`` to the undo history."""
+        if command is None or (isinstance(command, CommandGroup) and not command.commands):
+            return
+        self.undo_stack.push(command, coalesce)
+
+    @staticmethod
+    def _is_text_input(widget):
+        """Return ``True`` if ``widget`` is a text field with its own undo."""
+        return isinstance(widget, (tk.Text, tk.Entry, tk.Spinbox))
+
+    def undo(self):
+        cmd = self.undo_stack.undo()
+        if cmd is not None:
+            self._after_undo_redo(cmd)
+
+    def redo(self):
+        cmd = self.undo_stack.redo()
+        if cmd is not None:
+            self._after_undo_redo(cmd)
+
+    def _after_undo_redo(self, cmd):
+        """Resynchronise indices and views after ``cmd`` was replayed."""
+        if cmd.section not in ("top_events", "fmeas", "fmedas"):
+            # Other commands refresh their own views through ``on_apply``.
+            return
+        if cmd.structural:
+            if self.root_node not in self.top_events and self.top_events:
+                self.root_node = self.top_events[0]
+            self.clone_registry = CloneRegistry().rebuild(self.top_events)
+            self.reachability.rebuild(self.top_events)
+        with self.journal.batch():
+            for target in cmd.targets():
+                if isinstance(target, FaultTreeNode):
+                    self.sync_nodes_by_id(target)
+                    self.notify_change(NODE_CHANGED, cmd.section, target)
+            if cmd.structural:
+                self.notify_change(STRUCTURE_CHANGED, "top_events")
+        AutoML_Helper.calculate_assurance_recursive(self.root_node, self.top_events)
+
+    # ------------------------------------------------------------------
+    # Change notification
+    # ------------------------------------------------------------------
+    def notify_change(self, kind, section="", target=None, **data):
+        """Publish a model change so open views refresh what it affects."""
+        return self.journal.publish(kind, section, target, **data)
+
+    def _on_sysml_change(self, kind, obj_id):
+        if hasattr(self, "journal"):
+            self.journal.publish(SYSML_CHANGED, "sysml_repository", obj_id, change=kind)
+
+    def _on_model_change(self, event):
+        kind = event.kind
+        if kind == MODEL_RESET:
+            self._schedule_refresh("all")
+            return
+        if kind == STRUCTURE_CHANGED:
+            self._schedule_refresh("counts", "top_events", "canvas")
+        elif kind == NODE_CHANGED:
+            self._schedule_refresh("canvas")
+            if event.target in self.top_events:
+                self._schedule_refresh("top_events")
+        elif kind == DOCUMENT_CHANGED:
+            self._schedule_refresh(event.section)
+        elif kind == SYSML_CHANGED:
+            self._schedule_refresh("sysml_repository")
+        if kind in (NODE_CHANGED, STRUCTURE_CHANGED, FMEA_ROW_CHANGED) and self.pmhf_var.get():
+            # Only keep the metrics current once the user asked for them.
+            self._schedule_refresh("metrics")
+
+    def _schedule_refresh(self, *parts):
+        """Queue view updates and perform them together when Tk is idle."""
+        first = not self._pending_refresh
+        self._pending_refresh.update(parts)
+        if first:
+            self.root.after_idle(self._flush_refresh)
+
+    def _flush_refresh(self):
+        parts, self._pending_refresh = self._pending_refresh, set()
+        if "all" in parts:
+            self.update_views()
+            return
+        if "counts" in parts:
+            self.occurrence_counts = self.compute_occurrence_counts()
+        for section, _label in self.EXPLORER_SECTIONS:
+            if section in parts:
+                self.refresh_explorer(section)
+        if "metrics" in parts:
+            self.refresh_pmhf_metrics()
+        if "canvas" in parts:
+            self.refresh_canvas()
+
     def update_basic_event_probabilities(self):
         """Update failure probabilities for all basic events.
 
@@ -7561,25 +8022,8 @@ class FaultTreeApp:
         tau = 1.0
         if self.mission_profiles:
             tau = self.mission_profiles[0].tau
-        if tau <= 0:
-            tau = 1.0
         fm = self.find_node_by_id_all(failure_mode_ref) if failure_mode_ref else self.get_failure_mode_node(node)
-        fit = getattr(fm, "fmeda_fit", getattr(node, "fmeda_fit", 0.0))
-        t = tau
-        formula = formula or getattr(node, "prob_formula", getattr(fm, "prob_formula", "linear"))
-        f = str(formula).strip().lower()
-        if f == "constant":
-            try:
-                return float(getattr(node, "failure_prob", 0.0))
-            except (TypeError, ValueError):
-                return 0.0
-        if fit <= 0:
-            return 0.0
-        lam = fit / 1e9
-        if f == "exponential":
-            return 1 - math.exp(-lam * t)
-        else:
-            return lam * t
+        return failure_probability(node, fm, tau, formula)
 
     def propagate_failure_mode_attributes(self, fm_node):
         """Update basic events referencing ``fm_node`` and recompute probability."""
@@ -7635,6 +8079,8 @@ class FaultTreeApp:
             self.canvas.create_line(0, y, width, y, fill="#ddd", tags="grid")
 
     def create_diagram_image_without_grid(self):
+        from PIL import Image
+
         if hasattr(self, "canvas") and self.canvas.winfo_exists():
             target_canvas = self.canvas
         elif hasattr(self, "page_diagram") and self.page_diagram is not None:
@@ -7869,10 +8315,7 @@ class FaultTreeApp:
     def is_descendant(self, node, possible_ancestor):
         if node == possible_ancestor:
             return True
-        for p in node.parents:
-            if self.is_descendant(p, possible_ancestor):
-                return True
-        return False
+        return self.reachability.is_ancestor(possible_ancestor.unique_id, node.unique_id)
 
     def add_node_of_type(self, event_type):
         # If a node is selected, ensure it is a primary instance.
@@ -7923,7 +8366,10 @@ class FaultTreeApp:
         new_node.y = parent_node.y + 100
         parent_node.children.append(new_node)
         new_node.parents.append(parent_node)
-        self.update_views()
+        self.clone_registry.register(new_node)
+        self.reachability.add_edge(parent_node.unique_id, new_node.unique_id)
+        self.record_command(LinkNodes(parent_node, new_node, label="Add Node", section="top_events"))
+        self.notify_change(STRUCTURE_CHANGED, "top_events", new_node)
 
     def add_basic_event_from_fmea(self):
         events = list(self.fmea_entries)
@@ -7963,7 +8409,8 @@ class FaultTreeApp:
         new_node = FaultTreeNode.from_dict(data, parent_node)
         parent_node.children.append(new_node)
         new_node.parents.append(parent_node)
-        self.update_views()
+        self.reachability.add_edge(parent_node.unique_id, new_node.unique_id)
+        self.notify_change(STRUCTURE_CHANGED, "top_events", new_node)
 
     def add_basic_event_from_fmea(self):
         events = list(self.fmea_entries)
@@ -8003,7 +8450,8 @@ class FaultTreeApp:
         new_node = FaultTreeNode.from_dict(data, parent_node)
         parent_node.children.append(new_node)
         new_node.parents.append(parent_node)
-        self.update_views()
+        self.reachability.add_edge(parent_node.unique_id, new_node.unique_id)
+        self.notify_change(STRUCTURE_CHANGED, "top_events", new_node)
 
     def add_basic_event_from_fmea(self):
         events = list(self.fmea_entries)
@@ -8043,7 +8491,8 @@ class FaultTreeApp:
         new_node = FaultTreeNode.from_dict(data, parent_node)
         parent_node.children.append(new_node)
         new_node.parents.append(parent_node)
-        self.update_views()
+        self.reachability.add_edge(parent_node.unique_id, new_node.unique_id)
+        self.notify_change(STRUCTURE_CHANGED, "top_events", new_node)
 
 
     def remove_node(self):
@@ -8056,24 +8505,37 @@ class FaultTreeApp:
             target = self.selected_node
         if target and target != self.root_node:
             if target.parents:
+                self.record_command(
+                    UnlinkNodes(target, UnlinkNodes.capture(target), label="Remove Node", section="top_events")
+                )
                 for p in target.parents:
                     if target in p.children:
                         p.children.remove(target)
+                self.reachability.detach(target.unique_id, [p.unique_id for p in target.parents])
                 target.parents = []
-            self.update_views()
+                self.reachability.remove_subtree(target)
+                self.clone_registry.unregister_subtree(target)
+            self.notify_change(STRUCTURE_CHANGED, "top_events", target)
         else:
             messagebox.showwarning("Invalid", "Cannot remove the root node.")
 
     def remove_connection(self, node):
         if node and node != self.root_node:
             if node.parents:
+                commands = [UnlinkNodes(node, UnlinkNodes.capture(node))]
                 for p in node.parents:
                     if node in p.children:
                         p.children.remove(node)
+                self.reachability.detach(node.unique_id, [p.unique_id for p in node.parents])
                 node.parents = []
                 if node not in self.top_events:
+                    commands.append(ListInsert(self.top_events, len(self.top_events), node))
                     self.top_events.append(node)
-                self.update_views()
+                    self.reachability.add_root(node.unique_id)
+                self.record_command(
+                    CommandGroup(commands, label="Remove Connection", section="top_events", structural=True)
+                )
+                self.notify_change(STRUCTURE_CHANGED, "top_events", node)
                 messagebox.showinfo("Remove Connection",
                                     f"Disconnected {node.name} from its parent(s) and made it a top-level event.")
             else:
@@ -8084,13 +8546,24 @@ class FaultTreeApp:
     def delete_node_and_subtree(self, node):
         if node:
             if node in self.top_events:
+                self.record_command(
+                    ListRemove(self.top_events, self.top_events.index(node), node,
+                               label="Delete Node", section="top_events", structural=True)
+                )
                 self.top_events.remove(node)
+                self.reachability.remove_root(node.unique_id)
             else:
+                self.record_command(
+                    UnlinkNodes(node, UnlinkNodes.capture(node), label="Delete Node", section="top_events")
+                )
                 for p in node.parents:
                     if node in p.children:
                         p.children.remove(node)
+                self.reachability.detach(node.unique_id, [p.unique_id for p in node.parents])
                 node.parents = []
-            self.update_views()
+            self.reachability.remove_subtree(node)
+            self.clone_registry.unregister_subtree(node)
+            self.notify_change(STRUCTURE_CHANGED, "top_events", node)
             messagebox.showinfo("Delete Node", f"Deleted {node.name} and its subtree.")
         else:
             messagebox.showwarning("Delete Node", "Select a node to delete.")
@@ -8108,6 +8581,11 @@ class FaultTreeApp:
         messagebox.showinfo("Calculation", results.strip())
 
     def calculate_pmfh(self):
+        self.refresh_pmhf_metrics()
+        self.update_views()
+
+    def refresh_pmhf_metrics(self):
+        """Recompute the PMHF of every top event and update the metrics label."""
         self.update_basic_event_probabilities()
         spf = 0.0
         lpf = 0.0
@@ -8130,7 +8608,6 @@ class FaultTreeApp:
             te.probability = prob
             pmhf += prob
 
-        self.update_views()
         lines = [f"Total PMHF: {pmhf:.2e}"]
         overall_ok = True
         for te in self.top_events:
@@ -8143,49 +8620,71 @@ class FaultTreeApp:
         self.pmhf_var.set("\n".join(lines))
         self.pmhf_label.config(foreground="green" if overall_ok else "red", font=("Segoe UI", 10, "bold"))
 
+    def import_requirements_file(self):
+        """Bulk import requirements from a CSV or ReqIF export.
+
+        Link columns are matched against node ids and names.
+        """
+        path = filedialog.askopenfilename(
+            filetypes=[("Requirements", "*.csv *.reqif *.reqifz *.xml"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        replace = messagebox.askyesno(
+            "Import Requirements", "Update requirements that already exist?"
+        )
+        nodes = {}
+        for node in self.get_all_nodes_in_model():
+            node = self.resolve_original(node)
+            nodes.setdefault(str(node.unique_id), node)
+            nodes.setdefault((node.user_name or "").lower(), node)
+        try:
+            result = import_requirements(
+                iter_requirements_file(path),
+                global_requirements,
+                lambda ref: nodes.get(ref.lower()),
+                replace=replace,
+            )
+        except Exception as e:
+            messagebox.showerror("Import Requirements", f"Failed to import {path}:\n{e}")
+            return
+        if result.linked:
+            self.notify_change(REQUIREMENT_CHANGED, "global_requirements", allocation=True)
+        messagebox.showinfo("Import Requirements", result.summary())
+
     def show_requirements_matrix(self):
-        """Display a matrix table of requirements vs. basic events."""
+        """Display a matrix table of requirements vs. basic events.
+
+        The matrix only stores allocated cells and the grid draws the
+        visible rows and columns, so large projects open quickly.
+        """
         self.update_requirement_statuses()
         basic_events = [n for n in self.get_all_nodes(self.root_node)
                         if n.node_type.upper() == "BASIC EVENT"]
         reqs = list(global_requirements.values())
         reqs.sort(key=lambda r: r.get("req_type", ""))
+        index = self.requirement_index
+        full = SparseMatrix.from_allocations(reqs, basic_events, index.allocations)
 
         win = tk.Toplevel(self.root)
         win.title("Requirements Matrix")
 
-        columns = [
-            "Req ID",
-            "ASIL",
-            "Type",
-            "Status",
-            "Parent",
-            "Text",
-        ] + [be.user_name or f"BE {be.unique_id}" for be in basic_events]
-        tree = ttk.Treeview(win, columns=columns, show="headings")
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120 if col not in ["Text"] else 300, anchor="center")
-        tree.pack(fill=tk.BOTH, expand=True)
-
-
-        for req in reqs:
-            row = [
-                req.get("id", ""),
-                req.get("asil", ""),
-                req.get("req_type", ""),
-                req.get("status", "draft"),
-                req.get("parent_id", ""),
-                req.get("text", ""),
-            ]
-            for be in basic_events:
-                linked = any(r.get("id") == req.get("id") for r in getattr(be, "safety_requirements", []))
-                row.append("X" if linked else "")
-            tree.insert("", "end", values=row)
-
-        # Show allocation and safety goal traceability below the table
+        bar = tk.Frame(win)
+        bar.pack(fill=tk.X)
+        goals = sorted({g for r in reqs for g in index.goal_names(r.get("id"))})
+        goal_var = tk.StringVar(value="All")
+        asil_var = tk.StringVar(value="All")
+        tk.Label(bar, text="Safety Goal:").pack(side=tk.LEFT)
+        ttk.Combobox(bar, textvariable=goal_var, values=["All"] + goals,
+                     state="readonly", width=30).pack(side=tk.LEFT, padx=2)
+        tk.Label(bar, text="ASIL:").pack(side=tk.LEFT)
+        ttk.Combobox(bar, textvariable=asil_var, values=["All"] + ASIL_LEVEL_OPTIONS,
+                     state="readonly", width=8).pack(side=tk.LEFT, padx=2)
+        count_lbl = tk.Label(bar)
+        count_lbl.pack(side=tk.LEFT, padx=10)
+
+        # Show allocation and safety goal traceability of the selected requirement
         frame = tk.Frame(win)
-        frame.pack(fill=tk.BOTH, expand=True)
         vbar = tk.Scrollbar(frame, orient="vertical")
         text = tk.Text(frame, wrap="word", yscrollcommand=vbar.set, height=8)
         text.tag_configure("added", foreground="blue")
@@ -8195,28 +8694,14 @@ class FaultTreeApp:
         vbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         base_data = self.versions[-1]["data"] if self.versions else None
-
-        def alloc_from_data(req_id):
-            if not base_data:
-                return ""
-            names = []
-            def traverse(d):
-                if any(r.get("id") == req_id for r in d.get("safety_requirements", [])):
-                    names.append(d.get("user_name") or f"Node {d.get('unique_id')}")
-                for ch in d.get("children", []):
-                    traverse(ch)
-            for t in base_data.get("top_events", []):
-                traverse(t)
-            for fmea in base_data.get("fmeas", []):
-                for e in fmea.get("entries", []):
-                    if any(r.get("id") == req_id for r in e.get("safety_requirements", [])):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                        names.append(f"{fmea['name']}:{name}")
-            return ", ".join(names)
-
-        def goals_from_data(req_id):
-            if not base_data:
-                return ""
+        baseline = {}
+
+        def baseline_maps():
+            """Collect allocations and goals of the last version in one pass."""
+            if baseline or not base_data:
+                return baseline
+            alloc = {}
+            goal_sets = {}
             nodes = []
             def gather(n):
                 nodes.append(n)
@@ -8224,27 +8709,43 @@ class FaultTreeApp:
                     gather(ch)
             for t in base_data.get("top_events", []):
                 gather(t)
-            id_map = {n["unique_id"]: n for n in nodes}
-            def collect_goal_names(nd, acc):
+            id_map = {n["unique_id"]: n for n in nodes if "unique_id" in n}
+            goal_cache = {}
+            def goals_of(nd):
+                uid = nd.get("unique_id")
+                if uid in goal_cache:
+                    return goal_cache[uid]
+                acc = set()
+                goal_cache[uid] = acc
                 if nd.get("node_type", "").upper() == "TOP EVENT":
                     acc.add(nd.get("safety_goal_description") or nd.get("user_name") or f"SG {nd.get('unique_id')}")
                 for p in nd.get("parents", []):
                     pid = p.get("unique_id")
                     if pid and pid in id_map:
-                        collect_goal_names(id_map[pid], acc)
-            goals = set()
+                        acc |= goals_of(id_map[pid])
+                return acc
+            seen = set()
             for n in nodes:
-                if any(r.get("id") == req_id for r in n.get("safety_requirements", [])):
-                    collect_goal_names(n, goals)
+                if id(n) in seen:
+                    continue
+                seen.add(id(n))
+                for r in n.get("safety_requirements", []):
+                    rid = r.get("id")
+                    alloc.setdefault(rid, []).append(n.get("user_name") or f"Node {n.get('unique_id')}")
+                    goal_sets.setdefault(rid, set()).update(goals_of(n))
             for fmea in base_data.get("fmeas", []):
                 for e in fmea.get("entries", []):
-                    if any(r.get("id") == req_id for r in e.get("safety_requirements", [])):
-                        parents = e.get("parents", [])
-                        if parents:
-                            pid = parents[0].get("unique_id")
-                            if pid and pid in id_map:
-                                collect_goal_names(id_map[pid], goals)
-            return ", ".join(sorted(goals))
+                    parents = e.get("parents", [])
+                    pid = parents[0].get("unique_id") if parents else None
+                    for r in e.get("safety_requirements", []):
+                        rid = r.get("id")
+                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
+                        alloc.setdefault(rid, []).append(f"{fmea['name']}:{name}")
+                        if pid and pid in id_map:
+                            goal_sets.setdefault(rid, set()).update(goals_of(id_map[pid]))
+            baseline["alloc"] = {k: ", ".join(v) for k, v in alloc.items()}
+            baseline["goals"] = {k: ", ".join(sorted(v)) for k, v in goal_sets.items()}
+            return baseline
 
         import difflib
 
@@ -8282,27 +8783,60 @@ class FaultTreeApp:
                     first = False
                     widget.insert(tk.END, item, "removed")
 
-        for req in reqs:
+        def show_trace(req):
             rid = req.get("id")
-            alloc = ", ".join(self.get_requirement_allocation_names(rid))
-            goals = ", ".join(self.get_requirement_goal_names(rid))
+            alloc = ", ".join(index.allocation_names(rid))
+            goal_text = ", ".join(index.goal_names(rid))
+            text.delete("1.0", tk.END)
             text.insert(tk.END, f"[{rid}] {req.get('text','')}\n")
             text.insert(tk.END, "  Allocated to: ")
             if base_data:
-                insert_list_diff(text, alloc_from_data(rid), alloc)
+                insert_list_diff(text, baseline_maps()["alloc"].get(rid, ""), alloc)
             else:
                 text.insert(tk.END, alloc)
             text.insert(tk.END, "\n  Safety Goals: ")
             if base_data:
-                insert_diff(text, goals_from_data(rid), goals)
+                insert_diff(text, baseline_maps()["goals"].get(rid, ""), goal_text)
             else:
-                text.insert(tk.END, goals)
-            text.insert(tk.END, "\n\n")
+                text.insert(tk.END, goal_text)
+
+        grid = VirtualMatrixGrid(win, full, on_select=show_trace)
+        grid.pack(fill=tk.BOTH, expand=True)
+        frame.pack(fill=tk.BOTH, expand=False)
+
+        def apply_filter(*_):
+            goal = goal_var.get()
+            asil = asil_var.get()
+            if goal == "All" and asil == "All":
+                matrix = full
+            else:
+                matrix = full.filtered(
+                    lambda r: (asil == "All" or r.get("asil") == asil)
+                    and (goal == "All" or goal in index.goal_names(r.get("id")))
+                )
+            grid.set_matrix(matrix)
+            count_lbl.config(text=f"{len(matrix)} requirements, {matrix.cell_count} allocations")
 
+        goal_var.trace_add("write", apply_filter)
+        asil_var.trace_add("write", apply_filter)
+        apply_filter()
+
+        def export():
+            path = filedialog.asksaveasfilename(
+                defaultextension=".csv", filetypes=[("CSV", "*.csv")]
+            )
+            if path:
+                grid.matrix.export_csv(path)
+                messagebox.showinfo("Export", "Requirements matrix exported.")
+
+        tk.Button(bar, text="Export CSV", command=export).pack(side=tk.RIGHT, padx=2)
         tk.Button(win, text="Open Requirements Editor", command=self.show_requirements_editor).pack(pady=5)
 
-    def show_requirements_editor(self):
-        """Open an editor to manage global requirements and traceability."""
+    def show_requirements_editor(self, select=None):
+        """Open an editor to manage global requirements and traceability.
+
+        ``select`` optionally names a requirement id to highlight.
+        """
         self.update_requirement_statuses()
         win = tk.Toplevel(self.root)
         win.title("Requirements Editor")
@@ -8337,8 +8871,8 @@ class FaultTreeApp:
                 tk.Entry(master, textvariable=self.id_var).grid(row=0, column=1, padx=5, pady=5)
 
                 ttk.Label(master, text="Type:").grid(row=1, column=0, sticky="e")
-                self.type_var = tk.StringVar(value=self.initial.get("req_type", "vehicle"))
-                ttk.Combobox(master, textvariable=self.type_var, values=["vehicle", "operational"], state="readonly").grid(row=1, column=1, padx=5, pady=5)
+                self.type_var = tk.StringVar(value=self.initial.get("req_type", REQUIREMENT_TYPE_OPTIONS[0]))
+                ttk.Combobox(master, textvariable=self.type_var, values=REQUIREMENT_TYPE_OPTIONS, state="readonly").grid(row=1, column=1, padx=5, pady=5)
 
                 ttk.Label(master, text="ASIL:").grid(row=2, column=0, sticky="e")
                 self.asil_var = tk.StringVar(value=self.initial.get("asil", "QM"))
@@ -8419,7 +8953,7 @@ class FaultTreeApp:
             rid = sel[0]
             dlg = ReqDialog(win, "Edit Requirement", global_requirements.get(rid))
             if dlg.result:
-                global_requirements[rid].update(dlg.result)
+                global_requirements.update_fields(rid, dlg.result)
                 refresh_tree()
 
         def del_req():
@@ -8436,6 +8970,7 @@ class FaultTreeApp:
                     for e in fmea.get("entries", []):
                         reqs = e.get("safety_requirements", [])
                         e["safety_requirements"] = [r for r in reqs if r.get("id") != rid]
+                self.notify_change(REQUIREMENT_CHANGED, "global_requirements", rid, allocation=True)
                 refresh_tree()
 
         def edit_trace():
@@ -8454,6 +8989,7 @@ class FaultTreeApp:
                     if not val and present:
                         node.safety_requirements = [r for r in reqs if r.get("id") != rid]
                 # ASIL updates will occur after joint review
+                self.notify_change(REQUIREMENT_CHANGED, "global_requirements", rid, allocation=True)
                 refresh_tree()
 
         btn = tk.Frame(win)
@@ -8464,6 +9000,9 @@ class FaultTreeApp:
         tk.Button(btn, text="Traceability", command=edit_trace).pack(side=tk.LEFT)
 
         refresh_tree()
+        if select is not None and tree.exists(select):
+            tree.selection_set(select)
+            tree.see(select)
 
 
     def show_fmea_list(self):
@@ -8489,7 +9028,7 @@ class FaultTreeApp:
                 file_name = f"fmea_{name}.csv"
                 self.fmeas.append({'name': name, 'entries': [], 'file': file_name})
                 listbox.insert(tk.END, name)
-                self.update_views()
+                self.notify_change(DOCUMENT_CHANGED, "fmeas")
 
         def delete_fmea():
             sel = listbox.curselection()
@@ -8498,7 +9037,7 @@ class FaultTreeApp:
             idx = sel[0]
             del self.fmeas[idx]
             listbox.delete(idx)
-            self.update_views()
+            self.notify_change(DOCUMENT_CHANGED, "fmeas")
 
         listbox.bind("<Double-1>", open_selected)
         btn_frame = ttk.Frame(win)
@@ -8530,7 +9069,7 @@ class FaultTreeApp:
                 file_name = f"fmeda_{name}.csv"
                 self.fmedas.append({'name': name, 'entries': [], 'file': file_name, 'bom': ''})
                 listbox.insert(tk.END, name)
-                self.update_views()
+                self.notify_change(DOCUMENT_CHANGED, "fmedas")
 
         def delete_fmeda():
             sel = listbox.curselection()
@@ -8539,7 +9078,7 @@ class FaultTreeApp:
             idx = sel[0]
             del self.fmedas[idx]
             listbox.delete(idx)
-            self.update_views()
+            self.notify_change(DOCUMENT_CHANGED, "fmedas")
 
         listbox.bind("<Double-1>", open_selected)
         btn_frame = ttk.Frame(win)
@@ -8559,7 +9098,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 w = csv.writer(f)
                 w.writerow(["ID","Name","Description"])
                 for n in self.get_all_triggering_conditions():
@@ -8578,7 +9117,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 w = csv.writer(f)
                 w.writerow(["ID","Name","Description"])
                 for n in self.get_all_functional_insufficiencies():
@@ -8587,10 +9126,12 @@ class FaultTreeApp:
         ttk.Button(win, text="Export CSV", command=export_csv).pack(side=tk.RIGHT, padx=5, pady=5)
 
     class FMEARowDialog(simpledialog.Dialog):
-        def __init__(self, parent, node, app, fmea_entries, mechanisms=None, hide_diagnostics=False):
+        def __init__(self, parent, node, app, fmea_entries, mechanisms=None, hide_diagnostics=False,
+                     section="fmeas"):
             self.node = node
             self.app = app
             self.fmea_entries = fmea_entries
+            self.section = section
             self.mechanisms = mechanisms or []
             self.hide_diagnostics = hide_diagnostics
             super().__init__(parent, title="Edit FMEA Entry")
@@ -8808,6 +9349,9 @@ class FaultTreeApp:
             return self.effect_text
 
         def apply(self):
+            before = SetAttributes.capture(self.node)
+            parent = self.node.parents[0] if self.node.parents else None
+            parent_before = SetAttributes.capture(parent, ["user_name"]) if parent else {}
             comp = self.comp_var.get()
             if self.node.parents:
                 self.node.parents[0].user_name = comp
@@ -8870,6 +9414,16 @@ class FaultTreeApp:
                 self.node.fmeda_spfm_target = getattr(fta_goal, "sg_spfm_target", 0.0)
                 self.node.fmeda_lpfm_target = getattr(fta_goal, "sg_lpfm_target", 0.0)
             self.app.propagate_failure_mode_attributes(self.node)
+            self.app.record_command(
+                CommandGroup(
+                    [
+                        SetAttributes.from_change(self.node, before),
+                        SetAttributes.from_change(parent, parent_before) if parent else None,
+                    ],
+                    label="Edit FMEA Row",
+                    section=self.section,
+                )
+            )
 
         def add_existing_requirement(self):
             global global_requirements
@@ -8915,10 +9469,12 @@ class FaultTreeApp:
             if not custom_id:
                 custom_id = str(uuid.uuid4())
             if custom_id in global_requirements:
-                req = global_requirements[custom_id]
-                req["req_type"] = dialog.result["req_type"]
-                req["text"] = dialog.result["text"]
-                req["asil"] = dialog.result.get("asil", "QM")
+                req = global_requirements.update_fields(
+                    custom_id,
+                    req_type=dialog.result["req_type"],
+                    text=dialog.result["text"],
+                    asil=dialog.result.get("asil", "QM"),
+                )
             else:
                 req = {
                     "id": custom_id,
@@ -9369,6 +9925,37 @@ class FaultTreeApp:
         else:
             refresh_tree()
 
+        section = "fmedas" if fmeda else "fmeas"
+        refresh_pending = [False]
+
+        def publish_rows():
+            self.notify_change(FMEA_ROW_CHANGED, section, entries, source=win)
+
+        def deferred_refresh():
+            refresh_pending[0] = False
+            if win.winfo_exists():
+                refresh_tree()
+
+        def on_model_change(event):
+            if not win.winfo_exists():
+                self.journal.unsubscribe(on_model_change)
+                return
+            if event.data.get("source") is win:
+                return
+            if event.kind == FMEA_ROW_CHANGED:
+                if event.target is not entries:
+                    return
+            elif event.target is not None:
+                ids = {be.unique_id for be in entries}
+                ids.update(getattr(be, "failure_mode_ref", None) for be in entries)
+                if getattr(event.target, "unique_id", None) not in ids:
+                    return
+            if not refresh_pending[0]:
+                refresh_pending[0] = True
+                win.after_idle(deferred_refresh)
+
+        self.journal.subscribe(on_model_change, FMEA_ROW_CHANGED, NODE_CHANGED)
+
         def on_double(event):
             sel = tree.focus()
             node = node_map.get(sel)
@@ -9378,8 +9965,11 @@ class FaultTreeApp:
                     mechs.extend(lib.mechanisms)
                 comp_name = node.parents[0].user_name if node.parents else getattr(node, "fmea_component", "")
                 is_passive = any(c.name == comp_name and c.is_passive for c in self.reliability_components)
-                self.FMEARowDialog(win, node, self, entries, mechanisms=mechs, hide_diagnostics=is_passive)
+                self.FMEARowDialog(
+                    win, node, self, entries, mechanisms=mechs, hide_diagnostics=is_passive, section=section
+                )
                 refresh_tree()
+                publish_rows()
 
         tree.bind("<Double-1>", on_double)
 
@@ -9394,7 +9984,9 @@ class FaultTreeApp:
                     mechs.extend(lib.mechanisms)
                 comp_name = getattr(node, "fmea_component", "")
                 is_passive = any(c.name == comp_name and c.is_passive for c in self.reliability_components)
-                self.FMEARowDialog(win, node, self, entries, mechanisms=mechs, hide_diagnostics=is_passive)
+                self.FMEARowDialog(
+                    win, node, self, entries, mechanisms=mechs, hide_diagnostics=is_passive, section=section
+                )
             elif node:
                 # gather all failure modes under the same component/parent
                 if node.parents:
@@ -9423,8 +10015,11 @@ class FaultTreeApp:
                         mechs.extend(lib.mechanisms)
                     comp_name = be.parents[0].user_name if be.parents else getattr(be, "fmea_component", "")
                     is_passive = any(c.name == comp_name and c.is_passive for c in self.reliability_components)
-                    self.FMEARowDialog(win, be, self, entries, mechanisms=mechs, hide_diagnostics=is_passive)
+                    self.FMEARowDialog(
+                        win, be, self, entries, mechanisms=mechs, hide_diagnostics=is_passive, section=section
+                    )
             refresh_tree()
+            publish_rows()
 
         add_btn.config(command=add_failure_mode)
 
@@ -9438,6 +10033,7 @@ class FaultTreeApp:
                 if node in entries:
                     entries.remove(node)
             refresh_tree()
+            publish_rows()
 
         remove_btn.config(command=remove_from_fmea)
 
@@ -9453,6 +10049,7 @@ class FaultTreeApp:
                 if node in entries:
                     entries.remove(node)
             refresh_tree()
+            publish_rows()
 
         del_btn.config(command=delete_failure_mode)
 
@@ -9478,87 +10075,20 @@ class FaultTreeApp:
                     self.export_fmea_to_csv(fmea, fmea['file'])
                 if fmeda:
                     fmea['bom'] = bom_var.get()
+            self.journal.unsubscribe(on_model_change)
             win.destroy()
 
         win.protocol("WM_DELETE_WINDOW", on_close)
 
     def export_fmea_to_csv(self, fmea, path):
-        columns = ["Component", "Parent", "Failure Mode", "Failure Effect", "Cause", "S", "O", "D", "RPN", "Requirements"]
-        with open(path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            for be in fmea['entries']:
-                parent = be.parents[0] if be.parents else None
-                if parent:
-                    comp = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
-                    if parent.description:
-                        comp = f"{comp} - {parent.description}"
-                    parent_name = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
-                else:
-                    comp = getattr(be, "fmea_component", "") or "N/A"
-                    parent_name = ""
-                req_ids = "; ".join([f"{req['req_type']}:{req['text']}" for req in getattr(be, 'safety_requirements', [])])
-                rpn = be.fmea_severity * be.fmea_occurrence * be.fmea_detection
-                failure_mode = be.description or (be.user_name or f"BE {be.unique_id}")
-                row = [comp, parent_name, failure_mode, be.fmea_effect, be.fmea_cause, be.fmea_severity, be.fmea_occurrence, be.fmea_detection, rpn, req_ids]
-                writer.writerow(row)
+        """Write ``fmea`` to ``path`` unless the file already holds these rows."""
+        rows = (fmea_row(be) for be in fmea['entries'])
+        return self.csv_exports.write(path, FMEA_COLUMNS, rows)
 
     def export_fmeda_to_csv(self, fmeda, path):
-        columns = [
-            "Component",
-            "Parent",
-            "Failure Mode",
-            "Failure Effect",
-            "Cause",
-            "S",
-            "O",
-            "D",
-            "RPN",
-            "Requirements",
-            "Malfunction",
-            "Safety Goal",
-            "FaultType",
-            "Fraction",
-            "FIT",
-            "DiagCov",
-            "Mechanism",
-        ]
-        with open(path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            for be in fmeda['entries']:
-                parent = be.parents[0] if be.parents else None
-                if parent:
-                    comp = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
-                    if parent.description:
-                        comp = f"{comp} - {parent.description}"
-                    parent_name = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
-                else:
-                    comp = getattr(be, "fmea_component", "") or "N/A"
-                    parent_name = ""
-                req_ids = "; ".join([f"{req['req_type']}:{req['text']}" for req in getattr(be, 'safety_requirements', [])])
-                rpn = be.fmea_severity * be.fmea_occurrence * be.fmea_detection
-                failure_mode = be.description or (be.user_name or f"BE {be.unique_id}")
-                row = [
-                    comp,
-                    parent_name,
-                    failure_mode,
-                    be.fmea_effect,
-                    be.fmea_cause,
-                    be.fmea_severity,
-                    be.fmea_occurrence,
-                    be.fmea_detection,
-                    rpn,
-                    req_ids,
-                    getattr(be, "fmeda_malfunction", ""),
-                    ", ".join(self.get_top_event_safety_goals(be)) or getattr(be, "fmeda_safety_goal", ""),
-                    getattr(be, "fmeda_fault_type", ""),
-                    be.fmeda_fault_fraction,
-                    be.fmeda_fit,
-                    be.fmeda_diag_cov,
-                    getattr(be, "fmeda_mechanism", ""),
-                ]
-                writer.writerow(row)
+        """Write ``fmeda`` to ``path`` unless the file already holds these rows."""
+        rows = (fmeda_row(be, self.get_top_event_safety_goals(be)) for be in fmeda['entries'])
+        return self.csv_exports.write(path, FMEDA_COLUMNS, rows)
 
 
     def show_traceability_matrix(self):
@@ -9713,8 +10243,9 @@ class FaultTreeApp:
                 node.acceptance_criteria = dlg.result["accept"]
                 node.safety_goal_description = dlg.result["desc"]
                 self.top_events.append(node)
+                self.reachability.add_root(node.unique_id)
                 refresh_tree()
-                self.update_views()
+                self.notify_change(STRUCTURE_CHANGED, "top_events", node)
 
         def edit_sg():
             sel = tree.selection()
@@ -9731,7 +10262,7 @@ class FaultTreeApp:
                 sg.acceptance_criteria = dlg.result["accept"]
                 sg.safety_goal_description = dlg.result["desc"]
                 refresh_tree()
-                self.update_views()
+                self.notify_change(NODE_CHANGED, "top_events", sg)
 
         def del_sg():
             sel = tree.selection()
@@ -9741,8 +10272,10 @@ class FaultTreeApp:
             sg = self.find_node_by_id_all(uid)
             if sg and messagebox.askyesno("Delete", "Delete safety goal?"):
                 self.top_events = [t for t in self.top_events if t.unique_id != uid]
+                self.reachability.remove_root(uid)
+                self.reachability.remove_subtree(sg)
                 refresh_tree()
-                self.update_views()
+                self.notify_change(STRUCTURE_CHANGED, "top_events", sg)
 
         btn = ttk.Frame(win)
         btn.pack(fill=tk.X)
@@ -9759,7 +10292,7 @@ class FaultTreeApp:
             return
 
         columns = ["Safety Goal", "SG ASIL", "Safe State", "Requirement ID", "Req ASIL", "Text"]
-        with open(path, "w", newline="") as f:
+        with open_file(path, "w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(columns)
             for te in self.top_events:
@@ -9810,7 +10343,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Top Event", "Cut Set #", "Basic Events"])
                 for iid in tree.get_children():
@@ -9866,7 +10399,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Cause", "Events"])
                 for iid in tree.get_children():
@@ -9913,7 +10446,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Top Event", "Cut Set #", "Basic Events"])
                 for iid in tree.get_children():
@@ -9969,7 +10502,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Cause", "Events"])
                 for iid in tree.get_children():
@@ -10016,7 +10549,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Top Event", "Cut Set #", "Basic Events"])
                 for iid in tree.get_children():
@@ -10072,7 +10605,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Cause", "Events"])
                 for iid in tree.get_children():
@@ -10119,7 +10652,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Top Event", "Cut Set #", "Basic Events"])
                 for iid in tree.get_children():
@@ -10175,7 +10708,7 @@ class FaultTreeApp:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if not path:
                 return
-            with open(path, "w", newline="") as f:
+            with open_file(path, "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Cause", "Events"])
                 for iid in tree.get_children():
@@ -10658,6 +11191,7 @@ class FaultTreeApp:
             dlg = LibraryDialog(win, self)
             if dlg.data.get("name"):
                 self.scenario_libraries.append({"name": dlg.data["name"], "scenarios": [], "odds": dlg.data["odds"]})
+                self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
                 refresh_libs()
 
         def edit_lib():
@@ -10667,6 +11201,7 @@ class FaultTreeApp:
             lib = self.scenario_libraries[sel[0]]
             dlg = LibraryDialog(win, self, lib)
             lib.update(dlg.data)
+            self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
             refresh_libs()
 
         def delete_lib():
@@ -10674,6 +11209,7 @@ class FaultTreeApp:
             if sel:
                 idx = sel[0]
                 del self.scenario_libraries[idx]
+                self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
                 refresh_libs()
 
         def add_scen():
@@ -10684,6 +11220,7 @@ class FaultTreeApp:
             dlg = ScenarioDialog(win, self, lib)
             if dlg.data.get("name"):
                 lib.setdefault("scenarios", []).append(dlg.data)
+                self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
                 refresh_scenarios()
 
         def edit_scen():
@@ -10696,6 +11233,7 @@ class FaultTreeApp:
             data = lib.get("scenarios", [])[idx]
             dlg = ScenarioDialog(win, self, lib, data)
             lib["scenarios"][idx] = dlg.data
+            self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
             refresh_scenarios()
 
         def del_scen():
@@ -10706,6 +11244,7 @@ class FaultTreeApp:
             lib = self.scenario_libraries[sel_lib[0]]
             idx = scen_tree.index(sel_sc[0])
             del lib.get("scenarios", [])[idx]
+            self.notify_change(DOCUMENT_CHANGED, "scenario_libraries")
             refresh_scenarios()
 
         btnf = ttk.Frame(win)
@@ -10793,7 +11332,7 @@ class FaultTreeApp:
                 path = filedialog.askopenfilename(filetypes=[("CSV/Excel", "*.csv *.xlsx")])
                 if path:
                     if path.lower().endswith(".csv"):
-                        with open(path, newline="") as f:
+                        with open_file(path, "r", newline="") as f:
                             elems = list(csv.DictReader(f))
                     elif path.lower().endswith(".xlsx"):
                         try:
@@ -10941,7 +11480,6 @@ class FaultTreeApp:
         diag = repo.create_diagram("Use Case Diagram", name=name, package=repo.root_package.elem_id)
         tab = self._new_tab(diag.name)
         UseCaseDiagramWindow(tab, self, diagram_id=diag.diag_id)
-        self.update_views()
 
     def open_activity_diagram(self):
         """Prompt for a diagram name then open a new activity diagram."""
@@ -10952,7 +11490,6 @@ class FaultTreeApp:
         diag = repo.create_diagram("Activity Diagram", name=name, package=repo.root_package.elem_id)
         tab = self._new_tab(diag.name)
         ActivityDiagramWindow(tab, self, diagram_id=diag.diag_id)
-        self.update_views()
 
     def open_block_diagram(self):
         """Prompt for a diagram name then open a new block diagram."""
@@ -10963,7 +11500,6 @@ class FaultTreeApp:
         diag = repo.create_diagram("Block Diagram", name=name, package=repo.root_package.elem_id)
         tab = self._new_tab(diag.name)
         BlockDiagramWindow(tab, self, diagram_id=diag.diag_id)
-        self.update_views()
 
     def open_internal_block_diagram(self):
         """Prompt for a diagram name then open a new internal block diagram."""
@@ -10974,7 +11510,6 @@ class FaultTreeApp:
         diag = repo.create_diagram("Internal Block Diagram", name=name, package=repo.root_package.elem_id)
         tab = self._new_tab(diag.name)
         InternalBlockDiagramWindow(tab, self, diagram_id=diag.diag_id)
-        self.update_views()
 
     def manage_architecture(self):
         ArchitectureManagerDialog(self.root, self)
@@ -11045,14 +11580,33 @@ class FaultTreeApp:
             if child.unique_id == self.clipboard_node.unique_id:
                 messagebox.showwarning("Paste", "This node is already a child of the target.")
                 return
+        if self.cut_mode and self.reachability.would_create_cycle(
+            target.unique_id, self.clipboard_node.unique_id
+        ):
+            messagebox.showwarning("Paste", "Cannot move a node into its own subtree.")
+            return
 
         # 6) If in cut mode, update parent's pointer, remove from top_events, and update coordinates.
         if self.cut_mode:
+            commands = []
+            moved = self.clipboard_node
+            before = SetAttributes.capture(
+                moved,
+                ["node_type", "severity", "is_page", "input_subtype",
+                 "is_primary_instance", "x", "y", "display_label"],
+            )
+            if moved in self.top_events:
+                commands.append(ListRemove(self.top_events, self.top_events.index(moved), moved))
+            commands.append(UnlinkNodes(moved, UnlinkNodes.capture(moved)))
             if self.clipboard_node in self.top_events:
                 self.top_events.remove(self.clipboard_node)
+                self.reachability.remove_root(self.clipboard_node.unique_id)
             for p in list(self.clipboard_node.parents):
                 if self.clipboard_node in p.children:
                     p.children.remove(self.clipboard_node)
+            self.reachability.detach(
+                self.clipboard_node.unique_id, [p.unique_id for p in self.clipboard_node.parents]
+            )
             self.clipboard_node.parents = []
             if self.clipboard_node.node_type.upper() == "TOP EVENT":
                 # Demote top events so they no longer show in the tree.
@@ -11060,14 +11614,24 @@ class FaultTreeApp:
                 self.clipboard_node.severity = None
                 self.clipboard_node.is_page = False
                 self.clipboard_node.input_subtype = "Capability"
-            self.clipboard_node.is_primary_instance = True
+            if not self.clipboard_node.is_primary_instance:
+                # A moved clone stops mirroring the primary it was cloned from.
+                self.clone_registry.unregister(self.clipboard_node)
+                self.clipboard_node.is_primary_instance = True
+                self.clone_registry.register(self.clipboard_node)
             target.children.append(self.clipboard_node)
             self.clipboard_node.parents.append(target)
+            self.reachability.add_edge(target.unique_id, self.clipboard_node.unique_id)
             # NEW: Update its position so it is offset relative to the new parent.
             self.clipboard_node.x = target.x + 100
             self.clipboard_node.y = target.y + 100
             # (Optional: remove any clone marker from its label.)
             self.clipboard_node.display_label = self.clipboard_node.display_label.replace(" (clone)", "")
+            commands.append(LinkNodes(target, moved))
+            commands.append(SetAttributes.from_change(moved, before))
+            self.record_command(
+                CommandGroup(commands, label="Cut and Paste", section="top_events", structural=True)
+            )
             self.clipboard_node = None
             self.cut_mode = False
             messagebox.showinfo("Paste", "Node moved successfully (cut & pasted).")
@@ -11076,9 +11640,11 @@ class FaultTreeApp:
             cloned_node = self.clone_node_preserving_id(self.clipboard_node)
             target.children.append(cloned_node)
             cloned_node.parents.append(target)
+            self.reachability.add_edge(target.unique_id, cloned_node.unique_id)
             # NEW: Also update the cloned node’s position relative to the target.
             cloned_node.x = target.x + 100
             cloned_node.y = target.y + 100
+            self.record_command(LinkNodes(target, cloned_node, label="Paste", section="top_events"))
             messagebox.showinfo("Paste", "Node pasted successfully (copied).")
 
         # 8) Recalculate and update views.
@@ -11086,7 +11652,7 @@ class FaultTreeApp:
             self.root_node,
             self.top_events,
         )
-        self.update_views()
+        self.notify_change(STRUCTURE_CHANGED, "top_events", target)
  
     def clone_node_preserving_id(self, node):
         # Create a new node with the same properties, but assign a new unique ID.
@@ -11109,90 +11675,21 @@ class FaultTreeApp:
         # Set the clone’s "original" pointer: if the original was primary, use it; otherwise, use its original.
         new_node.original = node if node.is_primary_instance else node.original
         new_node.children = []
+        self.clone_registry.register(new_node)
         return new_node
 
     def sync_nodes_by_id(self, updated_node):
-        # Always work with the primary instance.
-        if not updated_node.is_primary_instance and updated_node.original:
-            updated_node = updated_node.original
-        updated_primary_id = updated_node.unique_id
-
-        for node in self.get_all_nodes(self.root_node):
-            # Skip the updated node itself.
-            if node is updated_node:
-                continue
-
-            if node.is_primary_instance:
-                if node.unique_id == updated_primary_id:
-                    node.node_type = updated_node.node_type
-                    node.user_name = updated_node.user_name
-                    node.description = updated_node.description
-                    node.rationale = updated_node.rationale
-                    node.quant_value = updated_node.quant_value
-                    node.gate_type = updated_node.gate_type
-                    node.severity = updated_node.severity
-                    node.input_subtype = updated_node.input_subtype
-                    node.display_label = updated_node.display_label
-                    node.equation = updated_node.equation
-                    node.detailed_equation = updated_node.detailed_equation
-                    node.is_page = updated_node.is_page
-                    node.failure_prob = updated_node.failure_prob
-                    node.prob_formula = updated_node.prob_formula
-                    node.failure_mode_ref = updated_node.failure_mode_ref
-                    node.fmea_effect = updated_node.fmea_effect
-                    node.fmea_cause = updated_node.fmea_cause
-                    node.fmea_severity = updated_node.fmea_severity
-                    node.fmea_occurrence = updated_node.fmea_occurrence
-                    node.fmea_detection = updated_node.fmea_detection
-                    node.fmea_component = updated_node.fmea_component
-                    node.fmeda_malfunction = updated_node.fmeda_malfunction
-                    node.fmeda_safety_goal = updated_node.fmeda_safety_goal
-                    node.fmeda_diag_cov = updated_node.fmeda_diag_cov
-                    node.fmeda_fit = updated_node.fmeda_fit
-                    node.fmeda_spfm = updated_node.fmeda_spfm
-                    node.fmeda_lpfm = updated_node.fmeda_lpfm
-                    node.fmeda_fault_type = updated_node.fmeda_fault_type
-                    node.fmeda_fault_fraction = updated_node.fmeda_fault_fraction
-            else:
-                # Use the original pointer to compare.
-                if node.original and node.original.unique_id == updated_primary_id:
-                    node.user_name = updated_node.user_name
-                    node.description = updated_node.description
-                    node.rationale = updated_node.rationale
-                    node.quant_value = updated_node.quant_value
-                    node.gate_type = updated_node.gate_type
-                    node.severity = updated_node.severity
-                    node.input_subtype = updated_node.input_subtype
-                    # Append a marker to the display label to indicate this is a clone.
-                    node.display_label = updated_node.display_label + " (clone)"
-                    node.equation = updated_node.equation
-                    node.detailed_equation = updated_node.detailed_equation
-                    # **The key change: update the page flag on clones as well.**
-                    node.is_page = updated_node.is_page
-                    node.failure_prob = updated_node.failure_prob
-                    node.prob_formula = updated_node.prob_formula
-                    node.failure_mode_ref = updated_node.failure_mode_ref
-                    node.fmea_effect = updated_node.fmea_effect
-                    node.fmea_cause = updated_node.fmea_cause
-                    node.fmea_severity = updated_node.fmea_severity
-                    node.fmea_occurrence = updated_node.fmea_occurrence
-                    node.fmea_detection = updated_node.fmea_detection
-                    node.fmea_component = updated_node.fmea_component
-                    node.fmeda_malfunction = updated_node.fmeda_malfunction
-                    node.fmeda_safety_goal = updated_node.fmeda_safety_goal
-                    node.fmeda_diag_cov = updated_node.fmeda_diag_cov
-                    node.fmeda_fit = updated_node.fmeda_fit
-                    node.fmeda_spfm = updated_node.fmeda_spfm
-                    node.fmeda_lpfm = updated_node.fmeda_lpfm
-                    node.fmeda_fault_type = updated_node.fmeda_fault_type
-                    node.fmeda_fault_fraction = updated_node.fmeda_fault_fraction
+        """Propagate edits of ``updated_node`` to every clone of its primary."""
+        self.clone_registry.sync(updated_node)
 
     def edit_user_name(self):
         if self.selected_node:
             new_name = simpledialog.askstring("Edit User Name", "Enter new user name:", initialvalue=self.selected_node.user_name)
             if new_name is not None:
+                before = SetAttributes.capture(self.selected_node, ["user_name"])
                 self.selected_node.user_name = new_name.strip()
-                self.update_views()
+                self.record_command(SetAttributes.from_change(self.selected_node, before, section="top_events"))
+                self.notify_change(NODE_CHANGED, "top_events", self.selected_node)
         else:
             messagebox.showwarning("Edit User Name", "Select a node first.")
 
@@ -11200,8 +11697,10 @@ class FaultTreeApp:
         if self.selected_node:
             new_desc = simpledialog.askstring("Edit Description", "Enter new description:", initialvalue=self.selected_node.description)
             if new_desc is not None:
+                before = SetAttributes.capture(self.selected_node, ["description"])
                 self.selected_node.description = new_desc
-                self.update_views()
+                self.record_command(SetAttributes.from_change(self.selected_node, before, section="top_events"))
+                self.notify_change(NODE_CHANGED, "top_events", self.selected_node)
         else:
             messagebox.showwarning("Edit Description", "Select a node first.")
 
@@ -11209,8 +11708,10 @@ class FaultTreeApp:
         if self.selected_node:
             new_rat = simpledialog.askstring("Edit Rationale", "Enter new rationale:", initialvalue=self.selected_node.rationale)
             if new_rat is not None:
+                before = SetAttributes.capture(self.selected_node, ["rationale"])
                 self.selected_node.rationale = new_rat
-                self.update_views()
+                self.record_command(SetAttributes.from_change(self.selected_node, before, section="top_events"))
+                self.notify_change(NODE_CHANGED, "top_events", self.selected_node)
         else:
             messagebox.showwarning("Edit Rationale", "Select a node first.")
 
@@ -11219,8 +11720,10 @@ class FaultTreeApp:
             try:
                 new_val = simpledialog.askfloat("Edit Value", "Enter new value (1-5):", initialvalue=self.selected_node.quant_value)
                 if new_val is not None and 1 <= new_val <= 5:
+                    before = SetAttributes.capture(self.selected_node, ["quant_value"])
                     self.selected_node.quant_value = new_val
-                    self.update_views()
+                    self.record_command(SetAttributes.from_change(self.selected_node, before, section="top_events"))
+                    self.notify_change(NODE_CHANGED, "top_events", self.selected_node)
                 else:
                     messagebox.showerror("Error", "Value must be between 1 and 5.")
             except Exception:
@@ -11232,8 +11735,10 @@ class FaultTreeApp:
         if self.selected_node and self.selected_node.node_type.upper() in ["GATE", "RIGOR LEVEL", "TOP EVENT"]:
             new_gt = simpledialog.askstring("Edit Gate Type", "Enter new gate type (AND/OR):", initialvalue=self.selected_node.gate_type)
             if new_gt is not None and new_gt.upper() in ["AND", "OR"]:
+                before = SetAttributes.capture(self.selected_node, ["gate_type"])
                 self.selected_node.gate_type = new_gt.upper()
-                self.update_views()
+                self.record_command(SetAttributes.from_change(self.selected_node, before, section="top_events"))
+                self.notify_change(NODE_CHANGED, "top_events", self.selected_node)
             else:
                 messagebox.showerror("Error", "Gate type must be AND or OR.")
         else:
@@ -11264,20 +11769,221 @@ class FaultTreeApp:
 
         # Ask for the new page flag value.
         response = messagebox.askyesno("Edit Page Flag", f"Should node '{target.name}' be a page gate?")
+        before = SetAttributes.capture(target, ["is_page"])
         target.is_page = response
+        self.record_command(
+            SetAttributes.from_change(target, before, section="top_events", structural=True)
+        )
 
         # Sync the changes to all clones.
         self.sync_nodes_by_id(target)
-        self.update_views()
-
-    def set_last_saved_state(self):
+        self.notify_change(STRUCTURE_CHANGED, "top_events", target)
+
+    # Sections whose every edit publishes a change event.  The others are
+    # compared by digest to find unsaved changes.
+    JOURNALED_SECTIONS = frozenset({
+        "top_events",
+        "fmeas",
+        "fmedas",
+        "hazops",
+        "haras",
+        "fi2tc_docs",
+        "tc2fi_docs",
+        "scenario_libraries",
+        "global_requirements",
+        "sysml_repository",
+    })
+
+    def set_last_saved_state(self, data=None):
         """Record the current model state for change detection."""
-        self.last_saved_state = json.dumps(self.export_model_data(), sort_keys=True)
+        if data is None:
+            data = self._unjournaled_data()
+        self.dirty_tracker.mark_saved(data)
+
+    def _unjournaled_data(self):
+        """Return the model data of the sections outside :attr:`JOURNALED_SECTIONS`."""
+        keys = [k for k in self._model_exporters() if k not in self.JOURNALED_SECTIONS]
+        return self.export_model_data(sections=keys + ["versions"])
+
+    def _requirement_index_source(self):
+        self._requirement_index_root = self.root_node
+        return self.get_all_nodes(self.root_node), self.fmeas, self.find_node_by_id_all
+
+    def _on_requirement_store_change(self, kind, req_id):
+        self.notify_change(REQUIREMENT_CHANGED, "global_requirements", req_id, change=kind)
+
+    def _on_requirement_trace_change(self, event):
+        index = self.requirement_index
+        if getattr(self, "_requirement_index_root", None) is not self.root_node:
+            index.invalidate()
+        elif event.kind == REQUIREMENT_CHANGED and not event.data.get("allocation"):
+            pass  # registry edits do not move allocations
+        elif (
+            event.kind == NODE_CHANGED
+            and isinstance(event.target, FaultTreeNode)
+            and event.target.node_type.upper() != "TOP EVENT"
+        ):
+            # Only the allocations of the edited node can have changed.
+            index.update_owner(event.target)
+        else:
+            index.invalidate()
 
     def has_unsaved_changes(self):
         """Return True if the model differs from the last saved state."""
-        current_state = json.dumps(self.export_model_data(), sort_keys=True)
-        return current_state != getattr(self, "last_saved_state", None)
+        return self.dirty_tracker.is_dirty(self._unjournaled_data)
+
+    def _mark_dirty(self, event):
+        if event.kind != MODEL_RESET:
+            self.dirty_tracker.mark(event.section)
+
+    # --- Autosave -----------------------------------------------------------
+    AUTOSAVE_INTERVAL_MS = 30000
+
+    def _autosave_tick(self, reschedule=True):
+        """Journal the sections changed since the last autosave.
+
+        Journaled sections are only exported when their change counter
+        moved; sections without journal coverage are small and compared by
+        digest every time.  Exporting and encoding happen on the main
+        thread, one top event, document or small section per event loop
+        iteration, and only the encoded bytes reach the autosave worker
+        thread.
+        """
+        if reschedule:
+            self.root.after(self.AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+        if self._autosave_work:
+            return  # previous round still exporting
+        failed = self.autosaver.take_failed()
+        for key in failed:
+            self._autosave_digests.pop(key, None)
+            if key == "versions":
+                self._autosave_versions = None
+            if self.model_path is None:
+                self._autosave_full = True
+        counters = self.dirty_tracker.counters()
+        moved = {s for s, n in counters.items() if self._autosave_counters.get(s) != n}
+        self._autosave_counters = counters
+        self.update_odd_elements()
+        self._autosave_exporters = self._model_exporters(journal=True)
+        keys = [
+            k for k in self._autosave_exporters
+            if UNKNOWN_SECTION in moved or k in moved or k in failed or k not in self.JOURNALED_SECTIONS
+        ]
+        mark = self._versions_mark()
+        if not self._autosave_full and mark == self._autosave_versions and "versions" not in failed:
+            # Versions are only ever added, so skip encoding the history.
+            keys.remove("versions")
+        self._autosave_versions = mark
+        self._autosave_batch = {}
+        self._queue_autosave_work(keys)
+        self._autosave_step()
+
+    def _queue_autosave_work(self, keys):
+        split = self._split_exporters()
+        for key in keys:
+            if key in split:
+                items, export = split[key]
+                self._autosave_parts[key] = []
+                self._autosave_work += [(key, partial(export, item)) for item in items()]
+                self._autosave_work.append((key, None))  # join the parts
+            else:
+                self._autosave_work.append((key, self._autosave_exporters[key]))
+
+    def _autosave_now(self):
+        """Journal the pending changes without waiting for the event loop."""
+        while self._autosave_work:  # finish a round already started
+            self._autosave_step()
+        self._autosave_tick(reschedule=False)
+        while self._autosave_work:
+            self._autosave_step()
+
+    def _autosave_step(self):
+        if not self._autosave_work:
+            return
+        key, export = self._autosave_work.pop(0)
+        if export is None:
+            raw = b"[" + b",".join(self._autosave_parts.pop(key)) + b"]"
+        elif key in self._autosave_parts:
+            self._autosave_parts[key].append(encode_section(export()))
+            raw = None
+        else:
+            raw = encode_section(export())
+        if raw is not None:
+            digest = text_digest(raw)
+            if self._autosave_full or self._autosave_digests.get(key) != digest:
+                self._autosave_batch[key] = (raw, digest)
+        if self._autosave_work:
+            self.root.after(1, self._autosave_step)
+            return
+        batch = self._autosave_batch
+        if not any(self._autosave_digests.get(k) != d for k, (_raw, d) in batch.items()):
+            self._autosave_batch = {}
+            return  # a full snapshot is only written once something changed
+        if self._autosave_full:
+            rest = [k for k in self._autosave_exporters if k not in batch]
+            if rest:
+                self._queue_autosave_work(rest)
+                self.root.after(1, self._autosave_step)
+                return
+        self._autosave_batch = {}
+        self.autosaver.submit(
+            {k: raw for k, (raw, _d) in batch.items()},
+            {"model_path": self.model_path},
+            full=self._autosave_full,
+        )
+        self._autosave_digests.update((k, d) for k, (_raw, d) in batch.items())
+        self._autosave_full = False
+
+    def _start_autosave_session(self, path, recovered=False):
+        """Journal further changes relative to the model file ``path``.
+
+        After a recovery the model differs from the file, so everything is
+        written to the new journal right away.
+        """
+        self.model_path = path
+        self._autosave_work = []
+        self._autosave_parts = {}
+        self._autosave_batch = {}
+        self._autosave_counters = self.dirty_tracker.counters()
+        self._autosave_digests = {} if recovered else self.dirty_tracker.saved_digests()
+        self._autosave_versions = None if recovered else self._versions_mark()
+        self._autosave_full = path is None
+        self.autosaver.reset(AutosaveJournal.for_model(path))
+        if recovered:
+            self.dirty_tracker.mark()
+            self._autosave_tick(reschedule=False)
+
+    def _ask_recover_autosave(self, path, meta):
+        when = datetime.datetime.fromtimestamp(meta.get("time", 0)).strftime("%Y-%m-%d %H:%M")
+        return messagebox.askyesno(
+            "Recover Autosave",
+            f"Unsaved changes to {path or 'an unsaved model'} from {when} were found.\n"
+            "Recover them?",
+        )
+
+    def offer_autosave_recovery(self):
+        """Offer to restore the most recent autosave left by a crashed session."""
+        sessions = AutosaveJournal.sessions()
+        if not sessions:
+            return
+        journal = sessions[0]
+        meta, sections = journal.recover()
+        path = meta.get("model_path")
+        if not sections or not self._ask_recover_autosave(path, meta):
+            journal.discard()
+            return
+        data = {}
+        if not meta["full"]:
+            if not path or not os.path.exists(path):
+                messagebox.showerror("Recover Autosave", f"Model file {path} not found.")
+                return
+            data = self._read_model_file(path)
+            if data is None:
+                return
+            data = dict(data)
+        data.update(sections)
+        self.apply_model_data(data)
+        self._start_autosave_session(path, recovered=True)
 
     def confirm_close(self):
         """Prompt to save if there are unsaved changes before closing."""
@@ -11285,62 +11991,103 @@ class FaultTreeApp:
             result = messagebox.askyesnocancel("Unsaved Changes", "Save changes before exiting?")
             if result is None:
                 return
-            if result:
-                self.save_model()
+            if result and not self.save_model():
+                # Keep the edits recoverable from the journal.
+                self._autosave_now()
+                self.autosaver.stop()
+                self.root.destroy()
+                return
+        self.autosaver.stop()
+        self.autosaver.journal.discard()
         self.root.destroy()
 
-    def export_model_data(self, include_versions=True):
+    def _export_versions_journal(self):
+        # A history that was never loaded is still the one in the archive.
+        history = self.versions
+        return history.to_json() if history.loaded else history.manifest()
+
+    def _versions_mark(self):
+        """Return what changes when the version history does."""
+        return self.versions.loaded, len(self.versions)
+
+    def export_model_data(self, include_versions=True, sections=None):
+        """Return the model as JSON data.
+
+        With ``include_versions`` the result describes the saved model file:
+        the version history and the comments of closed reviews are replaced
+        by references to the sidecar archive written by :meth:`save_model`
+        and fault tree nodes leave out fields holding their default value.
+        ``sections`` limits the result to the named top level keys so callers
+        such as autosave only export what changed.
+        """
         # Ensure aggregated ODD elements are up to date
         self.update_odd_elements()
-        reviews = []
-        for r in self.reviews:
-            reviews.append({
-                "name": r.name,
-                "description": r.description,
-                "mode": r.mode,
-                "moderators": [asdict(m) for m in r.moderators],
-                "approved": r.approved,
-                "reviewed": getattr(r, 'reviewed', False),
-                "due_date": r.due_date,
-                "closed": r.closed,
-                "participants": [asdict(p) for p in r.participants],
-                "comments": [asdict(c) for c in r.comments],
-                "fta_ids": r.fta_ids,
-                "fmea_names": r.fmea_names,
-                "fmeda_names": getattr(r, 'fmeda_names', []),
-                "hazop_names": getattr(r, 'hazop_names', []),
-                "hara_names": getattr(r, 'hara_names', []),
-            })
-        current_name = self.review_data.name if self.review_data else None
-        repo = SysMLRepository.get_instance()
+        exporters = self._model_exporters(include_versions)
         data = {
-            "top_events": [event.to_dict() for event in self.top_events],
-            "fmeas": [
-                {
-                    "name": f["name"],
-                    "file": f["file"],
-                    "entries": [e.to_dict() for e in f["entries"]],
-                }
-                for f in self.fmeas
-            ],
-            "fmedas": [
-                {
-                    "name": d["name"],
-                    "file": d["file"],
-                    "entries": [e.to_dict() for e in d["entries"]],
-                    "bom": d.get("bom", ""),
-                }
-                for d in self.fmedas
-            ],
-            "mechanism_libraries": [
+            key: export()
+            for key, export in exporters.items()
+            if sections is None or key in sections
+        }
+        if include_versions and (sections is None or "versions" in sections) and len(self.versions):
+            # The history is only written to the archive when it has versions.
+            data["versions"] = self.versions.manifest()
+        return data
+
+    def _model_exporters(self, include_versions=True, journal=False):
+        """Return ``{section: function}`` building each part of the model data.
+
+        With ``journal`` the functions build the autosave journal, which is
+        applied on top of the saved model file: comments of closed reviews
+        only stay in the archive while they were never loaded and
+        ``versions`` holds the history itself once versions were added.
+        """
+        compact = include_versions
+        def export_reviews():
+            reviews = []
+            for r in self.reviews:
+                if journal:
+                    archived = r.closed and isinstance(r.comments, LazyList) and not r.comments.loaded
+                else:
+                    archived = include_versions and r.closed
+                reviews.append({
+                    "name": r.name,
+                    "description": r.description,
+                    "mode": r.mode,
+                    "moderators": [asdict(m) for m in r.moderators],
+                    "approved": r.approved,
+                    "reviewed": getattr(r, 'reviewed', False),
+                    "due_date": r.due_date,
+                    "closed": r.closed,
+                    "participants": [asdict(p) for p in r.participants],
+                    "comments": [] if archived else [asdict(c) for c in r.comments],
+                    "comments_archived": archived,
+                    "fta_ids": r.fta_ids,
+                    "fmea_names": r.fmea_names,
+                    "fmeda_names": getattr(r, 'fmeda_names', []),
+                    "hazop_names": getattr(r, 'hazop_names', []),
+                    "hara_names": getattr(r, 'hara_names', []),
+                })
+            return reviews
+
+        split = self._split_exporters(compact)
+
+        def whole(key):
+            items, export = split[key]
+            return lambda: [export(item) for item in items()]
+
+        exporters = {
+            "top_events": whole("top_events"),
+            "fmeas": whole("fmeas"),
+            "fmedas": whole("fmedas"),
+            "mechanism_libraries": lambda: [
                 {
                     "name": lib.name,
                     "mechanisms": [asdict(m) for m in lib.mechanisms],
                 }
                 for lib in self.mechanism_libraries
             ],
-            "selected_mechanism_libraries": [lib.name for lib in self.selected_mechanism_libraries],
-            "mission_profiles": [
+            "selected_mechanism_libraries": lambda: [lib.name for lib in self.selected_mechanism_libraries],
+            "mission_profiles": lambda: [
                 {
                     **asdict(mp),
                     "duty_cycle": mp.tau_on / (mp.tau_on + mp.tau_off)
@@ -11349,7 +12096,7 @@ class FaultTreeApp:
                 }
                 for mp in self.mission_profiles
             ],
-            "reliability_analyses": [
+            "reliability_analyses": lambda: [
                 {
                     "name": ra.name,
                     "standard": ra.standard,
@@ -11362,122 +12109,319 @@ class FaultTreeApp:
                 }
                 for ra in self.reliability_analyses
             ],
-            "hazops": [
-                {
+            "hazops": whole("hazops"),
+            "haras": whole("haras"),
+            "fi2tc_docs": lambda: [
+                {"name": doc.name, "entries": doc.entries}
+                for doc in self.fi2tc_docs
+            ],
+            "tc2fi_docs": lambda: [
+                {"name": doc.name, "entries": doc.entries}
+                for doc in self.tc2fi_docs
+            ],
+            "hazop_entries": lambda: [asdict(e) for e in self.hazop_entries],
+            "fi2tc_entries": lambda: self.fi2tc_entries,
+            "tc2fi_entries": lambda: self.tc2fi_entries,
+            "scenario_libraries": lambda: self.scenario_libraries,
+            "odd_libraries": lambda: self.odd_libraries,
+            "project_properties": lambda: self.project_properties,
+            "global_requirements": lambda: global_requirements,
+            "reviews": export_reviews,
+            "current_review": lambda: self.review_data.name if self.review_data else None,
+            "sysml_repository": lambda: SysMLRepository.get_instance().to_dict(),
+            **({"versions": self._export_versions_journal} if journal else {}),
+        }
+        # Sections never built since loading are written back as read.
+        for key in self.deferred_sections.raw_keys():
+            exporters[key] = partial(self.deferred_sections.raw, key, [])
+        return exporters
+
+    def _split_exporters(self, compact=True):
+        """Return ``{section: (items, export)}`` for sections exported per item.
+
+        The section is ``[export(item) for item in items()]``; exporting
+        one top event or document at a time keeps autosave steps short.
+        """
+        split = {
+            "top_events": (lambda: self.top_events, lambda event: event.to_dict(compact)),
+            "fmeas": (
+                lambda: self.fmeas,
+                lambda f: {
+                    "name": f["name"],
+                    "file": f["file"],
+                    "entries": [e.to_dict(compact) for e in f["entries"]],
+                },
+            ),
+            "fmedas": (
+                lambda: self.fmedas,
+                lambda d: {
+                    "name": d["name"],
+                    "file": d["file"],
+                    "entries": [e.to_dict(compact) for e in d["entries"]],
+                    "bom": d.get("bom", ""),
+                },
+            ),
+            "hazops": (
+                lambda: self.hazop_docs,
+                lambda doc: {
                     "name": doc.name,
                     "entries": [asdict(e) for e in doc.entries],
-                }
-                for doc in self.hazop_docs
-            ],
-            "haras": [
-                {
+                },
+            ),
+            "haras": (
+                lambda: self.hara_docs,
+                lambda doc: {
                     "name": doc.name,
                     "hazops": getattr(doc, "hazops", []),
                     "entries": [asdict(e) for e in doc.entries],
                     "approved": getattr(doc, "approved", False),
                     "status": getattr(doc, "status", "draft"),
-                }
-                for doc in self.hara_docs
-            ],
-            "fi2tc_docs": [
-                {"name": doc.name, "entries": doc.entries}
-                for doc in self.fi2tc_docs
-            ],
-            "tc2fi_docs": [
-                {"name": doc.name, "entries": doc.entries}
-                for doc in self.tc2fi_docs
-            ],
-            "hazop_entries": [asdict(e) for e in self.hazop_entries],
-            "fi2tc_entries": self.fi2tc_entries,
-            "tc2fi_entries": self.tc2fi_entries,
-            "scenario_libraries": self.scenario_libraries,
-            "odd_libraries": self.odd_libraries,
-            "project_properties": self.project_properties,
-            "global_requirements": global_requirements,
-            "reviews": reviews,
-            "current_review": current_name,
-            "sysml_repository": repo.to_dict(),
+                },
+            ),
         }
-        if include_versions:
-            data["versions"] = self.versions
-        return data
+        for key in self.deferred_sections.raw_keys():
+            if key in split:
+                split[key] = (partial(self.deferred_sections.raw, key, []), lambda item: item)
+        return split
 
     def save_model(self):
-        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        """Ask for a file and save the model; return ``True`` once saved."""
+        if self.missing_archive:
+            messagebox.showerror(
+                "Save Model",
+                "The model refers to archived data that could not be found:\n"
+                + "\n".join(self.missing_archive)
+                + "\n\nSaving would discard it. Restore the archive next to the model "
+                "file and open the model again; unsaved changes are kept in the "
+                "autosave journal.",
+            )
+            return False
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[
+                ("JSON", "*.json"),
+                ("Compressed JSON", " ".join("*.json" + e for e in COMPRESSED_EXTENSIONS)),
+                ("AutoML Project", "*" + EXTENSION),
+                ("SQLite Project", " ".join("*" + e for e in SQLITE_EXTENSIONS)),
+            ],
+        )
         if path:
             for fmea in self.fmeas:
                 self.export_fmea_to_csv(fmea, fmea['file'])
-            for fmeda in self.fmedas:
-                self.export_fmeda_to_csv(fmeda, fmeda['file'])
+            # FMEDAs that were never built still match their CSV files.
+            if not self.deferred_sections.pending("fmedas"):
+                for fmeda in self.fmedas:
+                    self.export_fmeda_to_csv(fmeda, fmeda['file'])
             data = self.export_model_data()
-            with open(path, "w") as f:
-                json.dump(data, f, indent=4)
+            sections = self._archive_sections()
+            if path.lower().endswith(SQLITE_EXTENSIONS):
+                store = self._open_project_store(path)
+                store.save(data, sections)
+                self.model_archive = store.archive()
+            elif path.lower().endswith(EXTENSION):
+                write_container(path, data, sections)
+                self.model_archive = ContainerReader(path, prefix=ARCHIVE_PREFIX)
+            else:
+                # A .gz/.xz/.zst extension compresses while json.dump streams.
+                with open_file(path, "w") as f:
+                    json.dump(data, f, indent=4)
+                archive_path = sidecar_path(path)
+                if sections:
+                    write_archive(archive_path, sections)
+                    self.model_archive = ArchiveReader(archive_path)
+                else:
+                    if os.path.exists(archive_path):
+                        os.remove(archive_path)
+                    self.model_archive = ArchiveReader()
             messagebox.showinfo("Saved", "Model saved with all configuration and safety goal information.")
-            self.set_last_saved_state()
+            self.set_last_saved_state(data)
+            self._start_autosave_session(path)
+            return True
+        return False
+
+    def _archive_sections(self):
+        """Return the sidecar archive sections (name -> JSON bytes) to save.
+
+        Sections that were never loaded are copied from the current archive
+        without being parsed.
+        """
+        archive = self.model_archive
+        sections = {}
+        if not self.versions.loaded and archive.has("versions"):
+            sections["versions"] = archive.raw("versions")
+        elif self.versions:
+            sections["versions"] = json.dumps(self.versions.to_json()).encode("utf-8")
+        for r in self.reviews:
+            if not r.closed:
+                continue
+            name = f"review:{r.name}"
+            if isinstance(r.comments, LazyList) and not r.comments.loaded and archive.has(name):
+                sections[name] = archive.raw(name)
+            else:
+                sections[name] = json.dumps([asdict(c) for c in r.comments]).encode("utf-8")
+        return sections
+
+    def _open_project_store(self, path):
+        """Return the SQLite store for ``path``, reusing the open one.
+
+        Keeping the store open keeps its row digests, so the next save only
+        writes the rows that changed.
+        """
+        store = self.project_store
+        if store is not None and os.path.abspath(store.path) == os.path.abspath(path):
+            return store
+        if store is not None:
+            store.close()
+        self.project_store = SqliteProjectStore(path)
+        return self.project_store
+
+    def _archived_comments(self, review_name):
+        name = f"review:{review_name}"
+        return LazyList(
+            loader=lambda: [ReviewComment(**c) for c in self.model_archive.load(name, [])]
+        )
 
     def load_model(self):
-        global AutoML_Helper
-        # Reinitialize the helper so that the counter is reset.
-        AutoML_Helper = AutoMLHelper()
+        # Reset the unique id counter for the model being loaded.
+        AutoML_Helper.unique_node_id_counter = 1
         
-        path = filedialog.askopenfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        path = filedialog.askopenfilename(
+            defaultextension=".json",
+            filetypes=[
+                (
+                    "Model",
+                    " ".join(
+                        ["*.json", "*" + EXTENSION]
+                        + ["*.json" + e for e in COMPRESSED_EXTENSIONS]
+                        + ["*" + e for e in SQLITE_EXTENSIONS]
+                    ),
+                ),
+                ("JSON", "*.json"),
+                ("Compressed JSON", " ".join("*.json" + e for e in COMPRESSED_EXTENSIONS)),
+                ("AutoML Project", "*" + EXTENSION),
+                ("SQLite Project", " ".join("*" + e for e in SQLITE_EXTENSIONS)),
+            ],
+        )
         if not path:
             return
-        with open(path, "r") as f:
-            raw = f.read()
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError as exc:
-            import re
+        data = self._read_model_file(path)
+        if data is None:
+            return
+        journal = AutosaveJournal.for_model(path)
+        meta, sections = journal.recover() if journal.exists() else ({}, {})
+        recovered = bool(sections) and self._ask_recover_autosave(path, meta)
+        if recovered:
+            data = {} if meta["full"] else dict(data)
+            data.update(sections)
+        self.apply_model_data(data)
+        self._start_autosave_session(path, recovered)
+
+    def _read_model_file(self, path):
+        """Return the model data of ``path`` in any supported format.
+
+        Also points :attr:`model_archive` at the file's archive sections.
+        Returns ``None`` if the file cannot be parsed.
+        """
+        if is_sqlite(path):
+            store = self._open_project_store(path)
+            self.model_archive = store.archive()
+            return store.load()
+        if is_container(path):
+            self.model_archive = ContainerReader(path, prefix=ARCHIVE_PREFIX)
+            return ContainerData(ContainerReader(path))
+        data = self._load_json_model(path)
+        if data is not None:
+            self.model_archive = ArchiveReader(sidecar_path(path))
+        return data
 
-            def clean(text: str) -> str:
-                text = re.sub(r"//.*", "", text)
-                text = re.sub(r"#.*", "", text)
-                text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
-                text = re.sub(r",\s*(\]|\})", r"\1", text)
-                return text
+    # Files smaller than this load too quickly to need a progress window.
+    LOAD_PROGRESS_MIN_BYTES = 1 << 20
 
-            try:
-                data = json.loads(clean(raw))
-            except json.JSONDecodeError:
-                messagebox.showerror(
-                    "Load Model",
-                    f"Failed to parse JSON file:\n{exc}",
-                )
-                return
+    def _load_json_model(self, path):
+        """Parse a JSON model file, tolerating comments and trailing commas.
 
-        repo_data = data.get("sysml_repository")
-        if repo_data:
-            repo = SysMLRepository.get_instance()
-            repo.from_dict(repo_data)
+        Sections are decoded one after the other while the file is read and
+        fault tree nodes are built from each section right away.
+        """
+        progress = None
+        if os.path.getsize(path) >= self.LOAD_PROGRESS_MIN_BYTES:
+            progress = ProgressWindow(self.root, "Load Model", f"Loading {os.path.basename(path)}...")
+        try:
+            return load_model_file(
+                path,
+                self._model_section_converters(),
+                progress.report if progress else None,
+            )
+        except ValueError as exc:
+            messagebox.showerror(
+                "Load Model",
+                f"Failed to parse JSON file:\n{exc}",
+            )
+            return None
+        finally:
+            if progress:
+                progress.close()
+
+    @staticmethod
+    def _model_section_converters():
+        """Return loader converters replacing node dicts by ``FaultTreeNode``s."""
+        return section_converters()
 
+    @staticmethod
+    def _node_from_data(value, share=None):
+        """Return ``value`` as node; the JSON loader may have built it already."""
+        if isinstance(value, FaultTreeNode):
+            return value
+        return FaultTreeNode.from_dict(value, share=share)
+
+    # Sections of a container project built on first use: (section, loader, keys).
+    DEFERRED_SECTIONS = (
+        ("sysml_repository", "_load_repository", None),
+        ("fmedas", "_load_fmedas", None),
+        ("hazops", "_load_hazops", ("hazops", "hazop_entries")),
+        ("fi2tc_docs", "_load_fi2tc_docs", ("fi2tc_docs", "fi2tc_entries")),
+        ("tc2fi_docs", "_load_tc2fi_docs", ("tc2fi_docs", "tc2fi_entries")),
+    )
+
+    def apply_model_data(self, data):
+        """Replace the current model with ``data`` as read by :meth:`load_model`.
+
+        For container projects only the fault trees, FMEAs, HARAs and the
+        small sections are built here; the sections in
+        :attr:`DEFERRED_SECTIONS` are built when first used so the FTAs can
+        be shown without decoding them.
+        """
+        share = RequirementPool()
         if "top_events" in data:
-            self.top_events = [FaultTreeNode.from_dict(e) for e in data["top_events"]]
+            self.top_events = [self._node_from_data(e, share) for e in data["top_events"]]
         elif "root_node" in data:
-            root = FaultTreeNode.from_dict(data["root_node"])
+            root = self._node_from_data(data["root_node"], share)
             self.top_events = [root]
         else:
             messagebox.showerror("Error", "Invalid model file format.")
             return
 
+        deferred = self.deferred_sections
+        deferred.reset(data if isinstance(data, ContainerData) else None)
+        repo = SysMLRepository.get_instance()
+        repo.load_later(None)
+        for section, loader, keys in self.DEFERRED_SECTIONS:
+            load = partial(getattr(self, loader), data, share)
+            if isinstance(data, ContainerData) and any(k in data for k in keys or (section,)):
+                deferred.defer(section, load, keys)
+            else:
+                load()
+        if deferred.pending("sysml_repository"):
+            repo.load_later(partial(deferred.load, "sysml_repository"))
+
         self.fmeas = []
         for fmea_data in data.get("fmeas", []):
-            entries = [FaultTreeNode.from_dict(e) for e in fmea_data.get("entries", [])]
+            entries = [self._node_from_data(e, share) for e in fmea_data.get("entries", [])]
             self.fmeas.append({"name": fmea_data.get("name", "FMEA"), "file": fmea_data.get("file", f"fmea_{len(self.fmeas)}.csv"), "entries": entries})
         if not self.fmeas and "fmea_entries" in data:
-            entries = [FaultTreeNode.from_dict(e) for e in data.get("fmea_entries", [])]
+            entries = [self._node_from_data(e, share) for e in data.get("fmea_entries", [])]
             self.fmeas.append({"name": "Default FMEA", "file": "fmea_default.csv", "entries": entries})
 
-        self.fmedas = []
-        for doc in data.get("fmedas", []):
-            entries = [FaultTreeNode.from_dict(e) for e in doc.get("entries", [])]
-            self.fmedas.append({
-                "name": doc.get("name", "FMEDA"),
-                "file": doc.get("file", f"fmeda_{len(self.fmedas)}.csv"),
-                "entries": entries,
-                "bom": doc.get("bom", ""),
-            })
-
         # Mechanism libraries and selections
         self.mechanism_libraries = []
         for lib in data.get("mechanism_libraries", []):
@@ -11535,26 +12479,6 @@ class FaultTreeApp:
                 )
             )
 
-        self.hazop_docs = []
-        for d in data.get("hazops", []):
-            entries = []
-            for h in d.get("entries", []):
-                h["safety"] = boolify(h.get("safety", False), False)
-                h["covered"] = boolify(h.get("covered", False), False)
-                entries.append(HazopEntry(**h))
-            self.hazop_docs.append(
-                HazopDoc(d.get("name", f"HAZOP {len(self.hazop_docs)+1}"), entries)
-            )
-        if not self.hazop_docs and "hazop_entries" in data:
-            entries = []
-            for h in data.get("hazop_entries", []):
-                h["safety"] = boolify(h.get("safety", False), False)
-                h["covered"] = boolify(h.get("covered", False), False)
-                entries.append(HazopEntry(**h))
-            self.hazop_docs.append(HazopDoc("Default", entries))
-        self.active_hazop = self.hazop_docs[0] if self.hazop_docs else None
-        self.hazop_entries = self.active_hazop.entries if self.active_hazop else []
-
         self.hara_docs = []
         for d in data.get("haras", []):
             entries = [HaraEntry(**e) for e in d.get("entries", [])]
@@ -11579,44 +12503,15 @@ class FaultTreeApp:
         self.active_hara = self.hara_docs[0] if self.hara_docs else None
         self.hara_entries = self.active_hara.entries if self.active_hara else []
 
-        self.fi2tc_docs = []
-        for d in data.get("fi2tc_docs", []):
-            self.fi2tc_docs.append(
-                FI2TCDoc(d.get("name", f"FI2TC {len(self.fi2tc_docs)+1}"), d.get("entries", []))
-            )
-        if not self.fi2tc_docs and "fi2tc_entries" in data:
-            self.fi2tc_docs.append(FI2TCDoc("Default", data.get("fi2tc_entries", [])))
-        self.active_fi2tc = self.fi2tc_docs[0] if self.fi2tc_docs else None
-        self.fi2tc_entries = self.active_fi2tc.entries if self.active_fi2tc else []
-
-        self.tc2fi_docs = []
-        for d in data.get("tc2fi_docs", []):
-            self.tc2fi_docs.append(
-                TC2FIDoc(d.get("name", f"TC2FI {len(self.tc2fi_docs)+1}"), d.get("entries", []))
-            )
-        if not self.tc2fi_docs and "tc2fi_entries" in data:
-            self.tc2fi_docs.append(TC2FIDoc("Default", data.get("tc2fi_entries", [])))
-        self.active_tc2fi = self.tc2fi_docs[0] if self.tc2fi_docs else None
-        self.tc2fi_entries = self.active_tc2fi.entries if self.active_tc2fi else []
         self.scenario_libraries = data.get("scenario_libraries", [])
         self.odd_libraries = data.get("odd_libraries", [])
         if not self.odd_libraries and "odd_elements" in data:
             self.odd_libraries = [{"name": "Default", "elements": data.get("odd_elements", [])}]
         self.update_odd_elements()
 
-        self.fmedas = []
-        for doc in data.get("fmedas", []):
-            entries = [FaultTreeNode.from_dict(e) for e in doc.get("entries", [])]
-            self.fmedas.append({
-                "name": doc.get("name", "FMEDA"),
-                "file": doc.get("file", f"fmeda_{len(self.fmedas)}.csv"),
-                "entries": entries,
-                "bom": doc.get("bom", ""),
-            })
-
-        # Fix clone references for each top event.
-        for event in self.top_events:
-            AutoML_Helper.fix_clone_references(self.top_events)
+        # Fix clone references and index clones by their primary node.
+        self.clone_registry = AutoML_Helper.fix_clone_references(self.top_events)
+        self.reachability = ReachabilityIndex().rebuild(self.top_events)
 
         # Update the unique ID counter.
         AutoML_Helper.update_unique_id_counter_for_top_events(self.top_events)
@@ -11636,7 +12531,10 @@ class FaultTreeApp:
         if reviews_data:
             for rd in reviews_data:
                 participants = [ReviewParticipant(**p) for p in rd.get("participants", [])]
-                comments = [ReviewComment(**c) for c in rd.get("comments", [])]
+                if rd.get("comments_archived"):
+                    comments = self._archived_comments(rd.get("name", ""))
+                else:
+                    comments = [ReviewComment(**c) for c in rd.get("comments", [])]
                 moderators = [ReviewParticipant(**m) for m in rd.get("moderators", [])]
                 if not moderators and rd.get("moderator"):
                     moderators = [ReviewParticipant(rd.get("moderator"), "", "moderator")]
@@ -11697,22 +12595,100 @@ class FaultTreeApp:
 
         self.update_hara_statuses()
 
-        self.versions = data.get("versions", [])
+        self.versions = VersionHistory.from_json(
+            data.get("versions"), lambda: self.model_archive.load("versions")
+        )
+        self.missing_archive = missing_sections(data, self.model_archive)
+        if self.missing_archive:
+            messagebox.showwarning(
+                "Load Model",
+                "The archive holding these sections of the model is missing:\n"
+                + "\n".join(self.missing_archive)
+                + "\n\nThey are shown empty and the model cannot be saved "
+                "until the archive is restored.",
+            )
 
         self.selected_node = None
         if hasattr(self, "page_diagram") and self.page_diagram is not None:
             self.close_page_diagram()
-        self.update_views()
+        self.undo_stack.clear()
+        self.notify_change(MODEL_RESET)
         self.set_last_saved_state()
         
+    def _load_repository(self, data, _share=None):
+        repo_data = data.get("sysml_repository")
+        if not repo_data:
+            return
+        repo = SysMLRepository.get_instance()
+        if not isinstance(data, ContainerData):
+            repo.from_dict(repo_data)
+            return
+        # Building a deferred repository is not an edit of the model.
+        repo.remove_listener(self._on_sysml_change)
+        try:
+            repo.from_dict(repo_data)
+        finally:
+            repo.add_listener(self._on_sysml_change)
+
+    def _load_fmedas(self, data, share=None):
+        fmedas = []
+        for doc in data.get("fmedas", []):
+            entries = [self._node_from_data(e, share) for e in doc.get("entries", [])]
+            fmedas.append({
+                "name": doc.get("name", "FMEDA"),
+                "file": doc.get("file", f"fmeda_{len(fmedas)}.csv"),
+                "entries": entries,
+                "bom": doc.get("bom", ""),
+            })
+        self.fmedas = fmedas
+
+    def _load_hazops(self, data, _share=None):
+        def entry(h):
+            h = dict(h)
+            h["safety"] = boolify(h.get("safety", False), False)
+            h["covered"] = boolify(h.get("covered", False), False)
+            return HazopEntry(**h)
+
+        docs = []
+        for d in data.get("hazops", []):
+            docs.append(
+                HazopDoc(d.get("name", f"HAZOP {len(docs)+1}"), [entry(h) for h in d.get("entries", [])])
+            )
+        if not docs and "hazop_entries" in data:
+            docs.append(HazopDoc("Default", [entry(h) for h in data.get("hazop_entries", [])]))
+        self.hazop_docs = docs
+        self.active_hazop = docs[0] if docs else None
+        self.hazop_entries = self.active_hazop.entries if self.active_hazop else []
+
+    def _load_fi2tc_docs(self, data, _share=None):
+        docs = [
+            FI2TCDoc(d.get("name", f"FI2TC {i+1}"), d.get("entries", []))
+            for i, d in enumerate(data.get("fi2tc_docs", []))
+        ]
+        if not docs and "fi2tc_entries" in data:
+            docs.append(FI2TCDoc("Default", data.get("fi2tc_entries", [])))
+        self.fi2tc_docs = docs
+        self.active_fi2tc = docs[0] if docs else None
+        self.fi2tc_entries = self.active_fi2tc.entries if self.active_fi2tc else []
+
+    def _load_tc2fi_docs(self, data, _share=None):
+        docs = [
+            TC2FIDoc(d.get("name", f"TC2FI {i+1}"), d.get("entries", []))
+            for i, d in enumerate(data.get("tc2fi_docs", []))
+        ]
+        if not docs and "tc2fi_entries" in data:
+            docs.append(TC2FIDoc("Default", data.get("tc2fi_entries", [])))
+        self.tc2fi_docs = docs
+        self.active_tc2fi = docs[0] if docs else None
+        self.tc2fi_entries = self.active_tc2fi.entries if self.active_tc2fi else []
+
     def update_global_requirements_from_nodes(self,node):
-        if hasattr(node, "safety_requirements"):
-            for req in node.safety_requirements:
-                # Use req["id"] as key; if already exists, you could update if needed.
-                if req["id"] not in global_requirements:
-                    global_requirements[req["id"]] = req
-        for child in node.children:
-            self.update_global_requirements_from_nodes(child)
+        # Register requirements allocated in the tree; existing ids are kept.
+        global_requirements.add_many(
+            ((req["id"], req) for n in self.get_all_nodes_no_filter(node)
+             for req in getattr(n, "safety_requirements", [])),
+            replace=False,
+        )
 
     def generate_report(self):
         path = filedialog.asksaveasfilename(defaultextension=".html", filetypes=[("HTML", "*.html")])
@@ -12130,6 +13106,11 @@ class FaultTreeApp:
 
     def send_review_email(self, review):
         """Send the review summary to all reviewers via configured SMTP."""
+        import smtplib
+        import socket
+        from email.message import EmailMessage
+        from email.utils import make_msgid
+
         recipients = [p.email for p in review.participants if p.role == 'reviewer' and p.email]
         if not recipients:
             return
@@ -12462,8 +13443,8 @@ class FaultTreeApp:
             "pending approval": 3,
             "approved": 4,
         }
-        for req in global_requirements.values():
-            req.setdefault("status", "draft")
+        for rid in global_requirements.ids_where("status", ""):
+            global_requirements.update_fields(rid, status="draft")
         for review in self.reviews:
             ids = self.get_requirements_for_review(review)
             closed = self.review_is_closed_for(review)
@@ -12484,7 +13465,7 @@ class FaultTreeApp:
                     else:
                         status = "in review"
                 if status_order[status] > status_order.get(req.get("status", "draft"), 0):
-                    req["status"] = status
+                    global_requirements.update_fields(rid, status=status)
 
 
     def compute_requirement_asil(self, req_id):
@@ -12498,15 +13479,13 @@ class FaultTreeApp:
         return asil
 
     def update_requirement_asil(self, req_id):
-        req = global_requirements.get(req_id)
-        if not req:
+        if req_id not in global_requirements:
             return
-        req["asil"] = self.compute_requirement_asil(req_id)
+        global_requirements.update_fields(req_id, asil=self.compute_requirement_asil(req_id))
 
     def update_all_requirement_asil(self):
-        for rid, req in global_requirements.items():
-            if req.get("parent_id"):
-                continue  # keep decomposition ASIL
+        # Decomposed requirements keep their decomposition ASIL.
+        for rid in global_requirements.ids_where("parent_id", ""):
             self.update_requirement_asil(rid)
 
     def update_base_event_requirement_asil(self):
@@ -12520,8 +13499,7 @@ class FaultTreeApp:
                     continue
                 asil = self.compute_requirement_asil(rid)
                 req["asil"] = asil
-                if rid in global_requirements:
-                    global_requirements[rid]["asil"] = asil
+                global_requirements.update_fields(rid, asil=asil)
 
     def ensure_asil_consistency(self):
         """Sync safety goal ASILs from HARAs and update requirement ASILs."""
@@ -12557,7 +13535,7 @@ class FaultTreeApp:
         # Exclude the versions list when capturing a snapshot to avoid
         # recursively embedding previous versions within each saved state.
         data = self.export_model_data(include_versions=False)
-        self.versions.append({"name": name, "data": data})
+        self.versions.add(name, data)
 
     def compare_versions(self):
         if not self.versions:
@@ -12738,204 +13716,7 @@ class FaultTreeApp:
 
         return targets, target_map
 
-##########################################
-# Node Model 
-##########################################
-class FaultTreeNode:
-    def __init__(self, user_name, node_type, parent=None):
-        self.unique_id = AutoML_Helper.get_next_unique_id()
-        # Assign a sequential default name if none is provided
-        self.user_name = user_name if user_name else f"Node {self.unique_id}"
-        self.node_type = node_type
-        self.children = []
-        self.parents = []
-        if parent is not None:
-            self.parents.append(parent)
-        self.quant_value = None
-        self.gate_type = "AND" if node_type.upper() in ["GATE", "RIGOR LEVEL", "TOP EVENT"] else None
-        self.description = ""
-        self.rationale = ""
-        self.x = 50
-        self.y = 50
-        # Severity and controllability now use a 1-3 scale
-        # Default to the lowest level until linked to a HARA entry
-        self.severity = 1 if node_type.upper() == "TOP EVENT" else None
-        self.controllability = 1 if node_type.upper() == "TOP EVENT" else None
-        self.input_subtype = None
-        self.display_label = ""
-        self.equation = ""
-        self.detailed_equation = ""
-        self.is_page = False
-        self.is_primary_instance = True
-        self.original = self
-        self.safety_goal_description = ""
-        self.safety_goal_asil = ""
-        self.safe_state = ""
-        self.ftti = ""
-        self.acceptance_criteria = ""
-        # Targets for safety goal metrics
-        self.sg_dc_target = 0.0
-        self.sg_spfm_target = 0.0
-        self.sg_lpfm_target = 0.0
-        self.vehicle_safety_requirements = []          # List of vehicle safety requirements
-        self.operational_safety_requirements = []        # List of operational safety requirements
-        # Each requirement is a dict with keys: "id", "req_type" and "text"
-        self.safety_requirements = []
-        # --- FMEA attributes for basic events (AIAG style) ---
-        self.fmea_effect = ""       # Description of effect/failure mode
-        self.fmea_cause = ""        # Potential cause of failure
-        self.fmea_severity = 1       # 1-10 scale
-        self.fmea_occurrence = 1     # 1-10 scale
-        self.fmea_detection = 1      # 1-10 scale
-        self.fmea_component = ""     # Optional component name for FMEA-only nodes
-        # --- FMEDA attributes ---
-        self.fmeda_malfunction = ""
-        self.fmeda_safety_goal = ""
-        self.fmeda_diag_cov = 0.0
-        self.fmeda_fit = 0.0
-        self.fmeda_spfm = 0.0
-        self.fmeda_lpfm = 0.0
-        self.fmeda_fault_type = "permanent"
-        self.fmeda_fault_fraction = 0.0
-        # FMEDA specific targets if not derived from FTA
-        self.fmeda_dc_target = 0.0
-        self.fmeda_spfm_target = 0.0
-        self.fmeda_lpfm_target = 0.0
-        # Reference to a unique failure mode this node represents
-        self.failure_mode_ref = None
-        # Probability values for classical FTA calculations
-        self.failure_prob = 0.0
-        self.probability = 0.0
-        # Formula used to derive probability from FIT rate
-        self.prob_formula = "linear"  # linear, exponential, or constant
-
-    @property
-    def name(self):
-        orig = getattr(self, "original", self)
-        uid = orig.unique_id if not self.is_primary_instance else self.unique_id
-        base_name = self.user_name
-        # Avoid repeating the ID if the user_name already matches the default
-        if not base_name or base_name == f"Node {uid}":
-            return f"Node {uid}"
-        return f"Node {uid}: {base_name}"
-
-    def to_dict(self):
-        d = {
-            "unique_id": self.unique_id,
-            "user_name": self.user_name,
-            "type": self.node_type,
-            "quant_value": self.quant_value,
-            "gate_type": self.gate_type,
-            "description": self.description,
-            "rationale": self.rationale,
-            "x": self.x,
-            "y": self.y,
-            "severity": self.severity,
-            "controllability": self.controllability,
-            "input_subtype": self.input_subtype,
-            "is_page": self.is_page,
-            "is_primary_instance": self.is_primary_instance,
-            "safety_goal_description": self.safety_goal_description,
-            "safety_goal_asil": self.safety_goal_asil,
-            "safe_state": self.safe_state,
-            "ftti": self.ftti,
-            "acceptance_criteria": self.acceptance_criteria,
-            "sg_dc_target": self.sg_dc_target,
-            "sg_spfm_target": self.sg_spfm_target,
-            "sg_lpfm_target": self.sg_lpfm_target,
-            "fmea_effect": self.fmea_effect,
-            "fmea_cause": self.fmea_cause,
-            "fmea_severity": self.fmea_severity,
-            "fmea_occurrence": self.fmea_occurrence,
-            "fmea_detection": self.fmea_detection,
-            "fmea_component": self.fmea_component,
-            "fmeda_malfunction": self.fmeda_malfunction,
-            "fmeda_safety_goal": self.fmeda_safety_goal,
-            "fmeda_diag_cov": self.fmeda_diag_cov,
-            "fmeda_fit": self.fmeda_fit,
-            "fmeda_spfm": self.fmeda_spfm,
-            "fmeda_lpfm": self.fmeda_lpfm,
-            "fmeda_fault_type": self.fmeda_fault_type,
-            "fmeda_fault_fraction": self.fmeda_fault_fraction,
-            "fmeda_dc_target": self.fmeda_dc_target,
-            "fmeda_spfm_target": self.fmeda_spfm_target,
-            "fmeda_lpfm_target": self.fmeda_lpfm_target,
-            "failure_mode_ref": self.failure_mode_ref,
-            # Save the safety requirements list (which now includes custom_id)
-            "safety_requirements": self.safety_requirements,
-            "failure_prob": self.failure_prob,
-            "probability": self.probability,
-            "prob_formula": self.prob_formula,
-            "children": [child.to_dict() for child in self.children]
-        }
-        if not self.is_primary_instance and self.original and (self.original.unique_id != self.unique_id):
-            d["original_id"] = self.original.unique_id
-        return d
 
-    @staticmethod
-    def from_dict(data, parent=None):
-        node = FaultTreeNode.__new__(FaultTreeNode)
-        node.user_name = data.get("user_name", "")
-        node.node_type = data.get("type", "")
-        node.children = [FaultTreeNode.from_dict(child_data, parent=node) for child_data in data.get("children", [])]
-        node.parents = []
-        if parent is not None:
-            node.parents.append(parent)
-        node.quant_value = data.get("quant_value")
-        node.gate_type = data.get("gate_type", "AND")
-        node.description = data.get("description", "")
-        node.rationale = data.get("rationale", "")
-        node.x = data.get("x", 50)
-        node.y = data.get("y", 50)
-        node.severity = data.get("severity", 1) if node.node_type.upper() == "TOP EVENT" else None
-        node.controllability = data.get("controllability", 1) if node.node_type.upper() == "TOP EVENT" else None
-        node.input_subtype = data.get("input_subtype", None)
-        node.is_page = boolify(data.get("is_page", False), False)
-        node.is_primary_instance = boolify(data.get("is_primary_instance", True), True)
-        node.safety_goal_description = data.get("safety_goal_description", "")
-        node.safety_goal_asil = data.get("safety_goal_asil", "")
-        node.safe_state = data.get("safe_state", "")
-        node.ftti = data.get("ftti", "")
-        node.acceptance_criteria = data.get("acceptance_criteria", "")
-        node.sg_dc_target = data.get("sg_dc_target", 0.0)
-        node.sg_spfm_target = data.get("sg_spfm_target", 0.0)
-        node.sg_lpfm_target = data.get("sg_lpfm_target", 0.0)
-        node.fmea_effect = data.get("fmea_effect", "")
-        node.fmea_cause = data.get("fmea_cause", "")
-        node.fmea_severity = data.get("fmea_severity", 1)
-        node.fmea_occurrence = data.get("fmea_occurrence", 1)
-        node.fmea_detection = data.get("fmea_detection", 1)
-        node.fmea_component = data.get("fmea_component", "")
-        node.fmeda_malfunction = data.get("fmeda_malfunction", "")
-        node.fmeda_safety_goal = data.get("fmeda_safety_goal", "")
-        node.fmeda_diag_cov = data.get("fmeda_diag_cov", 0.0)
-        node.fmeda_fit = data.get("fmeda_fit", 0.0)
-        node.fmeda_spfm = data.get("fmeda_spfm", 0.0)
-        node.fmeda_lpfm = data.get("fmeda_lpfm", 0.0)
-        node.fmeda_fault_type = data.get("fmeda_fault_type", "permanent")
-        node.fmeda_fault_fraction = data.get("fmeda_fault_fraction", 0.0)
-        node.fmeda_dc_target = data.get("fmeda_dc_target", 0.0)
-        node.fmeda_spfm_target = data.get("fmeda_spfm_target", 0.0)
-        node.fmeda_lpfm_target = data.get("fmeda_lpfm_target", 0.0)
-        node.failure_mode_ref = data.get("failure_mode_ref")
-        # NEW: Load safety_requirements (or default to empty list)
-        node.safety_requirements = data.get("safety_requirements", [])
-        node.failure_prob = data.get("failure_prob", 0.0)
-        node.probability = data.get("probability", 0.0)
-        node.prob_formula = data.get("prob_formula", "linear")
-        node.display_label = ""
-        node.equation = ""
-        node.detailed_equation = ""
-        if "unique_id" in data:
-            node.unique_id = data["unique_id"]
-        else:
-            node.unique_id = AutoML_Helper.get_next_unique_id()
-        if not node.is_primary_instance and "original_id" in data:
-            node._original_id = data["original_id"]
-        else:
-            node._original_id = None
-        return node
-        
 ##########################################
 # Page Diagram 
 ##########################################
@@ -13060,19 +13841,16 @@ class PageDiagram:
     def context_edit(self, node):
         EditNodeDialog(self.canvas, node, self.app)
         self.redraw_canvas()
-        self.app.update_views()
 
     def context_remove(self, node):
         self.selected_node = node
         self.app.remove_connection(node)
         self.redraw_canvas()
-        self.app.update_views()
 
     def context_delete(self, node):
         self.selected_node = node
         self.app.delete_node_and_subtree(node)
         self.redraw_canvas()
-        self.app.update_views()
 
     def context_copy(self, node):
         self.selected_node = node
@@ -13095,7 +13873,6 @@ class PageDiagram:
         self.app.selected_node = self.selected_node
         self.app.add_node_of_type(event_type)
         self.redraw_canvas()
-        self.app.update_views()
 
     def on_canvas_click(self, event):
         x = self.canvas.canvasx(event.x) / self.zoom
@@ -13128,27 +13905,18 @@ class PageDiagram:
                     self.app.open_page_diagram(clicked_node)
                 else:
                     EditNodeDialog(self.app.root, clicked_node, self.app)
-            self.app.update_views()
+            self.app.refresh_canvas()
 
     def on_canvas_drag(self, event):
         if self.dragging_node:
             x = self.canvas.canvasx(event.x) / self.zoom
             y = self.canvas.canvasy(event.y) / self.zoom
-            new_x = x - self.drag_offset_x
-            new_y = y - self.drag_offset_y
-            dx = new_x - self.dragging_node.x
-            dy = new_y - self.dragging_node.y
-            self.dragging_node.x = new_x
-            self.dragging_node.y = new_y
-            if self.dragging_node.is_primary_instance:
-                self.app.move_subtree(self.dragging_node, dx, dy)
-            self.app.sync_nodes_by_id(self.dragging_node)
+            self.app.drag_node(self.dragging_node, x - self.drag_offset_x, y - self.drag_offset_y)
             self.redraw_canvas()
 
     def on_canvas_release(self, event):
         if self.dragging_node:
-            self.dragging_node.x = round(self.dragging_node.x/self.grid_size)*self.grid_size
-            self.dragging_node.y = round(self.dragging_node.y/self.grid_size)*self.grid_size
+            self.app.finish_drag(self.dragging_node, self.grid_size)
         self.dragging_node = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
@@ -13170,7 +13938,7 @@ class PageDiagram:
                     self.app.open_page_diagram(clicked_node)
                 else:
                     EditNodeDialog(self.app.root, clicked_node, self.app)
-            self.app.update_views()
+            self.app.refresh_canvas()
 
     def zoom_in(self):
         self.zoom *= 1.2
@@ -13394,12 +14162,16 @@ class PageDiagram:
             fta_drawing_helper.draw_shared_marker(self.canvas, marker_x, marker_y, self.zoom)
 
 def main():
+    STARTUP_TIMER.mark("modules imported")
     root = tk.Tk()
-    # Create a fresh helper each session:
-    global AutoML_Helper
-    AutoML_Helper = AutoMLHelper()
+    STARTUP_TIMER.mark("Tk root created")
+    # Start each session with a fresh id counter:
+    AutoML_Helper.unique_node_id_counter = 1
     
     app = FaultTreeApp(root)
+    STARTUP_TIMER.mark("application built")
+    if STARTUP_TIMER.enabled:
+        root.after_idle(STARTUP_TIMER.finish, "window shown")
     root.mainloop()
 
 if __name__ == "__main__":
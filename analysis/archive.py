@@ -0,0 +1,140 @@
+"""Sidecar archive holding rarely used model sections.
+
+Version history and the comments of closed reviews are written next to
+the model file so opening a project only parses the working model.  The
+archive starts with a JSON index of ``name -> [offset, length]`` and each
+section is read on demand.
+"""
+
+import json
+import os
+
+MAGIC = b"AUTOML-ARCHIVE 1\n"
+
+
+def sidecar_path(model_path) -> str:
+    """Return the archive path belonging to the model file ``model_path``."""
+    return os.path.splitext(str(model_path))[0] + ".archive"
+
+
+def write_archive(path, sections) -> None:
+    """Write ``sections`` (name -> JSON bytes) to ``path`` atomically."""
+    index = {}
+    offset = 0
+    for name, raw in sections.items():
+        index[name] = [offset, len(raw)]
+        offset += len(raw)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(index).encode("utf-8") + b"\n")
+        for raw in sections.values():
+            f.write(raw)
+    os.replace(tmp, path)
+
+
+class ArchiveReader:
+    """Read sections of an archive file without loading the others.
+
+    Only the index is read by :meth:`open`.  A missing file behaves like an
+    empty archive.  The reader can be re-opened on a new file after saving
+    so lazy loaders holding it stay valid.
+    """
+
+    def __init__(self, path=None):
+        self.open(path)
+
+    def open(self, path) -> None:
+        self.path = path
+        self._index = {}
+        self._base = 0
+        if not path or not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"Not a model archive: {path}")
+            self._index = json.loads(f.readline())
+            self._base = f.tell()
+
+    def names(self):
+        return list(self._index)
+
+    def has(self, name) -> bool:
+        return name in self._index
+
+    def raw(self, name) -> bytes:
+        offset, length = self._index[name]
+        with open(self.path, "rb") as f:
+            f.seek(self._base + offset)
+            return f.read(length)
+
+    def load(self, name, default=None):
+        if name not in self._index:
+            return default
+        return json.loads(self.raw(name))
+
+
+def missing_sections(data, archive):
+    """Return the archive sections model ``data`` refers to that ``archive`` lacks.
+
+    These are an archived version history with at least one version and
+    the comments of reviews saved with ``comments_archived``.
+    """
+    names = []
+    versions = data.get("versions")
+    if isinstance(versions, dict) and versions.get("archived") and versions.get("names"):
+        names.append("versions")
+    names += [
+        f"review:{rd.get('name', '')}"
+        for rd in data.get("reviews") or []
+        if rd.get("comments_archived")
+    ]
+    return [name for name in names if not archive.has(name)]
+
+
+def _lazy(method):
+    def wrapper(self, *args, **kwargs):
+        self._materialize()
+        return getattr(list, method)(self, *args, **kwargs)
+
+    wrapper.__name__ = method
+    return wrapper
+
+
+class LazyList(list):
+    """List whose items are produced by ``loader`` on first use.
+
+    Copies and pickles are plain lists.
+    """
+
+    def __init__(self, iterable=(), loader=None):
+        super().__init__(iterable)
+        self._loader = loader
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    def _materialize(self):
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            list.extend(self, loader())
+
+    def __bool__(self):
+        self._materialize()
+        return list.__len__(self) > 0
+
+    def __reduce_ex__(self, protocol):
+        self._materialize()
+        return list, (list(list.__iter__(self)),)
+
+
+for _name in (
+    "__len__", "__iter__", "__reversed__", "__getitem__", "__setitem__",
+    "__delitem__", "__contains__", "__eq__", "__ne__", "__iadd__", "__add__",
+    "__repr__", "append", "extend", "insert", "remove", "pop", "index",
+    "count", "sort", "reverse", "clear", "copy",
+):
+    setattr(LazyList, _name, _lazy(_name))
+del _name
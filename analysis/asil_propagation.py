@@ -0,0 +1,128 @@
+"""Incremental propagation of HARA results to safety goals and requirements."""
+
+from analysis.models import ASIL_ORDER
+
+
+def hara_doc_approved(doc) -> bool:
+    """Return ``True`` if the HARA ``doc`` contributes to safety goals."""
+    return getattr(doc, "approved", False) or getattr(doc, "status", "") == "closed"
+
+
+def doc_goal_data(doc):
+    """Return ``{goal: (asil, severity, controllability)}`` for one HARA.
+
+    Entries of a HARA that is neither approved nor closed do not count.
+    """
+    result = {}
+    if not hara_doc_approved(doc):
+        return result
+    for e in doc.entries:
+        if not e.safety_goal:
+            continue
+        asil, sev, cont = result.get(e.safety_goal, ("QM", 1, 1))
+        if ASIL_ORDER.get(e.asil, 0) > ASIL_ORDER.get(asil, 0):
+            asil = e.asil
+        result[e.safety_goal] = (asil, max(sev, e.severity), max(cont, e.controllability))
+    return result
+
+
+def _merge(values):
+    asil, sev, cont = "QM", 1, 1
+    for a, s, c in values:
+        if ASIL_ORDER.get(a, 0) > ASIL_ORDER.get(asil, 0):
+            asil = a
+        sev = max(sev, s)
+        cont = max(cont, c)
+    return asil, sev, cont
+
+
+class AsilGraph:
+    """Dependency graph HARA entry -> safety goal -> requirement -> children.
+
+    The graph keeps the contribution of every HARA document to each safety
+    goal so that editing one document only re-aggregates the goals named
+    in its old or new entries.  :meth:`update_doc` returns those goals
+    whose aggregated values actually changed; :meth:`affected_requirements`
+    follows the goal -> requirement edges of a requirement index and the
+    decomposition edges of the requirement store.
+    """
+
+    def __init__(self):
+        self._doc_goals = {}  # id(doc) -> {goal: (asil, sev, cont)}
+        self._goal_docs = {}  # goal -> {id(doc): (asil, sev, cont)}
+
+    def rebuild(self, docs):
+        """Recompute all contributions; return every goal named by ``docs``."""
+        self._doc_goals.clear()
+        self._goal_docs.clear()
+        for doc in docs:
+            self._store(id(doc), doc_goal_data(doc))
+        return set(self._goal_docs)
+
+    def _store(self, key, data):
+        self._doc_goals[key] = data
+        for goal, values in data.items():
+            self._goal_docs.setdefault(goal, {})[key] = values
+
+    def _drop(self, key):
+        for goal in self._doc_goals.pop(key, {}):
+            docs = self._goal_docs.get(goal)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self._goal_docs[goal]
+
+    def update_doc(self, doc):
+        """Refresh the contribution of ``doc``; return goals whose values changed."""
+        key = id(doc)
+        new = doc_goal_data(doc)
+        old = self._doc_goals.get(key, {})
+        if new == old and key in self._doc_goals:
+            return set()
+        touched = set(old) | set(new)
+        before = {g: self.goal_data(g) for g in touched}
+        self._drop(key)
+        self._store(key, new)
+        return {g for g in touched if self.goal_data(g) != before[g]}
+
+    def remove_doc(self, doc):
+        key = id(doc)
+        touched = set(self._doc_goals.get(key, {}))
+        before = {g: self.goal_data(g) for g in touched}
+        self._drop(key)
+        return {g for g in touched if self.goal_data(g) != before[g]}
+
+    def goal_data(self, goal):
+        """Return the aggregated ``(asil, severity, controllability)`` or ``None``."""
+        docs = self._goal_docs.get(goal)
+        if not docs:
+            return None
+        return _merge(docs.values())
+
+    def goal_asil(self, goal) -> str:
+        data = self.goal_data(goal)
+        return data[0] if data else "QM"
+
+    @staticmethod
+    def affected_requirements(goals, requirement_index, requirements):
+        """Return ``(direct, decomposed)`` requirement ids depending on ``goals``.
+
+        ``direct`` are requirements traced to the goals which are not
+        themselves decomposed from another requirement; ``decomposed``
+        lists their decomposition descendants in breadth-first order.
+        """
+        direct = []
+        for rid in requirement_index.requirement_ids_for_goals(goals):
+            req = requirements.get(rid)
+            if req is not None and not req.get("parent_id"):
+                direct.append(rid)
+        decomposed, seen = [], set(direct)
+        queue = list(direct)
+        while queue:
+            for child in requirements.children(queue.pop(0)):
+                cid = child.get("id")
+                if cid not in seen:
+                    seen.add(cid)
+                    decomposed.append(cid)
+                    queue.append(cid)
+        return direct, decomposed
@@ -0,0 +1,227 @@
+"""Background autosave to a write-ahead journal of changed model sections.
+
+The journal of a model lives in :data:`AUTOSAVE_DIR` and consists of
+framed records (length, CRC32, JSON payload) appended by a worker thread.
+Each record holds the sections that changed since the previous record, so
+the saved model file plus the journal give the latest state.  A model that
+was never saved starts its journal with a full snapshot.  The journal is
+compacted from time to time by writing one record with the latest value of
+every section to a temporary file and renaming it over the journal.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".automl", "autosave")
+JOURNAL_SUFFIX = ".wal"
+
+_FRAME = struct.Struct("<II")  # payload length, CRC32
+
+
+def session_key(model_path=None) -> str:
+    """Return the journal name used for ``model_path`` (``None`` if unsaved)."""
+    name = os.path.abspath(model_path) if model_path else "untitled"
+    return hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+
+
+def _frame(meta, sections) -> bytes:
+    """Build one record from ``meta`` and ``sections`` (name -> JSON bytes)."""
+    body = b",".join(json.dumps(name).encode("utf-8") + b":" + raw for name, raw in sections.items())
+    payload = b'{"meta":' + json.dumps(meta).encode("utf-8") + b',"sections":{' + body + b"}}"
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path):
+    """Yield the payloads of the intact records of the journal ``path``.
+
+    Reading stops at the first truncated or corrupted record, which is what
+    a crash during an append leaves behind.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        while True:
+            head = f.read(_FRAME.size)
+            if len(head) < _FRAME.size:
+                return
+            length, crc = _FRAME.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            try:
+                yield json.loads(payload)
+            except ValueError:
+                return
+
+
+class AutosaveJournal:
+    """Journal file of one model."""
+
+    def __init__(self, directory=AUTOSAVE_DIR, key="untitled"):
+        self.directory = directory
+        self.path = os.path.join(directory, key + JOURNAL_SUFFIX)
+
+    @classmethod
+    def for_model(cls, model_path=None, directory=AUTOSAVE_DIR):
+        return cls(directory, session_key(model_path))
+
+    @classmethod
+    def sessions(cls, directory=AUTOSAVE_DIR):
+        """Return journals found in ``directory``, most recent first."""
+        try:
+            names = [n for n in os.listdir(directory) if n.endswith(JOURNAL_SUFFIX)]
+        except OSError:
+            return []
+        journals = [cls(directory, n[: -len(JOURNAL_SUFFIX)]) for n in names]
+        journals = [j for j in journals if os.path.getsize(j.path) > 0]
+        return sorted(journals, key=lambda j: os.path.getmtime(j.path), reverse=True)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def append(self, meta, sections) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(_frame(meta, sections))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, meta, sections) -> None:
+        """Replace the journal by a single record, atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_frame(meta, sections))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def recover(self):
+        """Return ``(meta, sections)`` merged from all intact records.
+
+        ``meta["full"]`` tells whether ``sections`` hold the whole model or
+        only the changes to the saved model file ``meta["model_path"]``.
+        """
+        meta, sections = {}, {}
+        full = False
+        for record in read_records(self.path):
+            if record.get("meta", {}).get("full"):
+                sections = {}
+                full = True
+            meta.update(record.get("meta", {}))
+            sections.update(record.get("sections", {}))
+        meta["full"] = full
+        return meta, sections
+
+    def discard(self) -> None:
+        for path in (self.path, self.path + ".tmp"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class Autosaver:
+    """Write autosave records on a worker thread.
+
+    :meth:`submit` queues sections already encoded as JSON bytes, so the
+    worker never touches live model objects.  It appends the record and
+    compacts the journal every :attr:`COMPACT_EVERY` records.  Sections of
+    records that could not be written are reported through
+    :meth:`take_failed` so the caller can submit them again.
+    """
+
+    COMPACT_EVERY = 20
+
+    def __init__(self, journal):
+        self.journal = journal
+        self.last_error = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._latest = {}  # section -> JSON bytes written to the journal
+        self._meta = {}
+        self._records = 0
+        self._complete = False  # journal started with a full snapshot
+
+    # -- main thread ---------------------------------------------------
+    def submit(self, sections, meta=None, full=False) -> None:
+        """Queue a record of ``sections`` (name -> JSON bytes)."""
+        self._ensure_thread()
+        self._queue.put(("append", sections, dict(meta or {}), full))
+
+    def reset(self, journal) -> None:
+        """Discard the current journal and continue with ``journal``."""
+        self._ensure_thread()
+        self._queue.put(("reset", journal, None, False))
+
+    def take_failed(self):
+        with self._lock:
+            failed, self._failed = self._failed, set()
+        return failed
+
+    def flush(self, timeout=None) -> None:
+        if self._thread is not None:
+            done = threading.Event()
+            self._queue.put(("flush", done, None, False))
+            done.wait(timeout)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._queue.put(("stop", None, None, False))
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+
+    # -- worker thread -------------------------------------------------
+    def _run(self):
+        while True:
+            op, arg, meta, full = self._queue.get()
+            if op == "stop":
+                return
+            if op == "flush":
+                arg.set()
+                continue
+            try:
+                if op == "reset":
+                    self.journal.discard()
+                    self.journal = arg
+                    self._latest, self._meta, self._records = {}, {}, 0
+                    self._complete = False
+                else:
+                    self._append(arg, meta, full)
+            except Exception as exc:  # keep the worker alive, report later
+                self.last_error = exc
+                if op == "append":
+                    with self._lock:
+                        self._failed.update(arg)
+
+    def _append(self, sections, meta, full):
+        if not sections:
+            return
+        meta["time"] = time.time()
+        meta["full"] = full
+        if full:
+            self._latest = {}
+            self._complete = True
+        self._latest.update(sections)
+        self._meta.update(meta)
+        self._records += 1
+        if self._records >= self.COMPACT_EVERY:
+            self.journal.rewrite(dict(self._meta, full=self._complete), self._latest)
+            self._records = 1
+        else:
+            self.journal.append(meta, sections)
@@ -0,0 +1,139 @@
+"""Analyse many project files in parallel and aggregate the results.
+
+Usage::
+
+    python -m analysis.batch PATH_OR_GLOB... [-j WORKERS] [--check pmhf] [-o REPORT]
+
+Directories are searched recursively for model files.  Files are loaded
+and analysed by :meth:`analysis.headless.Project.analyze` in a pool of
+worker processes.  A file that fails to load or analyse is recorded as
+failed in its entry without stopping the run; if a worker process dies,
+the files it did not finish are reported as failed too.  The aggregated
+report lists each file with its status, load and analysis times and
+metrics, in the order the files were given.  Exit codes are those of
+:mod:`analysis.cli`.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analysis.cli import EXIT_ERROR, EXIT_OK, EXIT_VIOLATION
+from analysis.compression import EXTENSIONS as COMPRESSED_EXTENSIONS
+from analysis.headless import CHECKS, FMEDA, PMHF, REFERENCES, Project
+from analysis.project_container import EXTENSION as CONTAINER_EXTENSION
+from analysis.sqlite_store import EXTENSIONS as SQLITE_EXTENSIONS
+
+DEFAULT_CHECKS = (PMHF, FMEDA, REFERENCES)
+
+MODEL_SUFFIXES = (
+    (".json", CONTAINER_EXTENSION)
+    + tuple(".json" + ext for ext in COMPRESSED_EXTENSIONS)
+    + tuple(SQLITE_EXTENSIONS)
+)
+
+PASSED, VIOLATION, FAILED = "passed", "violation", "failed"
+
+
+def collect_paths(patterns):
+    """Return the model files named by ``patterns`` (files, directories or globs)."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                paths += [os.path.join(root, f) for f in sorted(files) if f.lower().endswith(MODEL_SUFFIXES)]
+        elif glob.has_magic(pattern):
+            paths += sorted(glob.glob(pattern, recursive=True))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def analyze_file(path, checks=DEFAULT_CHECKS):
+    """Return the report entry of one model file; never raises."""
+    entry = {"path": path}
+    start = time.perf_counter()
+    try:
+        project = Project.load(path)
+        loaded = time.perf_counter()
+        entry["load_seconds"] = loaded - start
+        report = project.analyze(checks)
+        entry["analyze_seconds"] = time.perf_counter() - loaded
+        entry["status"] = PASSED if report["ok"] else VIOLATION
+        entry.update((c, report[c]) for c in checks)
+    except Exception as exc:
+        entry["status"] = FAILED
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+def run_batch(paths, checks=DEFAULT_CHECKS, workers=None):
+    """Analyse ``paths`` in a pool of ``workers`` processes.
+
+    Returns the aggregated report.  With ``workers`` set to 1 the files are
+    analysed in the calling process.
+    """
+    start = time.perf_counter()
+    entries = {}
+    if workers == 1:
+        for path in paths:
+            entries[path] = analyze_file(path, checks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(analyze_file, path, checks): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    entries[path] = future.result()
+                except Exception as exc:  # the worker process died
+                    entries[path] = {"path": path, "status": FAILED, "error": f"{type(exc).__name__}: {exc}"}
+    files = [entries[p] for p in paths]
+    summary = {status: sum(1 for e in files if e["status"] == status) for status in (PASSED, VIOLATION, FAILED)}
+    summary["files"] = len(files)
+    summary["seconds"] = time.perf_counter() - start
+    return {"checks": list(checks), "summary": summary, "files": files}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m analysis.batch",
+        description="Compute safety metrics of many AutoML projects in parallel.",
+    )
+    parser.add_argument("paths", nargs="+", help="model files, directories or glob patterns")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=CHECKS,
+        help="analysis to run; repeat for several (default: %s)" % ", ".join(DEFAULT_CHECKS),
+    )
+    parser.add_argument("-o", "--output", metavar="FILE", help="write the JSON report to FILE")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON report")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    checks = tuple(dict.fromkeys(args.check)) if args.check else DEFAULT_CHECKS
+    paths = collect_paths(args.paths)
+    report = run_batch(paths, checks, args.jobs)
+    text = json.dumps(report, indent=args.indent)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    summary = report["summary"]
+    if summary[FAILED] or not paths:
+        return EXIT_ERROR
+    return EXIT_VIOLATION if summary[VIOLATION] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Central journal of model changes with publish/subscribe delivery."""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+# Kinds of change events published by the application.
+NODE_CHANGED = "node_changed"  # attributes of a fault tree node edited
+STRUCTURE_CHANGED = "structure_changed"  # nodes added, removed or re-parented
+DOCUMENT_CHANGED = "document_changed"  # analysis document added, renamed or removed
+FMEA_ROW_CHANGED = "fmea_row_changed"  # FMEA/FMEDA row added, edited or removed
+HAZOP_CHANGED = "hazop_changed"  # HAZOP entry edited
+HARA_CHANGED = "hara_changed"  # HARA entry edited
+ANALYSIS_ROW_CHANGED = "analysis_row_changed"  # FI2TC/TC2FI row edited
+REQUIREMENT_CHANGED = "requirement_changed"  # requirement added, edited or removed
+SYSML_CHANGED = "sysml_changed"  # SysML element, relationship or diagram changed
+MODEL_RESET = "model_reset"  # whole model replaced (new or load)
+
+ALL = "*"
+
+
+@dataclass
+class ChangeEvent:
+    """Single model mutation.
+
+    ``section`` names the affected part of the model using the keys of
+    :meth:`FaultTreeApp.export_model_data` (``"top_events"``, ``"fmeas"``,
+    ``"haras"`` ...).  ``target`` is the changed object when available.
+    """
+
+    kind: str
+    section: str = ""
+    target: Any = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
+
+
+class ChangeJournal:
+    """Record model changes and notify subscribers.
+
+    Subscribers register for one or more event kinds (or :data:`ALL`).
+    Inside :meth:`batch` events are collected, duplicates for the same
+    kind, section and target are merged, and delivery happens once when
+    the outermost batch ends.  A bounded history allows consumers to ask
+    for everything that happened after a given sequence number.
+    """
+
+    def __init__(self, history: int = 1000):
+        self._subscribers: Dict[str, List[Callable[[ChangeEvent], None]]] = {}
+        self._history = deque(maxlen=history)
+        self._seq = 0
+        self._batch_depth = 0
+        self._pending: List[ChangeEvent] = []
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None], *kinds: str):
+        """Register ``callback`` for ``kinds`` (all kinds when omitted)."""
+        for kind in kinds or (ALL,):
+            subs = self._subscribers.setdefault(kind, [])
+            if callback not in subs:
+                subs.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        for subs in self._subscribers.values():
+            if callback in subs:
+                subs.remove(callback)
+
+    def publish(self, kind: str, section: str = "", target: Any = None, **data) -> ChangeEvent:
+        self._seq += 1
+        event = ChangeEvent(kind, section, target, data, self._seq)
+        self._history.append(event)
+        if self._batch_depth:
+            self._pending.append(event)
+        else:
+            self._deliver(event)
+        return event
+
+    @contextmanager
+    def batch(self):
+        """Defer and coalesce notifications until the block finishes."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                pending, self._pending = self._pending, []
+                for event in self._coalesce(pending):
+                    self._deliver(event)
+
+    @staticmethod
+    def _coalesce(events: List[ChangeEvent]) -> List[ChangeEvent]:
+        merged = {}
+        for ev in events:
+            key = (ev.kind, ev.section, id(ev.target))
+            if key in merged:
+                merged[key].data.update(ev.data)
+                merged[key].seq = ev.seq
+            else:
+                merged[key] = ChangeEvent(ev.kind, ev.section, ev.target, dict(ev.data), ev.seq)
+        return list(merged.values())
+
+    def _deliver(self, event: ChangeEvent) -> None:
+        callbacks = list(self._subscribers.get(event.kind, ())) + list(self._subscribers.get(ALL, ()))
+        for cb in callbacks:
+            cb(event)
+
+    def since(self, seq: int) -> List[ChangeEvent]:
+        """Return recorded events newer than ``seq``."""
+        return [ev for ev in self._history if ev.seq > seq]
@@ -0,0 +1,76 @@
+"""Command line safety analysis of a project file.
+
+Usage::
+
+    python -m analysis.cli MODEL [--check pmhf] [--csv DIR] [--pdf FILE] [-o REPORT]
+
+The report of :meth:`analysis.headless.Project.analyze` is written as JSON
+to standard output (or ``REPORT``).  The exit status is :data:`EXIT_OK`
+when every check passed, :data:`EXIT_VIOLATION` when a PMHF, FMEDA or ASIL
+target is violated or a reference is dangling and :data:`EXIT_ERROR` when
+the model cannot be loaded or an export fails.
+"""
+
+import argparse
+import json
+import sys
+
+from analysis.headless import CHECKS, Project, export_pdf
+
+EXIT_OK, EXIT_VIOLATION, EXIT_ERROR = 0, 1, 2
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m analysis.cli",
+        description="Compute safety metrics of an AutoML project without the GUI.",
+    )
+    parser.add_argument("model", help="model file (JSON, compressed JSON, .automl or SQLite)")
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=CHECKS,
+        help="analysis to run; repeat for several (default: all)",
+    )
+    parser.add_argument("--csv", metavar="DIR", help="export FMEA and FMEDA tables as CSV to DIR")
+    parser.add_argument("--pdf", metavar="FILE", help="write a PDF summary of the metrics (needs reportlab)")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write the JSON report to FILE")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON report")
+    return parser
+
+
+def run(args):
+    """Run the analyses selected by parsed ``args``; return ``(report, status)``."""
+    checks = tuple(dict.fromkeys(args.check)) if args.check else CHECKS
+    try:
+        project = Project.load(args.model)
+    except (OSError, ValueError) as exc:
+        return {"model": args.model, "ok": False, "error": str(exc)}, EXIT_ERROR
+    report = project.analyze(checks)
+    status = EXIT_OK if report["ok"] else EXIT_VIOLATION
+    try:
+        if args.csv:
+            report["csv"] = project.export_csv(args.csv)
+        if args.pdf:
+            export_pdf(report, args.pdf)
+            report["pdf"] = args.pdf
+    except (OSError, ValueError) as exc:
+        report["error"] = str(exc)
+        status = EXIT_ERROR
+    return report, status
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report, status = run(args)
+    text = json.dumps(report, indent=args.indent)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Registry of fault tree node instances sharing a primary node."""
+
+# Non-positional attributes mirrored from a primary node onto its clones.
+# Coordinates, structure (``children``/``parents``) and the clone's own
+# ``unique_id`` stay independent per instance.
+CLONE_SHARED_ATTRIBUTES = (
+    "user_name",
+    "description",
+    "rationale",
+    "quant_value",
+    "gate_type",
+    "severity",
+    "input_subtype",
+    "equation",
+    "detailed_equation",
+    "is_page",
+    "failure_prob",
+    "prob_formula",
+    "failure_mode_ref",
+    "fmea_effect",
+    "fmea_cause",
+    "fmea_severity",
+    "fmea_occurrence",
+    "fmea_detection",
+    "fmea_component",
+    "fmeda_malfunction",
+    "fmeda_safety_goal",
+    "fmeda_diag_cov",
+    "fmeda_fit",
+    "fmeda_spfm",
+    "fmeda_lpfm",
+    "fmeda_fault_type",
+    "fmeda_fault_fraction",
+)
+
+
+class CloneRegistry:
+    """Map each primary node id to the other instances representing it.
+
+    Instances are either clones (``is_primary_instance`` is ``False``) whose
+    ``original`` points to the primary, or duplicate primary objects with the
+    same ``unique_id`` which are created when a shared node is serialized
+    under several parents.  Edits are propagated only to these registered
+    instances instead of walking every tree.
+    """
+
+    def __init__(self):
+        self._primaries = {}
+        self._instances = {}
+
+    def clear(self):
+        self._primaries.clear()
+        self._instances.clear()
+
+    def rebuild(self, root_nodes):
+        """Index all nodes below ``root_nodes`` and resolve clone references.
+
+        Clones loaded from a file carry an ``_original_id`` which is resolved
+        against the collected primaries after a single traversal.  Clones
+        without a matching primary reference themselves.
+        """
+        self.clear()
+        pending = []
+        seen = set()
+        stack = list(reversed(root_nodes))
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if node.is_primary_instance:
+                node.original = node
+                self._add_primary(node)
+            else:
+                pending.append(node)
+            stack.extend(reversed(node.children))
+        for clone in pending:
+            orig_id = getattr(clone, "_original_id", None)
+            if orig_id is None:
+                orig = getattr(clone, "original", None)
+                orig_id = orig.unique_id if orig is not None else clone.unique_id
+            primary = self._primaries.get(orig_id)
+            if primary is None:
+                clone.original = clone
+                continue
+            clone.original = primary
+            self._instances.setdefault(orig_id, []).append(clone)
+        return self
+
+    def _add_primary(self, node):
+        existing = self._primaries.get(node.unique_id)
+        if existing is None:
+            self._primaries[node.unique_id] = node
+        elif existing is not node:
+            self._instances.setdefault(node.unique_id, []).append(node)
+
+    def register(self, node):
+        """Add a newly created primary node or clone to the registry."""
+        if node.is_primary_instance:
+            self._add_primary(node)
+            return
+        orig = node.original
+        if orig is None or orig is node:
+            return
+        insts = self._instances.setdefault(orig.unique_id, [])
+        if not any(n is node for n in insts):
+            insts.append(node)
+
+    def unregister(self, node):
+        """Forget ``node`` so future edits no longer touch it."""
+        key = node.unique_id if node.is_primary_instance else getattr(node.original, "unique_id", None)
+        insts = [n for n in self._instances.get(key, []) if n is not node]
+        if node.is_primary_instance and self._primaries.get(key) is node:
+            del self._primaries[key]
+            # Promote a duplicate primary so the remaining clones stay tracked.
+            promoted = next((n for n in insts if n.is_primary_instance), None)
+            if promoted is not None:
+                insts.remove(promoted)
+                self._primaries[key] = promoted
+        if insts:
+            self._instances[key] = insts
+        else:
+            self._instances.pop(key, None)
+
+    def unregister_subtree(self, node):
+        """Forget ``node`` and every node below it."""
+        stack = [node]
+        seen = set()
+        while stack:
+            n = stack.pop()
+            if id(n) in seen:
+                continue
+            seen.add(id(n))
+            self.unregister(n)
+            stack.extend(n.children)
+
+    def primary(self, unique_id):
+        return self._primaries.get(unique_id)
+
+    def instances(self, unique_id):
+        """Return the clones and duplicate primaries of ``unique_id``."""
+        return list(self._instances.get(unique_id, []))
+
+    def sync(self, updated_node):
+        """Copy shared attributes of ``updated_node`` to its registered instances.
+
+        Returns the list of instances that were updated.
+        """
+        if not updated_node.is_primary_instance and updated_node.original:
+            updated_node = updated_node.original
+        targets = [n for n in self._instances.get(updated_node.unique_id, []) if n is not updated_node]
+        values = {attr: getattr(updated_node, attr) for attr in CLONE_SHARED_ATTRIBUTES}
+        for node in targets:
+            for attr, value in values.items():
+                setattr(node, attr, value)
+            if node.is_primary_instance:
+                node.node_type = updated_node.node_type
+                node.display_label = updated_node.display_label
+            else:
+                # Mark clones so they are distinguishable on the diagram.
+                node.display_label = updated_node.display_label + " (clone)"
+        return targets
@@ -0,0 +1,157 @@
+"""Transparent gzip, xz and zstd compression of model files and exports.
+
+Files are written compressed when their name ends with one of the
+extensions in :data:`EXTENSIONS` and read back by looking at their magic
+bytes, so a compressed file is loaded correctly whatever it is called.
+Compression is streaming in both directions: data passes through the
+codec in chunks and is never held twice in memory.  zstd needs the
+optional ``zstandard`` package.
+"""
+
+import gzip
+import io
+import lzma
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+GZIP, XZ, ZSTD = "gzip", "xz", "zstd"
+
+MAGIC = {
+    GZIP: b"\x1f\x8b",
+    XZ: b"\xfd7zXZ\x00",
+    ZSTD: b"\x28\xb5\x2f\xfd",
+}
+
+EXTENSIONS = {".gz": GZIP, ".xz": XZ, ".zst": ZSTD}
+
+# Fast levels: model files compress well even at the lowest settings.
+LEVELS = {GZIP: 6, XZ: 1, ZSTD: 3}
+
+
+def detect(head: bytes):
+    """Return the codec whose magic starts ``head``, or ``None``."""
+    for codec, magic in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def codec_for_path(path):
+    """Return the codec selected by the extension of ``path``, or ``None``."""
+    lower = str(path).lower()
+    for ext, codec in EXTENSIONS.items():
+        if lower.endswith(ext):
+            return codec
+    return None
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise ValueError("zstd compressed files need the 'zstandard' package")
+
+
+def wrap_reader(raw):
+    """Return a binary stream decompressing ``raw`` if it is compressed.
+
+    ``raw`` must be seekable; its position keeps reflecting how much of the
+    compressed file has been consumed, which callers use for progress.
+    """
+    head = raw.read(6)
+    raw.seek(0)
+    codec = detect(head)
+    if codec == GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if codec == XZ:
+        return lzma.LZMAFile(raw, "rb")
+    if codec == ZSTD:
+        _require_zstd()
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+    return raw
+
+
+def wrap_writer(raw, codec):
+    """Return a binary stream compressing into ``raw`` with ``codec``."""
+    if codec == GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=LEVELS[GZIP], mtime=0)
+    if codec == XZ:
+        return lzma.LZMAFile(raw, "wb", preset=LEVELS[XZ])
+    if codec == ZSTD:
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=LEVELS[ZSTD]).stream_writer(raw, closefd=False)
+    return raw
+
+
+class _Stream(io.BufferedIOBase):
+    """Binary file whose codec layer and underlying file close together."""
+
+    def __init__(self, inner, raw):
+        self._inner = inner
+        self._raw = raw
+
+    def readable(self):
+        return self._inner.readable()
+
+    def writable(self):
+        return self._inner.writable()
+
+    def read(self, size=-1):
+        return self._inner.read(size)
+
+    def read1(self, size=-1):
+        return self._inner.read(size)
+
+    def readinto(self, b):
+        data = self._inner.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def write(self, data):
+        return self._inner.write(data)
+
+    def flush(self):
+        if not self.closed:
+            self._inner.flush()
+
+    def raw_position(self):
+        """Return the offset reached in the (compressed) file."""
+        return self._raw.tell()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            super().close()  # flushes while the codec is still open
+        finally:
+            try:
+                if self._inner is not self._raw:
+                    self._inner.close()
+            finally:
+                self._raw.close()
+
+
+def open_file(path, mode="rb", encoding=None, newline=None):
+    """Open ``path`` like :func:`open`, compressing or decompressing it.
+
+    Reading detects the codec from the file content; writing uses the codec
+    named by the extension of ``path``.  Text modes wrap the stream in a
+    :class:`io.TextIOWrapper`.
+    """
+    binary_mode = mode.replace("t", "")
+    if "b" not in binary_mode:
+        binary_mode += "b"
+    raw = open(path, binary_mode)
+    try:
+        if "r" in mode:
+            inner = wrap_reader(raw)
+        else:
+            inner = wrap_writer(raw, codec_for_path(path))
+    except Exception:
+        raw.close()
+        raise
+    stream = _Stream(inner, raw)
+    if "b" in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, newline=newline)
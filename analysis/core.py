@@ -0,0 +1,45 @@
+"""Stable interface of the analysis core for use outside the application.
+
+Batch jobs, worker processes and services should import from this module
+rather than from the modules behind it, whose layout may change.  It only
+pulls in the standard library and the GUI-free modules of this package,
+never tkinter or the optional PDF and image libraries.  Nodes and projects
+can be pickled, so they can be sent to worker processes.
+
+Example::
+
+    from analysis.core import Project
+
+    project = Project.load("model.json")
+    report = project.analyze()
+"""
+
+from analysis.fault_tree import FaultTreeNode, cut_sets, failure_probability, probability
+from analysis.fmeda_utils import compute_fmeda_metrics
+from analysis.headless import ASIL, CHECKS, CUT_SETS, FMEDA, PMHF, REFERENCES, Project
+from analysis.model_io import read_model_data, write_model_data
+from analysis.model_loader import ModelFormatError
+from analysis.models import ASIL_ORDER, ASIL_TARGETS, PMHF_TARGETS
+from analysis.requirement_index import RequirementIndex
+
+__all__ = [
+    "ASIL",
+    "ASIL_ORDER",
+    "ASIL_TARGETS",
+    "CHECKS",
+    "CUT_SETS",
+    "FMEDA",
+    "FaultTreeNode",
+    "ModelFormatError",
+    "PMHF",
+    "PMHF_TARGETS",
+    "Project",
+    "REFERENCES",
+    "RequirementIndex",
+    "compute_fmeda_metrics",
+    "cut_sets",
+    "failure_probability",
+    "probability",
+    "read_model_data",
+    "write_model_data",
+]
@@ -0,0 +1,100 @@
+"""CSV export of analysis documents that skips files whose content is unchanged."""
+
+import csv
+import hashlib
+import io
+import os
+
+from analysis.compression import open_file
+
+FMEA_COLUMNS = ["Component", "Parent", "Failure Mode", "Failure Effect", "Cause", "S", "O", "D", "RPN", "Requirements"]
+FMEDA_COLUMNS = FMEA_COLUMNS + [
+    "Malfunction",
+    "Safety Goal",
+    "FaultType",
+    "Fraction",
+    "FIT",
+    "DiagCov",
+    "Mechanism",
+]
+
+
+def fmea_row(be):
+    """Return the FMEA CSV row of the failure mode ``be``."""
+    parent = be.parents[0] if be.parents else None
+    if parent:
+        comp = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
+        if parent.description:
+            comp = f"{comp} - {parent.description}"
+        parent_name = parent.user_name if parent.user_name else f"Node {parent.unique_id}"
+    else:
+        comp = getattr(be, "fmea_component", "") or "N/A"
+        parent_name = ""
+    req_ids = "; ".join([f"{req['req_type']}:{req['text']}" for req in getattr(be, 'safety_requirements', [])])
+    rpn = be.fmea_severity * be.fmea_occurrence * be.fmea_detection
+    failure_mode = be.description or (be.user_name or f"BE {be.unique_id}")
+    return [comp, parent_name, failure_mode, be.fmea_effect, be.fmea_cause, be.fmea_severity, be.fmea_occurrence, be.fmea_detection, rpn, req_ids]
+
+
+def fmeda_row(be, safety_goals=()):
+    """Return the FMEDA CSV row of ``be`` linked to ``safety_goals``."""
+    return fmea_row(be) + [
+        getattr(be, "fmeda_malfunction", ""),
+        ", ".join(safety_goals) or getattr(be, "fmeda_safety_goal", ""),
+        getattr(be, "fmeda_fault_type", ""),
+        be.fmeda_fault_fraction,
+        be.fmeda_fit,
+        be.fmeda_diag_cov,
+        getattr(be, "fmeda_mechanism", ""),
+    ]
+
+
+class CsvExportCache:
+    """Remember what was last written to each exported CSV file.
+
+    For every path the digest of the CSV text and the size and modification
+    time of the written file are kept.  :meth:`write` renders the rows in
+    memory and only rewrites the file when the text differs from the last
+    export or the file was changed or removed by someone else meanwhile.
+    Paths ending in a compression extension are written compressed.
+    """
+
+    def __init__(self):
+        self._written = {}  # absolute path -> (digest, size, mtime_ns)
+
+    @staticmethod
+    def render(header, rows) -> str:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(header)
+        writer.writerows(rows)
+        return buf.getvalue()
+
+    def is_current(self, path, digest) -> bool:
+        entry = self._written.get(os.path.abspath(path))
+        if entry is None or entry[0] != digest:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == entry[1:]
+
+    def write(self, path, header, rows, force=False) -> bool:
+        """Export ``header`` and ``rows`` to ``path``; return ``True`` if written."""
+        text = self.render(header, rows)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        if not force and self.is_current(path, digest):
+            return False
+        with open_file(path, "w", newline="") as f:
+            f.write(text)
+        st = os.stat(path)
+        self._written[os.path.abspath(path)] = (digest, st.st_size, st.st_mtime_ns)
+        return True
+
+    def forget(self, path=None) -> None:
+        """Drop the record of ``path`` (of every file when omitted)."""
+        if path is None:
+            self._written.clear()
+        else:
+            self._written.pop(os.path.abspath(path), None)
@@ -0,0 +1,87 @@
+"""Detect unsaved model changes without keeping a copy of the saved model."""
+
+import hashlib
+import json
+
+# Marker for changes whose model section is unknown.
+UNKNOWN_SECTION = "*"
+
+
+def encode_section(value) -> bytes:
+    """Return the canonical JSON form of a model section."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def text_digest(raw: bytes) -> bytes:
+    """Return the digest of a section encoded by :func:`encode_section`."""
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def section_digest(value) -> bytes:
+    """Return a digest of the JSON form of ``value``.
+
+    Sections are encoded one at a time with the C encoder, so only the
+    text of the largest section exists at once and only briefly.
+    """
+    return text_digest(encode_section(value))
+
+
+class DirtyTracker:
+    """Per-section modification counters backed by content digests.
+
+    :meth:`mark` is called for every change reported by the change journal
+    and bumps the counter of the affected section, so a journaled edit is
+    detected in constant time.  Sections not listed in ``journaled`` have
+    no complete journal coverage; when no counter moved since the last
+    save, :meth:`is_dirty` compares a digest of each of them against the
+    digest recorded by :meth:`mark_saved`, which catches edits made without
+    a journal event while only storing 16 bytes per section.
+    """
+
+    def __init__(self, journaled=()):
+        self.journaled = frozenset(journaled)
+        self._counters = {}
+        self._saved_counters = {}
+        self._digests = {}
+
+    def mark(self, section: str = UNKNOWN_SECTION) -> None:
+        section = section or UNKNOWN_SECTION
+        self._counters[section] = self._counters.get(section, 0) + 1
+
+    def counters(self) -> dict:
+        """Return a copy of the per-section modification counters."""
+        return dict(self._counters)
+
+    def mark_saved(self, data: dict) -> None:
+        """Record ``data`` (as returned by ``export_model_data``) as saved.
+
+        Only sections outside :attr:`journaled` need to be present.
+        """
+        self._digests = {
+            key: section_digest(value) for key, value in data.items() if key not in self.journaled
+        }
+        self._saved_counters = dict(self._counters)
+
+    def saved_digests(self) -> dict:
+        """Return a copy of the section digests recorded by :meth:`mark_saved`."""
+        return dict(self._digests)
+
+    def dirty_sections(self):
+        """Return sections with journaled changes since the last save."""
+        return sorted(
+            s for s, n in self._counters.items() if self._saved_counters.get(s) != n
+        )
+
+    def is_dirty(self, data_provider) -> bool:
+        """Return ``True`` if the model differs from the last saved state.
+
+        ``data_provider`` is only called when no journaled change is
+        pending and must return the current ``export_model_data`` dict of
+        at least the sections outside :attr:`journaled`.
+        """
+        if self.dirty_sections():
+            return True
+        data = {k: v for k, v in data_provider().items() if k not in self.journaled}
+        if data.keys() != self._digests.keys():
+            return True
+        return any(section_digest(value) != self._digests[key] for key, value in data.items())
@@ -0,0 +1,160 @@
+"""Fault tree node model and its quantification, independent of the GUI.
+
+:class:`FaultTreeNode` is the node of every fault tree, FMEA and FMEDA in
+a model.  Nodes get their ``unique_id`` from :data:`helper`, the id counter
+shared by everything creating nodes in the process, and are serialized by
+:data:`NODE_CODEC`.  :func:`cut_sets`, :func:`failure_probability` and
+:func:`probability` implement the classical FTA calculations.
+"""
+
+import math
+
+from analysis.node_codec import NodeCodec
+from analysis.risk_assessment import AutoMLHelper
+
+# Unique id counter and calculation helper shared by the whole process.
+helper = AutoMLHelper()
+
+
+class FaultTreeNode:
+    def __init__(self, user_name, node_type, parent=None):
+        self.unique_id = helper.get_next_unique_id()
+        # Assign a sequential default name if none is provided
+        self.user_name = user_name if user_name else f"Node {self.unique_id}"
+        self.node_type = node_type
+        self.children = []
+        self.parents = []
+        if parent is not None:
+            self.parents.append(parent)
+        self.quant_value = None
+        self.gate_type = "AND" if node_type.upper() in ["GATE", "RIGOR LEVEL", "TOP EVENT"] else None
+        self.description = ""
+        self.rationale = ""
+        self.x = 50
+        self.y = 50
+        # Severity and controllability now use a 1-3 scale
+        # Default to the lowest level until linked to a HARA entry
+        self.severity = 1 if node_type.upper() == "TOP EVENT" else None
+        self.controllability = 1 if node_type.upper() == "TOP EVENT" else None
+        self.input_subtype = None
+        self.display_label = ""
+        self.equation = ""
+        self.detailed_equation = ""
+        self.is_page = False
+        self.is_primary_instance = True
+        self.original = self
+        self.safety_goal_description = ""
+        self.safety_goal_asil = ""
+        self.safe_state = ""
+        self.ftti = ""
+        self.acceptance_criteria = ""
+        # Targets for safety goal metrics
+        self.sg_dc_target = 0.0
+        self.sg_spfm_target = 0.0
+        self.sg_lpfm_target = 0.0
+        self.vehicle_safety_requirements = []          # List of vehicle safety requirements
+        self.operational_safety_requirements = []        # List of operational safety requirements
+        # Each requirement is a dict with keys: "id", "req_type" and "text"
+        self.safety_requirements = []
+        # --- FMEA attributes for basic events (AIAG style) ---
+        self.fmea_effect = ""       # Description of effect/failure mode
+        self.fmea_cause = ""        # Potential cause of failure
+        self.fmea_severity = 1       # 1-10 scale
+        self.fmea_occurrence = 1     # 1-10 scale
+        self.fmea_detection = 1      # 1-10 scale
+        self.fmea_component = ""     # Optional component name for FMEA-only nodes
+        # --- FMEDA attributes ---
+        self.fmeda_malfunction = ""
+        self.fmeda_safety_goal = ""
+        self.fmeda_diag_cov = 0.0
+        self.fmeda_fit = 0.0
+        self.fmeda_spfm = 0.0
+        self.fmeda_lpfm = 0.0
+        self.fmeda_fault_type = "permanent"
+        self.fmeda_fault_fraction = 0.0
+        # FMEDA specific targets if not derived from FTA
+        self.fmeda_dc_target = 0.0
+        self.fmeda_spfm_target = 0.0
+        self.fmeda_lpfm_target = 0.0
+        # Reference to a unique failure mode this node represents
+        self.failure_mode_ref = None
+        # Probability values for classical FTA calculations
+        self.failure_prob = 0.0
+        self.probability = 0.0
+        # Formula used to derive probability from FIT rate
+        self.prob_formula = "linear"  # linear, exponential, or constant
+
+    @property
+    def name(self):
+        orig = getattr(self, "original", self)
+        uid = orig.unique_id if not self.is_primary_instance else self.unique_id
+        base_name = self.user_name
+        # Avoid repeating the ID if the user_name already matches the default
+        if not base_name or base_name == f"Node {uid}":
+            return f"Node {uid}"
+        return f"Node {uid}: {base_name}"
+
+    def to_dict(self, compact=False):
+        """Return this node and its subtree as JSON data.
+
+        ``compact`` leaves out fields holding their load default, which is
+        used for the saved model file.
+        """
+        return NODE_CODEC.encode(self, compact)
+
+    @staticmethod
+    def from_dict(data, parent=None, share=None):
+        """Build a node tree from :meth:`to_dict` data.
+
+        ``share`` is an optional :class:`RequirementPool` used to share
+        identical requirement dictionaries between nodes.
+        """
+        return NODE_CODEC.decode(data, parent, share)
+
+
+NODE_CODEC = NodeCodec(FaultTreeNode, lambda: helper.get_next_unique_id())
+
+
+def cut_sets(node):
+    """Return the cut sets of ``node`` as sets of ``unique_id``s."""
+    if not node.children:
+        return [{node.unique_id}]
+    gate = (node.gate_type or "AND").upper() if node.node_type.upper() in ["TOP EVENT", "GATE", "RIGOR LEVEL"] else "AND"
+    child_cut_sets = [cut_sets(child) for child in node.children]
+    if gate != "AND":
+        return [cs for cuts in child_cut_sets for cs in cuts]
+    result = [set()]
+    for cuts in child_cut_sets:
+        result = [partial | cs for partial in result for cs in cuts]
+    return result
+
+
+def failure_probability(node, failure_mode=None, tau=1.0, formula=None):
+    """Return the probability of failure of ``node`` within ``tau`` hours.
+
+    The FIT rate of ``failure_mode`` (the node itself when omitted) is
+    converted to a failure rate per hour.  With the constant formula the
+    ``failure_prob`` stored on the node is returned unchanged.
+    """
+    fm = failure_mode or node
+    if tau <= 0:
+        tau = 1.0
+    fit = getattr(fm, "fmeda_fit", getattr(node, "fmeda_fit", 0.0))
+    formula = formula or getattr(node, "prob_formula", getattr(fm, "prob_formula", "linear"))
+    f = str(formula).strip().lower()
+    if f == "constant":
+        try:
+            return float(getattr(node, "failure_prob", 0.0))
+        except (TypeError, ValueError):
+            return 0.0
+    if fit <= 0:
+        return 0.0
+    lam = fit / 1e9
+    if f == "exponential":
+        return 1 - math.exp(-lam * tau)
+    return lam * tau
+
+
+def probability(node):
+    """Return (and store on the tree) the failure probability of ``node``."""
+    return helper.calculate_probability_recursive(node)
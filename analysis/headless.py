@@ -0,0 +1,387 @@
+"""Safety analyses of a project file without the graphical application.
+
+:class:`Project` loads a model in any supported file format into plain
+fault tree nodes and runs the same calculations as the application: PMHF
+of every top event against :data:`PMHF_TARGETS`, cut sets, FMEDA metrics
+per FMEDA document, ASIL consistency between HARAs, safety goals and
+requirements and a check for dangling references.  Results are JSON
+compatible dictionaries.  Nothing here imports tkinter, so the module can
+run in CI jobs and worker processes, and projects can be pickled to pass
+them between processes.
+"""
+
+import os
+
+from analysis.asil_propagation import AsilGraph
+from analysis.csv_export import FMEA_COLUMNS, FMEDA_COLUMNS, CsvExportCache, fmea_row, fmeda_row
+from analysis.fmeda_utils import compute_fmeda_metrics
+from analysis.fault_tree import NODE_CODEC, FaultTreeNode, cut_sets, failure_probability, helper
+from analysis.model_io import read_archive_sections, read_model_data, write_model_data
+from analysis.model_loader import ModelFormatError
+from analysis.models import (
+    ASIL_ORDER,
+    HaraDoc,
+    HaraEntry,
+    PMHF_TARGETS,
+    MissionProfile,
+    ReliabilityComponent,
+)
+from analysis.node_codec import RequirementPool
+from analysis.reachability import ReachabilityIndex
+from analysis.requirement_index import RequirementIndex, goal_name
+
+PMHF, CUT_SETS, FMEDA, ASIL, REFERENCES = "pmhf", "cut_sets", "fmeda", "asil", "references"
+CHECKS = (PMHF, CUT_SETS, FMEDA, ASIL, REFERENCES)
+
+
+def _load_component(data):
+    comp = ReliabilityComponent(
+        data.get("name", ""),
+        data.get("comp_type", ""),
+        data.get("quantity", 1),
+        data.get("attributes", {}),
+        data.get("qualification", data.get("safety_req", "")),
+        data.get("fit", 0.0),
+        data.get("is_passive", False),
+    )
+    comp.sub_boms = [[_load_component(c) for c in bom] for bom in data.get("sub_boms", [])]
+    return comp
+
+
+# Sections rebuilt from the fault tree nodes by :meth:`Project.to_data`.
+_NODE_SECTIONS = ("top_events", "root_node", "fmea_entries", "fmeas", "fmedas")
+
+
+class Project:
+    """A model loaded for analysis; ``data`` is the saved model data."""
+
+    def __init__(self, data, path=None):
+        self.path = path
+        share = RequirementPool()
+
+        def node(value):
+            if isinstance(value, FaultTreeNode):
+                return value
+            return NODE_CODEC.decode(value, share=share)
+
+        if "top_events" in data:
+            self.top_events = [node(e) for e in data["top_events"]]
+        elif "root_node" in data:
+            self.top_events = [node(data["root_node"])]
+        else:
+            raise ModelFormatError("Model has no fault trees")
+
+        self.fmeas = [
+            {
+                "name": d.get("name", "FMEA"),
+                "file": d.get("file", f"fmea_{i}.csv"),
+                "entries": [node(e) for e in d.get("entries", [])],
+            }
+            for i, d in enumerate(data.get("fmeas", []))
+        ]
+        if not self.fmeas and "fmea_entries" in data:
+            entries = [node(e) for e in data.get("fmea_entries", [])]
+            self.fmeas.append({"name": "Default FMEA", "file": "fmea_default.csv", "entries": entries})
+        self.fmedas = [
+            {
+                "name": d.get("name", "FMEDA"),
+                "file": d.get("file", f"fmeda_{i}.csv"),
+                "entries": [node(e) for e in d.get("entries", [])],
+                "bom": d.get("bom", ""),
+            }
+            for i, d in enumerate(data.get("fmedas", []))
+        ]
+
+        # Every other section is kept as saved so the project can be
+        # written back without losing what is not analysed here.
+        self.sections = {key: data[key] for key in data if key not in _NODE_SECTIONS}
+        self.mission_profiles = []
+        for mp in data.get("mission_profiles", []):
+            try:
+                self.mission_profiles.append(MissionProfile(**mp))
+            except TypeError:
+                pass
+        self.boms = {
+            ra.get("name", ""): [_load_component(c) for c in ra.get("components", [])]
+            for ra in data.get("reliability_analyses", [])
+        }
+        self.hara_docs = [
+            HaraDoc(
+                d.get("name", ""),
+                d.get("hazops", []),
+                [HaraEntry(**e) for e in d.get("entries", [])],
+                d.get("approved", False),
+                d.get("status", "draft"),
+            )
+            for d in data.get("haras", [])
+        ]
+
+        self.clone_registry = helper.fix_clone_references(self.top_events)
+        self.reachability = ReachabilityIndex().rebuild(self.top_events)
+        self.asil_graph = AsilGraph()
+        self.asil_graph.rebuild(self.hara_docs)
+        self._nodes = {}
+        for n in self.all_nodes() + [e for d in self.fmeas + self.fmedas for e in d["entries"]]:
+            self._nodes.setdefault(n.unique_id, n)
+        self.requirement_index = RequirementIndex(lambda: (self.all_nodes(), self.fmeas, self.find_node))
+
+    @classmethod
+    def load(cls, path):
+        """Return the project stored in ``path``.
+
+        Raises :class:`ValueError` if the file cannot be parsed.
+        """
+        return cls(read_model_data(path), path)
+
+    def to_data(self):
+        """Return the model data of the project, as saved in a model file."""
+        data = {"top_events": [NODE_CODEC.encode(te, compact=True) for te in self.top_events]}
+        for key in ("fmeas", "fmedas"):
+            data[key] = [
+                dict(doc, entries=[NODE_CODEC.encode(e, compact=True) for e in doc["entries"]])
+                for doc in getattr(self, key)
+            ]
+        data.update(self.sections)
+        return data
+
+    def save(self, path):
+        """Write the project to ``path`` in the format of its extension.
+
+        The version history and closed review comments archived with the
+        file the project was loaded from are written along with it.
+        """
+        archive = read_archive_sections(self.path) if self.path else {}
+        write_model_data(path, self.to_data(), archive)
+        self.path = path
+
+    def __getstate__(self):
+        return {"path": self.path, "data": self.to_data()}
+
+    def __setstate__(self, state):
+        self.__init__(state["data"], state["path"])
+
+    # ------------------------------------------------------------------
+    # Model queries
+    # ------------------------------------------------------------------
+    def all_nodes(self):
+        """Return every node instance of all fault trees."""
+        result, seen = [], set()
+        stack = list(reversed(self.top_events))
+        while stack:
+            n = stack.pop()
+            if id(n) in seen:
+                continue
+            seen.add(id(n))
+            result.append(n)
+            stack.extend(reversed(n.children))
+        return result
+
+    def basic_events(self):
+        return [n for n in self.all_nodes() if n.node_type.upper() == "BASIC EVENT"]
+
+    def find_node(self, unique_id):
+        return self._nodes.get(unique_id)
+
+    def failure_mode_node(self, node):
+        ref = getattr(node, "failure_mode_ref", None)
+        return (self.find_node(ref) if ref else None) or node
+
+    def safety_goals_of(self, node):
+        """Return names of safety goals for top events containing ``node``."""
+        goals = {te.unique_id: te.safety_goal_description or te.user_name or "" for te in self.top_events}
+        target = self.failure_mode_node(node)
+        return [goals[t] for t in self.reachability.top_events_of(target.unique_id) if goals.get(t)]
+
+    def goal_asil(self, name):
+        """Return the highest ASIL of safety goal ``name`` (HARAs and top events)."""
+        best = self.asil_graph.goal_asil(name) if name else "QM"
+        for te in self.top_events:
+            if name and (name == te.user_name or name == te.safety_goal_description):
+                if ASIL_ORDER.get(te.safety_goal_asil or "QM", 0) > ASIL_ORDER.get(best, 0):
+                    best = te.safety_goal_asil or "QM"
+        return best
+
+    def requirements(self):
+        """Return ``{id: requirement}`` for requirements allocated in the model."""
+        reqs = {}
+        for n in self.all_nodes() + [e for d in self.fmeas for e in d["entries"]]:
+            for req in getattr(n, "safety_requirements", []) or []:
+                if isinstance(req, dict) and req.get("id"):
+                    reqs.setdefault(req["id"], req)
+        return reqs
+
+    # ------------------------------------------------------------------
+    # Analyses
+    # ------------------------------------------------------------------
+    def failure_probability(self, node):
+        """Return the failure probability of ``node`` from its FIT rate."""
+        tau = self.mission_profiles[0].tau if self.mission_profiles else 1.0
+        return failure_probability(node, self.failure_mode_node(node), tau)
+
+    def pmhf(self):
+        """Return the PMHF of every top event checked against its ASIL target."""
+        for be in self.basic_events():
+            be.failure_prob = self.failure_probability(be)
+        total = 0.0
+        events = []
+        for te in self.top_events:
+            prob = helper.calculate_probability_recursive(te)
+            te.probability = prob
+            total += prob
+            asil = te.safety_goal_asil or "QM"
+            target = PMHF_TARGETS.get(asil, 1.0)
+            events.append(
+                {
+                    "id": te.unique_id,
+                    "name": te.user_name,
+                    "asil": asil,
+                    "probability": prob,
+                    "target": target,
+                    "ok": prob <= target,
+                }
+            )
+        return {"total": total, "top_events": events, "ok": all(e["ok"] for e in events)}
+
+    def cut_sets(self):
+        """Return the cut sets of every top event."""
+        return {
+            "top_events": [
+                {
+                    "id": te.unique_id,
+                    "name": te.user_name,
+                    "cut_sets": sorted(sorted(cs) for cs in cut_sets(te)),
+                }
+                for te in self.top_events
+            ],
+            "ok": True,
+        }
+
+    def fmeda_metrics(self):
+        """Return the metrics of every FMEDA checked against the ASIL targets."""
+        docs = []
+        for doc in self.fmedas:
+            metrics = compute_fmeda_metrics(
+                doc["entries"],
+                self.boms.get(doc["bom"], []),
+                self.goal_asil,
+                get_node=self.failure_mode_node,
+            )
+            checks = [metrics] + list(metrics["goal_metrics"].values())
+            ok = all(m["ok_dc"] and m["ok_spfm"] and m["ok_lpfm"] for m in checks)
+            docs.append({"name": doc["name"], "ok": ok, **metrics})
+        return {"fmedas": docs, "ok": all(d["ok"] for d in docs)}
+
+    def asil_consistency(self):
+        """Return safety goals and requirements whose ASIL is out of date.
+
+        Safety goals must carry the ASIL aggregated from approved HARAs and
+        requirements the highest ASIL of the goals they trace to.
+        Decomposed requirements keep their decomposition ASIL.
+        """
+        issues = []
+        for te in self.top_events:
+            name = goal_name(te)
+            data = self.asil_graph.goal_data(name)
+            asil = te.safety_goal_asil or "QM"
+            if data is not None and data[0] != asil:
+                issues.append({"kind": "safety_goal", "name": name, "asil": asil, "expected": data[0]})
+        for rid, req in sorted(self.requirements().items(), key=lambda item: str(item[0])):
+            asil = req.get("asil") or "QM"
+            if req.get("parent_id") or asil not in ASIL_ORDER:
+                continue
+            goals = self.requirement_index.goal_names(rid)
+            expected = "QM"
+            for g in goals:
+                a = self.goal_asil(g)
+                if ASIL_ORDER.get(a, 0) > ASIL_ORDER.get(expected, 0):
+                    expected = a
+            if expected != asil:
+                issues.append(
+                    {"kind": "requirement", "name": rid, "asil": asil, "expected": expected, "goals": goals}
+                )
+        return {"issues": issues, "ok": not issues}
+
+    def references(self):
+        """Return references to nodes or BOMs missing from the model.
+
+        Covers clones whose primary node is gone, failure mode references
+        of basic events and FMEA/FMEDA entries and the BOM of each FMEDA.
+        """
+        issues = []
+        entries = [e for d in self.fmeas + self.fmedas for e in d["entries"]]
+        for n in self.all_nodes() + entries:
+            orig_id = getattr(n, "_original_id", None)
+            if not n.is_primary_instance and orig_id is not None and n.original is n:
+                issues.append({"kind": "clone", "node": n.unique_id, "ref": orig_id})
+            ref = n.failure_mode_ref
+            if ref is not None and self.find_node(ref) is None:
+                issues.append({"kind": "failure_mode", "node": n.unique_id, "ref": ref})
+        for doc in self.fmedas:
+            if doc["bom"] and doc["bom"] not in self.boms:
+                issues.append({"kind": "bom", "node": doc["name"], "ref": doc["bom"]})
+        return {"issues": issues, "ok": not issues}
+
+    def analyze(self, checks=CHECKS):
+        """Run ``checks`` and return the report; ``ok`` is false on any violation."""
+        runs = {
+            PMHF: self.pmhf,
+            CUT_SETS: self.cut_sets,
+            FMEDA: self.fmeda_metrics,
+            ASIL: self.asil_consistency,
+            REFERENCES: self.references,
+        }
+        report = {"model": self.path}
+        for check in checks:
+            report[check] = runs[check]()
+        report["ok"] = all(report[c]["ok"] for c in checks)
+        return report
+
+    # ------------------------------------------------------------------
+    # Exports
+    # ------------------------------------------------------------------
+    def export_csv(self, directory, cache=None):
+        """Write every FMEA and FMEDA to ``directory``; return the paths."""
+        cache = cache or CsvExportCache()
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for doc in self.fmeas:
+            path = os.path.join(directory, os.path.basename(doc["file"]))
+            cache.write(path, FMEA_COLUMNS, (fmea_row(be) for be in doc["entries"]))
+            paths.append(path)
+        for doc in self.fmedas:
+            path = os.path.join(directory, os.path.basename(doc["file"]))
+            rows = (fmeda_row(be, self.safety_goals_of(be)) for be in doc["entries"])
+            cache.write(path, FMEDA_COLUMNS, rows)
+            paths.append(path)
+        return paths
+
+
+def export_pdf(report, path):
+    """Write the metrics of ``report`` (see :meth:`Project.analyze`) to a PDF."""
+    try:
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+    except ImportError as exc:
+        raise ValueError("PDF export needs the 'reportlab' package") from exc
+
+    styles = getSampleStyleSheet()
+    story = [Paragraph(f"Safety metrics: {os.path.basename(report.get('model') or '')}", styles["Title"])]
+    if PMHF in report:
+        rows = [["Top Event", "ASIL", "PMHF", "Target", "OK"]]
+        rows += [
+            [e["name"], e["asil"], f"{e['probability']:.2e}", f"{e['target']:.1e}", "yes" if e["ok"] else "NO"]
+            for e in report[PMHF]["top_events"]
+        ]
+        story += [Paragraph(f"PMHF (total {report[PMHF]['total']:.2e})", styles["Heading2"]), Table(rows)]
+    if FMEDA in report:
+        rows = [["FMEDA", "ASIL", "SPFM", "LPFM", "DC", "OK"]]
+        rows += [
+            [d["name"], d["asil"], f"{d['spfm_metric']:.2%}", f"{d['lpfm_metric']:.2%}", f"{d['dc']:.2%}", "yes" if d["ok"] else "NO"]
+            for d in report[FMEDA]["fmedas"]
+        ]
+        story += [Spacer(1, 12), Paragraph("FMEDA", styles["Heading2"]), Table(rows)]
+    if ASIL in report:
+        rows = [["Kind", "Name", "ASIL", "Expected"]]
+        rows += [[i["kind"], str(i["name"]), i["asil"], i["expected"]] for i in report[ASIL]["issues"]]
+        story += [Spacer(1, 12), Paragraph("ASIL consistency", styles["Heading2"]), Table(rows)]
+    SimpleDocTemplate(path).build(story)
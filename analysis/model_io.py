@@ -0,0 +1,103 @@
+"""Read and write model data in every supported project file format.
+
+Plain JSON files (optionally compressed, see :mod:`analysis.compression`)
+keep the sidecar archive next to them, ``.automl`` containers and SQLite
+projects store it inside.  Fault trees, FMEAs and FMEDAs of JSON files are
+decoded into :class:`~analysis.fault_tree.FaultTreeNode` trees while the
+file is read.
+"""
+
+import json
+import os
+
+from analysis.archive import ArchiveReader, sidecar_path, write_archive
+from analysis.compression import open_file
+from analysis.fault_tree import NODE_CODEC
+from analysis.model_loader import load_model_file
+from analysis.node_codec import RequirementPool
+from analysis.project_container import ARCHIVE_PREFIX, EXTENSION, ContainerData, ContainerReader, is_container, write_container
+from analysis.sqlite_store import EXTENSIONS as SQLITE_EXTENSIONS, SqliteProjectStore, is_sqlite
+
+
+def section_converters(share=None):
+    """Return loader converters replacing node dicts by ``FaultTreeNode``s."""
+    share = share or RequirementPool()
+
+    def nodes(items):
+        for i, item in enumerate(items):
+            items[i] = NODE_CODEC.decode(item, share=share)
+        return items
+
+    def documents(docs):
+        for doc in docs:
+            nodes(doc.get("entries", []))
+        return docs
+
+    return {
+        "top_events": nodes,
+        "root_node": lambda item: NODE_CODEC.decode(item, share=share),
+        "fmea_entries": nodes,
+        "fmeas": documents,
+        "fmedas": documents,
+    }
+
+
+def read_model_data(path, progress=None):
+    """Return the model data of ``path`` (JSON, container or SQLite)."""
+    if is_sqlite(path):
+        store = SqliteProjectStore(path)
+        try:
+            return store.load()
+        finally:
+            store.close()
+    if is_container(path):
+        return ContainerData(ContainerReader(path))
+    return load_model_file(path, section_converters(), progress)
+
+
+def read_archive_sections(path):
+    """Return the archive sections (name -> JSON bytes) saved with ``path``.
+
+    These are the version history and the comments of closed reviews,
+    which :func:`read_model_data` leaves out; pass them back to
+    :func:`write_model_data` to keep them.
+    """
+    if not os.path.exists(path):
+        return {}
+    if is_sqlite(path):
+        store = SqliteProjectStore(path)
+        try:
+            reader = store.archive()
+            return {name: reader.raw(name) for name in reader.names()}
+        finally:
+            store.close()
+    if is_container(path):
+        reader = ContainerReader(path, prefix=ARCHIVE_PREFIX)
+    else:
+        reader = ArchiveReader(sidecar_path(path))
+    return {name: reader.raw(name) for name in reader.names()}
+
+
+def write_model_data(path, data, archive=None):
+    """Write model ``data`` and the ``archive`` sections to ``path``.
+
+    The format follows the extension of ``path``.  A stale sidecar archive
+    of a JSON file is removed when there are no sections to write.
+    """
+    lower = path.lower()
+    if lower.endswith(SQLITE_EXTENSIONS):
+        store = SqliteProjectStore(path)
+        try:
+            store.save(data, archive)
+        finally:
+            store.close()
+    elif lower.endswith(EXTENSION):
+        write_container(path, data, archive)
+    else:
+        with open_file(path, "w") as f:
+            json.dump(data, f, indent=4)
+        archive_path = sidecar_path(path)
+        if archive:
+            write_archive(archive_path, archive)
+        elif os.path.exists(archive_path):
+            os.remove(archive_path)
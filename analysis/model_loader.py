@@ -0,0 +1,216 @@
+"""Streaming, tolerant reader for JSON model files.
+
+The file is read in blocks of whole lines and passed once through a small
+tokenizer that drops ``//``, ``#`` and ``/* */`` comments and trailing commas outside
+of strings, and splits the top level object into its members.  Each member
+is decoded as soon as its text is complete and can be converted right away
+(for example into ``FaultTreeNode`` objects), so neither the whole file
+text nor the decoded dictionaries of every section are held at once.
+"""
+
+import json
+import os
+import re
+
+from analysis.compression import open_file
+
+# Strings, comment openers and the structural characters of JSON.
+_STRING_PATTERN = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_TOKEN = re.compile(_STRING_PATTERN + r'|//|/\*|[#,:\[\]{}]')
+# Everything but the structural characters outside strings.
+_NOT_STRUCTURE = re.compile(r'[^",\[\]{}/#]+|' + _STRING_PATTERN)
+_BRACKET_PAIR = re.compile(r"\{\}|\[\]")
+
+# Bytes handed to the tokenizer at once (cut at a line end).
+CHUNK_SIZE = 1 << 18
+
+# Report progress at most once per this many bytes (and per section).
+PROGRESS_STEP = 1 << 20
+
+
+class ModelFormatError(ValueError):
+    """Raised when a model file is not a well-formed JSON object."""
+
+
+class _Splitter:
+    """Tokenizer state carried from one block of lines to the next."""
+
+    def __init__(self):
+        self.depth = 0
+        self.closed = False
+        self.in_comment = False
+        self.pending_comma = False
+        self.key = None
+        self.parts = None  # text of the member value being read
+        self.sections = []  # completed (name, text) pairs
+
+    def _text(self, text):
+        if self.parts is not None:
+            if self.pending_comma:
+                stripped = text.lstrip()
+                if not stripped:
+                    return
+                self.pending_comma = False
+                if stripped[0] not in "]}":
+                    self.parts.append(",")
+            self.parts.append(text)
+        elif text.strip():
+            raise ModelFormatError(f"Unexpected text {text.strip()[:40]!r} outside a model section")
+
+    def _finish(self):
+        if self.parts is not None:
+            self.sections.append((self.key, "".join(self.parts)))
+        self.key = None
+        self.parts = None
+        self.pending_comma = False
+
+    def _feed_nested(self, text):
+        """Take lines lying inside a section without tokenizing them.
+
+        This covers most of a model file: no comment characters, no
+        trailing comma and no closing bracket that could end the section.
+        Strings and matched bracket pairs are removed with regular
+        expressions, so the check runs at C speed.  Returns ``False`` if
+        ``text`` needs the tokenizer.
+        """
+        bare = _NOT_STRUCTURE.sub("", text)
+        if "/" in bare or "#" in bare or ",]" in bare or ",}" in bare:
+            return False
+        brackets = bare.replace(",", "")
+        n = 1
+        while n:
+            brackets, n = _BRACKET_PAIR.subn("", brackets)
+        opened = brackets.lstrip("]}")
+        if len(brackets) - len(opened) > self.depth - 2:
+            return False
+        self.depth += 2 * len(opened) - len(brackets)
+        body = text.rstrip()
+        if body.endswith(","):
+            self._text(body[:-1])
+            self.pending_comma = True
+        else:
+            self._text(text)
+        return True
+
+    def feed(self, text):
+        """Process ``text``, which must consist of complete lines."""
+        if self.depth >= 2 and not self.in_comment and self._feed_nested(text):
+            return
+        for line in text.splitlines(True):
+            if self.depth >= 2 and not self.in_comment and self._feed_nested(line):
+                continue
+            self._tokenize(line)
+
+    def _tokenize(self, line):
+        pos, end = 0, len(line)
+        while pos < end:
+            if self.in_comment:
+                close = line.find("*/", pos)
+                if close < 0:
+                    return
+                pos = close + 2
+                self.in_comment = False
+                continue
+            m = _TOKEN.search(line, pos)
+            if m is None:
+                self._text(line[pos:])
+                return
+            if m.start() > pos:
+                self._text(line[pos:m.start()])
+            pos = m.end()
+            tok = m.group()
+            c = tok[0]
+            if c == '"':
+                if self.depth == 1 and self.parts is None:
+                    self.key = json.loads(tok)
+                else:
+                    self._text(tok)
+            elif tok == "//" or c == "#":
+                return
+            elif tok == "/*":
+                self.in_comment = True
+            elif c == ",":
+                if self.depth == 1:
+                    self._finish()
+                else:
+                    self.pending_comma = True
+            elif c == ":" and self.depth == 1 and self.parts is None:
+                if self.key is None:
+                    raise ModelFormatError("Model section without a name")
+                self.parts = []
+            elif c in "{[":
+                if self.depth == 0:
+                    if c != "{" or self.closed:
+                        raise ModelFormatError("A model file must contain one JSON object")
+                else:
+                    self._text(c)
+                self.depth += 1
+            elif c in "}]" and self.depth == 1:
+                self._finish()
+                self.depth = 0
+                self.closed = True
+            elif c in "}]" and self.depth == 0:
+                raise ModelFormatError(f"Unbalanced {c!r} in model file")
+            else:
+                if c in "}]":
+                    self.depth -= 1
+                self._text(c)
+
+    def take(self):
+        sections, self.sections = self.sections, []
+        return sections
+
+
+def iter_sections(path, progress=None):
+    """Yield ``(name, value)`` for each member of the model file ``path``.
+
+    Compressed files are decompressed on the fly.  ``progress`` is called
+    with the fraction of the file read so far.
+    Raises :class:`ModelFormatError` if the file cannot be parsed.
+    """
+    size = os.path.getsize(path) or 1
+    splitter = _Splitter()
+    reported = 0
+    pending = []  # blocks read since the last line end
+    with open_file(path, "rb") as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            cut = block.rfind(b"\n") + 1 if block else len(block)
+            if block and not cut:
+                pending.append(block)
+                continue
+            pending.append(block[:cut])
+            text = b"".join(pending)
+            pending = [block[cut:]]
+            splitter.feed(text.decode("utf-8"))
+            done = f.raw_position()
+            sections = splitter.take()
+            for name, text in sections:
+                try:
+                    value = json.loads(text)
+                except ValueError as exc:
+                    raise ModelFormatError(f"Section {name!r}: {exc}") from exc
+                yield name, value
+            if progress and (sections or done - reported >= PROGRESS_STEP):
+                reported = done
+                progress(done / size)
+            if not block:
+                break
+    if not splitter.closed or splitter.in_comment:
+        raise ModelFormatError("Unexpected end of model file")
+    if progress:
+        progress(1.0)
+
+
+def load_model_file(path, converters=None, progress=None):
+    """Return the model data of the JSON file ``path``.
+
+    ``converters`` maps section names to callables applied to the decoded
+    value of that section as soon as it has been read.
+    """
+    converters = converters or {}
+    data = {}
+    for name, value in iter_sections(path, progress):
+        convert = converters.get(name)
+        data[name] = convert(value) if convert else value
+    return data
@@ -1,3 +1,5 @@
+import copy
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 
 @dataclass
@@ -336,7 +338,215 @@ RELIABILITY_MODELS = {
     },
 }
 
-global_requirements = {}
+class RequirementStore(dict):
+    """Registry of requirements keyed by id with secondary indexes.
+
+    Behaves like the plain ``dict`` it replaces.  Requirements are indexed
+    by the fields listed in :attr:`INDEXED_FIELDS` so queries such as
+    "all children of a decomposed requirement" or "all requirements with
+    status *approved*" do not scan the whole registry.  Requirement dicts
+    are shared with the nodes allocating them, so indexed fields must be
+    changed through :meth:`update_fields` (or followed by :meth:`reindex`)
+    to keep the indexes current.  Listeners registered with
+    :meth:`add_listener` are called as ``callback(kind, req_id)`` with
+    ``kind`` one of ``"added"``, ``"updated"``, ``"removed"`` or
+    ``"reset"``; the latter reports bulk changes with ``req_id`` ``None``.
+    """
+
+    INDEXED_FIELDS = ("req_type", "asil", "status", "parent_id")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._indexes = {f: {} for f in self.INDEXED_FIELDS}
+        self._indexed = {}  # req id -> tuple of indexed field values
+        self._listeners = []
+        self._batch = 0
+        self._batch_changed = False
+        for rid, req in dict(*args, **kwargs).items():
+            self[rid] = req
+
+    # ------------------------------------------------------------------
+    # Change feed
+    # ------------------------------------------------------------------
+    def add_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, kind, rid=None):
+        if self._batch:
+            self._batch_changed = True
+            return
+        for cb in list(self._listeners):
+            cb(kind, rid)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _unindex(self, rid):
+        values = self._indexed.pop(rid, None)
+        if values is None:
+            return
+        for field_name, value in zip(self.INDEXED_FIELDS, values):
+            ids = self._indexes[field_name].get(value)
+            if ids is not None:
+                ids.pop(rid, None)
+                if not ids:
+                    del self._indexes[field_name][value]
+
+    def _index(self, rid, req):
+        values = tuple(req.get(f) or "" for f in self.INDEXED_FIELDS)
+        self._indexed[rid] = values
+        for field_name, value in zip(self.INDEXED_FIELDS, values):
+            self._indexes[field_name].setdefault(value, {})[rid] = None
+
+    def reindex(self, rid=None):
+        """Refresh the indexes after requirement dicts were edited in place."""
+        ids = list(self) if rid is None else [rid]
+        for key in ids:
+            self._unindex(key)
+            if key in self:
+                self._index(key, dict.__getitem__(self, key))
+
+    # ------------------------------------------------------------------
+    # dict interface
+    # ------------------------------------------------------------------
+    def __setitem__(self, rid, req):
+        existed = rid in self
+        self._unindex(rid)
+        super().__setitem__(rid, req)
+        self._index(rid, req)
+        self._notify("updated" if existed else "added", rid)
+
+    def __delitem__(self, rid):
+        super().__delitem__(rid)
+        self._unindex(rid)
+        self._notify("removed", rid)
+
+    def pop(self, rid, *default):
+        if rid not in self:
+            return super().pop(rid, *default)
+        req = dict.__getitem__(self, rid)
+        del self[rid]
+        return req
+
+    def setdefault(self, rid, req=None):
+        if rid not in self:
+            self[rid] = req if req is not None else {}
+        return dict.__getitem__(self, rid)
+
+    def update(self, *args, **kwargs):
+        self.add_many(dict(*args, **kwargs).items())
+
+    def clear(self):
+        super().clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._indexed.clear()
+        self._notify("reset")
+
+    def popitem(self):
+        rid, req = super().popitem()
+        self._unindex(rid)
+        self._notify("removed", rid)
+        return rid, req
+
+    def __deepcopy__(self, memo):
+        return RequirementStore(copy.deepcopy(dict(self), memo))
+
+    def __reduce__(self):
+        return (RequirementStore, (dict(self),))
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+    @contextmanager
+    def batch(self):
+        """Group changes so listeners receive a single ``"reset"``."""
+        self._batch += 1
+        try:
+            yield self
+        finally:
+            self._batch -= 1
+            if not self._batch and self._batch_changed:
+                self._batch_changed = False
+                self._notify("reset")
+
+    def add_many(self, items, replace=True):
+        """Add ``(id, requirement)`` pairs with a single change notification.
+
+        Existing ids are kept unless ``replace`` is true.  Returns the ids
+        that were stored.
+        """
+        added = []
+        with self.batch():
+            for rid, req in items:
+                if not replace and rid in self:
+                    continue
+                self[rid] = req
+                added.append(rid)
+        return added
+
+    def update_fields(self, rid, fields=None, **kwargs):
+        """Change fields of requirement ``rid`` in place and reindex it."""
+        req = self.get(rid)
+        if req is None:
+            return None
+        changes = dict(fields or {}, **kwargs)
+        changed = {k: v for k, v in changes.items() if req.get(k) != v}
+        req.update(changed)
+        if any(k in self.INDEXED_FIELDS for k in changes):
+            # The dict may also have been edited through a node holding it.
+            before = self._indexed.get(rid)
+            self.reindex(rid)
+            if self._indexed.get(rid) != before:
+                changed = changed or changes
+        if changed:
+            self._notify("updated", rid)
+        return req
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def ids_where(self, field_name, value):
+        """Return ids of requirements whose ``field_name`` equals ``value``."""
+        return list(self._indexes[field_name].get(value or "", ()))
+
+    def where(self, field_name, value):
+        """Return requirements whose ``field_name`` equals ``value``."""
+        get = dict.__getitem__
+        return [get(self, rid) for rid in self._indexes[field_name].get(value or "", ())]
+
+    def values_of(self, field_name):
+        """Return the distinct values of an indexed field."""
+        return [v for v in self._indexes[field_name] if v]
+
+    def by_type(self, req_type):
+        return self.where("req_type", req_type)
+
+    def by_asil(self, asil):
+        return self.where("asil", asil)
+
+    def by_status(self, status):
+        return self.where("status", status)
+
+    def children(self, parent_id):
+        """Return requirements decomposed from ``parent_id``."""
+        return self.where("parent_id", parent_id) if parent_id else []
+
+    def decomposed_parents(self):
+        """Return ids of requirements that have decomposed children."""
+        return self.values_of("parent_id")
+
+
+global_requirements = RequirementStore()
+# Requirement types offered by the requirement editors; new requirements
+# get the first one.
+REQUIREMENT_TYPE_OPTIONS = ["vehicle", "operational"]
+
 # ASIL level options including decomposition levels
 ASIL_LEVEL_OPTIONS = [
     "QM", "QM(A)", "QM(B)", "QM(C)", "QM(D)",
@@ -352,6 +562,15 @@ ASIL_TARGETS = {
     "QM": {"spfm":0.0, "lpfm":0.0, "dc":0.0},
 }
 
+# Target PMHF limits per ASIL level (events per hour)
+PMHF_TARGETS = {
+    "D": 1e-8,
+    "C": 1e-7,
+    "B": 1e-7,
+    "A": 1e-6,
+    "QM": 1.0,
+}
+
 # Mapping of ASIL decomposition schemes as allowed by ISO 26262. Each
 # parent ASIL level maps to a list of two-element tuples representing the
 # resulting ASIL assignments for the decomposed requirements.
@@ -0,0 +1,234 @@
+"""Serializers for fault tree nodes generated from a field table.
+
+:data:`NODE_FIELDS` lists every plain attribute stored in a node dictionary
+together with the value assumed when the key is missing.  :class:`NodeCodec`
+turns the table into straight-line encoder and decoder functions once, so
+encoding a node is a single dict display and decoding a run of attribute
+assignments without per-field lookups in Python loops.  Trees are walked
+with an explicit stack, so arbitrarily deep trees do not hit the recursion
+limit.
+
+The compact encoder omits fields holding the value they would be loaded
+with anyway.  The decoder can share one dictionary between all nodes that
+carry an identical requirement, the same way requirements allocated from
+the registry are shared in a live model.
+"""
+
+from analysis.risk_assessment import boolify
+
+# Placeholder default of fields that are always written.
+REQUIRED = object()
+
+# (key, attribute, default on load)
+NODE_FIELDS = (
+    ("unique_id", "unique_id", REQUIRED),
+    ("user_name", "user_name", ""),
+    ("type", "node_type", ""),
+    ("quant_value", "quant_value", None),
+    ("gate_type", "gate_type", "AND"),
+    ("description", "description", ""),
+    ("rationale", "rationale", ""),
+    ("x", "x", 50),
+    ("y", "y", 50),
+    ("severity", "severity", 1),
+    ("controllability", "controllability", 1),
+    ("input_subtype", "input_subtype", None),
+    ("is_page", "is_page", False),
+    ("is_primary_instance", "is_primary_instance", True),
+    ("safety_goal_description", "safety_goal_description", ""),
+    ("safety_goal_asil", "safety_goal_asil", ""),
+    ("safe_state", "safe_state", ""),
+    ("ftti", "ftti", ""),
+    ("acceptance_criteria", "acceptance_criteria", ""),
+    ("sg_dc_target", "sg_dc_target", 0.0),
+    ("sg_spfm_target", "sg_spfm_target", 0.0),
+    ("sg_lpfm_target", "sg_lpfm_target", 0.0),
+    ("fmea_effect", "fmea_effect", ""),
+    ("fmea_cause", "fmea_cause", ""),
+    ("fmea_severity", "fmea_severity", 1),
+    ("fmea_occurrence", "fmea_occurrence", 1),
+    ("fmea_detection", "fmea_detection", 1),
+    ("fmea_component", "fmea_component", ""),
+    ("fmeda_malfunction", "fmeda_malfunction", ""),
+    ("fmeda_safety_goal", "fmeda_safety_goal", ""),
+    ("fmeda_diag_cov", "fmeda_diag_cov", 0.0),
+    ("fmeda_fit", "fmeda_fit", 0.0),
+    ("fmeda_spfm", "fmeda_spfm", 0.0),
+    ("fmeda_lpfm", "fmeda_lpfm", 0.0),
+    ("fmeda_fault_type", "fmeda_fault_type", "permanent"),
+    ("fmeda_fault_fraction", "fmeda_fault_fraction", 0.0),
+    ("fmeda_dc_target", "fmeda_dc_target", 0.0),
+    ("fmeda_spfm_target", "fmeda_spfm_target", 0.0),
+    ("fmeda_lpfm_target", "fmeda_lpfm_target", 0.0),
+    ("failure_mode_ref", "failure_mode_ref", None),
+    ("safety_requirements", "safety_requirements", []),
+    ("failure_prob", "failure_prob", 0.0),
+    ("probability", "probability", 0.0),
+    ("prob_formula", "prob_formula", "linear"),
+)
+
+# Fields only loaded for top events; other nodes get ``None``.
+TOP_EVENT_FIELDS = ("severity", "controllability")
+BOOL_FIELDS = ("is_page", "is_primary_instance")
+# Attributes not stored in the dictionary and reset on load.
+TRANSIENT = (("display_label", ""), ("equation", ""), ("detailed_equation", ""))
+
+
+def _is_default(default):
+    """Return a condition (on ``v``) true when ``v`` equals ``default``."""
+    if default is None or isinstance(default, bool):
+        return f"v is {default!r}"
+    if isinstance(default, list):
+        return "v.__class__ is list and not v"
+    return f"v.__class__ is {type(default).__name__} and v == {default!r}"
+
+
+def _full_encoder_source(fields):
+    lines = ["def encode(n):", "    d = {"]
+    for key, attr, _default in fields:
+        lines.append(f"        {key!r}: n.{attr},")
+    lines += [
+        '        "children": None,',
+        "    }",
+        "    if not n.is_primary_instance and n.original and n.original.unique_id != n.unique_id:",
+        '        d["original_id"] = n.original.unique_id',
+        "    return d",
+    ]
+    return "\n".join(lines)
+
+
+def _compact_encoder_source(fields):
+    lines = ["def encode(n):", "    d = {}"]
+    for key, attr, default in fields:
+        lines.append(f"    v = n.{attr}")
+        if default is REQUIRED:
+            lines.append(f"    d[{key!r}] = v")
+            continue
+        cond = f"not ({_is_default(default)})"
+        if key in TOP_EVENT_FIELDS:
+            cond = f'n.node_type.upper() == "TOP EVENT" and {cond}'
+        lines.append(f"    if {cond}:")
+        lines.append(f"        d[{key!r}] = v")
+    lines += [
+        "    if n.children:",
+        '        d["children"] = None',
+        "    if not n.is_primary_instance and n.original and n.original.unique_id != n.unique_id:",
+        '        d["original_id"] = n.original.unique_id',
+        "    return d",
+    ]
+    return "\n".join(lines)
+
+
+def _decoder_source(fields):
+    lines = [
+        "def decode(d, share):",
+        "    n = new(cls)",
+        "    g = d.get",
+        '    top = g("type", "").upper() == "TOP EVENT"',
+    ]
+    for key, attr, default in fields:
+        if default is REQUIRED:
+            lines.append(f"    n.{attr} = d[{key!r}] if {key!r} in d else new_id()")
+        elif key in TOP_EVENT_FIELDS:
+            lines.append(f"    n.{attr} = g({key!r}, {default!r}) if top else None")
+        elif key in BOOL_FIELDS:
+            lines.append(f"    n.{attr} = boolify(g({key!r}, {default!r}), {default!r})")
+        elif key == "safety_requirements":
+            lines.append(f"    v = g({key!r}, [])")
+            lines.append(f"    n.{attr} = share(v) if share and v else v")
+        else:
+            lines.append(f"    n.{attr} = g({key!r}, {default!r})")
+    for attr, value in TRANSIENT:
+        lines.append(f"    n.{attr} = {value!r}")
+    lines += [
+        "    n.parents = []",
+        "    n.children = []",
+        '    n._original_id = g("original_id") if not n.is_primary_instance else None',
+        "    return n",
+    ]
+    return "\n".join(lines)
+
+
+def _compile(name, source, namespace):
+    exec(compile(source, f"<node_codec {name}>", "exec"), namespace)
+    return namespace.pop(source[4:source.index("(")])
+
+
+class RequirementPool:
+    """Share one dictionary between identical requirement allocations."""
+
+    def __init__(self):
+        self._items = {}
+
+    def __call__(self, reqs):
+        items = self._items  # requirement id -> distinct dicts with that id
+        shared = []
+        for req in reqs:
+            if isinstance(req, dict):
+                same_id = items.setdefault(str(req.get("id")), [])
+                for known in same_id:
+                    if known == req:
+                        req = known
+                        break
+                else:
+                    same_id.append(req)
+            shared.append(req)
+        return shared
+
+
+class NodeCodec:
+    """Encode and decode trees of ``cls`` instances using :data:`NODE_FIELDS`.
+
+    ``new_id`` supplies unique ids for dictionaries that lack one.
+    """
+
+    def __init__(self, cls, new_id, fields=NODE_FIELDS):
+        namespace = {"cls": cls, "new": cls.__new__, "new_id": new_id, "boolify": boolify}
+        self.sources = {
+            "full": _full_encoder_source(fields),
+            "compact": _compact_encoder_source(fields),
+            "decode": _decoder_source(fields),
+        }
+        self._encode_full = _compile("full", self.sources["full"], namespace)
+        self._encode_compact = _compile("compact", self.sources["compact"], namespace)
+        self._decode = _compile("decode", self.sources["decode"], namespace)
+
+    def encode(self, node, compact=False):
+        """Return the dictionary of ``node`` and its descendants.
+
+        With ``compact`` fields holding their load default are left out.
+        """
+        encode = self._encode_compact if compact else self._encode_full
+        root = encode(node)
+        stack = [(node, root)]
+        pop, push = stack.pop, stack.extend
+        while stack:
+            n, d = pop()
+            children = n.children
+            if children:
+                kids = d["children"] = [encode(c) for c in children]
+                push(zip(children, kids))
+            elif not compact:
+                d["children"] = []
+        return root
+
+    def decode(self, data, parent=None, share=None):
+        """Return a node tree built from ``data``.
+
+        ``share`` (e.g. a :class:`RequirementPool`) maps each requirement
+        list to the list stored on the node.
+        """
+        decode = self._decode
+        root = decode(data, share)
+        if parent is not None:
+            root.parents.append(parent)
+        stack = [(root, data)]
+        while stack:
+            n, d = stack.pop()
+            kids = d.get("children") or ()
+            for kid in kids:
+                child = decode(kid, share)
+                child.parents.append(n)
+                n.children.append(child)
+                stack.append((child, kid))
+        return root
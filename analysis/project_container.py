@@ -0,0 +1,229 @@
+"""Binary project container with a table of contents and per-section encoding.
+
+Layout::
+
+    MAGIC | uint32 TOC length | TOC (JSON) | section bodies
+
+The TOC maps each section name to ``{"offset", "length", "codec"}`` with
+offsets relative to the first body byte.  Sections are compact JSON
+compressed with zlib, so any one of them can be read and decoded without
+touching the others.  Sections whose name starts with :data:`ARCHIVE_PREFIX`
+hold the data otherwise written to the sidecar archive (version history,
+closed review comments).
+
+Opening a project in the application decodes the fault trees, FMEAs and
+HARAs right away.  FMEDAs, HAZOPs, FI2TC/TC2FI analyses and the SysML
+repository are registered with :class:`DeferredSections` and built when
+first used, the archive sections (version history, closed review comments)
+when first read.
+"""
+
+import json
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+
+MAGIC = b"AUTOMLP\x01"
+EXTENSION = ".automl"
+ARCHIVE_PREFIX = "archive:"
+COMPRESS_LEVEL = 1
+
+_LEN = struct.Struct("<I")
+
+
+def is_container(path) -> bool:
+    """Return ``True`` if ``path`` starts with the container magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def encode_section(value) -> bytes:
+    """Encode a JSON value, or pass through already encoded JSON bytes."""
+    if not isinstance(value, (bytes, bytearray)):
+        value = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(value, COMPRESS_LEVEL)
+
+
+def write_container(path, data, archive=None) -> None:
+    """Write model ``data`` and ``archive`` sections to ``path`` atomically.
+
+    ``archive`` maps archive section names to JSON bytes as returned by
+    the application's archive writer.
+    """
+    bodies = [(name, encode_section(value)) for name, value in data.items()]
+    bodies += [(ARCHIVE_PREFIX + name, encode_section(raw)) for name, raw in (archive or {}).items()]
+    toc = {}
+    offset = 0
+    for name, body in bodies:
+        toc[name] = {"offset": offset, "length": len(body), "codec": "zjson"}
+        offset += len(body)
+    header = json.dumps({"format": 1, "sections": toc}).encode("utf-8")
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LEN.pack(len(header)))
+        f.write(header)
+        for _name, body in bodies:
+            f.write(body)
+    os.replace(tmp, path)
+
+
+class ContainerReader:
+    """Random access to the sections of a container file.
+
+    With ``prefix`` only sections starting with it are visible, under their
+    name without the prefix; this gives the archive view used for lazily
+    loaded history.  The interface matches
+    :class:`analysis.archive.ArchiveReader`.
+    """
+
+    def __init__(self, path=None, prefix=""):
+        self.prefix = prefix
+        self.open(path)
+
+    def open(self, path) -> None:
+        self.path = path
+        self._toc = {}
+        self._base = 0
+        if not path or not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a project container: {path}")
+            (length,) = _LEN.unpack(f.read(_LEN.size))
+            header = json.loads(f.read(length))
+            self._base = f.tell()
+        sections = header.get("sections", {})
+        if self.prefix:
+            n = len(self.prefix)
+            self._toc = {k[n:]: v for k, v in sections.items() if k.startswith(self.prefix)}
+        else:
+            self._toc = {k: v for k, v in sections.items() if not k.startswith(ARCHIVE_PREFIX)}
+
+    def names(self):
+        return list(self._toc)
+
+    def has(self, name) -> bool:
+        return name in self._toc
+
+    def raw(self, name) -> bytes:
+        """Return the decoded JSON bytes of section ``name``."""
+        entry = self._toc[name]
+        with open(self.path, "rb") as f:
+            f.seek(self._base + entry["offset"])
+            body = f.read(entry["length"])
+        if entry.get("codec") == "zjson":
+            body = zlib.decompress(body)
+        return body
+
+    def load(self, name, default=None):
+        if name not in self._toc:
+            return default
+        return json.loads(self.raw(name))
+
+
+class ContainerData(Mapping):
+    """Read-only model data mapping decoding each section on first access.
+
+    Iterating over the items decodes every section.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if not self.reader.has(key):
+                raise KeyError(key)
+            self._values[key] = self.reader.load(key)
+        return self._values[key]
+
+    def __contains__(self, key):
+        return self.reader.has(key)
+
+    def __iter__(self):
+        return iter(self.reader.names())
+
+    def __len__(self):
+        return len(self.reader.names())
+
+
+class DeferredSections:
+    """Model sections whose objects are built by a loader on first use.
+
+    While a section is pending, :meth:`raw` returns the JSON values of its
+    keys from the model data so saving does not have to build the objects.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, data=None) -> None:
+        """Drop all pending loaders; ``data`` holds the undecoded sections."""
+        self.data = data if data is not None else {}
+        self._loaders = {}
+        self._keys = {}
+
+    def defer(self, section, loader, keys=None) -> None:
+        """Call ``loader()`` the first time ``section`` is needed.
+
+        ``keys`` lists the model data keys the section is saved under and
+        defaults to the section name.
+        """
+        self._loaders[section] = loader
+        for key in keys or (section,):
+            self._keys[key] = section
+
+    def pending(self, section) -> bool:
+        return section in self._loaders
+
+    def load(self, section) -> None:
+        """Build ``section`` if it is still pending."""
+        loader = self._loaders.pop(section, None)
+        if loader is not None:
+            loader()
+
+    def load_all(self) -> None:
+        for section in list(self._loaders):
+            self.load(section)
+
+    def raw_keys(self):
+        """Return the model data keys of the pending sections."""
+        return [key for key, section in self._keys.items() if section in self._loaders]
+
+    def raw(self, key, default=None):
+        return self.data.get(key, default)
+
+
+class DeferredAttribute:
+    """Attribute that builds its deferred section before it is read or set.
+
+    The owner keeps a :class:`DeferredSections` in ``deferred_sections``.
+    Setting the attribute also builds the section first, so the other
+    attributes filled by the same loader are never left pending.
+    """
+
+    def __init__(self, section):
+        self.section = section
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.key = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        obj.deferred_sections.load(self.section)
+        try:
+            return obj.__dict__[self.key]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        obj.deferred_sections.load(self.section)
+        obj.__dict__[self.key] = value
@@ -0,0 +1,200 @@
+"""Ancestor labelling for constant time reachability queries on fault trees."""
+
+
+class ReachabilityIndex:
+    """Maintain the ancestor set of every node in the fault tree DAG.
+
+    Nodes are identified by ``unique_id``.  Each node is labelled with the
+    ids of all its ancestors and with the ids of the top events whose tree
+    contains it, so ``is_ancestor`` and ``top_events_of`` are simple set
+    lookups.  Structural edits update only the labels of the affected
+    subtree.  Node instances sharing a ``unique_id`` share an entry, so
+    every parent to child edge is counted once per parent instance and
+    only disappears when its last instance is removed.
+    """
+
+    def __init__(self):
+        self._children = {}
+        self._parents = {}
+        self._ancestors = {}
+        self._tops = {}
+        self._roots = {}
+        self._edges = {}  # (parent uid, child uid) -> number of node instances
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def rebuild(self, top_events):
+        """Index all nodes reachable from ``top_events``."""
+        self._children.clear()
+        self._parents.clear()
+        self._ancestors.clear()
+        self._tops.clear()
+        self._edges.clear()
+        self._roots = {te.unique_id: pos for pos, te in enumerate(top_events)}
+        seen = set()
+        stack = list(top_events)
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            self._ensure(node.unique_id)
+            for child in node.children:
+                self._ensure(child.unique_id)
+                self._children[node.unique_id].add(child.unique_id)
+                self._parents[child.unique_id].add(node.unique_id)
+                edge = (node.unique_id, child.unique_id)
+                self._edges[edge] = self._edges.get(edge, 0) + 1
+                stack.append(child)
+        self._relabel(self._topological_order(list(self._children)))
+        return self
+
+    def _ensure(self, uid):
+        if uid not in self._children:
+            self._children[uid] = set()
+            self._parents[uid] = set()
+            self._ancestors[uid] = set()
+            self._tops[uid] = {uid} if uid in self._roots else set()
+
+    def _topological_order(self, uids):
+        """Return ``uids`` ordered so parents precede their children."""
+        subset = set(uids)
+        indegree = {u: sum(1 for p in self._parents[u] if p in subset) for u in subset}
+        ready = [u for u, d in indegree.items() if d == 0]
+        order = []
+        while ready:
+            uid = ready.pop()
+            order.append(uid)
+            for child in self._children[uid]:
+                if child in indegree:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        ready.append(child)
+        return order
+
+    def _relabel(self, order):
+        for uid in order:
+            anc = set()
+            tops = {uid} if uid in self._roots else set()
+            for p in self._parents[uid]:
+                anc.add(p)
+                anc |= self._ancestors[p]
+                tops |= self._tops[p]
+            self._ancestors[uid] = anc
+            self._tops[uid] = tops
+
+    def _subtree(self, uid):
+        result = set()
+        stack = [uid]
+        while stack:
+            u = stack.pop()
+            if u in result:
+                continue
+            result.add(u)
+            stack.extend(self._children.get(u, ()))
+        return result
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    def add_root(self, uid):
+        if uid in self._roots:
+            return
+        self._roots[uid] = max(self._roots.values(), default=-1) + 1
+        self._ensure(uid)
+        for d in self._subtree(uid):
+            self._tops[d].add(uid)
+
+    def remove_root(self, uid):
+        if self._roots.pop(uid, None) is None:
+            return
+        self._relabel(self._topological_order(self._subtree(uid)))
+
+    def set_root_order(self, top_events):
+        """Record the display order of the top events."""
+        self._roots = {te.unique_id: pos for pos, te in enumerate(top_events)}
+
+    def add_edge(self, parent_uid, child_uid):
+        """Record ``child_uid`` below ``parent_uid``.
+
+        Returns ``False`` without changing the index if the edge would
+        introduce a cycle.
+        """
+        if self.would_create_cycle(parent_uid, child_uid):
+            return False
+        self._ensure(parent_uid)
+        self._ensure(child_uid)
+        edge = (parent_uid, child_uid)
+        self._edges[edge] = self._edges.get(edge, 0) + 1
+        if child_uid in self._children[parent_uid]:
+            return True
+        self._children[parent_uid].add(child_uid)
+        self._parents[child_uid].add(parent_uid)
+        anc = self._ancestors[parent_uid] | {parent_uid}
+        tops = self._tops[parent_uid]
+        for d in self._subtree(child_uid):
+            self._ancestors[d] |= anc
+            self._tops[d] |= tops
+        return True
+
+    def remove_edge(self, parent_uid, child_uid):
+        """Remove one instance of the edge ``parent_uid`` -> ``child_uid``."""
+        edge = (parent_uid, child_uid)
+        count = self._edges.get(edge, 0)
+        if count > 1:
+            self._edges[edge] = count - 1
+            return
+        self._edges.pop(edge, None)
+        if child_uid not in self._children.get(parent_uid, ()):
+            return
+        self._children[parent_uid].discard(child_uid)
+        self._parents[child_uid].discard(parent_uid)
+        self._relabel(self._topological_order(self._subtree(child_uid)))
+
+    def detach(self, uid, parent_uids):
+        """Remove the edges from each of ``parent_uids`` to ``uid``."""
+        for p in parent_uids:
+            self.remove_edge(p, uid)
+
+    def remove_subtree(self, node):
+        """Forget ``node`` and the part of its subtree linked nowhere else.
+
+        ``node`` must already be detached from its parents and removed from
+        the top events.  Nodes still reachable through another parent keep
+        their entries.
+        """
+        done = set()
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            uid = n.unique_id
+            if id(n) in done or self._parents.get(uid) or uid in self._roots:
+                continue
+            done.add(id(n))
+            for child in n.children:
+                self.remove_edge(uid, child.unique_id)
+                stack.append(child)
+            if not self._children.get(uid):
+                for table in (self._children, self._parents, self._ancestors, self._tops):
+                    table.pop(uid, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def __contains__(self, uid):
+        return uid in self._ancestors
+
+    def is_ancestor(self, ancestor_uid, uid):
+        """Return ``True`` if ``ancestor_uid`` lies above ``uid``."""
+        return ancestor_uid in self._ancestors.get(uid, ())
+
+    def would_create_cycle(self, parent_uid, child_uid):
+        return parent_uid == child_uid or self.is_ancestor(child_uid, parent_uid)
+
+    def ancestors(self, uid):
+        return set(self._ancestors.get(uid, ()))
+
+    def top_events_of(self, uid):
+        """Return ids of the top events containing ``uid`` in display order."""
+        return sorted(self._tops.get(uid, ()), key=lambda r: self._roots.get(r, 0))
@@ -0,0 +1,266 @@
+"""Streaming bulk import of requirements from CSV and ReqIF files."""
+
+import csv
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from analysis.models import ASIL_LEVEL_OPTIONS, REQUIREMENT_TYPE_OPTIONS
+
+# Column or attribute names (lower case, without punctuation) mapped to the
+# requirement fields used by the application.  ``links`` lists references
+# to fault tree nodes the requirement is allocated to.
+DEFAULT_FIELD_MAP = {
+    "id": "id",
+    "reqid": "id",
+    "requirementid": "id",
+    "identifier": "id",
+    "reqifforeignid": "id",
+    "text": "text",
+    "description": "text",
+    "requirement": "text",
+    "requirementtext": "text",
+    "reqiftext": "text",
+    "type": "req_type",
+    "reqtype": "req_type",
+    "requirementtype": "req_type",
+    "asil": "asil",
+    "status": "status",
+    "parent": "parent_id",
+    "parentid": "parent_id",
+    "links": "links",
+    "allocatedto": "links",
+    "allocation": "links",
+    "nodes": "links",
+}
+
+_KEY_RE = re.compile(r"[^a-z0-9]")
+_LINK_SPLIT_RE = re.compile(r"[;,|\n]")
+
+
+@lru_cache(maxsize=1024)
+def normalize_key(name) -> str:
+    """Return ``name`` lower cased without spaces or punctuation."""
+    return _KEY_RE.sub("", str(name).lower())
+
+
+def normalize_asil(value) -> str:
+    """Map spellings such as ``"ASIL B"`` to the application's ASIL labels."""
+    value = str(value or "").strip()
+    if not value:
+        return "QM"
+    upper = value.upper()
+    if upper.startswith("ASIL"):
+        upper = upper[4:].strip(" -_")
+    return upper if upper in ASIL_LEVEL_OPTIONS else value
+
+
+def make_requirement(values, field_map=None):
+    """Build ``(requirement, links)`` from a mapping of raw column values.
+
+    Returns ``(None, [])`` when no id can be determined.
+    """
+    field_map = DEFAULT_FIELD_MAP if field_map is None else field_map
+    req = {}
+    links = []
+    for name, value in values.items():
+        target = field_map.get(normalize_key(name))
+        if target is None or value is None:
+            continue
+        value = str(value).strip()
+        if target == "links":
+            links.extend(v.strip() for v in _LINK_SPLIT_RE.split(value) if v.strip())
+        elif value and target not in req:
+            req[target] = value
+    rid = req.get("id")
+    if not rid:
+        return None, []
+    return {
+        "id": rid,
+        "req_type": req.get("req_type", REQUIREMENT_TYPE_OPTIONS[0]),
+        "text": req.get("text", ""),
+        "custom_id": rid,
+        "asil": normalize_asil(req.get("asil")),
+        "status": req.get("status", "draft"),
+        "parent_id": req.get("parent_id", ""),
+    }, links
+
+
+def iter_csv_requirements(path, field_map=None, encoding="utf-8-sig"):
+    """Yield ``(requirement, links)`` for each row of the CSV file ``path``.
+
+    The delimiter is detected from the header line and rows are read one
+    at a time, so memory use does not grow with the file size.
+    """
+    with open(path, newline="", encoding=encoding) as f:
+        header = f.readline()
+        try:
+            dialect = csv.Sniffer().sniff(header, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        names = next(csv.reader([header], dialect))
+        for row in csv.DictReader(f, fieldnames=names, dialect=dialect):
+            req, links = make_requirement(row, field_map)
+            if req is not None:
+                yield req, links
+
+
+def _local(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _child(elem, name):
+    for c in elem:
+        if _local(c.tag) == name:
+            return c
+    return None
+
+
+def iter_reqif_requirements(source, field_map=None):
+    """Yield ``(requirement, links)`` for each SPEC-OBJECT of a ReqIF file.
+
+    ``source`` is a path or a binary file object.
+    The file is parsed incrementally with :func:`xml.etree.ElementTree.iterparse`;
+    attribute definitions and enumeration values are remembered by id and
+    every processed SPEC-OBJECT is dropped from the tree immediately.
+    """
+    attr_names = {}  # attribute definition id -> long name
+    enum_names = {}  # enum value id -> long name
+    spec_objects = None  # parent of the SPEC-OBJECT elements
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == "SPEC-OBJECTS":
+                spec_objects = elem
+            continue
+        if tag.startswith("ATTRIBUTE-DEFINITION-"):
+            attr_names[elem.get("IDENTIFIER")] = elem.get("LONG-NAME") or elem.get("IDENTIFIER")
+        elif tag == "ENUM-VALUE":
+            enum_names[elem.get("IDENTIFIER")] = elem.get("LONG-NAME") or elem.get("IDENTIFIER")
+        elif tag == "SPEC-OBJECT":
+            values = {}
+            container = _child(elem, "VALUES")
+            for av in container if container is not None else ():
+                definition = _child(av, "DEFINITION")
+                if definition is None or not len(definition):
+                    continue
+                name = attr_names.get((definition[0].text or "").strip())
+                if not name:
+                    continue
+                kind = _local(av.tag)
+                if kind == "ATTRIBUTE-VALUE-XHTML":
+                    the_value = _child(av, "THE-VALUE")
+                    text = " ".join("".join(the_value.itertext()).split()) if the_value is not None else ""
+                elif kind == "ATTRIBUTE-VALUE-ENUMERATION":
+                    refs = _child(av, "VALUES")
+                    text = ", ".join(
+                        enum_names.get((r.text or "").strip(), "") for r in (refs if refs is not None else ())
+                    )
+                else:
+                    text = av.get("THE-VALUE", "")
+                values[name] = text
+            req, links = make_requirement(values, field_map)
+            if req is None:
+                # Fall back to the SPEC-OBJECT identifier.
+                values["id"] = elem.get("IDENTIFIER", "")
+                req, links = make_requirement(values, field_map)
+            if req is not None:
+                yield req, links
+            elem.clear()
+            if spec_objects is not None:
+                spec_objects.remove(elem)
+
+
+def _iter_reqifz_requirements(path, field_map=None):
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if name.lower().endswith(".reqif"):
+                with archive.open(name) as f:
+                    yield from iter_reqif_requirements(f, field_map)
+
+
+def iter_requirements_file(path, field_map=None):
+    """Dispatch to the CSV, ReqIF or ReqIFz reader based on the file extension."""
+    lower = str(path).lower()
+    if lower.endswith(".reqifz"):
+        return _iter_reqifz_requirements(path, field_map)
+    if lower.endswith((".reqif", ".xml")):
+        return iter_reqif_requirements(path, field_map)
+    return iter_csv_requirements(path, field_map)
+
+
+@dataclass
+class ImportResult:
+    added: int = 0
+    updated: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    linked: int = 0
+    unresolved: list = field(default_factory=list)
+
+    def summary(self) -> str:
+        text = (
+            f"{self.added} added, {self.updated} updated, {self.skipped} unchanged, "
+            f"{self.duplicates} duplicates, {self.linked} links"
+        )
+        if self.unresolved:
+            text += f", {len(self.unresolved)} unresolved links"
+        return text
+
+
+def import_requirements(records, store, resolve_node=None, replace=False):
+    """Merge ``(requirement, links)`` records into the requirement ``store``.
+
+    Ids repeated in ``records`` are counted as duplicates and only the
+    first occurrence is used.  Existing requirements keep their values
+    unless ``replace`` is true, in which case their fields are updated in
+    place so nodes sharing the dict see the change.  ``resolve_node`` maps
+    a link reference to a node whose ``safety_requirements`` receive the
+    requirement.  All changes are made in one store batch so listeners
+    are notified once.
+    """
+    result = ImportResult()
+    seen = set()
+    new_items = []
+    links_of = []
+    with store.batch():
+        for req, links in records:
+            rid = req["id"]
+            if rid in seen:
+                result.duplicates += 1
+                continue
+            seen.add(rid)
+            existing = store.get(rid)
+            if existing is None:
+                new_items.append((rid, req))
+            elif replace:
+                fields = {k: v for k, v in req.items() if k not in ("id", "custom_id")}
+                store.update_fields(rid, fields)
+                req = existing
+                result.updated += 1
+            else:
+                req = existing
+                result.skipped += 1
+            if links:
+                links_of.append((req, links))
+        result.added = len(store.add_many(new_items))
+    allocated = {}  # id(node) -> ids of requirements already allocated
+    for req, links in links_of:
+        for ref in links:
+            node = resolve_node(ref) if resolve_node else None
+            if node is None:
+                result.unresolved.append(ref)
+                continue
+            reqs = getattr(node, "safety_requirements", None)
+            if reqs is None:
+                reqs = node.safety_requirements = []
+            ids = allocated.get(id(node))
+            if ids is None:
+                ids = allocated[id(node)] = {r.get("id") for r in reqs}
+            if req["id"] not in ids:
+                ids.add(req["id"])
+                reqs.append(req)
+                result.linked += 1
+    return result
@@ -0,0 +1,209 @@
+"""Reverse indexes from requirement ids to allocations and safety goals."""
+
+
+def requirement_ids(owner):
+    """Return the ids of the requirements allocated to ``owner``."""
+    if isinstance(owner, dict):
+        reqs = owner.get("safety_requirements", [])
+    else:
+        reqs = getattr(owner, "safety_requirements", [])
+    ids = []
+    for r in reqs or []:
+        rid = r.get("id") if isinstance(r, dict) else getattr(r, "id", None)
+        if rid is not None:
+            ids.append(rid)
+    return ids
+
+
+def goal_name(node):
+    """Return the safety goal name shown for a top event."""
+    return node.safety_goal_description or (node.user_name or f"SG {node.unique_id}")
+
+
+def entry_name(entry):
+    """Return the display name of an FMEA entry."""
+    if isinstance(entry, dict):
+        return entry.get("description") or entry.get("user_name", f"BE {entry.get('unique_id','')}")
+    return getattr(entry, "description", "") or getattr(
+        entry, "user_name", f"BE {getattr(entry, 'unique_id', '')}"
+    )
+
+
+class RequirementIndex:
+    """Map requirement ids to the nodes and FMEA entries allocating them.
+
+    ``source`` is a callable returning ``(nodes, fmeas, resolve)`` where
+    ``nodes`` are the fault tree nodes in scope, ``fmeas`` the FMEA
+    documents and ``resolve`` maps a unique id to a node.  The index is
+    built lazily on first use after :meth:`invalidate`; edits of a single
+    node are applied with :meth:`update_owner`.  Safety goals of every
+    owner are derived once from its parent chain so looking up the goals
+    of a requirement only touches its own allocations.
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self._stale = True
+        self._alloc = {}  # rid -> {owner key: name}
+        self._owner_reqs = {}  # owner key -> set of rids
+        self._owner_goals = {}  # owner key -> frozenset of goal names
+        self._goal_owners = {}  # goal name -> {owner key: None}
+        self._keys = {}  # id(owner object) -> [owner keys]
+        self._objects = {}  # owner key -> (owner object, name)
+
+    def invalidate(self):
+        self._stale = True
+
+    @property
+    def stale(self):
+        return self._stale
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def rebuild(self):
+        nodes, fmeas, resolve = self._source()
+        self._alloc.clear()
+        self._owner_reqs.clear()
+        self._owner_goals.clear()
+        self._goal_owners.clear()
+        self._keys.clear()
+        self._objects.clear()
+        memo = {}
+        for n in nodes:
+            key = ("node", id(n))
+            name = n.user_name or f"Node {n.unique_id}"
+            self._add_owner(key, n, name, self._goals_above(n, memo))
+        for fmea in fmeas:
+            for e in fmea.get("entries", []):
+                key = ("fmea", fmea["name"], id(e))
+                parent = self._first_parent(e, resolve)
+                goals = self._goals_above(parent, memo) if parent is not None else frozenset()
+                self._add_owner(key, e, f"{fmea['name']}:{entry_name(e)}", goals)
+        self._stale = False
+        return self
+
+    def _ensure(self):
+        if self._stale:
+            self.rebuild()
+
+    @staticmethod
+    def _first_parent(entry, resolve):
+        if isinstance(entry, dict):
+            parents = entry.get("parents") or []
+        else:
+            parents = getattr(entry, "parents", []) or []
+        parent = parents[0] if parents else None
+        if isinstance(parent, dict) and "unique_id" in parent:
+            return resolve(parent["unique_id"])
+        return parent if hasattr(parent, "unique_id") else None
+
+    @staticmethod
+    def _goals_above(node, memo):
+        """Return names of the top events on all parent paths of ``node``."""
+        visiting = set()
+        added = []
+        cyclic = False
+        stack = [(node, False)]
+        while stack:
+            n, expanded = stack.pop()
+            if id(n) in memo:
+                continue
+            parents = getattr(n, "parents", []) or []
+            if not expanded:
+                if id(n) in visiting:
+                    cyclic = True
+                    continue
+                visiting.add(id(n))
+                stack.append((n, True))
+                stack.extend((p, False) for p in parents if id(p) not in memo)
+                continue
+            goals = set()
+            if n.node_type.upper() == "TOP EVENT":
+                goals.add(goal_name(n))
+            for p in parents:
+                goals |= memo.get(id(p), frozenset())
+            memo[id(n)] = frozenset(goals)
+            added.append(id(n))
+        if not cyclic:
+            return memo[id(node)]
+        # Parent links form a cycle: results gathered along it are partial,
+        # so walk every ancestor of ``node`` without memoizing.
+        for key in added:
+            del memo[key]
+        goals, seen, todo = set(), {id(node)}, [node]
+        while todo:
+            n = todo.pop()
+            if n.node_type.upper() == "TOP EVENT":
+                goals.add(goal_name(n))
+            for p in getattr(n, "parents", []) or []:
+                if id(p) not in seen:
+                    seen.add(id(p))
+                    todo.append(p)
+        return frozenset(goals)
+
+    def _add_owner(self, key, owner, name, goals):
+        rids = set(requirement_ids(owner))
+        self._owner_reqs[key] = rids
+        self._owner_goals[key] = goals
+        for goal in goals:
+            self._goal_owners.setdefault(goal, {})[key] = None
+        self._objects[key] = (owner, name)
+        self._keys.setdefault(id(owner), []).append(key)
+        for rid in rids:
+            self._alloc.setdefault(rid, {})[key] = name
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    def update_owner(self, owner):
+        """Re-read the ``safety_requirements`` of ``owner`` after an edit."""
+        if self._stale:
+            return
+        for key in self._keys.get(id(owner), []):
+            for rid in self._owner_reqs.get(key, ()):
+                allocs = self._alloc.get(rid)
+                if allocs is not None:
+                    allocs.pop(key, None)
+                    if not allocs:
+                        del self._alloc[rid]
+            if key[0] == "node":
+                name = owner.user_name or f"Node {owner.unique_id}"
+            else:
+                name = f"{key[1]}:{entry_name(owner)}"
+            rids = set(requirement_ids(owner))
+            self._owner_reqs[key] = rids
+            self._objects[key] = (owner, name)
+            for rid in rids:
+                self._alloc.setdefault(rid, {})[key] = name
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def allocation_names(self, rid):
+        """Return node or FMEA entry names where ``rid`` is allocated."""
+        self._ensure()
+        return list(self._alloc.get(rid, {}).values())
+
+    def allocations(self, rid):
+        """Return the node and FMEA entry objects allocating ``rid``."""
+        self._ensure()
+        return [self._objects[key][0] for key in self._alloc.get(rid, {})]
+
+    def goal_names(self, rid):
+        """Return the sorted safety goal names linked to ``rid``."""
+        self._ensure()
+        goals = set()
+        for key in self._alloc.get(rid, {}):
+            goals |= self._owner_goals[key]
+        return sorted(goals)
+
+    def requirement_ids_for_goals(self, goals):
+        """Return ids of requirements allocated below any of ``goals``."""
+        self._ensure()
+        rids = {}
+        for goal in goals:
+            for key in self._goal_owners.get(goal, ()):
+                for rid in self._owner_reqs[key]:
+                    rids[rid] = None
+        return list(rids)
@@ -0,0 +1,84 @@
+"""Sparse requirement allocation matrix."""
+
+import csv
+from bisect import bisect_left
+
+
+class SparseMatrix:
+    """Requirements (rows) against allocation targets (columns).
+
+    Only allocated cells are stored, as a sorted list of column indices
+    per row, so memory and build time follow the number of allocations
+    rather than ``rows * columns``.
+    """
+
+    def __init__(self, rows, columns, cells=None):
+        self.rows = list(rows)  # requirement dicts
+        self.columns = list(columns)  # (key, label) pairs
+        self._cells = {r: sorted(set(c)) for r, c in (cells or {}).items() if c}
+
+    @classmethod
+    def from_allocations(cls, requirements, targets, allocations, label=None):
+        """Build the matrix from an allocation lookup.
+
+        ``targets`` are the column objects (e.g. basic events) and
+        ``allocations(req_id)`` returns the objects a requirement is
+        allocated to, such as :meth:`RequirementIndex.allocations`.
+        """
+        label = label or (lambda t: getattr(t, "user_name", "") or f"BE {getattr(t, 'unique_id', '')}")
+        column_of = {}
+        columns = []
+        for t in targets:
+            if id(t) not in column_of:
+                column_of[id(t)] = len(columns)
+                columns.append((getattr(t, "unique_id", id(t)), label(t)))
+        cells = {}
+        for r, req in enumerate(requirements):
+            cols = [column_of[id(o)] for o in allocations(req.get("id")) if id(o) in column_of]
+            if cols:
+                cells[r] = cols
+        return cls(requirements, columns, cells)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def cell_count(self):
+        return sum(len(c) for c in self._cells.values())
+
+    def row_cells(self, row, first=0, last=None):
+        """Return allocated column indices of ``row`` within ``[first, last)``."""
+        cols = self._cells.get(row, ())
+        if not cols:
+            return []
+        start = bisect_left(cols, first)
+        stop = len(cols) if last is None else bisect_left(cols, last)
+        return cols[start:stop]
+
+    def is_set(self, row, col):
+        cols = self._cells.get(row, ())
+        i = bisect_left(cols, col)
+        return i < len(cols) and cols[i] == col
+
+    def filtered(self, predicate):
+        """Return a matrix keeping only rows whose requirement matches ``predicate``."""
+        rows, cells = [], {}
+        for r, req in enumerate(self.rows):
+            if predicate(req):
+                if r in self._cells:
+                    cells[len(rows)] = self._cells[r]
+                rows.append(req)
+        return SparseMatrix(rows, self.columns, cells)
+
+    def export_csv(self, path):
+        """Write one line per allocated cell instead of the dense grid."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Req ID", "ASIL", "Type", "Target ID", "Target"])
+            for r, cols in sorted(self._cells.items()):
+                req = self.rows[r]
+                for c in cols:
+                    key, label = self.columns[c]
+                    writer.writerow(
+                        [req.get("id", ""), req.get("asil", ""), req.get("req_type", ""), key, label]
+                    )
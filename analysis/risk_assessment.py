@@ -1,3 +1,5 @@
+from analysis.clone_registry import CloneRegistry
+
 # Derived Maturity Table: (avg_confidence, avg_robustness) → maturity level
 DERIVED_MATURITY_TABLE = {
     (1, 1): 1, (1, 2): 1, (1, 3): 1, (1, 4): 2, (1, 5): 2,
@@ -119,35 +121,8 @@ class AutoMLHelper:
             return {}
 
     def fix_clone_references(self, root_nodes):
-        # First pass: collect all primary nodes from every top event.
-        primary_by_id = {}
-        def collect_primary(node):
-            if node.is_primary_instance:
-                primary_by_id[node.unique_id] = node
-                print(f"[DEBUG] Added primary node: id={node.unique_id}, name='{node.user_name}'")
-            for child in node.children:
-                collect_primary(child)
-        for root in root_nodes:
-            collect_primary(root)
-        
-        # Second pass: update all clones using the complete dictionary.
-        def fix(node):
-            if not node.is_primary_instance:
-                orig_id = getattr(node, "_original_id", node.unique_id)
-                print(f"[DEBUG] Fixing clone: id={node.unique_id}, _original_id={orig_id}")
-                if orig_id in primary_by_id:
-                    node.original = primary_by_id[orig_id]
-                    print(f"[DEBUG] Clone {node.unique_id} now references primary node {node.original.unique_id}")
-                else:
-                    node.original = node
-                    print(f"[DEBUG] No matching primary for clone {node.unique_id} with _original_id={orig_id}; using self")
-            else:
-                node.original = node
-                print(f"[DEBUG] Primary node {node.unique_id} set to reference itself")
-            for child in node.children:
-                fix(child)
-        for root in root_nodes:
-            fix(root)
+        """Point every clone at its primary node and return the clone registry."""
+        return CloneRegistry().rebuild(root_nodes)
 
     def get_next_unique_id(self):
         uid = self.unique_node_id_counter
@@ -0,0 +1,172 @@
+"""In-memory full-text index over the objects of a safety model."""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Weight of tokens found in the label of an object compared to its other text.
+LABEL_WEIGHT = 3.0
+# Score factor for a token matched only as a prefix of an indexed term.
+PREFIX_FACTOR = 0.5
+# Upper bound of vocabulary terms a single query prefix expands to.
+MAX_PREFIX_TERMS = 512
+# Shorter query tokens only match whole terms.
+MIN_PREFIX_LENGTH = 2
+
+
+def tokenize(text) -> list:
+    """Split ``text`` into lower case word tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+@dataclass
+class SearchHit:
+    key: Any
+    kind: str
+    label: str
+    score: float
+    ref: Any = None
+
+
+class SearchIndex:
+    """Inverted index with prefix matching and TF-IDF style ranking.
+
+    Every indexed object is identified by a hashable ``key`` and belongs
+    to a ``group`` so a whole part of the model can be dropped and
+    re-added when finer change information is not available.  Query
+    tokens match indexed terms exactly or as prefixes; an object must
+    match every token and hits are ranked by the summed weight of the
+    matching terms scaled by their inverse document frequency.
+    """
+
+    def __init__(self):
+        self._docs = {}  # key -> (kind, label, ref, group, {term: weight})
+        self._postings = {}  # term -> {key: weight}
+        self._terms = []  # sorted vocabulary used for prefix lookups
+        self._groups = {}  # group -> {key: None}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, key):
+        return key in self._docs
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add(self, key, kind, label, texts=(), ref=None, group=""):
+        """Index ``label`` and ``texts`` under ``key``, replacing older content."""
+        if key in self._docs:
+            self.remove(key)
+        weights = {}
+        for tok in tokenize(label):
+            weights[tok] = weights.get(tok, 0.0) + LABEL_WEIGHT
+        for text in texts:
+            for tok in tokenize(text):
+                weights[tok] = weights.get(tok, 0.0) + 1.0
+        self._docs[key] = (kind, label, ref, group, weights)
+        self._groups.setdefault(group, {})[key] = None
+        for term, weight in weights.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                insort(self._terms, term)
+            posting[key] = weight
+
+    def remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        group, weights = doc[3], doc[4]
+        members = self._groups.get(group)
+        if members is not None:
+            members.pop(key, None)
+        for term in weights:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[term]
+                i = bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+
+    def remove_group(self, group):
+        for key in list(self._groups.pop(group, {})):
+            self.remove(key)
+
+    def clear(self):
+        self._docs.clear()
+        self._postings.clear()
+        self._terms.clear()
+        self._groups.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _expand(self, token):
+        """Return ``[(term, factor)]`` of vocabulary terms matching ``token``."""
+        if len(token) < MIN_PREFIX_LENGTH:
+            return [(token, 1.0)] if token in self._postings else []
+        result = []
+        i = bisect_left(self._terms, token)
+        terms = self._terms
+        while i < len(terms) and terms[i].startswith(token) and len(result) < MAX_PREFIX_TERMS:
+            term = terms[i]
+            result.append((term, 1.0 if term == token else PREFIX_FACTOR))
+            i += 1
+        return result
+
+    def search(self, query, limit=20, kinds=None):
+        """Return the best :class:`SearchHit` objects for ``query``."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._docs:
+            return []
+        total = len(self._docs)
+        expanded = []
+        for tok in tokens:
+            terms = self._expand(tok)
+            if not terms:
+                return []
+            size = sum(len(self._postings[t]) for t, _f in terms)
+            expanded.append((size, terms))
+        # Score the most selective token first so later tokens only
+        # touch objects that can still match.
+        expanded.sort(key=lambda item: item[0])
+        scores = None
+        for _size, terms in expanded:
+            token_scores = {}
+            for term, factor in terms:
+                posting = self._postings[term]
+                idf = math.log(1.0 + total / len(posting))
+                for key, weight in posting.items():
+                    if scores is not None and key not in scores:
+                        continue
+                    score = weight * idf * factor
+                    if score > token_scores.get(key, 0.0):
+                        token_scores[key] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {k: scores[k] + s for k, s in token_scores.items()}
+            if not scores:
+                return []
+        if kinds is not None:
+            kinds = set(kinds)
+            scores = {k: s for k, s in scores.items() if self._docs[k][0] in kinds}
+        best = heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], str(self._docs[item[0]][1]))
+        )
+        hits = []
+        for key, score in best:
+            kind, label, ref, _group, _weights = self._docs[key]
+            hits.append(SearchHit(key, kind, label, score, ref))
+        return hits
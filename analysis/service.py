@@ -0,0 +1,271 @@
+"""Local analysis service keeping loaded projects in memory.
+
+Usage::
+
+    python -m analysis.service [--port 8765] [--unix SOCKET] [--max-projects 4]
+
+:class:`AnalysisService` answers JSON-RPC 2.0 requests about project
+files.  A project is loaded on its first query and kept, together with its
+indexes and computed results, until it falls out of the least recently
+used set of ``max_projects`` or its file changes on disk.  The service is
+served over HTTP (``POST /`` with the request as body) on the loopback
+interface or over a Unix socket with one request per line.
+:class:`LocalClient` calls a service in the same process and
+:class:`HttpClient` one running elsewhere, both with the same interface.
+
+Methods (``path`` names the project file)::
+
+    load(path)                  unload(path)               status()
+    pmhf(path)                  cut_sets(path)             fmeda(path)
+    asil(path)                  references(path)           analyze(path, checks)
+    requirement_trace(path, requirement)
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import threading
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analysis.headless import CHECKS, Project
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+LOAD_ERROR = -32000
+
+
+class ServiceError(Exception):
+    """Error returned by the service; ``code`` is the JSON-RPC error code."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class AnalysisService:
+    """Answer queries about project files, caching ``max_projects`` of them."""
+
+    def __init__(self, max_projects=4):
+        self.max_projects = max_projects
+        self._projects = OrderedDict()  # absolute path -> (stat key, project, results)
+        self._lock = threading.RLock()
+        self.methods = {
+            "load": self.load,
+            "unload": self.unload,
+            "status": self.status,
+            "analyze": self.analyze,
+            "requirement_trace": self.requirement_trace,
+        }
+        for check in CHECKS:
+            self.methods[check] = lambda path, check=check: self.analyze(path, [check])[check]
+
+    @staticmethod
+    def _stat_key(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def _entry(self, path):
+        path = os.path.abspath(path)
+        try:
+            key = self._stat_key(path)
+        except OSError as exc:
+            raise ServiceError(LOAD_ERROR, str(exc)) from exc
+        entry = self._projects.get(path)
+        if entry is not None and entry[0] == key:
+            self._projects.move_to_end(path)
+            return entry
+        try:
+            project = Project.load(path)
+        except (OSError, ValueError) as exc:
+            self._projects.pop(path, None)
+            raise ServiceError(LOAD_ERROR, f"{path}: {exc}") from exc
+        entry = self._projects[path] = (key, project, {})
+        self._projects.move_to_end(path)
+        while len(self._projects) > self.max_projects:
+            self._projects.popitem(last=False)
+        return entry
+
+    def project(self, path):
+        """Return the loaded project of ``path``, loading it if needed."""
+        with self._lock:
+            return self._entry(path)[1]
+
+    # ------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------
+    def load(self, path):
+        project = self.project(path)
+        return {"path": os.path.abspath(path), "top_events": len(project.top_events)}
+
+    def unload(self, path):
+        with self._lock:
+            return self._projects.pop(os.path.abspath(path), None) is not None
+
+    def status(self):
+        with self._lock:
+            return {"max_projects": self.max_projects, "projects": list(self._projects)}
+
+    def analyze(self, path, checks=CHECKS):
+        """Return the results of ``checks``; each is computed once per load."""
+        unknown = [c for c in checks if c not in CHECKS]
+        if unknown:
+            raise ServiceError(INVALID_PARAMS, f"Unknown checks: {', '.join(map(str, unknown))}")
+        with self._lock:
+            _key, project, results = self._entry(path)
+            for check in checks:
+                if check not in results:
+                    results[check] = project.analyze([check])[check]
+            return {check: results[check] for check in checks}
+
+    def requirement_trace(self, path, requirement):
+        """Return a requirement with its allocations and safety goals."""
+        with self._lock:
+            project = self._entry(path)[1]
+            index = project.requirement_index
+            return {
+                "requirement": project.requirements().get(requirement),
+                "allocations": index.allocation_names(requirement),
+                "goals": index.goal_names(requirement),
+            }
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+    def handle(self, request):
+        """Return the JSON-RPC response to ``request`` (a decoded object)."""
+        req_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise ServiceError(INVALID_REQUEST, "Invalid request")
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise ServiceError(METHOD_NOT_FOUND, f"Unknown method {request['method']!r}")
+            params = request.get("params") or {}
+            try:
+                result = method(*params) if isinstance(params, list) else method(**params)
+            except TypeError as exc:
+                raise ServiceError(INVALID_PARAMS, str(exc)) from exc
+        except ServiceError as exc:
+            return {"jsonrpc": "2.0", "id": req_id, "error": {"code": exc.code, "message": str(exc)}}
+        except Exception as exc:
+            message = f"{type(exc).__name__}: {exc}"
+            return {"jsonrpc": "2.0", "id": req_id, "error": {"code": INTERNAL_ERROR, "message": message}}
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    def handle_text(self, text):
+        """Return the encoded response to the encoded request ``text``."""
+        try:
+            request = json.loads(text)
+        except ValueError as exc:
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(exc)}}
+        else:
+            response = self.handle(request)
+        return json.dumps(response)
+
+
+class _Client:
+    def __init__(self):
+        self._next_id = 0
+
+    def call(self, method, **params):
+        """Call ``method``; raise :class:`ServiceError` if it fails."""
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        response = json.loads(self._send(json.dumps(request)))
+        if "error" in response:
+            raise ServiceError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
+
+
+class LocalClient(_Client):
+    """Client of a service in this process (requests still go through JSON)."""
+
+    def __init__(self, service=None):
+        super().__init__()
+        self.service = service or AnalysisService()
+
+    def _send(self, text):
+        return self.service.handle_text(text)
+
+
+class HttpClient(_Client):
+    """Client of a service served by :func:`serve_http`."""
+
+    def __init__(self, url="http://127.0.0.1:8765/", timeout=60):
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+
+    def _send(self, text):
+        req = urllib.request.Request(
+            self.url, data=text.encode("utf-8"), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return resp.read().decode("utf-8")
+
+
+def serve_http(service, host="127.0.0.1", port=8765):
+    """Return an HTTP server for ``service``; call ``serve_forever`` on it."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = service.handle_text(self.rfile.read(length).decode("utf-8")).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def serve_unix(service, path):
+    """Return a Unix socket server for ``service`` reading one request per line."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    self.wfile.write(service.handle_text(line.decode("utf-8")).encode("utf-8") + b"\n")
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.remove(path)
+    return Server(path, Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m analysis.service",
+        description="Serve safety metrics of AutoML projects kept loaded in memory.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port (default: %(default)s)")
+    parser.add_argument("--unix", metavar="SOCKET", help="serve on a Unix socket instead of HTTP")
+    parser.add_argument("--max-projects", type=int, default=4, help="projects kept loaded (default: %(default)s)")
+    args = parser.parse_args(argv)
+    service = AnalysisService(args.max_projects)
+    server = serve_unix(service, args.unix) if args.unix else serve_http(service, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,388 @@
+"""SQLite storage backend saving only the model rows that changed.
+
+Model data (as returned by ``export_model_data``) is split into keyed rows:
+
+``sections``
+    every top level key in file order; split sections hold a placeholder
+``nodes`` / ``edges``
+    fault tree nodes by ``unique_id`` and their ordered child links
+``documents`` / ``document_rows``
+    FMEA, FMEDA, HAZOP, HARA and similar documents and their entries
+``requirements``
+    the global requirement registry
+``sysml_elements`` / ``sysml_relationships`` / ``sysml_diagrams``
+    the SysML repository
+``reviews``
+    reviews by name
+``archive``
+    sidecar archive sections (version history, closed review comments)
+
+Every table has the same columns and stores a digest per row, so
+:meth:`SqliteProjectStore.save` compares digests and writes or deletes only
+the rows that differ, all in one transaction.  :func:`split_model` and
+:func:`join_model` convert losslessly, so the JSON format stays available
+through :func:`import_json` and :func:`export_json`, which carry the
+archive between the table and the sidecar file.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+from analysis.archive import ArchiveReader, sidecar_path, write_archive
+from analysis.compression import open_file
+
+EXTENSIONS = (".db", ".sqlite")
+SQLITE_MAGIC = b"SQLite format 3\x00"
+SPLIT = "$split"
+
+TABLES = (
+    "sections",
+    "nodes",
+    "edges",
+    "documents",
+    "document_rows",
+    "requirements",
+    "sysml_elements",
+    "sysml_relationships",
+    "sysml_diagrams",
+    "reviews",
+    "archive",
+)
+
+SYSML_TABLES = {
+    "elements": ("sysml_elements", "elem_id"),
+    "relationships": ("sysml_relationships", "rel_id"),
+    "diagrams": ("sysml_diagrams", "diag_id"),
+}
+
+
+def is_sqlite(path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _dump(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _digest(text) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _unique(key, taken) -> str:
+    base, n = key, 1
+    while key in taken:
+        key = f"{base}#{n}"
+        n += 1
+    return key
+
+
+def _is_documents(value) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(d, dict) and isinstance(d.get("entries"), list) for d in value)
+    )
+
+
+# ----------------------------------------------------------------------
+# Model <-> rows
+# ----------------------------------------------------------------------
+def _split_tree(rows, tops):
+    nodes, edges = rows["nodes"], rows["edges"]
+    subtree = {}  # node key -> digest of the node and its descendants
+
+    def visit(d):
+        own = dict(d)
+        children = own.get("children") or []
+        if "children" in own:
+            own["children"] = None
+        text = _dump(own)
+        child_keys = [visit(c) for c in children]
+        digest = _digest(text + "\x1f".join(child_keys))
+        # Nodes shared by several parents are serialised once per parent;
+        # identical copies share a row, diverging copies get their own key.
+        key = base = str(own.get("unique_id"))
+        n = 1
+        while key in subtree and subtree[key] != digest:
+            key = f"{base}#{n}"
+            n += 1
+        if key not in subtree:
+            subtree[key] = digest
+            nodes[key] = ("", 0, text)
+            for pos, child in enumerate(child_keys):
+                edges[f"{key}/{pos}"] = (key, pos, _dump(child))
+        return key
+
+    for pos, top in enumerate(tops):
+        edges[f"/{pos}"] = ("", pos, _dump(visit(top)))
+
+
+def _split_keyed(rows, table, parent, items, id_field):
+    target = rows[table]
+    for pos, item in enumerate(items):
+        ident = item.get(id_field) if isinstance(item, dict) else None
+        key = _unique(f"{parent}/{pos if ident is None else ident}", target)
+        target[key] = (parent, pos, _dump(item))
+
+
+def _split_documents(rows, section, docs):
+    documents = rows["documents"]
+    for pos, doc in enumerate(docs):
+        key = _unique(f"{section}/{doc.get('name', pos)}", documents)
+        own = dict(doc)
+        own["entries"] = None
+        documents[key] = (section, pos, _dump(own))
+        _split_keyed(rows, "document_rows", key, doc["entries"], "unique_id")
+
+
+def split_model(data):
+    """Return ``{table: {key: (parent, position, json_text)}}`` for ``data``."""
+    rows = {t: {} for t in TABLES}
+    for pos, (name, value) in enumerate(data.items()):
+        stored = value
+        if name == "top_events" and isinstance(value, list):
+            _split_tree(rows, value)
+            stored = {SPLIT: "tree"}
+        elif name == "global_requirements" and isinstance(value, dict):
+            for i, (rid, req) in enumerate(value.items()):
+                rows["requirements"][str(rid)] = ("", i, _dump(req))
+            stored = {SPLIT: "requirements"}
+        elif name == "sysml_repository" and isinstance(value, dict):
+            rest = {}
+            for key, item in value.items():
+                if key in SYSML_TABLES and isinstance(item, list):
+                    table, id_field = SYSML_TABLES[key]
+                    _split_keyed(rows, table, "", item, id_field)
+                    rest[key] = None
+                else:
+                    rest[key] = item
+            stored = {SPLIT: "sysml", "rest": rest}
+        elif name == "reviews" and isinstance(value, list):
+            _split_keyed(rows, "reviews", "", value, "name")
+            stored = {SPLIT: "reviews"}
+        elif _is_documents(value):
+            _split_documents(rows, name, value)
+            stored = {SPLIT: "documents"}
+        rows["sections"][name] = ("", pos, _dump(stored))
+    return rows
+
+
+def _grouped(table_rows):
+    """Return ``{parent: [json_text, ...]}`` ordered by position."""
+    groups = {}
+    for key, (parent, pos, text) in table_rows.items():
+        groups.setdefault(parent, []).append((pos, key, text))
+    return {p: [t for _pos, _k, t in sorted(items)] for p, items in groups.items()}
+
+
+def join_model(rows):
+    """Rebuild model data from rows produced by :func:`split_model`."""
+    data = {}
+    sections = sorted(rows["sections"].items(), key=lambda kv: kv[1][1])
+    for name, (_parent, _pos, text) in sections:
+        value = json.loads(text)
+        kind = value.get(SPLIT) if isinstance(value, dict) else None
+        if kind == "tree":
+            value = _join_tree(rows)
+        elif kind == "requirements":
+            items = sorted(rows["requirements"].items(), key=lambda kv: kv[1][1])
+            value = {rid: json.loads(t) for rid, (_p, _i, t) in items}
+        elif kind == "sysml":
+            value = value["rest"]
+            for key, (table, _id_field) in SYSML_TABLES.items():
+                if key in value:
+                    value[key] = [json.loads(t) for t in _grouped(rows[table]).get("", [])]
+        elif kind == "reviews":
+            value = [json.loads(t) for t in _grouped(rows["reviews"]).get("", [])]
+        elif kind == "documents":
+            value = _join_documents(rows, name)
+        data[name] = value
+    return data
+
+
+def _join_tree(rows):
+    nodes = rows["nodes"]
+    children = {}
+    for _key, (parent, pos, text) in rows["edges"].items():
+        children.setdefault(parent, []).append((pos, json.loads(text)))
+
+    def build(key):
+        node = json.loads(nodes[key][2])
+        if "children" in node:
+            node["children"] = [build(k) for _p, k in sorted(children.get(key, []))]
+        return node
+
+    return [build(k) for _p, k in sorted(children.get("", []))]
+
+
+def _join_documents(rows, section):
+    entries = {}
+    for key, (parent, pos, text) in rows["document_rows"].items():
+        entries.setdefault(parent, []).append((pos, key, text))
+    docs = []
+    for key, (parent, pos, text) in rows["documents"].items():
+        if parent != section:
+            continue
+        doc = json.loads(text)
+        doc["entries"] = [json.loads(t) for _p, _k, t in sorted(entries.get(key, []))]
+        docs.append((pos, doc))
+    return [doc for _pos, doc in sorted(docs, key=lambda pd: pd[0])]
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+class SqliteProjectStore:
+    """Project file kept as keyed rows in a SQLite database."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for table in TABLES:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "key TEXT PRIMARY KEY, parent TEXT NOT NULL, position INTEGER NOT NULL, "
+                    "digest TEXT NOT NULL, data TEXT NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_parent ON {table}(parent)")
+        self._state = None  # {table: {key: (parent, position, digest)}}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _saved_state(self):
+        if self._state is None:
+            self._state = {
+                table: {
+                    key: (parent, pos, digest)
+                    for key, parent, pos, digest in self.conn.execute(
+                        f"SELECT key, parent, position, digest FROM {table}"
+                    )
+                }
+                for table in TABLES
+            }
+        return self._state
+
+    def save(self, data, archive=None) -> int:
+        """Store ``data`` and ``archive`` sections; return the rows touched."""
+        rows = split_model(data)
+        for pos, (name, raw) in enumerate((archive or {}).items()):
+            text = raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else raw
+            rows["archive"][name] = ("", pos, text)
+        state = self._saved_state()
+        # The cached state only follows once the transaction has committed,
+        # so a failed save is retried in full by the next one.
+        saved = {}
+        touched = 0
+        with self.conn:
+            for table, new in rows.items():
+                old = state[table]
+                current = saved[table] = {}
+                upserts = []
+                for key, (parent, pos, text) in new.items():
+                    entry = current[key] = (parent, pos, _digest(text))
+                    if old.get(key) != entry:
+                        upserts.append((key, parent, pos, entry[2], text))
+                removed = [(key,) for key in old if key not in new]
+                if upserts:
+                    self.conn.executemany(
+                        f"INSERT OR REPLACE INTO {table} (key, parent, position, digest, data) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        upserts,
+                    )
+                if removed:
+                    self.conn.executemany(f"DELETE FROM {table} WHERE key = ?", removed)
+                touched += len(upserts) + len(removed)
+        self._state = saved
+        return touched
+
+    def load(self):
+        """Return the stored model data."""
+        rows = {
+            table: {
+                key: (parent, pos, text)
+                for key, parent, pos, text in self.conn.execute(
+                    f"SELECT key, parent, position, data FROM {table}"
+                )
+            }
+            for table in TABLES
+            if table != "archive"
+        }
+        return join_model(rows)
+
+    def archive(self):
+        return SqliteArchiveReader(self)
+
+
+class SqliteArchiveReader:
+    """Archive reader (see :class:`analysis.archive.ArchiveReader`) over a store."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def open(self, path) -> None:
+        pass
+
+    def names(self):
+        return [k for (k,) in self.store.conn.execute("SELECT key FROM archive ORDER BY position")]
+
+    def has(self, name) -> bool:
+        return self.store.conn.execute("SELECT 1 FROM archive WHERE key = ?", (name,)).fetchone() is not None
+
+    def raw(self, name) -> bytes:
+        row = self.store.conn.execute("SELECT data FROM archive WHERE key = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0].encode("utf-8")
+
+    def load(self, name, default=None):
+        row = self.store.conn.execute("SELECT data FROM archive WHERE key = ?", (name,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+
+def import_json(json_path, db_path) -> None:
+    """Create or update the SQLite project ``db_path`` from a JSON model.
+
+    The sidecar archive of ``json_path`` is stored with it.
+    """
+    with open_file(json_path, "r") as f:
+        data = json.load(f)
+    reader = ArchiveReader(sidecar_path(json_path))
+    archive = {name: reader.raw(name) for name in reader.names()}
+    store = SqliteProjectStore(db_path)
+    try:
+        store.save(data, archive)
+    finally:
+        store.close()
+
+
+def export_json(db_path, json_path) -> None:
+    """Write the SQLite project ``db_path`` as a JSON model file.
+
+    The archive rows are written to the sidecar archive of ``json_path``.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    store = SqliteProjectStore(db_path)
+    try:
+        data = store.load()
+        reader = store.archive()
+        archive = {name: reader.raw(name) for name in reader.names()}
+    finally:
+        store.close()
+    with open_file(json_path, "w") as f:
+        json.dump(data, f, indent=4)
+    archive_path = sidecar_path(json_path)
+    if archive:
+        write_archive(archive_path, archive)
+    elif os.path.exists(archive_path):
+        os.remove(archive_path)
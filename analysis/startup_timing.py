@@ -0,0 +1,89 @@
+"""Startup time measurement for ``python AutoML.py --startup-times``.
+
+:class:`StartupTimer` wraps :func:`builtins.__import__` to record how long
+every module took to import, both including (cumulative) and excluding
+(self) the modules it imported in turn, and records named phases such as
+creating the main window.  :meth:`StartupTimer.report` formats both as a
+table; the import hook is removed by :meth:`StartupTimer.stop`.
+"""
+
+import builtins
+import sys
+import time
+
+FLAG = "--startup-times"
+
+
+class StartupTimer:
+    """Record import times and startup phases while enabled."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []  # (label, seconds since start)
+        self.imports = {}  # module name -> [cumulative, self] seconds
+        self._stack = []  # child import time of the modules being imported
+        self._import = None
+
+    @classmethod
+    def from_argv(cls, argv=None):
+        """Return a timer enabled by :data:`FLAG` in ``argv`` (which is removed)."""
+        argv = sys.argv if argv is None else argv
+        enabled = FLAG in argv
+        if enabled:
+            argv.remove(FLAG)
+        timer = cls(enabled)
+        if enabled:
+            timer.start()
+        return timer
+
+    def start(self):
+        if self._import is not None:
+            return
+        self._import = original = builtins.__import__
+        imports, stack, modules = self.imports, self._stack, sys.modules
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in modules:
+                return original(name, globals, locals, fromlist, level)
+            stack.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                total = time.perf_counter() - t0
+                children = stack.pop()
+                if stack:
+                    stack[-1] += total
+                if name not in imports:
+                    imports[name] = [total, total - children]
+
+        builtins.__import__ = timed_import
+
+    def stop(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def mark(self, label):
+        """Record that the phase ``label`` has been reached."""
+        if self.enabled:
+            self.phases.append((label, time.perf_counter() - self.started))
+
+    def report(self, limit=25):
+        """Return the phases and the ``limit`` slowest imports as text."""
+        lines = ["Startup phases (ms since start):"]
+        lines += [f"  {seconds * 1000:10.1f}  {label}" for label, seconds in self.phases]
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        lines.append(f"Slowest imports (ms, {len(self.imports)} modules timed):")
+        lines.append(f"  {'cumulative':>10}  {'self':>10}  module")
+        lines += [f"  {cum * 1000:10.1f}  {own * 1000:10.1f}  {name}" for name, (cum, own) in slowest]
+        return "\n".join(lines)
+
+    def finish(self, label="startup complete", file=None):
+        """Mark ``label``, stop timing imports and print the report."""
+        if not self.enabled:
+            return
+        self.mark(label)
+        self.stop()
+        print(self.report(), file=file or sys.stderr)
@@ -0,0 +1,357 @@
+"""Reversible model commands and a bounded undo/redo stack."""
+
+import copy
+from collections import deque
+
+# Attributes describing tree structure or identity are never captured by
+# :class:`SetAttributes`; structural edits use the link commands instead.
+_STRUCTURE_ATTRS = frozenset({"children", "parents", "original", "unique_id"})
+
+
+# Attributes holding lists of objects shared with other owners, such as the
+# requirement dicts of the global registry.  Only the list is copied so the
+# node keeps referring to the shared objects after undo and redo.
+_SHARED_ITEM_ATTRS = frozenset({"safety_requirements"})
+
+
+def _snapshot(value, attr=""):
+    """Copy mutable containers so later in-place edits do not leak in."""
+    if attr in _SHARED_ITEM_ATTRS and isinstance(value, list):
+        return list(value)
+    if isinstance(value, (list, dict, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+class Command:
+    """Base class for an undoable change.
+
+    ``section`` names the model section touched by the command (the keys
+    of ``export_model_data``) and ``structural`` tells the application
+    whether tree indices must be rebuilt after undo/redo.  ``on_apply`` is
+    called with the command after each undo or redo so views owning the
+    changed objects can resynchronise.
+    """
+
+    label = ""
+    section = ""
+    structural = False
+
+    def __init__(self, label="", section="", on_apply=None, structural=None):
+        if label:
+            self.label = label
+        if section:
+            self.section = section
+        if structural is not None:
+            self.structural = structural
+        self.on_apply = on_apply
+
+    def undo(self):
+        raise NotImplementedError
+
+    def redo(self):
+        raise NotImplementedError
+
+    def merge(self, other) -> bool:
+        """Absorb ``other`` into this command; return ``True`` on success."""
+        return False
+
+    def targets(self):
+        """Return the objects changed by the command."""
+        return []
+
+    def _applied(self):
+        if self.on_apply is not None:
+            self.on_apply(self)
+
+
+class SetAttributes(Command):
+    """Attribute changes of one object stored as ``{name: (old, new)}``."""
+
+    label = "Edit"
+
+    def __init__(self, target, changes, **kwargs):
+        super().__init__(**kwargs)
+        self.target = target
+        self.changes = changes
+
+    @staticmethod
+    def capture(obj, attrs=None):
+        """Return the current values of ``attrs`` (all public attributes by default)."""
+        if attrs is None:
+            attrs = [a for a in vars(obj) if a not in _STRUCTURE_ATTRS]
+        return {a: _snapshot(getattr(obj, a), a) for a in attrs if hasattr(obj, a)}
+
+    @classmethod
+    def from_change(cls, obj, before, **kwargs):
+        """Build a command from ``before`` values, or ``None`` if nothing changed."""
+        changes = {}
+        for attr, old in before.items():
+            new = getattr(obj, attr, None)
+            if new != old:
+                changes[attr] = (old, _snapshot(new, attr))
+        if not changes:
+            return None
+        return cls(obj, changes, **kwargs)
+
+    def _set(self, index):
+        for attr, values in self.changes.items():
+            setattr(self.target, attr, _snapshot(values[index], attr))
+        self._applied()
+
+    def undo(self):
+        self._set(0)
+
+    def redo(self):
+        self._set(1)
+
+    def merge(self, other):
+        if not isinstance(other, SetAttributes) or other.target is not self.target:
+            return False
+        for attr, (old, new) in other.changes.items():
+            first = self.changes.get(attr, (old, new))[0]
+            self.changes[attr] = (first, new)
+        return True
+
+    def targets(self):
+        return [self.target]
+
+
+class MoveNodes(Command):
+    """Position change of several diagram nodes.
+
+    Successive moves of the same set of nodes merge into one command, so a
+    drag produces a single undo step holding the start and end positions.
+    """
+
+    label = "Move"
+
+    def __init__(self, positions, **kwargs):
+        super().__init__(**kwargs)
+        # id(node) -> (node, (old_x, old_y), (new_x, new_y))
+        self.positions = {id(n): (n, old, new) for n, old, new in positions}
+
+    @classmethod
+    def by_offset(cls, nodes, dx, dy, **kwargs):
+        """Create a move for ``nodes`` already shifted by ``dx``/``dy``."""
+        return cls(
+            [(n, (n.x - dx, n.y - dy), (n.x, n.y)) for n in nodes], **kwargs
+        )
+
+    @classmethod
+    def from_positions(cls, before, **kwargs):
+        """Build a move from ``[(node, (old_x, old_y))]`` or ``None`` if nothing moved."""
+        moved = [(n, old, (n.x, n.y)) for n, old in before if old != (n.x, n.y)]
+        if not moved:
+            return None
+        return cls(moved, **kwargs)
+
+    def _set(self, index):
+        for node, old, new in self.positions.values():
+            node.x, node.y = (old, new)[index]
+        self._applied()
+
+    def undo(self):
+        self._set(0)
+
+    def redo(self):
+        self._set(1)
+
+    def merge(self, other):
+        if not isinstance(other, MoveNodes):
+            return False
+        for key, (node, old, new) in other.positions.items():
+            if key in self.positions:
+                old = self.positions[key][1]
+            self.positions[key] = (node, old, new)
+        return True
+
+    def targets(self):
+        return [n for n, _old, _new in self.positions.values()]
+
+
+class LinkNodes(Command):
+    """Attach ``child`` below ``parent`` at ``index`` in its children list."""
+
+    label = "Link"
+    structural = True
+
+    def __init__(self, parent, child, index=None, **kwargs):
+        super().__init__(**kwargs)
+        self.parent = parent
+        self.child = child
+        self.index = len(parent.children) - 1 if index is None else index
+
+    def undo(self):
+        if self.child in self.parent.children:
+            self.parent.children.remove(self.child)
+        if self.parent in self.child.parents:
+            self.child.parents.remove(self.parent)
+        self._applied()
+
+    def redo(self):
+        if self.child not in self.parent.children:
+            self.parent.children.insert(self.index, self.child)
+        if self.parent not in self.child.parents:
+            self.child.parents.append(self.parent)
+        self._applied()
+
+    def targets(self):
+        return [self.parent, self.child]
+
+
+class UnlinkNodes(Command):
+    """Inverse of :class:`LinkNodes` remembering every former parent."""
+
+    label = "Unlink"
+    structural = True
+
+    def __init__(self, child, links, **kwargs):
+        super().__init__(**kwargs)
+        self.child = child
+        # [(parent, index in parent.children)] captured before unlinking
+        self.links = list(links)
+
+    @staticmethod
+    def capture(child):
+        return [(p, p.children.index(child)) for p in child.parents if child in p.children]
+
+    def undo(self):
+        for parent, index in self.links:
+            if self.child not in parent.children:
+                parent.children.insert(index, self.child)
+            if parent not in self.child.parents:
+                self.child.parents.append(parent)
+        self._applied()
+
+    def redo(self):
+        for parent, _index in self.links:
+            if self.child in parent.children:
+                parent.children.remove(self.child)
+        self.child.parents = [p for p in self.child.parents if all(p is not q for q, _ in self.links)]
+        self._applied()
+
+    def targets(self):
+        return [self.child] + [p for p, _ in self.links]
+
+
+class ListInsert(Command):
+    """Insertion of ``item`` into ``items`` at ``index``."""
+
+    label = "Insert"
+
+    def __init__(self, items, index, item, **kwargs):
+        super().__init__(**kwargs)
+        self.items = items
+        self.index = index
+        self.item = item
+
+    def undo(self):
+        for i, existing in enumerate(self.items):
+            if existing is self.item:
+                del self.items[i]
+                break
+        self._applied()
+
+    def redo(self):
+        self.items.insert(self.index, self.item)
+        self._applied()
+
+    def targets(self):
+        return [self.item]
+
+
+class ListRemove(ListInsert):
+    """Removal of ``item`` from ``items`` at ``index``."""
+
+    label = "Remove"
+
+    def undo(self):
+        ListInsert.redo(self)
+
+    def redo(self):
+        ListInsert.undo(self)
+
+
+class CommandGroup(Command):
+    """Several commands undone and redone as one step."""
+
+    def __init__(self, commands, **kwargs):
+        super().__init__(**kwargs)
+        self.commands = [c for c in commands if c is not None]
+        self.structural = self.structural or any(c.structural for c in self.commands)
+        if not self.section:
+            self.section = next((c.section for c in self.commands if c.section), "")
+
+    def undo(self):
+        for cmd in reversed(self.commands):
+            cmd.undo()
+        self._applied()
+
+    def redo(self):
+        for cmd in self.commands:
+            cmd.redo()
+        self._applied()
+
+    def targets(self):
+        return [t for c in self.commands for t in c.targets()]
+
+
+class UndoStack:
+    """Bounded history of :class:`Command` objects.
+
+    Only the oldest commands are dropped once ``limit`` is reached.  A
+    command pushed with ``coalesce=True`` may be merged into the previous
+    one until :meth:`close` is called, which is how drag gestures become a
+    single step.
+    """
+
+    def __init__(self, limit: int = 500):
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        self._open = False
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._open = False
+
+    def push(self, command, coalesce=False):
+        if command is None:
+            return None
+        self._redo.clear()
+        if coalesce and self._open and self._undo and self._undo[-1].merge(command):
+            return self._undo[-1]
+        self._undo.append(command)
+        self._open = coalesce
+        return command
+
+    def close(self):
+        """Stop merging further commands into the last one."""
+        self._open = False
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self):
+        if not self._undo:
+            return None
+        self._open = False
+        cmd = self._undo.pop()
+        cmd.undo()
+        self._redo.append(cmd)
+        return cmd
+
+    def redo(self):
+        if not self._redo:
+            return None
+        cmd = self._redo.pop()
+        cmd.redo()
+        self._undo.append(cmd)
+        return cmd
+
+    def __len__(self):
+        return len(self._undo)
@@ -0,0 +1,396 @@
+"""Version history stored as base snapshots plus structural deltas."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+
+FORMAT = "delta-v1"
+
+# Fields identifying the records of a list section, tried in order.
+RECORD_KEYS = ("unique_id", "id", "name")
+
+# Key of the record listing the top level records of a flattened section.
+ROOT = "/"
+
+
+def _dump(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _unique(key, taken) -> str:
+    base, n = key, 1
+    while key in taken:
+        key = f"{base}#{n}"
+        n += 1
+    return key
+
+
+def _is_tree(value) -> bool:
+    return bool(value) and all(
+        isinstance(v, dict) and "unique_id" in v and isinstance(v.get("children"), list) for v in value
+    )
+
+
+def _is_documents(value) -> bool:
+    return bool(value) and all(isinstance(d, dict) and isinstance(d.get("entries"), list) for d in value)
+
+
+def _flatten_tree(tops):
+    """Return ``[(key, node), ...]`` with children replaced by their keys.
+
+    Nodes are keyed by ``unique_id``.  A node shared by several parents is
+    stored once; copies that differ get a key of their own.
+    """
+    records = {}
+
+    def visit(d):
+        own = dict(d)
+        own["children"] = [visit(c) for c in d["children"]]
+        key = base = str(own.get("unique_id"))
+        n = 1
+        while key in records and records[key] != own:
+            key = f"{base}#{n}"
+            n += 1
+        records[key] = own
+        return key
+
+    records[ROOT] = [visit(top) for top in tops]
+    return list(records.items())
+
+
+def _flatten_documents(docs):
+    """Return ``[(key, record), ...]`` of the documents and their rows."""
+    records = {}
+    roots = []
+    for pos, doc in enumerate(docs):
+        key = _unique(str(doc.get("name", pos)), records)
+        roots.append(key)
+        own = dict(doc)
+        records[key] = own
+        rows = []
+        for i, row in enumerate(doc["entries"]):
+            ident = row.get("unique_id", i) if isinstance(row, dict) else i
+            row_key = _unique(f"{key}/{ident}", records)
+            records[row_key] = row
+            rows.append(row_key)
+        own["entries"] = rows
+    records[ROOT] = roots
+    return list(records.items())
+
+
+def _unflatten(kind, records):
+    """Rebuild a section flattened by :func:`_flatten_tree` or :func:`_flatten_documents`."""
+    if kind == "tree":
+        def build(key):
+            node = dict(records[key])
+            node["children"] = [build(k) for k in node["children"]]
+            return node
+        return [build(k) for k in records[ROOT]]
+    docs = []
+    for key in records[ROOT]:
+        doc = dict(records[key])
+        doc["entries"] = [records[k] for k in doc["entries"]]
+        docs.append(doc)
+    return docs
+
+
+def _keyed_items(value):
+    """Return ``(kind, [(key, item), ...])`` for sections of keyed records.
+
+    Fault trees are flattened into one record per node and documents such
+    as FMEAs into one record per document and per row, so a change deep in
+    a tree or table only stores that record.  Dicts of dicts (such as the
+    global requirements) are keyed by their dict keys and other lists of
+    dicts by the first of :data:`RECORD_KEYS` that is present and unique in
+    every item.  Other values return ``None`` and are stored as one blob.
+    """
+    if isinstance(value, list) and _is_tree(value):
+        return "tree", _flatten_tree(value)
+    if isinstance(value, list) and _is_documents(value):
+        return "documents", _flatten_documents(value)
+    if isinstance(value, dict):
+        if len(value) > 1 and all(isinstance(v, dict) for v in value.values()):
+            return "map", list(value.items())
+        return None
+    if not isinstance(value, list) or len(value) < 2:
+        return None
+    if not all(isinstance(v, dict) for v in value):
+        return None
+    for field in RECORD_KEYS:
+        keys = [v.get(field) for v in value]
+        if None in keys:
+            continue
+        try:
+            if len(set(keys)) == len(keys):
+                return field, list(zip(keys, value))
+        except TypeError:  # unhashable key values
+            continue
+    return None
+
+
+class _Version(Mapping):
+    """Read-only ``{"name": ..., "data": ...}`` view of one version.
+
+    ``data`` is only reconstructed when accessed.
+    """
+
+    __slots__ = ("_history", "_index")
+
+    def __init__(self, history, index):
+        self._history = history
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == "name":
+            return self._history.name(self._index)
+        if key == "data":
+            return self._history.data(self._index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(("name", "data"))
+
+    def __len__(self):
+        return 2
+
+
+class VersionHistory(Sequence):
+    """Model versions kept as deduplicated sections and keyed deltas.
+
+    Each top level section of a version is stored by content hash, so
+    sections that did not change between versions share one blob.  Sections
+    made of keyed records (fault tree nodes by ``unique_id``, document rows,
+    requirements by id) are stored as a full record list every
+    :attr:`REBASE_INTERVAL` versions, or when a delta would be large, and
+    as the changed, removed and reordered records against that snapshot
+    otherwise.  Any version is therefore rebuilt from at most one snapshot
+    and one delta.
+
+    Items behave like the former ``{"name": ..., "data": ...}`` dicts.
+    A history created by :meth:`deferred` only knows the version names
+    until data is first needed and can be unloaded again with
+    :meth:`evict`.
+    """
+
+    REBASE_INTERVAL = 10
+    REBASE_RATIO = 0.5
+    CACHE_SIZE = 2
+
+    def __init__(self):
+        self._blobs = {}  # hash -> JSON text
+        self._entries = []  # {"name": str, "sections": {key: ref}}
+        self._bases = {}  # section key -> index of its latest snapshot
+        self._cache = OrderedDict()
+        self._names = None  # version names while deferred
+        self._loader = None  # pending loader while deferred
+        self._reload = None  # loader used to reload after evict()
+        self._modified = False
+
+    @classmethod
+    def deferred(cls, names, loader):
+        """Return a history that calls ``loader()`` for its data on first use.
+
+        ``loader`` returns a value accepted by :meth:`from_json`.
+        """
+        history = cls()
+        history._names = list(names)
+        history._loader = history._reload = loader
+        return history
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    def _ensure(self):
+        loader = self._loader
+        if loader is None:
+            return
+        self._loader = None
+        loaded = VersionHistory.from_json(loader())
+        self._blobs, self._entries, self._bases = loaded._blobs, loaded._entries, loaded._bases
+        self._names = None
+        self._modified = False
+
+    def evict(self) -> bool:
+        """Drop loaded data that can be reloaded unchanged from the loader."""
+        if self._loader is not None or self._reload is None or self._modified:
+            return False
+        self._names = self.names()
+        self._blobs, self._entries, self._bases = {}, [], {}
+        self._cache.clear()
+        self._loader = self._reload
+        return True
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+    def __len__(self):
+        if self._loader is not None:
+            return len(self._names)
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("version index out of range")
+        return _Version(self, index)
+
+    def name(self, index):
+        if self._loader is not None:
+            return self._names[index]
+        return self._entries[index]["name"]
+
+    def names(self):
+        if self._loader is not None:
+            return list(self._names)
+        return [e["name"] for e in self._entries]
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _put(self, value) -> str:
+        text = _dump(value)
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+        self._blobs.setdefault(key, text)
+        return key
+
+    def _load(self, key):
+        return json.loads(self._blobs[key])
+
+    def append(self, version):
+        """Add a ``{"name": ..., "data": ...}`` version."""
+        self.add(version["name"], version["data"])
+
+    def add(self, name, data) -> int:
+        """Store ``data`` as a new version and return its index."""
+        self._ensure()
+        self._modified = True
+        index = len(self._entries)
+        sections = {}
+        for key, value in data.items():
+            keyed = _keyed_items(value)
+            if keyed is None:
+                sections[key] = {"blob": self._put(value)}
+                continue
+            kind, pairs = keyed
+            items = [[k, self._put(item)] for k, item in pairs]
+            ref = self._delta(key, kind, items, index)
+            if ref is None:
+                ref = {"kind": kind, "items": items}
+                self._bases[key] = index
+            sections[key] = ref
+        self._entries.append({"name": name, "sections": sections})
+        return index
+
+    def _delta(self, key, kind, items, index):
+        """Return a delta ref against the section's snapshot or ``None``."""
+        base = self._bases.get(key)
+        if base is None or index - base >= self.REBASE_INTERVAL:
+            return None
+        base_ref = self._entries[base]["sections"].get(key)
+        if not base_ref or base_ref.get("kind") != kind:
+            return None
+        base_items = base_ref["items"]
+        base_map = {k: h for k, h in base_items}
+        new_keys = {k for k, _h in items}
+        changed = [[k, h] for k, h in items if base_map.get(k) != h]
+        dropped = [k for k, _h in base_items if k not in new_keys]
+        if len(changed) + len(dropped) > self.REBASE_RATIO * max(len(items), 1):
+            return None
+        ref = {"base": base, "set": changed, "drop": dropped}
+        expected = [k for k, _h in base_items if k in new_keys]
+        expected += [k for k, _h in items if k not in base_map]
+        order = [k for k, _h in items]
+        if order != expected:
+            ref["order"] = order
+        return ref
+
+    # ------------------------------------------------------------------
+    # Reconstruction
+    # ------------------------------------------------------------------
+    def section(self, index, key):
+        """Reconstruct one section of version ``index``."""
+        self._ensure()
+        ref = self._entries[index]["sections"][key]
+        if "blob" in ref:
+            return self._load(ref["blob"])
+        if "items" in ref:
+            kind, items = ref["kind"], ref["items"]
+        else:
+            base_ref = self._entries[ref["base"]]["sections"][key]
+            kind = base_ref["kind"]
+            merged = {k: h for k, h in base_ref["items"]}
+            for k in ref["drop"]:
+                merged.pop(k, None)
+            added = []
+            for k, h in ref["set"]:
+                if k not in merged:
+                    added.append(k)
+                merged[k] = h
+            order = ref.get("order")
+            if order is None:
+                order = [k for k, _h in base_ref["items"] if k in merged] + added
+            items = [(k, merged[k]) for k in order]
+        if kind == "map":
+            return {k: self._load(h) for k, h in items}
+        if kind in ("tree", "documents"):
+            return _unflatten(kind, {k: self._load(h) for k, h in items})
+        return [self._load(h) for _k, h in items]
+
+    def data(self, index):
+        """Return the model data of version ``index``."""
+        self._ensure()
+        if index < 0:
+            index += len(self)
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._cache.move_to_end(index)
+            return cached
+        data = {key: self.section(index, key) for key in self._entries[index]["sections"]}
+        self._cache[index] = data
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return data
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+    def to_json(self):
+        self._ensure()
+        return {"format": FORMAT, "blobs": self._blobs, "entries": self._entries}
+
+    def manifest(self):
+        """Return the reference stored in the model file for an archived history."""
+        return {"format": FORMAT, "archived": True, "names": self.names()}
+
+    @classmethod
+    def from_json(cls, value, loader=None):
+        """Load a history saved by :meth:`to_json` or a legacy version list.
+
+        A :meth:`manifest` gives a deferred history reading its data from
+        ``loader``.
+        """
+        history = cls()
+        if not value:
+            return history
+        if isinstance(value, dict) and value.get("archived"):
+            if loader is None:
+                return history
+            return cls.deferred(value.get("names", []), loader)
+        if isinstance(value, list):
+            for version in value:
+                history.append(version)
+            return history
+        if value.get("format") != FORMAT:
+            raise ValueError(f"Unsupported version history format: {value.get('format')}")
+        history._blobs = dict(value.get("blobs", {}))
+        history._entries = list(value.get("entries", []))
+        for i, entry in enumerate(history._entries):
+            for key, ref in entry["sections"].items():
+                if "items" in ref:
+                    history._bases[key] = i
+        return history
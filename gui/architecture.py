@@ -9,6 +9,7 @@ from sysml.sysml_repository import SysMLRepository, SysMLDiagram, SysMLElement
 
 from sysml.sysml_spec import SYSML_PROPERTIES
 from analysis.models import global_requirements, ASIL_ORDER
+from analysis.undo import SetAttributes, ListInsert, ListRemove, CommandGroup
 
 # ---------------------------------------------------------------------------
 # Appearance customization
@@ -206,6 +207,9 @@ class DiagramConnection:
 class SysMLDiagramWindow(tk.Frame):
     """Base frame for AutoML diagrams with zoom and pan support."""
 
+    # Object attributes restored by undo after a move, resize or edit.
+    UNDO_ATTRS = ("x", "y", "width", "height", "properties")
+
     def __init__(self, master, title, tools, diagram_id: str | None = None, app=None):
         super().__init__(master)
         self.app = app
@@ -235,6 +239,7 @@ class SysMLDiagramWindow(tk.Frame):
         if self.objects:
             global _next_obj_id
             _next_obj_id = max(o.obj_id for o in self.objects) + 1
+        self._synced_state = self._diagram_state()
 
         self.zoom = 1.0
         self.font = tkFont.Font(family="Arial", size=int(8 * self.zoom))
@@ -250,6 +255,7 @@ class SysMLDiagramWindow(tk.Frame):
         self.resize_edge: str | None = None
         self.temp_line_end: tuple[float, float] | None = None
         self.rc_dragged = False
+        self._press_state = None
 
         self.toolbox = ttk.Frame(self)
         self.toolbox.pack(side=tk.LEFT, fill=tk.Y)
@@ -405,12 +411,14 @@ class SysMLDiagramWindow(tk.Frame):
             else:
                 self.objects.append(new_obj)
             self.sort_objects()
+            self._record_undo(self._insertion_command(new_obj, "Add Object"))
             self._sync_to_repository()
             self.selected_obj = new_obj
             self.redraw()
         else:
             if obj:
                 self.selected_obj = obj
+                self._press_state = (obj, SetAttributes.capture(obj, self.UNDO_ATTRS))
                 self.drag_offset = (x / self.zoom - obj.x, y / self.zoom - obj.y)
                 self.resizing_obj = None
                 self.resize_edge = self.hit_resize_handle(obj, x, y)
@@ -441,6 +449,10 @@ class SysMLDiagramWindow(tk.Frame):
                         self.resize_edge = self.hit_resize_handle(self.selected_obj, x, y)
                         if self.resize_edge:
                             self.resizing_obj = self.selected_obj
+                            self._press_state = (
+                                self.selected_obj,
+                                SetAttributes.capture(self.selected_obj, self.UNDO_ATTRS),
+                            )
                             return
                     self.selected_obj = None
                     self.selected_conn = None
@@ -563,6 +575,10 @@ class SysMLDiagramWindow(tk.Frame):
                 else:
                     self.selected_obj.properties.pop("boundary", None)
             self._sync_to_repository()
+        if self._press_state:
+            obj, before = self._press_state
+            self._record_undo(SetAttributes.from_change(obj, before, label="Move"))
+        self._press_state = None
         self.redraw()
 
     def on_mouse_move(self, event):
@@ -598,8 +614,7 @@ class SysMLDiagramWindow(tk.Frame):
         if obj:
             if self._open_linked_diagram(obj):
                 return
-            SysMLObjectDialog(self, obj)
-            self.redraw()
+            self._edit_object(obj)
         else:
             conn = self.find_connection(x, y)
             if conn:
@@ -638,7 +653,9 @@ class SysMLDiagramWindow(tk.Frame):
         menu.tk_popup(event.x_root, event.y_root)
 
     def _edit_object(self, obj):
+        before = SetAttributes.capture(obj, self.UNDO_ATTRS)
         SysMLObjectDialog(self, obj)
+        self._record_undo(SetAttributes.from_change(obj, before, label="Edit Object"))
         self._sync_to_repository()
         self.redraw()
 
@@ -1293,6 +1310,7 @@ class SysMLDiagramWindow(tk.Frame):
         if self.selected_obj:
             import copy
             self.clipboard = copy.deepcopy(self.selected_obj)
+            self._record_undo(self._removal_command(self.selected_obj, "Cut"))
             self.remove_object(self.selected_obj)
             self.selected_obj = None
             self._sync_to_repository()
@@ -1313,12 +1331,14 @@ class SysMLDiagramWindow(tk.Frame):
             diag = self.repo.diagrams.get(self.diagram_id)
             if diag and new_obj.element_id and new_obj.element_id not in diag.elements:
                 diag.elements.append(new_obj.element_id)
+            self._record_undo(self._insertion_command(new_obj, "Paste"))
             self.selected_obj = new_obj
             self._sync_to_repository()
             self.redraw()
 
     def delete_selected(self, _event=None):
         if self.selected_obj:
+            self._record_undo(self._removal_command(self.selected_obj, "Delete"))
             self.remove_object(self.selected_obj)
             self.selected_obj = None
             self._sync_to_repository()
@@ -1327,18 +1347,75 @@ class SysMLDiagramWindow(tk.Frame):
     def remove_object(self, obj: SysMLObject) -> None:
         if obj in self.objects:
             self.objects.remove(obj)
-        self.connections = [c for c in self.connections if c.src != obj.obj_id and c.dst != obj.obj_id]
+        # Filter in place so undo commands keep referring to the same list.
+        self.connections[:] = [c for c in self.connections if c.src != obj.obj_id and c.dst != obj.obj_id]
         diag = self.repo.diagrams.get(self.diagram_id)
         if diag and obj.element_id in diag.elements:
             diag.elements.remove(obj.element_id)
         self._sync_to_repository()
 
+    # ------------------------------------------------------------
+    # Undo support
+    # ------------------------------------------------------------
+    def _record_undo(self, command) -> None:
+        """Add ``command`` to the application's undo history."""
+        if command is None or not hasattr(self.app, "record_command"):
+            return
+        command.section = "sysml_repository"
+        command.on_apply = self._on_undo_apply
+        self.app.record_command(command)
+
+    def _on_undo_apply(self, _command) -> None:
+        if self.winfo_exists():
+            self.sort_objects()
+            self._sync_to_repository()
+            self.redraw()
+
+    def _insertion_command(self, obj: SysMLObject, label: str):
+        """Return a command undoing the insertion of ``obj``."""
+        commands = [ListInsert(self.objects, self.objects.index(obj), obj)]
+        diag = self.repo.diagrams.get(self.diagram_id)
+        if diag and obj.element_id in diag.elements:
+            commands.append(ListInsert(diag.elements, diag.elements.index(obj.element_id), obj.element_id))
+        return CommandGroup(commands, label=label)
+
+    def _removal_command(self, obj: SysMLObject, label: str):
+        """Return a command restoring ``obj`` and its connections once removed."""
+        commands = []
+        diag = self.repo.diagrams.get(self.diagram_id)
+        if diag and obj.element_id in diag.elements:
+            commands.append(ListRemove(diag.elements, diag.elements.index(obj.element_id), obj.element_id))
+        # Remove from the highest index down so the recorded positions stay valid.
+        for idx in reversed(range(len(self.connections))):
+            conn = self.connections[idx]
+            if conn.src == obj.obj_id or conn.dst == obj.obj_id:
+                commands.append(ListRemove(self.connections, idx, conn))
+        if obj in self.objects:
+            commands.append(ListRemove(self.objects, self.objects.index(obj), obj))
+        return CommandGroup(commands, label=label)
+
+    def _diagram_state(self) -> str:
+        """Return the objects and connections of the diagram as JSON text."""
+        return json.dumps(
+            [[obj.__dict__ for obj in self.objects], [conn.__dict__ for conn in self.connections]],
+            sort_keys=True,
+            default=str,
+        )
+
     def _sync_to_repository(self) -> None:
-        """Persist current objects and connections back to the repository."""
+        """Persist current objects and connections back to the repository.
+
+        Listeners are only notified when the diagram changed since it was
+        opened or last synchronised.
+        """
         diag = self.repo.diagrams.get(self.diagram_id)
         if diag:
             diag.objects = [obj.__dict__ for obj in self.objects]
             diag.connections = [conn.__dict__ for conn in self.connections]
+            state = self._diagram_state()
+            if state != self._synced_state:
+                self._synced_state = state
+                self.repo.notify_change("diagram", self.diagram_id)
 
     def on_close(self):
         self._sync_to_repository()
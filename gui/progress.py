@@ -0,0 +1,24 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class ProgressWindow:
+    """Small window with a determinate progress bar for long operations."""
+
+    def __init__(self, master, title, message):
+        self.win = tk.Toplevel(master)
+        self.win.title(title)
+        self.win.transient(master)
+        self.win.resizable(False, False)
+        ttk.Label(self.win, text=message).pack(padx=20, pady=(15, 5))
+        self.bar = ttk.Progressbar(self.win, length=300, maximum=1.0, mode="determinate")
+        self.bar.pack(padx=20, pady=(0, 15))
+        self.win.update_idletasks()
+
+    def report(self, fraction):
+        """Show ``fraction`` (0.0 to 1.0) of the work as done."""
+        self.bar["value"] = fraction
+        self.win.update_idletasks()
+
+    def close(self):
+        self.win.destroy()
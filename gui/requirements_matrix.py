@@ -0,0 +1,169 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualMatrixGrid(tk.Frame):
+    """Canvas grid drawing only the visible part of a :class:`SparseMatrix`.
+
+    The requirement attribute columns stay fixed on the left and the
+    header row stays at the top; allocation columns and requirement rows
+    are scrolled by index, so the number of canvas items depends on the
+    window size only.
+    """
+
+    ROW_HEIGHT = 22
+    CELL_WIDTH = 26
+    HEADER_HEIGHT = 120
+    FIXED_COLUMNS = (
+        ("Req ID", "id", 90),
+        ("ASIL", "asil", 50),
+        ("Type", "req_type", 80),
+        ("Status", "status", 90),
+        ("Parent", "parent_id", 80),
+        ("Text", "text", 260),
+    )
+
+    def __init__(self, master, matrix, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.matrix = matrix
+        self.on_select = on_select
+        self.top_row = 0
+        self.left_col = 0
+        self.selected = None
+        self.fixed_width = sum(w for _l, _k, w in self.FIXED_COLUMNS)
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.vbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.hbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._xview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.hbar.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", lambda _e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self._scroll_cols(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda _e: self._scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda _e: self._scroll_rows(1))
+
+    # ------------------------------------------------------------------
+    # Geometry
+    # ------------------------------------------------------------------
+    def visible_rows(self):
+        height = max(self.canvas.winfo_height() - self.HEADER_HEIGHT, 0)
+        return max(height // self.ROW_HEIGHT, 1)
+
+    def visible_cols(self):
+        width = max(self.canvas.winfo_width() - self.fixed_width, 0)
+        return max(width // self.CELL_WIDTH, 1)
+
+    def set_matrix(self, matrix):
+        self.matrix = matrix
+        self.top_row = 0
+        self.left_col = 0
+        self.selected = None
+        self.redraw()
+
+    def _clamp(self):
+        self.top_row = max(0, min(self.top_row, len(self.matrix.rows) - self.visible_rows()))
+        self.left_col = max(0, min(self.left_col, len(self.matrix.columns) - self.visible_cols()))
+
+    # ------------------------------------------------------------------
+    # Scrolling
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _target(args, first, page, total):
+        if not args:
+            return first
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        if args[0] == "scroll":
+            step = int(args[1]) * (page if args[2] == "pages" else 1)
+            return first + step
+        return first
+
+    def _yview(self, *args):
+        self.top_row = self._target(args, self.top_row, self.visible_rows(), len(self.matrix.rows))
+        self.redraw()
+
+    def _xview(self, *args):
+        self.left_col = self._target(args, self.left_col, self.visible_cols(), len(self.matrix.columns))
+        self.redraw()
+
+    def _scroll_rows(self, step):
+        self._yview("scroll", step * 3, "units")
+
+    def _scroll_cols(self, step):
+        self._xview("scroll", step * 3, "units")
+
+    def see(self, row):
+        if row < self.top_row or row >= self.top_row + self.visible_rows():
+            self.top_row = row
+        self.redraw()
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+    def redraw(self):
+        self._clamp()
+        c = self.canvas
+        c.delete("all")
+        rows, cols = self.visible_rows(), self.visible_cols()
+        first_row, first_col = self.top_row, self.left_col
+        last_row = min(first_row + rows, len(self.matrix.rows))
+        last_col = min(first_col + cols, len(self.matrix.columns))
+        rh, cw, hh = self.ROW_HEIGHT, self.CELL_WIDTH, self.HEADER_HEIGHT
+        right = self.fixed_width + (last_col - first_col) * cw
+        bottom = hh + (last_row - first_row) * rh
+
+        # Header
+        x = 0
+        for label, _key, width in self.FIXED_COLUMNS:
+            c.create_rectangle(x, 0, x + width, hh, fill="#e8e8e8", outline="#b0b0b0")
+            c.create_text(x + 4, hh - 4, text=label, anchor="sw")
+            x += width
+        for j in range(first_col, last_col):
+            x = self.fixed_width + (j - first_col) * cw
+            c.create_rectangle(x, 0, x + cw, hh, fill="#e8e8e8", outline="#b0b0b0")
+            c.create_text(x + cw / 2, hh - 4, text=self.matrix.columns[j][1][:20], angle=90, anchor="w")
+
+        # Rows
+        for i in range(first_row, last_row):
+            y = hh + (i - first_row) * rh
+            req = self.matrix.rows[i]
+            fill = "#cce0ff" if i == self.selected else ("white" if i % 2 == 0 else "#f7f7f7")
+            c.create_rectangle(0, y, right, y + rh, fill=fill, outline="")
+            x = 0
+            for _label, key, width in self.FIXED_COLUMNS:
+                value = str(req.get(key, "") or "")
+                limit = max(width // 7, 4)
+                if len(value) > limit:
+                    value = value[: limit - 1] + "…"
+                c.create_text(x + 4, y + rh / 2, text=value, anchor="w")
+                x += width
+            for j in self.matrix.row_cells(i, first_col, last_col):
+                cx = self.fixed_width + (j - first_col) * cw + cw / 2
+                c.create_text(cx, y + rh / 2, text="X")
+
+        # Grid lines
+        for j in range(last_col - first_col + 1):
+            x = self.fixed_width + j * cw
+            c.create_line(x, hh, x, bottom, fill="#d0d0d0")
+        c.create_line(self.fixed_width, 0, self.fixed_width, bottom, fill="#808080")
+        c.create_line(0, hh, right, hh, fill="#808080")
+
+        total_rows = max(len(self.matrix.rows), 1)
+        total_cols = max(len(self.matrix.columns), 1)
+        self.vbar.set(first_row / total_rows, last_row / total_rows if self.matrix.rows else 1.0)
+        self.hbar.set(first_col / total_cols, last_col / total_cols if self.matrix.columns else 1.0)
+
+    def _on_click(self, event):
+        if event.y < self.HEADER_HEIGHT:
+            return
+        row = self.top_row + int((event.y - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+        if row >= len(self.matrix.rows):
+            return
+        self.selected = row
+        self.redraw()
+        if self.on_select:
+            self.on_select(self.matrix.rows[row])
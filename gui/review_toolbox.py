@@ -23,7 +23,6 @@ import difflib
 import sys
 import json
 import re
-from PIL import Image, ImageTk
 
 EMAIL_REGEX = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
@@ -1302,7 +1301,7 @@ class ReviewDocumentDialog(tk.Toplevel):
 
             img = self.app.capture_diff_diagram(node)
             if img:
-                from PIL import ImageTk
+                from PIL import Image, ImageTk
                 img = img.resize((img.width // 2, img.height // 2), Image.LANCZOS)
                 photo = ImageTk.PhotoImage(img)
                 self.images.append(photo)
@@ -2452,6 +2451,7 @@ class VersionCompareDialog(tk.Toplevel):
 
     def on_close(self):
         self.app.diff_nodes = []
+        self.app.versions.evict()
         try:
             if hasattr(self.app, "canvas") and self.app.canvas.winfo_exists():
                 self.app.redraw_canvas()
@@ -20,7 +20,14 @@ from analysis.models import (
     calc_asil,
 )
 from analysis.fmeda_utils import compute_fmeda_metrics
+from analysis.compression import open_file
 from analysis.constants import CHECK_MARK, CROSS_MARK
+from analysis.change_journal import (
+    ANALYSIS_ROW_CHANGED,
+    DOCUMENT_CHANGED,
+    HARA_CHANGED,
+    HAZOP_CHANGED,
+)
 
 
 def _total_fit_from_boms(boms):
@@ -225,7 +232,7 @@ class ReliabilityWindow(tk.Toplevel):
         if not path:
             return
         self.components.clear()
-        with open(path, newline="") as f:
+        with open_file(path, "r", newline="") as f:
             reader = csv.DictReader(f)
             fields = reader.fieldnames or []
             mapping = self.ask_mapping(fields)
@@ -611,6 +618,7 @@ class FI2TCWindow(tk.Frame):
         if getattr(dlg, "result", None):
             self.app.fi2tc_entries.append(dlg.data)
             self.refresh()
+            self.app.notify_change(ANALYSIS_ROW_CHANGED, "fi2tc_docs", self.app.active_fi2tc)
     def edit_row(self):
         sel = self.tree.focus()
         if not sel:
@@ -620,6 +628,7 @@ class FI2TCWindow(tk.Frame):
         dlg = self.RowDialog(self, self.app, data)
         if getattr(dlg, "result", None):
             self.refresh()
+            self.app.notify_change(ANALYSIS_ROW_CHANGED, "fi2tc_docs", self.app.active_fi2tc)
     def del_row(self):
         sel = self.tree.selection()
         for iid in sel:
@@ -627,11 +636,12 @@ class FI2TCWindow(tk.Frame):
             if idx < len(self.app.fi2tc_entries):
                 del self.app.fi2tc_entries[idx]
         self.refresh()
+        self.app.notify_change(ANALYSIS_ROW_CHANGED, "fi2tc_docs", self.app.active_fi2tc)
     def export_csv(self):
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")])
         if not path:
             return
-        with open(path, "w", newline="") as f:
+        with open_file(path, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(self.COLS)
             for r in self.app.fi2tc_entries:
@@ -665,7 +675,7 @@ class FI2TCWindow(tk.Frame):
         self.app.fi2tc_entries = doc.entries
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "fi2tc_docs")
 
     def rename_doc(self):
         if not self.app.active_fi2tc:
@@ -677,7 +687,7 @@ class FI2TCWindow(tk.Frame):
             return
         self.app.active_fi2tc.name = name
         self.refresh_docs()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "fi2tc_docs")
 
     def delete_doc(self):
         doc = self.app.active_fi2tc
@@ -695,7 +705,7 @@ class FI2TCWindow(tk.Frame):
         )
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "fi2tc_docs")
 
 class HazopWindow(tk.Frame):
     def __init__(self, master, app):
@@ -771,7 +781,7 @@ class HazopWindow(tk.Frame):
         self.app.hazop_entries = doc.entries
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "hazops")
 
     def refresh(self):
         self.tree.delete(*self.tree.get_children())
@@ -885,6 +895,7 @@ class HazopWindow(tk.Frame):
             self.row.rationale = self.rat.get("1.0", "end-1c")
             self.row.covered = self.cov.get() == "Yes"
             self.row.covered_by = self.cov_by.get()
+            self.result = True
 
     def add_row(self):
         if not self.app.active_hazop:
@@ -894,6 +905,7 @@ class HazopWindow(tk.Frame):
         if dlg.row.function:
             self.app.hazop_entries.append(dlg.row)
             self.refresh()
+            self.app.notify_change(HAZOP_CHANGED, "hazops", dlg.row)
 
     def edit_row(self):
         sel = self.tree.focus()
@@ -901,8 +913,12 @@ class HazopWindow(tk.Frame):
             return
         idx = self.tree.index(sel)
         row = self.app.hazop_entries[idx]
+        before = copy.copy(row)
         dlg = self.RowDialog(self, row)
+        if not dlg.result or row == before:
+            return
         self.refresh()
+        self.app.notify_change(HAZOP_CHANGED, "hazops", row)
 
     def del_row(self):
         sel = self.tree.selection()
@@ -911,6 +927,7 @@ class HazopWindow(tk.Frame):
             if idx < len(self.app.hazop_entries):
                 del self.app.hazop_entries[idx]
         self.refresh()
+        self.app.notify_change(HAZOP_CHANGED, "hazops", self.app.active_hazop)
 
     def load_analysis(self):
         if not self.app.reliability_analyses:
@@ -1066,7 +1083,7 @@ class HaraWindow(tk.Frame):
         self.status_lbl.config(text=f"Status: {doc.status}")
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "haras")
 
     def refresh(self):
         self.tree.delete(*self.tree.get_children())
@@ -1079,7 +1096,7 @@ class HaraWindow(tk.Frame):
                 row.asil, row.safety_goal
             ]
             self.tree.insert("", "end", values=vals)
-        self.app.sync_hara_to_safety_goals()
+        self.app.propagate_hara_change(self.app.active_hara, requirements=False)
 
     class RowDialog(simpledialog.Dialog):
         def __init__(self, parent, app, row=None):
@@ -1180,6 +1197,7 @@ class HaraWindow(tk.Frame):
             self.app.invalidate_reviews_for_hara(self.app.active_hara.name)
             self.status_lbl.config(text=f"Status: {self.app.active_hara.status}")
         self.refresh()
+        self.app.notify_change(HARA_CHANGED, "haras", dlg.row)
 
     def edit_row(self):
         sel = self.tree.focus()
@@ -1193,6 +1211,7 @@ class HaraWindow(tk.Frame):
             self.app.invalidate_reviews_for_hara(self.app.active_hara.name)
             self.status_lbl.config(text=f"Status: {self.app.active_hara.status}")
         self.refresh()
+        self.app.notify_change(HARA_CHANGED, "haras", self.app.hara_entries[idx])
 
     def del_row(self):
         sel = self.tree.selection()
@@ -1206,15 +1225,18 @@ class HaraWindow(tk.Frame):
             self.app.invalidate_reviews_for_hara(self.app.active_hara.name)
             self.status_lbl.config(text=f"Status: {self.app.active_hara.status}")
         self.refresh()
+        self.app.notify_change(HARA_CHANGED, "haras", self.app.active_hara)
 
     def approve_doc(self):
         if not self.app.active_hara:
             return
         self.app.active_hara.status = "closed"
         self.app.active_hara.approved = True
-        self.app.update_hara_statuses()
-        self.app.ensure_asil_consistency()
-        self.app.update_views()
+        with self.app.journal.batch():
+            self.app.update_hara_statuses()
+            # Only goals and requirements depending on this HARA are updated.
+            self.app.propagate_hara_change(self.app.active_hara)
+            self.app.notify_change(HARA_CHANGED, "haras", self.app.active_hara)
         messagebox.showinfo("HARA", "HARA approved")
 
 
@@ -1388,6 +1410,7 @@ class TC2FIWindow(tk.Frame):
         if getattr(dlg, "result", None):
             self.app.tc2fi_entries.append(dlg.data)
             self.refresh()
+            self.app.notify_change(ANALYSIS_ROW_CHANGED, "tc2fi_docs", self.app.active_tc2fi)
 
     def edit_row(self):
         sel = self.tree.focus()
@@ -1398,6 +1421,7 @@ class TC2FIWindow(tk.Frame):
         dlg = self.RowDialog(self, self.app, data)
         if getattr(dlg, "result", None):
             self.refresh()
+            self.app.notify_change(ANALYSIS_ROW_CHANGED, "tc2fi_docs", self.app.active_tc2fi)
 
     def del_row(self):
         sel = self.tree.selection()
@@ -1406,12 +1430,13 @@ class TC2FIWindow(tk.Frame):
             if idx < len(self.app.tc2fi_entries):
                 del self.app.tc2fi_entries[idx]
         self.refresh()
+        self.app.notify_change(ANALYSIS_ROW_CHANGED, "tc2fi_docs", self.app.active_tc2fi)
 
     def export_csv(self):
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if not path:
             return
-        with open(path, "w", newline="") as f:
+        with open_file(path, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(self.COLS)
             for r in self.app.tc2fi_entries:
@@ -1445,7 +1470,7 @@ class TC2FIWindow(tk.Frame):
         self.app.tc2fi_entries = doc.entries
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "tc2fi_docs")
 
     def rename_doc(self):
         if not self.app.active_tc2fi:
@@ -1457,7 +1482,7 @@ class TC2FIWindow(tk.Frame):
             return
         self.app.active_tc2fi.name = name
         self.refresh_docs()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "tc2fi_docs")
 
     def delete_doc(self):
         doc = self.app.active_tc2fi
@@ -1475,7 +1500,7 @@ class TC2FIWindow(tk.Frame):
         )
         self.refresh_docs()
         self.refresh()
-        self.app.update_views()
+        self.app.notify_change(DOCUMENT_CHANGED, "tc2fi_docs")
 
 class HazardExplorerWindow(tk.Toplevel):
     """Read-only list of hazards per HARA."""
@@ -1509,7 +1534,7 @@ class HazardExplorerWindow(tk.Toplevel):
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if not path:
             return
-        with open(path, "w", newline="") as f:
+        with open_file(path, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(["HARA", "Malfunction", "Hazard"])
             for iid in self.tree.get_children():
@@ -4,6 +4,8 @@ from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional
 import os
 
+from analysis.compression import open_file
+
 @dataclass
 class SysMLElement:
     """Basic AutoML element stored in the repository."""
@@ -41,6 +43,8 @@ class SysMLRepository:
     _instance = None
 
     def __init__(self):
+        self._listeners = []
+        self._pending_load = None
         self.elements: Dict[str, SysMLElement] = {}
         self.relationships: List[SysMLRelationship] = []
         self.diagrams: Dict[str, SysMLDiagram] = {}
@@ -52,14 +56,46 @@ class SysMLRepository:
     def get_instance(cls) -> "SysMLRepository":
         if cls._instance is None:
             cls._instance = SysMLRepository()
+        cls._instance._run_pending_load()
         return cls._instance
 
+    def load_later(self, loader) -> None:
+        """Call ``loader()`` the next time the repository is requested.
+
+        The loader is expected to fill the repository, e.g. through
+        :meth:`from_dict`.  ``None`` cancels a pending loader.
+        """
+        self._pending_load = loader
+
+    def _run_pending_load(self) -> None:
+        loader, self._pending_load = self._pending_load, None
+        if loader is not None:
+            loader()
+
     def create_element(self, elem_type: str, name: str = "", properties: Optional[Dict[str, str]] = None, owner: Optional[str] = None) -> SysMLElement:
         elem_id = str(uuid.uuid4())
         elem = SysMLElement(elem_id, elem_type, name, properties or {}, owner=owner)
         self.elements[elem_id] = elem
+        self.notify_change("element", elem_id)
         return elem
 
+    # ------------------------------------------------------------------
+    # Change notification
+    # ------------------------------------------------------------------
+    def add_listener(self, callback) -> None:
+        """Call ``callback(kind, obj_id)`` whenever the repository changes."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def notify_change(self, kind: str, obj_id: Optional[str] = None) -> None:
+        """Inform listeners that an element, relationship or diagram changed."""
+        for cb in list(self._listeners):
+            cb(kind, obj_id)
+
     # ------------------------------------------------------------------
     # Convenience helpers
     # ------------------------------------------------------------------
@@ -84,23 +120,27 @@ class SysMLRepository:
             package = self.root_package.elem_id
         diagram = SysMLDiagram(diag_id, diag_type, name, package, description, color)
         self.diagrams[diag_id] = diagram
+        self.notify_change("diagram", diag_id)
         return diagram
 
     def add_element_to_diagram(self, diag_id: str, elem_id: str) -> None:
         diag = self.diagrams.get(diag_id)
         if diag and elem_id not in diag.elements:
             diag.elements.append(elem_id)
+            self.notify_change("diagram", diag_id)
 
     def add_relationship_to_diagram(self, diag_id: str, rel_id: str) -> None:
         diag = self.diagrams.get(diag_id)
         if diag and rel_id not in diag.relationships:
             diag.relationships.append(rel_id)
+            self.notify_change("diagram", diag_id)
 
     def delete_element(self, elem_id: str) -> None:
         """Remove an element and any relationships referencing it."""
         if elem_id in self.elements:
             del self.elements[elem_id]
         self.relationships = [r for r in self.relationships if r.source != elem_id and r.target != elem_id]
+        self.notify_change("element", elem_id)
 
     def delete_package(self, pkg_id: str) -> None:
         """Delete a package and reassign its contents to the parent package."""
@@ -123,6 +163,7 @@ class SysMLRepository:
         for k, v in list(self.element_diagrams.items()):
             if v == diag_id:
                 del self.element_diagrams[k]
+        self.notify_change("diagram", diag_id)
 
     def get_element(self, elem_id: str) -> Optional[SysMLElement]:
         return self.elements.get(elem_id)
@@ -138,13 +179,14 @@ class SysMLRepository:
         return "::".join(reversed(parts))
 
     def save(self, path: str) -> None:
-        with open(path, "w", encoding="utf-8") as f:
+        """Write the repository to ``path``, compressed for .gz/.xz/.zst names."""
+        with open_file(path, "w", encoding="utf-8") as f:
             f.write(self.serialize())
 
     def load(self, path: str) -> None:
         if not os.path.exists(path):
             return
-        with open(path, "r", encoding="utf-8") as f:
+        with open_file(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         self.elements.clear()
         self.relationships.clear()
@@ -166,11 +208,13 @@ class SysMLRepository:
                 break
         if self.root_package is None:
             self.root_package = self.create_element("Package", name="Root")
+        self.notify_change("reset")
 
     def create_relationship(self, rel_type: str, source: str, target: str, stereotype: Optional[str] = None, properties: Optional[Dict[str, str]] = None) -> SysMLRelationship:
         rel_id = str(uuid.uuid4())
         rel = SysMLRelationship(rel_id, rel_type, source, target, stereotype, properties or {})
         self.relationships.append(rel)
+        self.notify_change("relationship", rel_id)
         return rel
 
     # ------------------------------------------------------------
@@ -182,6 +226,7 @@ class SysMLRepository:
             self.element_diagrams[elem_id] = diag_id
         else:
             self.element_diagrams.pop(elem_id, None)
+        self.notify_change("element", elem_id)
 
     def get_linked_diagram(self, elem_id: str) -> Optional[str]:
         return self.element_diagrams.get(elem_id)
@@ -221,6 +266,7 @@ class SysMLRepository:
                 break
         if self.root_package is None:
             self.root_package = self.create_element("Package", name="Root")
+        self.notify_change("reset")
 
     def get_activity_actions(self) -> list[str]:
         """Return all action names and activity diagram names."""
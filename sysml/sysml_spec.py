@@ -1,5 +1,7 @@
-import re
+import functools
 import os
+import re
+from collections.abc import Mapping
 
 
 def load_sysml_properties():
@@ -25,39 +27,60 @@ def load_sysml_properties():
         props[name] = attrs
     return props
 
-SYSML_PROPERTIES = load_sysml_properties()
-if 'BlockUsage' not in SYSML_PROPERTIES:
-    SYSML_PROPERTIES['BlockUsage'] = [
-        'valueProperties',
-        'partProperties',
-        'referenceProperties',
-        'ports',
-        'constraintProperties',
-        'operations',
-    ]
-if 'PortUsage' not in SYSML_PROPERTIES:
-    SYSML_PROPERTIES['PortUsage'] = []
-for p in ('direction', 'flow'):
-    if p not in SYSML_PROPERTIES['PortUsage']:
-        SYSML_PROPERTIES['PortUsage'].append(p)
-for p in ('labelX', 'labelY'):
-    if p not in SYSML_PROPERTIES['PortUsage']:
-        SYSML_PROPERTIES['PortUsage'].append(p)
-
-# ----------------------------------------------------------------------
-# Additional properties for reliability annotations
-# ----------------------------------------------------------------------
-# Blocks can represent circuits while parts map to components. Include
-# dedicated attributes to reference BOM items and store FIT, qualification
-# and failure mode details so they can be displayed in diagrams.
-
-SYSML_PROPERTIES.setdefault('BlockUsage', [])
-SYSML_PROPERTIES.setdefault('PartUsage', [])
-
-for prop in ('circuit', 'fit', 'qualification', 'failureModes'):
-    if prop not in SYSML_PROPERTIES['BlockUsage']:
-        SYSML_PROPERTIES['BlockUsage'].append(prop)
-
-for prop in ('component', 'failureModes', 'asil'):
-    if prop not in SYSML_PROPERTIES['PartUsage']:
-        SYSML_PROPERTIES['PartUsage'].append(prop)
+
+@functools.lru_cache(maxsize=None)
+def sysml_properties():
+    """Return the properties per SysML element type, parsing the XMI once."""
+    props = load_sysml_properties()
+    if 'BlockUsage' not in props:
+        props['BlockUsage'] = [
+            'valueProperties',
+            'partProperties',
+            'referenceProperties',
+            'ports',
+            'constraintProperties',
+            'operations',
+        ]
+    if 'PortUsage' not in props:
+        props['PortUsage'] = []
+    for p in ('direction', 'flow'):
+        if p not in props['PortUsage']:
+            props['PortUsage'].append(p)
+    for p in ('labelX', 'labelY'):
+        if p not in props['PortUsage']:
+            props['PortUsage'].append(p)
+
+    # ------------------------------------------------------------------
+    # Additional properties for reliability annotations
+    # ------------------------------------------------------------------
+    # Blocks can represent circuits while parts map to components. Include
+    # dedicated attributes to reference BOM items and store FIT, qualification
+    # and failure mode details so they can be displayed in diagrams.
+
+    props.setdefault('BlockUsage', [])
+    props.setdefault('PartUsage', [])
+
+    for prop in ('circuit', 'fit', 'qualification', 'failureModes'):
+        if prop not in props['BlockUsage']:
+            props['BlockUsage'].append(prop)
+
+    for prop in ('component', 'failureModes', 'asil'):
+        if prop not in props['PartUsage']:
+            props['PartUsage'].append(prop)
+    return props
+
+
+class _LazyProperties(Mapping):
+    """Read-only view of :func:`sysml_properties` parsed on first access."""
+
+    def __getitem__(self, key):
+        return sysml_properties()[key]
+
+    def __iter__(self):
+        return iter(sysml_properties())
+
+    def __len__(self):
+        return len(sysml_properties())
+
+
+SYSML_PROPERTIES = _LazyProperties()
@@ -0,0 +1,33 @@
+"""Model data shared by the tests of the headless analysis modules."""
+
+
+def node(uid, node_type, children=(), **fields):
+    return {"unique_id": uid, "type": node_type, "children": list(children), **fields}
+
+
+def model(fit=100.0, asil="B"):
+    """Return a braking model whose single top event has cut sets {3, 4} and {5}.
+
+    ``fit`` is the FIT rate of basic events 3 and 5; with its mission
+    time of 1000 h the PMHF target of ``asil`` is met for a
+    ``fit`` of 0.001 and violated for 100.
+    """
+    be1 = node(3, "Basic Event", user_name="Valve", fmeda_fit=fit, fmeda_diag_cov=0.9,
+               safety_requirements=[{"id": "R1", "req_type": "functional", "text": "t", "asil": "B"}])
+    be2 = node(4, "Basic Event", fmeda_fit=10.0)
+    gate = node(2, "Gate", [be1, be2], gate_type="AND")
+    top = node(1, "Top Event", [gate, node(5, "Basic Event", fmeda_fit=fit)],
+               user_name="Loss of braking", safety_goal_asil=asil, gate_type="OR")
+    return {
+        "top_events": [top],
+        "fmedas": [{"name": "Brake", "file": "brake.csv", "entries": [dict(be1, children=[])]}],
+        "mission_profiles": [{"name": "Urban", "tau_on": 1000.0}],
+        "haras": [{
+            "name": "H", "approved": True,
+            "entries": [{
+                "malfunction": "m", "hazard": "h", "severity": 3, "sev_rationale": "",
+                "controllability": 3, "cont_rationale": "", "exposure": 4, "exp_rationale": "",
+                "asil": asil, "safety_goal": "Loss of braking",
+            }],
+        }],
+    }
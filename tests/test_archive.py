@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+from analysis.archive import ArchiveReader, LazyList, missing_sections, sidecar_path, write_archive
+from analysis.model_io import read_archive_sections, read_model_data, write_model_data
+from analysis.version_history import VersionHistory
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = sidecar_path(os.path.join(self.tmp.name, "model.json"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sections_read_on_demand(self):
+        self.assertTrue(self.path.endswith("model.archive"))
+        write_archive(self.path, {"a": b"[1, 2]", "b": json.dumps({"x": 1}).encode()})
+        reader = ArchiveReader(self.path)
+        self.assertEqual(reader.names(), ["a", "b"])
+        self.assertEqual(reader.load("b"), {"x": 1})
+        self.assertEqual(reader.raw("a"), b"[1, 2]")
+        self.assertIsNone(reader.load("missing"))
+        # Re-opening after a rewrite keeps the same reader usable.
+        write_archive(self.path, {"b": b"2"})
+        reader.open(self.path)
+        self.assertEqual(reader.load("b"), 2)
+        self.assertFalse(ArchiveReader(os.path.join(self.tmp.name, "none")).has("b"))
+
+    def test_lazy_list(self):
+        calls = []
+        items = LazyList(loader=lambda: calls.append(1) or ["x", "y"])
+        self.assertFalse(items.loaded)
+        self.assertEqual(len(items), 2)
+        items.append("z")
+        self.assertEqual(list(items), ["x", "y", "z"])
+        self.assertEqual(calls, [1])
+        self.assertFalse(LazyList(loader=list))
+
+    def test_deferred_history(self):
+        history = VersionHistory()
+        history.add("v1", {"top_events": [{"unique_id": 1}]})
+        history.add("v2", {"top_events": [{"unique_id": 2}]})
+        write_archive(self.path, {"versions": json.dumps(history.to_json()).encode()})
+        reader = ArchiveReader(self.path)
+        manifest = json.loads(json.dumps(history.manifest()))
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return reader.load("versions")
+
+        deferred = VersionHistory.from_json(manifest, loader)
+        self.assertEqual((len(deferred), deferred[1]["name"]), (2, "v2"))
+        self.assertFalse(deferred.loaded)
+        self.assertEqual(deferred[0]["data"], {"top_events": [{"unique_id": 1}]})
+        self.assertTrue(deferred.evict())
+        self.assertEqual((deferred.loaded, deferred.names()), (False, ["v1", "v2"]))
+        deferred.add("v3", {"top_events": []})
+        self.assertEqual(len(loads), 2)
+        self.assertFalse(deferred.evict())
+        self.assertEqual(len(deferred), 3)
+
+    def test_missing_sections(self):
+        data = {
+            "versions": {"format": "delta-v1", "archived": True, "names": ["v1"]},
+            "reviews": [{"name": "R", "comments_archived": True}, {"name": "Open", "comments": []}],
+        }
+        self.assertEqual(missing_sections(data, ArchiveReader()), ["versions", "review:R"])
+        write_archive(self.path, {"versions": b"{}", "review:R": b"[]"})
+        self.assertEqual(missing_sections(data, ArchiveReader(self.path)), [])
+        # Older files wrote a manifest for an empty history without a section.
+        data = {"versions": VersionHistory().manifest()}
+        self.assertEqual(missing_sections(data, ArchiveReader()), [])
+
+    def test_reopen_model_without_versions(self):
+        for name in ("model.json", "model.automl", "model.db"):
+            path = os.path.join(self.tmp.name, name)
+            write_model_data(path, {"top_events": [], "reviews": []}, {})
+            reopened = read_model_data(path)
+            self.assertNotIn("versions", reopened)
+            sections = read_archive_sections(path)
+            self.assertEqual(sections, {})
+            self.assertEqual(missing_sections(reopened, ArchiveReader()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
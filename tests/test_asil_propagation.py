@@ -0,0 +1,63 @@
+import unittest
+from analysis.asil_propagation import AsilGraph
+from analysis.models import HaraDoc, HaraEntry, RequirementStore
+
+
+def entry(goal, asil, sev=1, cont=1):
+    return HaraEntry("m", "h", sev, "", cont, "", 1, "", asil, goal)
+
+
+class GoalIndex:
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self.queries = []
+
+    def requirement_ids_for_goals(self, goals):
+        self.queries.append(set(goals))
+        return [rid for g in sorted(goals) for rid in self.mapping.get(g, [])]
+
+
+class AsilGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.doc1 = HaraDoc("H1", [], [entry("SG1", "B", 2, 2), entry("SG2", "A")], True, "closed")
+        self.doc2 = HaraDoc("H2", [], [entry("SG1", "C", 1, 3)], True, "closed")
+        self.graph = AsilGraph()
+        self.assertEqual(self.graph.rebuild([self.doc1, self.doc2]), {"SG1", "SG2"})
+
+    def test_aggregates_across_documents(self):
+        self.assertEqual(self.graph.goal_data("SG1"), ("C", 2, 3))
+        self.assertEqual(self.graph.goal_asil("SG2"), "A")
+        self.assertEqual(self.graph.goal_asil("missing"), "QM")
+
+    def test_row_edit_touches_only_its_goals(self):
+        self.doc1.entries[1].asil = "D"
+        self.assertEqual(self.graph.update_doc(self.doc1), {"SG2"})
+        self.assertEqual(self.graph.update_doc(self.doc1), set())
+        # Lowering a value masked by another document changes nothing.
+        self.doc1.entries[0].asil = "A"
+        self.assertEqual(self.graph.update_doc(self.doc1), set())
+        self.assertEqual(self.graph.goal_asil("SG1"), "C")
+
+    def test_unapproved_documents_do_not_count(self):
+        self.doc2.approved = False
+        self.doc2.status = "draft"
+        self.assertEqual(self.graph.update_doc(self.doc2), {"SG1"})
+        self.assertEqual(self.graph.goal_data("SG1"), ("B", 2, 2))
+        self.assertEqual(self.graph.remove_doc(self.doc1), {"SG1", "SG2"})
+        self.assertIsNone(self.graph.goal_data("SG1"))
+
+    def test_affected_requirements_follow_decomposition(self):
+        store = RequirementStore()
+        store["R1"] = {"id": "R1", "parent_id": ""}
+        store["R1a"] = {"id": "R1a", "parent_id": "R1"}
+        store["R1a1"] = {"id": "R1a1", "parent_id": "R1a"}
+        store["R2"] = {"id": "R2", "parent_id": ""}
+        index = GoalIndex({"SG1": ["R1", "R1a"], "SG2": ["R2"]})
+        direct, decomposed = AsilGraph.affected_requirements({"SG1"}, index, store)
+        self.assertEqual(direct, ["R1"])
+        self.assertEqual(decomposed, ["R1a", "R1a1"])
+        self.assertEqual(index.queries, [{"SG1"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
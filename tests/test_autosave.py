@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from analysis.autosave import AutosaveJournal, Autosaver, read_records, session_key
+
+
+class AutosaveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = AutosaveJournal.for_model("/models/a.json", self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_session_key(self):
+        self.assertEqual(session_key("/models/a.json"), session_key("/models/../models/a.json"))
+        self.assertNotEqual(session_key(None), session_key("/models/a.json"))
+
+    def test_recover_merges_records_and_stops_at_torn_write(self):
+        self.journal.append({"model_path": "/models/a.json", "full": False}, {"a": b"1", "b": b"[2]"})
+        self.journal.append({"full": False}, {"b": b"[3]"})
+        with open(self.journal.path, "ab") as f:
+            f.write(b"\x10\x00\x00\x00garbage")
+        meta, sections = self.journal.recover()
+        self.assertEqual(sections, {"a": 1, "b": [3]})
+        self.assertEqual((meta["model_path"], meta["full"]), ("/models/a.json", False))
+        self.assertEqual([j.path for j in AutosaveJournal.sessions(self.tmp.name)], [self.journal.path])
+        self.journal.discard()
+        self.assertFalse(self.journal.exists())
+
+    def test_worker_appends_and_compacts(self):
+        saver = Autosaver(self.journal)
+        saver.COMPACT_EVERY = 3
+        saver.submit({"top_events": b"[1]", "fmeas": b"[]"}, {"model_path": None}, full=True)
+        saver.submit({"fmeas": b'[{"name":"F"}]'})
+        saver.flush()
+        meta, sections = self.journal.recover()
+        self.assertTrue(meta["full"])
+        self.assertEqual(sections, {"top_events": [1], "fmeas": [{"name": "F"}]})
+        self.assertEqual(len(list(read_records(self.journal.path))), 2)
+        saver.submit({"top_events": b"[2]"})
+        saver.flush()
+        # The third record compacted the journal into a single full record.
+        self.assertEqual(len(list(read_records(self.journal.path))), 1)
+        meta, sections = self.journal.recover()
+        self.assertTrue(meta["full"])
+        self.assertEqual(sections, {"top_events": [2], "fmeas": [{"name": "F"}]})
+        other = AutosaveJournal.for_model(None, self.tmp.name)
+        saver.reset(other)
+        saver.submit({"top_events": b"[]"})
+        saver.stop()
+        self.assertFalse(self.journal.exists())
+        self.assertEqual(other.recover()[1], {"top_events": []})
+        self.assertIsNone(saver.last_error)
+
+    def test_failed_sections_are_reported(self):
+        # The journal directory is a file, so appending fails.
+        blocker = os.path.join(self.tmp.name, "blocker")
+        open(blocker, "w").close()
+        saver = Autosaver(AutosaveJournal.for_model(None, blocker))
+        saver.submit({"haras": b"[]", "reviews": b"[]"})
+        saver.stop()
+        self.assertIsNotNone(saver.last_error)
+        self.assertEqual(saver.take_failed(), {"haras", "reviews"})
+        self.assertEqual(saver.take_failed(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
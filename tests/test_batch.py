@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+
+from analysis import batch
+from project_fixture import model
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        for name, data in (("a.json", model(fit=0.001)), ("b.json", model(fit=100.0))):
+            with open(os.path.join(self.dir, name), "w") as f:
+                json.dump(data, f)
+        os.mkdir(os.path.join(self.dir, "sub"))
+        with open(os.path.join(self.dir, "sub", "broken.json"), "w") as f:
+            f.write("{")
+        with open(os.path.join(self.dir, "notes.txt"), "w") as f:
+            f.write("not a model")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collect_paths(self):
+        paths = batch.collect_paths([self.dir, os.path.join(self.dir, "*.json")])
+        names = [os.path.relpath(p, self.dir) for p in paths]
+        self.assertEqual(names, ["a.json", "b.json", os.path.join("sub", "broken.json")])
+
+    def test_failures_are_isolated(self):
+        paths = batch.collect_paths([self.dir])
+        for workers in (1, 2):
+            report = batch.run_batch(paths, workers=workers)
+            statuses = [e["status"] for e in report["files"]]
+            self.assertEqual(statuses, [batch.PASSED, batch.VIOLATION, batch.FAILED])
+            self.assertEqual(report["summary"]["files"], 3)
+            self.assertIn("ModelFormatError", report["files"][2]["error"])
+            self.assertIn("load_seconds", report["files"][0])
+            self.assertEqual(set(report["files"][0]) & set(batch.CHECKS), set(batch.DEFAULT_CHECKS))
+
+    def test_exit_status(self):
+        out = os.path.join(self.dir, "report.out")
+        self.assertEqual(batch.main([os.path.join(self.dir, "a.json"), "-j", "1", "-o", out]), batch.EXIT_OK)
+        self.assertEqual(batch.main([self.dir, "-j", "1", "-o", out]), batch.EXIT_ERROR)
+        with open(out) as f:
+            self.assertEqual(json.load(f)["summary"]["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
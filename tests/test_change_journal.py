@@ -0,0 +1,73 @@
+import unittest
+from analysis.change_journal import (
+    ChangeJournal,
+    NODE_CHANGED,
+    STRUCTURE_CHANGED,
+    FMEA_ROW_CHANGED,
+)
+from sysml.sysml_repository import SysMLRepository
+
+
+class ChangeJournalTests(unittest.TestCase):
+    def test_subscribers_receive_matching_kinds(self):
+        journal = ChangeJournal()
+        nodes, everything = [], []
+        journal.subscribe(nodes.append, NODE_CHANGED)
+        journal.subscribe(everything.append)
+        journal.publish(NODE_CHANGED, "top_events", "n1")
+        journal.publish(FMEA_ROW_CHANGED, "fmeas", "doc")
+        self.assertEqual([e.target for e in nodes], ["n1"])
+        self.assertEqual([e.kind for e in everything], [NODE_CHANGED, FMEA_ROW_CHANGED])
+
+    def test_unsubscribe(self):
+        journal = ChangeJournal()
+        events = []
+        journal.subscribe(events.append, NODE_CHANGED)
+        journal.unsubscribe(events.append)
+        journal.publish(NODE_CHANGED)
+        self.assertEqual(events, [])
+
+    def test_batch_coalesces_duplicates(self):
+        journal = ChangeJournal()
+        events = []
+        journal.subscribe(events.append)
+        target = object()
+        with journal.batch():
+            journal.publish(NODE_CHANGED, "top_events", target, field="name")
+            with journal.batch():
+                journal.publish(NODE_CHANGED, "top_events", target, value=2)
+            journal.publish(STRUCTURE_CHANGED, "top_events", target)
+            self.assertEqual(events, [])
+        self.assertEqual([e.kind for e in events], [NODE_CHANGED, STRUCTURE_CHANGED])
+        self.assertEqual(events[0].data, {"field": "name", "value": 2})
+        self.assertEqual(events[0].seq, 2)
+
+    def test_since_returns_newer_events(self):
+        journal = ChangeJournal(history=2)
+        journal.publish(NODE_CHANGED)
+        mark = journal.last_seq
+        journal.publish(STRUCTURE_CHANGED)
+        journal.publish(FMEA_ROW_CHANGED)
+        self.assertEqual([e.kind for e in journal.since(mark)], [STRUCTURE_CHANGED, FMEA_ROW_CHANGED])
+        self.assertEqual(len(journal.since(0)), 2)
+
+
+class RepositoryListenerTests(unittest.TestCase):
+    def setUp(self):
+        SysMLRepository._instance = None
+        self.repo = SysMLRepository.get_instance()
+        self.changes = []
+        self.repo.add_listener(lambda kind, obj_id: self.changes.append((kind, obj_id)))
+
+    def test_repository_reports_changes(self):
+        blk = self.repo.create_element("Block", name="B")
+        diag = self.repo.create_diagram("Block Diagram", name="D")
+        self.repo.add_element_to_diagram(diag.diag_id, blk.elem_id)
+        self.repo.delete_diagram(diag.diag_id)
+        kinds = [k for k, _ in self.changes]
+        self.assertEqual(kinds, ["element", "diagram", "diagram", "diagram"])
+        self.assertEqual(self.changes[0][1], blk.elem_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from analysis.clone_registry import CloneRegistry, CLONE_SHARED_ATTRIBUTES
+
+
+class DummyNode:
+    def __init__(self, uid, primary=True, original_id=None):
+        self.unique_id = uid
+        self.is_primary_instance = primary
+        self.original = self
+        self._original_id = original_id
+        self.node_type = "GATE"
+        self.display_label = ""
+        self.children = []
+        self.parents = []
+        for attr in CLONE_SHARED_ATTRIBUTES:
+            setattr(self, attr, None)
+        self.x = 0
+        self.y = 0
+
+    def add(self, child):
+        self.children.append(child)
+        child.parents.append(self)
+        return child
+
+
+class CloneRegistryTests(unittest.TestCase):
+    def build(self):
+        top = DummyNode(1)
+        gate = top.add(DummyNode(2))
+        other = top.add(DummyNode(3))
+        # Clone listed before its primary to check resolution order.
+        clone = DummyNode(4, primary=False, original_id=2)
+        top.children.insert(0, clone)
+        clone.parents.append(top)
+        return top, gate, other, clone
+
+    def test_rebuild_resolves_clones(self):
+        top, gate, other, clone = self.build()
+        reg = CloneRegistry().rebuild([top])
+        self.assertIs(clone.original, gate)
+        self.assertIs(reg.primary(2), gate)
+        self.assertEqual(reg.instances(2), [clone])
+        self.assertEqual(reg.instances(3), [])
+
+    def test_missing_primary_references_self(self):
+        orphan = DummyNode(9, primary=False, original_id=99)
+        CloneRegistry().rebuild([orphan])
+        self.assertIs(orphan.original, orphan)
+
+    def test_sync_only_touches_clones(self):
+        top, gate, other, clone = self.build()
+        reg = CloneRegistry().rebuild([top])
+        gate.user_name = "Renamed"
+        gate.display_label = "L"
+        gate.x = 500
+        touched = reg.sync(gate)
+        self.assertEqual(touched, [clone])
+        self.assertEqual(clone.user_name, "Renamed")
+        self.assertEqual(clone.display_label, "L (clone)")
+        self.assertEqual(clone.x, 0)
+        self.assertIsNone(other.user_name)
+
+    def test_sync_from_clone_uses_primary(self):
+        top, gate, other, clone = self.build()
+        reg = CloneRegistry().rebuild([top])
+        gate.description = "desc"
+        reg.sync(clone)
+        self.assertEqual(clone.description, "desc")
+
+    def test_duplicate_primaries(self):
+        top = DummyNode(1)
+        a = top.add(DummyNode(5))
+        b = top.add(DummyNode(5))
+        reg = CloneRegistry().rebuild([top])
+        a.user_name = "Shared"
+        a.node_type = "RIGOR LEVEL"
+        reg.sync(a)
+        self.assertEqual(b.user_name, "Shared")
+        self.assertEqual(b.node_type, "RIGOR LEVEL")
+
+    def test_register_and_unregister(self):
+        top, gate, other, clone = self.build()
+        reg = CloneRegistry().rebuild([top])
+        extra = DummyNode(10, primary=False)
+        extra.original = gate
+        reg.register(extra)
+        self.assertEqual(len(reg.instances(2)), 2)
+        reg.unregister_subtree(extra)
+        self.assertEqual(reg.instances(2), [clone])
+        reg.unregister(gate)
+        self.assertIsNone(reg.primary(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
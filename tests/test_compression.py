@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+from analysis import compression
+from analysis.compression import codec_for_path, detect, open_file
+from analysis.model_loader import load_model_file
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_round_trip_detected_by_magic(self):
+        data = {"top_events": [{"unique_id": i, "children": []} for i in range(200)]}
+        for name, codec in (("m.json", None), ("m.json.gz", "gzip"), ("m.json.xz", "xz")):
+            with open_file(self.path(name), "w") as f:
+                json.dump(data, f, indent=4)
+            with open(self.path(name), "rb") as f:
+                self.assertEqual(detect(f.read(6)), codec)
+            self.assertEqual(codec_for_path(name), codec)
+            # The extension only matters for writing.
+            os.replace(self.path(name), self.path("renamed"))
+            seen = []
+            self.assertEqual(load_model_file(self.path("renamed"), progress=seen.append), data)
+            self.assertEqual(seen[-1], 1.0)
+        self.assertLess(os.path.getsize(self.path("renamed")), len(json.dumps(data, indent=4)) / 10)
+
+    def test_csv_text_mode(self):
+        with open_file(self.path("rows.csv.gz"), "w", newline="") as f:
+            f.write("a,b\r\n1,2\r\n")
+        with open_file(self.path("rows.csv.gz"), "r", newline="") as f:
+            self.assertEqual(f.read(), "a,b\r\n1,2\r\n")
+
+    @unittest.skipIf(compression.zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        with open_file(self.path("m.json.zst"), "wb") as f:
+            f.write(b'{"a": 1}')
+        with open_file(self.path("m.json.zst"), "rb") as f:
+            self.assertEqual(f.read(), b'{"a": 1}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import math
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from analysis.archive import ArchiveReader, sidecar_path
+from analysis.core import FaultTreeNode, Project, cut_sets, failure_probability, read_model_data, write_model_data
+from project_fixture import model
+
+
+class CoreTests(unittest.TestCase):
+    def test_calculations(self):
+        top = FaultTreeNode("Top", "Top Event")
+        top.gate_type = "OR"
+        gate = FaultTreeNode("Gate", "Gate")
+        a, b, c = (FaultTreeNode(n, "Basic Event") for n in "abc")
+        gate.children = [a, b]
+        top.children = [gate, c]
+        self.assertEqual(cut_sets(top), [{a.unique_id, b.unique_id}, {c.unique_id}])
+        a.fmeda_fit = 100.0
+        self.assertAlmostEqual(failure_probability(a, tau=10.0), 1e-6)
+        a.prob_formula = "exponential"
+        self.assertAlmostEqual(failure_probability(a, tau=10.0), 1 - math.exp(-1e-6))
+        a.prob_formula, a.failure_prob = "constant", 0.5
+        self.assertEqual(failure_probability(a), 0.5)
+
+    def test_pickle_project(self):
+        project = Project(model(fit=0.001))
+        copy = pickle.loads(pickle.dumps(project))
+        self.assertEqual(copy.analyze(), project.analyze())
+        self.assertEqual([n.unique_id for n in copy.all_nodes()], [1, 2, 3, 4, 5])
+        self.assertEqual(copy.fmedas[0]["entries"][0].fmeda_fit, 0.001)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.json.gz")
+            Project(model(fit=0.001)).save(path)
+            data = read_model_data(path)
+            self.assertIsInstance(data["top_events"][0], FaultTreeNode)
+            project = Project.load(path)
+            self.assertEqual(project.top_events[0].user_name, "Loss of braking")
+            self.assertEqual(project.mission_profiles[0].tau_on, 1000.0)
+
+    def test_save_keeps_other_sections_and_archive(self):
+        data = model()
+        data["hazops"] = [{"name": "HZ", "entries": []}]
+        data["reviews"] = [{"name": "R", "closed": True, "comments": [], "comments_archived": True}]
+        data["versions"] = {"format": "delta-v1", "archived": True, "names": ["v1"]}
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "model.json")
+            write_model_data(src, data, {"versions": b'{"v": 1}', "review:R": b'[{"text": "c"}]'})
+            dst = os.path.join(tmp, "copy.json")
+            Project.load(src).save(dst)
+            saved = read_model_data(dst)
+            for key in ("hazops", "reviews", "versions"):
+                self.assertEqual(saved[key], data[key])
+            archive = ArchiveReader(sidecar_path(dst))
+            self.assertEqual(archive.load("review:R"), [{"text": "c"}])
+            Project.load(dst).save(dst)
+            self.assertEqual(ArchiveReader(sidecar_path(dst)).load("versions"), {"v": 1})
+
+    def test_does_not_import_tkinter(self):
+        code = "import sys, analysis.core; print(sorted({'tkinter', 'PIL', 'reportlab'} & set(sys.modules)))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from analysis.csv_export import CsvExportCache
+
+
+class CsvExportCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fmea.csv")
+        self.cache = CsvExportCache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged_rows_are_not_rewritten(self):
+        header = ["Component", "RPN"]
+        self.assertTrue(self.cache.write(self.path, header, [["A", 6], ["B", 1]]))
+        with open(self.path, newline="") as f:
+            self.assertEqual(f.read(), "Component,RPN\r\nA,6\r\nB,1\r\n")
+        self.assertFalse(self.cache.write(self.path, header, iter([["A", 6], ["B", 1]])))
+        self.assertTrue(self.cache.write(self.path, header, [["A", 6]]))
+        self.assertTrue(self.cache.write(self.path, header, [["A", 6]], force=True))
+
+    def test_external_changes_trigger_rewrite(self):
+        rows = [["A", 6]]
+        self.cache.write(self.path, ["C", "R"], rows)
+        with open(self.path, "a") as f:
+            f.write("edited elsewhere\n")
+        self.assertTrue(self.cache.write(self.path, ["C", "R"], rows))
+        os.remove(self.path)
+        self.assertTrue(self.cache.write(self.path, ["C", "R"], rows))
+        self.cache.forget(self.path)
+        self.assertTrue(self.cache.write(self.path, ["C", "R"], rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from analysis.dirty_tracker import DirtyTracker, encode_section, section_digest, text_digest
+
+
+class DirtyTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.data = {"top_events": [{"id": 1, "name": "TE"}], "fmeas": []}
+        self.tracker = DirtyTracker()
+        self.tracker.mark_saved(self.data)
+
+    def provider(self):
+        self.calls += 1
+        return self.data
+
+    def test_clean_model(self):
+        self.calls = 0
+        self.assertFalse(self.tracker.is_dirty(self.provider))
+        self.assertEqual(self.calls, 1)
+
+    def test_journaled_change_skips_export(self):
+        self.calls = 0
+        self.tracker.mark("fmeas")
+        self.assertEqual(self.tracker.dirty_sections(), ["fmeas"])
+        self.assertTrue(self.tracker.is_dirty(self.provider))
+        self.assertEqual(self.calls, 0)
+        self.tracker.mark_saved(self.data)
+        self.assertEqual(self.tracker.dirty_sections(), [])
+
+    def test_unjournaled_change_detected_by_digest(self):
+        self.calls = 0
+        self.data["top_events"][0]["name"] = "Renamed"
+        self.assertTrue(self.tracker.is_dirty(self.provider))
+        self.data["top_events"][0]["name"] = "TE"
+        self.assertFalse(self.tracker.is_dirty(self.provider))
+
+    def test_new_section_is_dirty(self):
+        self.calls = 0
+        self.data["haras"] = []
+        self.assertTrue(self.tracker.is_dirty(self.provider))
+
+    def test_journaled_sections_are_not_exported(self):
+        tracker = DirtyTracker(journaled={"top_events"})
+        tracker.mark_saved(self.data)
+        self.assertEqual(list(tracker.saved_digests()), ["fmeas"])
+        # Only the sections without journal coverage are compared.
+        self.assertFalse(tracker.is_dirty(lambda: {"fmeas": []}))
+        self.assertTrue(tracker.is_dirty(lambda: {"fmeas": [{"name": "F"}]}))
+        tracker.mark("top_events")
+        self.assertTrue(tracker.is_dirty(lambda: self.fail("exported")))
+
+    def test_digest_ignores_key_order(self):
+        self.assertEqual(section_digest({"a": 1, "b": 2}), section_digest({"b": 2, "a": 1}))
+
+    def test_saved_digests_match_encoded_sections(self):
+        digests = self.tracker.saved_digests()
+        self.assertEqual(digests["top_events"], text_digest(encode_section(self.data["top_events"])))
+        digests.clear()
+        self.assertEqual(len(self.tracker.saved_digests()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
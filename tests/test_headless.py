@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from analysis import cli
+from analysis.headless import Project
+from project_fixture import model, node
+
+
+class HeadlessProjectTests(unittest.TestCase):
+    def test_pmhf_and_cut_sets(self):
+        project = Project(model(fit=0.001))
+        pmhf = project.pmhf()
+        # P(5) = 1e-12 * 1000, P(gate) = P(3) * P(4) is negligible
+        self.assertAlmostEqual(pmhf["total"], 1e-9, delta=1e-12)
+        self.assertTrue(pmhf["ok"])
+        cuts = project.cut_sets()["top_events"][0]["cut_sets"]
+        self.assertEqual(cuts, [[3, 4], [5]])
+
+    def test_violations(self):
+        project = Project(model(fit=100.0))
+        report = project.analyze()
+        self.assertFalse(report["pmhf"]["ok"])
+        self.assertFalse(report["ok"])
+        project = Project(model(fit=0.001, asil="D"))
+        project.top_events[0].safety_goal_asil = "B"
+        issues = project.asil_consistency()["issues"]
+        self.assertEqual(
+            [(i["kind"], i["asil"], i["expected"]) for i in issues],
+            [("safety_goal", "B", "D"), ("requirement", "B", "D")],
+        )
+
+    def test_dangling_references(self):
+        data = model()
+        data["top_events"][0]["children"][1].update(failure_mode_ref=99)
+        data["top_events"][0]["children"].append(node(6, "Basic Event", is_primary_instance=False, original_id=98))
+        data["fmedas"][0]["bom"] = "Missing BOM"
+        issues = Project(data).references()["issues"]
+        self.assertEqual(
+            [(i["kind"], i["ref"]) for i in issues],
+            [("failure_mode", 99), ("clone", 98), ("bom", "Missing BOM")],
+        )
+
+    def test_csv_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = Project(model()).export_csv(tmp)
+            self.assertEqual(paths, [os.path.join(tmp, "brake.csv")])
+            with open(paths[0], newline="") as f:
+                lines = f.read().splitlines()
+            self.assertIn("Loss of braking", lines[1])
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = cli.main([self.path, *args])
+        return status, json.loads(out.getvalue())
+
+    def test_exit_status(self):
+        with open(self.path, "w") as f:
+            json.dump(model(fit=0.001), f)
+        status, report = self.run_cli("--check", "pmhf")
+        self.assertEqual(status, cli.EXIT_OK)
+        self.assertEqual(set(report), {"model", "pmhf", "ok"})
+        with open(self.path, "w") as f:
+            json.dump(model(fit=100.0), f)
+        self.assertEqual(self.run_cli()[0], cli.EXIT_VIOLATION)
+        with open(self.path, "w") as f:
+            f.write("{")
+        status, report = self.run_cli()
+        self.assertEqual(status, cli.EXIT_ERROR)
+        self.assertIn("error", report)
+
+    def test_does_not_import_tkinter(self):
+        code = "import sys, analysis.cli; print('tkinter' in sys.modules)"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
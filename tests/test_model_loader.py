@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from analysis import model_loader
+from analysis.model_loader import ModelFormatError, iter_sections, load_model_file
+
+TOLERANT = """{
+    // project written by hand
+    "top_events": [
+        {"unique_id": 1, "description": "a // b, # c /* d */ [e]", "children": [],},
+    ],
+    /* block
+       comment */ "fmeas": [], # trailing note
+    "project_properties": {"pdf_report_name": "R",},
+}
+"""
+
+
+class ModelLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_comments_and_trailing_commas(self):
+        self.write(TOLERANT)
+        data = load_model_file(self.path)
+        self.assertEqual(list(data), ["top_events", "fmeas", "project_properties"])
+        self.assertEqual(data["top_events"][0]["description"], "a // b, # c /* d */ [e]")
+        self.assertEqual(data["project_properties"], {"pdf_report_name": "R"})
+
+    def test_sections_stream_with_progress_and_converters(self):
+        model = {
+            "top_events": [{"unique_id": i, "children": [{"unique_id": -i, "text": "x]}"}]} for i in range(500)],
+            "fmeas": [{"name": "F", "entries": [{"unique_id": 7}]}],
+            "empty": {},
+            "count": 3,
+        }
+        self.write(json.dumps(model, indent=4))
+        old = model_loader.CHUNK_SIZE
+        model_loader.CHUNK_SIZE = 512
+        try:
+            seen = []
+            data = load_model_file(
+                self.path,
+                {"top_events": lambda tops: [t["unique_id"] for t in tops]},
+                seen.append,
+            )
+        finally:
+            model_loader.CHUNK_SIZE = old
+        self.assertEqual(data["top_events"], list(range(500)))
+        self.assertEqual({k: data[k] for k in ("fmeas", "empty", "count")}, {k: model[k] for k in ("fmeas", "empty", "count")})
+        self.assertEqual(seen, sorted(seen))
+        self.assertGreater(len(seen), 3)
+        self.assertEqual(seen[-1], 1.0)
+        self.write(json.dumps(model))
+        self.assertEqual(load_model_file(self.path), model)
+
+    def test_errors(self):
+        for text in ('{"a": [1, 2}', '{"a": 1', "[1, 2]", '{"a": tru}'):
+            self.write(text)
+            with self.assertRaises(ModelFormatError):
+                list(iter_sections(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
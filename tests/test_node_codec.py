@@ -0,0 +1,89 @@
+import itertools
+import json
+import sys
+import unittest
+from analysis.node_codec import NODE_FIELDS, REQUIRED, NodeCodec, RequirementPool
+
+_ids = itertools.count(1)
+
+
+class Node:
+    def __init__(self, node_type="GATE", parent=None):
+        for _key, attr, default in NODE_FIELDS:
+            setattr(self, attr, [] if isinstance(default, list) else default)
+        self.unique_id = next(_ids)
+        self.node_type = node_type
+        self.gate_type = None if node_type == "Basic Event" else "AND"
+        if node_type != "TOP EVENT":
+            self.severity = self.controllability = None
+        self.children = []
+        self.parents = [parent] if parent else []
+        self.original = self
+        if parent:
+            parent.children.append(self)
+
+
+CODEC = NodeCodec(Node, lambda: next(_ids))
+
+
+class NodeCodecTests(unittest.TestCase):
+    def test_compact_round_trip(self):
+        top = Node("TOP EVENT")
+        top.severity = 3
+        gate = Node("GATE", top)
+        gate.severity = 2  # ignored for anything but top events
+        leaf = Node("Basic Event", gate)
+        leaf.fmeda_fit = 1.5
+        full = CODEC.encode(top)
+        compact = CODEC.encode(top, compact=True)
+        self.assertEqual([k for k, _a, _d in NODE_FIELDS] + ["children"], list(full))
+        self.assertEqual(compact["severity"], 3)
+        self.assertEqual(set(compact["children"][0]), {"unique_id", "type", "children"})
+        self.assertEqual(compact["children"][0]["children"][0]["fmeda_fit"], 1.5)
+        self.assertNotIn("children", compact["children"][0]["children"][0])
+        full["children"][0]["severity"] = None
+        for data in (full, compact):
+            node = CODEC.decode(json.loads(json.dumps(data)))
+            for n in (node, node.children[0], node.children[0].children[0]):
+                n.original = n
+            self.assertEqual(CODEC.encode(node), full)
+            self.assertIs(node.children[0].parents[0], node)
+            self.assertEqual(node.children[0].children[0].gate_type, None)
+
+    def test_missing_id_and_clone_reference(self):
+        node = CODEC.decode({"type": "GATE", "is_primary_instance": "false", "original_id": 7})
+        self.assertIsInstance(node.unique_id, int)
+        self.assertFalse(node.is_primary_instance)
+        self.assertEqual(node._original_id, 7)
+        self.assertNotIn(REQUIRED, vars(node).values())
+
+    def test_requirement_pool_shares_equal_dicts(self):
+        req = {"id": "R1", "text": "a"}
+        data = {
+            "unique_id": 1,
+            "children": [
+                {"unique_id": 2, "safety_requirements": [dict(req)]},
+                {"unique_id": 3, "safety_requirements": [dict(req), {"id": "R1", "text": "b"}]},
+            ],
+        }
+        node = CODEC.decode(data, share=RequirementPool())
+        a, b = node.children
+        self.assertIs(a.safety_requirements[0], b.safety_requirements[0])
+        self.assertIsNot(a.safety_requirements, b.safety_requirements)
+        self.assertEqual(b.safety_requirements[1]["text"], "b")
+
+    def test_deep_trees_do_not_recurse(self):
+        top = node = Node("TOP EVENT")
+        for _ in range(sys.getrecursionlimit() + 100):
+            node = Node("GATE", node)
+        data = CODEC.encode(top, compact=True)
+        back = CODEC.decode(data)
+        depth = 0
+        while back.children:
+            back = back.children[0]
+            depth += 1
+        self.assertEqual(depth, sys.getrecursionlimit() + 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from analysis.project_container import (
+    ContainerData,
+    ContainerReader,
+    DeferredAttribute,
+    DeferredSections,
+    is_container,
+    write_container,
+)
+
+
+class ProjectContainerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.automl")
+        self.data = {
+            "top_events": [{"unique_id": 1, "children": []}],
+            "fmedas": [{"name": "F", "entries": [{"unique_id": i} for i in range(50)]}],
+            "project_properties": {"pdf_report_name": "Report"},
+        }
+        write_container(self.path, self.data, {"versions": b'{"format": "delta-v1"}'})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_random_access(self):
+        self.assertTrue(is_container(self.path))
+        reader = ContainerReader(self.path)
+        self.assertEqual(reader.names(), ["top_events", "fmedas", "project_properties"])
+        self.assertEqual(reader.load("project_properties"), {"pdf_report_name": "Report"})
+        self.assertIsNone(reader.load("versions"))
+        archive = ContainerReader(self.path, prefix="archive:")
+        self.assertEqual(archive.names(), ["versions"])
+        self.assertEqual(archive.load("versions"), {"format": "delta-v1"})
+
+    def test_sections_decoded_on_access(self):
+        data = ContainerData(ContainerReader(self.path))
+        self.assertIn("fmedas", data)
+        self.assertEqual(data._values, {})
+        self.assertEqual(data["top_events"], self.data["top_events"])
+        self.assertEqual(list(data._values), ["top_events"])
+        self.assertEqual(dict(data), self.data)
+        self.assertEqual(data.get("missing", []), [])
+
+    def test_json_file_is_not_a_container(self):
+        path = os.path.join(self.tmp.name, "model.json")
+        with open(path, "w") as f:
+            f.write("{}")
+        self.assertFalse(is_container(path))
+        self.assertFalse(is_container(os.path.join(self.tmp.name, "missing")))
+
+    def test_deferred_sections(self):
+        data = ContainerData(ContainerReader(self.path))
+        built = []
+
+        class Model:
+            fmedas = DeferredAttribute("fmedas")
+            fmeda_names = DeferredAttribute("fmedas")
+
+            def __init__(self):
+                self.deferred_sections = DeferredSections()
+
+            def load_fmedas(self):
+                built.append("fmedas")
+                self.fmedas = data["fmedas"]
+                self.fmeda_names = [d["name"] for d in self.fmedas]
+
+        model = Model()
+        model.deferred_sections.reset(data)
+        model.deferred_sections.defer("fmedas", model.load_fmedas, ("fmedas", "fmeda_bom"))
+        self.assertTrue(model.deferred_sections.pending("fmedas"))
+        self.assertEqual(model.deferred_sections.raw_keys(), ["fmedas", "fmeda_bom"])
+        self.assertEqual(list(data._values), [])
+        self.assertEqual(model.fmeda_names, ["F"])
+        self.assertEqual(built, ["fmedas"])
+        self.assertFalse(model.deferred_sections.pending("fmedas"))
+        self.assertEqual(model.deferred_sections.raw_keys(), [])
+        self.assertEqual(len(model.fmedas[0]["entries"]), 50)
+        self.assertEqual(built, ["fmedas"])
+
+    def test_setting_deferred_attribute_builds_section(self):
+        class Model:
+            docs = DeferredAttribute("docs")
+            active = DeferredAttribute("docs")
+
+            def __init__(self):
+                self.deferred_sections = DeferredSections()
+
+            def load(self):
+                self.docs = ["a", "b"]
+                self.active = "a"
+
+        model = Model()
+        self.assertFalse(hasattr(model, "docs"))
+        model.deferred_sections.defer("docs", model.load)
+        model.active = "b"
+        self.assertEqual((model.docs, model.active), (["a", "b"], "b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from analysis.reachability import ReachabilityIndex
+
+
+class Node:
+    def __init__(self, uid):
+        self.unique_id = uid
+        self.children = []
+
+    def add(self, child):
+        self.children.append(child)
+        return child
+
+
+class ReachabilityTests(unittest.TestCase):
+    def setUp(self):
+        self.t1 = Node(1)
+        self.t2 = Node(2)
+        self.g = self.t1.add(Node(3))
+        self.be = self.g.add(Node(4))
+        # Shared subtree under both top events
+        self.t2.add(self.g)
+        self.other = self.t2.add(Node(5))
+        self.idx = ReachabilityIndex().rebuild([self.t1, self.t2])
+
+    def test_ancestor_queries(self):
+        self.assertTrue(self.idx.is_ancestor(1, 4))
+        self.assertTrue(self.idx.is_ancestor(3, 4))
+        self.assertFalse(self.idx.is_ancestor(4, 3))
+        self.assertFalse(self.idx.is_ancestor(5, 4))
+        self.assertEqual(self.idx.top_events_of(4), [1, 2])
+        self.assertEqual(self.idx.top_events_of(5), [2])
+        self.assertEqual(self.idx.top_events_of(1), [1])
+
+    def test_cycle_detection(self):
+        self.assertTrue(self.idx.would_create_cycle(4, 3))
+        self.assertTrue(self.idx.would_create_cycle(3, 3))
+        self.assertFalse(self.idx.would_create_cycle(5, 3))
+        self.assertFalse(self.idx.add_edge(4, 1))
+        self.assertFalse(self.idx.is_ancestor(4, 1))
+
+    def test_incremental_edges(self):
+        self.idx.add_edge(5, 6)
+        self.assertTrue(self.idx.is_ancestor(2, 6))
+        self.assertEqual(self.idx.top_events_of(6), [2])
+        self.idx.remove_edge(1, 3)
+        self.assertFalse(self.idx.is_ancestor(1, 4))
+        self.assertEqual(self.idx.top_events_of(4), [2])
+        self.idx.add_edge(1, 3)
+        self.assertEqual(self.idx.top_events_of(4), [1, 2])
+
+    def test_detach_and_roots(self):
+        self.idx.detach(3, [1, 2])
+        self.assertEqual(self.idx.top_events_of(4), [])
+        self.idx.add_root(3)
+        self.assertEqual(self.idx.top_events_of(4), [3])
+        self.idx.remove_root(3)
+        self.assertEqual(self.idx.top_events_of(4), [])
+
+    def test_duplicate_instances(self):
+        # A second primary instance of node 3 below node 5
+        twin = self.other.add(Node(3))
+        twin.add(Node(4))
+        idx = ReachabilityIndex().rebuild([self.t1, self.t2])
+        self.other.children.remove(twin)
+        idx.detach(3, [5])
+        self.assertEqual(idx.top_events_of(4), [1, 2])
+        self.t2.children.remove(self.g)
+        idx.detach(3, [2])
+        self.assertEqual(idx.top_events_of(4), [1])
+        self.assertFalse(idx.is_ancestor(5, 4))
+
+    def test_remove_deleted_subtree(self):
+        self.idx.remove_root(2)
+        self.idx.remove_subtree(self.t2)
+        self.assertNotIn(2, self.idx)
+        self.assertNotIn(5, self.idx)
+        # The subtree shared with top event 1 stays, without labels of 2.
+        self.assertFalse(self.idx.is_ancestor(2, 4))
+        self.assertEqual(self.idx.top_events_of(4), [1])
+        self.t1.children.remove(self.g)
+        self.idx.detach(3, [1])
+        self.idx.remove_subtree(self.g)
+        self.assertNotIn(4, self.idx)
+
+    def test_root_order(self):
+        self.idx.set_root_order([self.t2, self.t1])
+        self.assertEqual(self.idx.top_events_of(4), [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,6 +29,19 @@ class RepositoryTests(unittest.TestCase):
         self.assertIn("Car", js)
         self.assertIn(blk.elem_id, js)
 
+    def test_load_later(self):
+        blk = self.repo.create_element("Block", name="Car")
+        data = self.repo.to_dict()
+        SysMLRepository._instance = None
+        repo = SysMLRepository.get_instance()
+        calls = []
+        repo.load_later(lambda: calls.append(repo.from_dict(data)))
+        self.assertNotIn(blk.elem_id, repo.elements)
+        self.assertIs(SysMLRepository.get_instance(), repo)
+        self.assertIn(blk.elem_id, repo.elements)
+        SysMLRepository.get_instance()
+        self.assertEqual(len(calls), 1)
+
     def test_sysml_properties_port(self):
         from sysml.sysml_spec import SYSML_PROPERTIES
         self.assertIn("PortUsage", SYSML_PROPERTIES)
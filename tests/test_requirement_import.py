@@ -0,0 +1,137 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from analysis.models import RequirementStore
+from analysis.requirement_import import (
+    import_requirements,
+    iter_csv_requirements,
+    iter_reqif_requirements,
+    iter_requirements_file,
+    normalize_asil,
+)
+
+REQIF = """<?xml version="1.0" encoding="UTF-8"?>
+<REQ-IF xmlns="http://www.omg.org/spec/ReqIF/20110401/reqif.xsd" xmlns:xhtml="http://www.w3.org/1999/xhtml">
+  <CORE-CONTENT><REQ-IF-CONTENT>
+    <DATATYPES>
+      <DATATYPE-DEFINITION-ENUMERATION IDENTIFIER="dt-asil">
+        <SPECIFIED-VALUES>
+          <ENUM-VALUE IDENTIFIER="ev-c" LONG-NAME="ASIL C"/>
+        </SPECIFIED-VALUES>
+      </DATATYPE-DEFINITION-ENUMERATION>
+    </DATATYPES>
+    <SPEC-TYPES><SPEC-OBJECT-TYPE IDENTIFIER="t1"><SPEC-ATTRIBUTES>
+      <ATTRIBUTE-DEFINITION-STRING IDENTIFIER="a-id" LONG-NAME="ReqIF.ForeignID"/>
+      <ATTRIBUTE-DEFINITION-XHTML IDENTIFIER="a-text" LONG-NAME="ReqIF.Text"/>
+      <ATTRIBUTE-DEFINITION-ENUMERATION IDENTIFIER="a-asil" LONG-NAME="ASIL"/>
+    </SPEC-ATTRIBUTES></SPEC-OBJECT-TYPE></SPEC-TYPES>
+    <SPEC-OBJECTS>
+      <SPEC-OBJECT IDENTIFIER="so-1"><VALUES>
+        <ATTRIBUTE-VALUE-STRING THE-VALUE="SR-1">
+          <DEFINITION><ATTRIBUTE-DEFINITION-STRING-REF>a-id</ATTRIBUTE-DEFINITION-STRING-REF></DEFINITION>
+        </ATTRIBUTE-VALUE-STRING>
+        <ATTRIBUTE-VALUE-XHTML>
+          <DEFINITION><ATTRIBUTE-DEFINITION-XHTML-REF>a-text</ATTRIBUTE-DEFINITION-XHTML-REF></DEFINITION>
+          <THE-VALUE><xhtml:div>Limit <xhtml:b>torque</xhtml:b></xhtml:div></THE-VALUE>
+        </ATTRIBUTE-VALUE-XHTML>
+        <ATTRIBUTE-VALUE-ENUMERATION>
+          <DEFINITION><ATTRIBUTE-DEFINITION-ENUMERATION-REF>a-asil</ATTRIBUTE-DEFINITION-ENUMERATION-REF></DEFINITION>
+          <VALUES><ENUM-VALUE-REF>ev-c</ENUM-VALUE-REF></VALUES>
+        </ATTRIBUTE-VALUE-ENUMERATION>
+      </VALUES></SPEC-OBJECT>
+      <SPEC-OBJECT IDENTIFIER="so-2"><VALUES/></SPEC-OBJECT>
+    </SPEC-OBJECTS>
+  </REQ-IF-CONTENT></CORE-CONTENT>
+</REQ-IF>
+"""
+
+
+class Node:
+    def __init__(self):
+        self.safety_requirements = []
+
+
+class RequirementImportTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_normalize_asil(self):
+        self.assertEqual(normalize_asil("ASIL B"), "B")
+        self.assertEqual(normalize_asil("qm(d)"), "QM(D)")
+        self.assertEqual(normalize_asil(""), "QM")
+
+    def test_csv_columns_and_links(self):
+        path = self.write(
+            "reqs.csv",
+            "Req ID;Description;Type;ASIL;Allocated To\n"
+            "R1;Detect fault;functional;ASIL D;BE 1, 7\n"
+            ";missing id;;;\n",
+        )
+        rows = list(iter_csv_requirements(path))
+        self.assertEqual(len(rows), 1)
+        req, links = rows[0]
+        self.assertEqual((req["id"], req["text"], req["req_type"], req["asil"]), ("R1", "Detect fault", "functional", "D"))
+        self.assertEqual(req["status"], "draft")
+        self.assertEqual(links, ["BE 1", "7"])
+
+    def test_reqif_stream(self):
+        path = self.write("reqs.reqif", REQIF)
+        rows = list(iter_requirements_file(path))
+        self.assertEqual([r["id"] for r, _ in rows], ["SR-1", "so-2"])
+        self.assertEqual(rows[0][0]["text"], "Limit torque")
+        self.assertEqual(rows[0][0]["asil"], "C")
+        # Rows without a type get the editor's default type.
+        self.assertEqual(rows[0][0]["req_type"], "vehicle")
+        archive = os.path.join(self.tmp.name, "reqs.reqifz")
+        with zipfile.ZipFile(archive, "w") as z:
+            z.write(path, "export.reqif")
+        self.assertEqual(len(list(iter_requirements_file(archive))), 2)
+
+    def test_reqif_file_object(self):
+        with io.BytesIO(REQIF.encode("utf-8")) as f:
+            rows = list(iter_reqif_requirements(f, {"reqiftext": "id"}))
+        self.assertEqual([r["id"] for r, _ in rows], ["Limit torque"])
+
+    def test_import_dedup_update_and_link(self):
+        store = RequirementStore()
+        existing = {"id": "R1", "text": "old", "asil": "A", "req_type": "", "status": "draft", "parent_id": ""}
+        store["R1"] = existing
+        events = []
+        store.add_listener(lambda kind, rid: events.append(kind))
+        node = Node()
+        records = [
+            ({"id": "R1", "text": "new", "asil": "B", "req_type": "", "status": "draft", "parent_id": ""}, ["n1"]),
+            ({"id": "R2", "text": "two", "asil": "QM", "req_type": "", "status": "draft", "parent_id": ""}, ["n1", "x"]),
+            ({"id": "R2", "text": "dup", "asil": "QM", "req_type": "", "status": "draft", "parent_id": ""}, []),
+        ]
+        result = import_requirements(iter(records), store, {"n1": node}.get, replace=True)
+        self.assertEqual((result.added, result.updated, result.duplicates, result.linked), (1, 1, 1, 2))
+        self.assertEqual(result.unresolved, ["x"])
+        self.assertIs(store["R1"], existing)
+        self.assertEqual(existing["text"], "new")
+        self.assertEqual(store.ids_where("asil", "B"), ["R1"])
+        self.assertEqual(store["R2"]["text"], "two")
+        self.assertEqual([r["id"] for r in node.safety_requirements], ["R1", "R2"])
+        self.assertEqual(events, ["reset"])
+
+    def test_import_keeps_existing_without_replace(self):
+        store = RequirementStore({"R1": {"id": "R1", "text": "old"}})
+        path = self.write("reqs.csv", "id,text\nR1,new\n")
+        result = import_requirements(iter_csv_requirements(path), store)
+        self.assertEqual((result.added, result.skipped), (0, 1))
+        self.assertEqual(store["R1"]["text"], "old")
+
+
+if __name__ == "__main__":
+    unittest.main()
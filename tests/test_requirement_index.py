@@ -0,0 +1,82 @@
+import unittest
+from analysis.requirement_index import RequirementIndex
+
+
+class Node:
+    def __init__(self, uid, name, node_type="BASIC EVENT", reqs=None):
+        self.unique_id = uid
+        self.user_name = name
+        self.node_type = node_type
+        self.safety_goal_description = ""
+        self.safety_requirements = [{"id": r} for r in reqs or []]
+        self.parents = []
+        self.children = []
+
+
+def link(parent, child):
+    parent.children.append(child)
+    child.parents.append(parent)
+
+
+class RequirementIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.top = Node(1, "TE", "TOP EVENT")
+        self.top.safety_goal_description = "SG1"
+        self.other = Node(2, "TE2", "TOP EVENT")
+        self.gate = Node(3, "G", "GATE")
+        self.be = Node(4, "BE", reqs=["R1"])
+        link(self.top, self.gate)
+        link(self.other, self.gate)
+        link(self.gate, self.be)
+        self.nodes = [self.top, self.gate, self.be, self.other]
+        self.fmeas = [
+            {
+                "name": "FMEA1",
+                "entries": [
+                    {"description": "Short", "safety_requirements": [{"id": "R2"}], "parents": [{"unique_id": 3}]}
+                ],
+            }
+        ]
+        self.builds = 0
+        self.index = RequirementIndex(self.source)
+
+    def source(self):
+        self.builds += 1
+        by_id = {n.unique_id: n for n in self.nodes}
+        return self.nodes, self.fmeas, by_id.get
+
+    def test_allocations_and_goals(self):
+        self.assertEqual(self.index.allocation_names("R1"), ["BE"])
+        self.assertEqual(self.index.goal_names("R1"), ["SG1", "TE2"])
+        self.assertEqual(self.index.allocation_names("R2"), ["FMEA1:Short"])
+        self.assertEqual(self.index.goal_names("R2"), ["SG1", "TE2"])
+        self.assertEqual(self.index.allocation_names("missing"), [])
+        self.assertEqual(self.builds, 1)
+
+    def test_update_owner(self):
+        self.index.allocation_names("R1")
+        self.be.safety_requirements = [{"id": "R3"}]
+        self.index.update_owner(self.be)
+        self.assertEqual(self.index.allocation_names("R1"), [])
+        self.assertEqual(self.index.allocations("R3"), [self.be])
+        self.assertEqual(self.builds, 1)
+
+    def test_invalidate_rebuilds_lazily(self):
+        self.index.goal_names("R1")
+        self.gate.parents.remove(self.other)
+        self.index.invalidate()
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(self.index.goal_names("R1"), ["SG1"])
+        self.assertEqual(self.builds, 2)
+
+    def test_requirements_for_goals(self):
+        self.assertEqual(sorted(self.index.requirement_ids_for_goals(["SG1"])), ["R1", "R2"])
+        self.assertEqual(self.index.requirement_ids_for_goals(["other"]), [])
+
+    def test_cyclic_parents(self):
+        link(self.be, self.gate)
+        self.assertEqual(self.index.goal_names("R1"), ["SG1", "TE2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import csv
+import os
+import tempfile
+import unittest
+from analysis.requirement_matrix import SparseMatrix
+
+
+class Event:
+    def __init__(self, uid, name=""):
+        self.unique_id = uid
+        self.user_name = name
+
+
+class SparseMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.events = [Event(1, "Sensor"), Event(2), Event(3, "Motor")]
+        self.reqs = [
+            {"id": "R1", "asil": "D", "req_type": "functional"},
+            {"id": "R2", "asil": "B", "req_type": "technical"},
+            {"id": "R3", "asil": "D", "req_type": "technical"},
+        ]
+        alloc = {"R1": [self.events[2], self.events[0]], "R3": [self.events[1], object()]}
+        self.matrix = SparseMatrix.from_allocations(self.reqs, self.events, lambda rid: alloc.get(rid, []))
+
+    def test_from_allocations(self):
+        self.assertEqual(len(self.matrix), 3)
+        self.assertEqual(self.matrix.columns, [(1, "Sensor"), (2, "BE 2"), (3, "Motor")])
+        self.assertEqual(self.matrix.cell_count, 3)
+        self.assertTrue(self.matrix.is_set(0, 2))
+        self.assertFalse(self.matrix.is_set(0, 1))
+        self.assertFalse(self.matrix.is_set(1, 0))
+
+    def test_row_cells_range(self):
+        self.assertEqual(self.matrix.row_cells(0), [0, 2])
+        self.assertEqual(self.matrix.row_cells(0, 1, 3), [2])
+        self.assertEqual(self.matrix.row_cells(0, 1, 2), [])
+        self.assertEqual(self.matrix.row_cells(1), [])
+
+    def test_filtered(self):
+        sub = self.matrix.filtered(lambda r: r["asil"] == "D")
+        self.assertEqual([r["id"] for r in sub.rows], ["R1", "R3"])
+        self.assertEqual(sub.row_cells(1), [1])
+        self.assertEqual(sub.columns, self.matrix.columns)
+
+    def test_export_csv_is_sparse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "matrix.csv")
+            self.matrix.export_csv(path)
+            with open(path, newline="") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["Req ID", "ASIL", "Type", "Target ID", "Target"])
+        self.assertEqual(
+            rows[1:],
+            [
+                ["R1", "D", "functional", "1", "Sensor"],
+                ["R1", "D", "functional", "3", "Motor"],
+                ["R3", "D", "technical", "2", "BE 2"],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
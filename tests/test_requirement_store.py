@@ -0,0 +1,67 @@
+import copy
+import json
+import unittest
+from analysis.models import RequirementStore
+
+
+def req(rid, req_type="vehicle", asil="QM", status="draft", parent_id=""):
+    return {"id": rid, "req_type": req_type, "asil": asil, "status": status, "parent_id": parent_id, "text": rid}
+
+
+class RequirementStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.store = RequirementStore()
+        self.store.add_listener(lambda kind, rid: self.events.append((kind, rid)))
+
+    def test_indexes_follow_dict_operations(self):
+        self.store["R1"] = req("R1", asil="B")
+        self.store["R2"] = req("R2", req_type="functional", asil="B")
+        self.assertEqual([r["id"] for r in self.store.by_asil("B")], ["R1", "R2"])
+        self.assertEqual([r["id"] for r in self.store.by_type("functional")], ["R2"])
+        self.store["R1"] = req("R1", asil="D")
+        self.assertEqual(self.store.ids_where("asil", "B"), ["R2"])
+        del self.store["R2"]
+        self.assertEqual(self.store.by_asil("B"), [])
+        self.assertEqual(self.events, [("added", "R1"), ("added", "R2"), ("updated", "R1"), ("removed", "R2")])
+
+    def test_decomposition_children(self):
+        self.store.add_many(
+            [("P", req("P", asil="D")), ("A", req("A", parent_id="P")), ("B", req("B", parent_id="P"))]
+        )
+        self.assertEqual(self.events, [("reset", None)])
+        self.assertEqual([r["id"] for r in self.store.children("P")], ["A", "B"])
+        self.assertEqual(self.store.decomposed_parents(), ["P"])
+        self.assertEqual(self.store.ids_where("parent_id", ""), ["P"])
+
+    def test_update_fields_reindexes(self):
+        shared = req("R1")
+        self.store["R1"] = shared
+        self.store.update_fields("R1", status="approved")
+        self.assertEqual(self.store.by_status("approved"), [shared])
+        # Edited through a node holding the same dict.
+        shared["asil"] = "C"
+        self.store.update_fields("R1", asil="C")
+        self.assertEqual(self.store.by_asil("C"), [shared])
+        self.assertEqual(self.store.by_asil("QM"), [])
+        self.assertIsNone(self.store.update_fields("missing", asil="A"))
+
+    def test_add_many_keeps_existing(self):
+        first = req("R1")
+        self.store["R1"] = first
+        self.store.add_many([("R1", req("R1", asil="D")), ("R2", req("R2"))], replace=False)
+        self.assertIs(self.store["R1"], first)
+        self.assertIn("R2", self.store)
+
+    def test_copy_and_json(self):
+        self.store["R1"] = req("R1", asil="A")
+        clone = copy.deepcopy(self.store)
+        self.assertIsInstance(clone, RequirementStore)
+        self.assertEqual(clone.by_asil("A")[0]["id"], "R1")
+        self.assertEqual(json.loads(json.dumps(self.store)), {"R1": req("R1", asil="A")})
+        self.store.clear()
+        self.assertEqual(self.store.by_asil("A"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from analysis.search_index import SearchIndex, tokenize
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add(("node", 1), "node", "Brake failure", ["Loss of braking torque"], group="nodes")
+        self.index.add(("node", 2), "node", "Steering loss", ["Brake assist unavailable"], group="nodes")
+        self.index.add(("req", "R1"), "requirement", "[R1] Detect brake fault", ["functional"], group="requirements")
+
+    def keys(self, query, **kwargs):
+        return [hit.key for hit in self.index.search(query, **kwargs)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Brake-by-Wire, ASIL D"), ["brake", "by", "wire", "asil", "d"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_label_matches_rank_first(self):
+        self.assertEqual(self.keys("brake")[-1], ("node", 2))
+        self.assertEqual(set(self.keys("brake")), {("node", 1), ("node", 2), ("req", "R1")})
+
+    def test_prefix_and_all_tokens_required(self):
+        self.assertEqual(self.keys("brak tor"), [("node", 1)])
+        self.assertEqual(self.keys("brake steering"), [("node", 2)])
+        self.assertEqual(self.keys("brake missing"), [])
+        # Single characters only match whole terms.
+        self.assertEqual(self.keys("b"), [])
+
+    def test_kind_filter_and_limit(self):
+        self.assertEqual(self.keys("brake", kinds=["requirement"]), [("req", "R1")])
+        self.assertEqual(len(self.keys("brake", limit=1)), 1)
+
+    def test_updates_and_groups(self):
+        self.index.add(("node", 1), "node", "Motor overheat")
+        self.assertEqual(self.keys("torque"), [])
+        self.assertEqual(self.keys("motor"), [("node", 1)])
+        self.index.remove_group("nodes")
+        self.assertEqual(self.keys("brake"), [("req", "R1")])
+        self.assertEqual(self.keys("steer"), [])
+        self.index.remove(("req", "R1"))
+        self.assertEqual(len(self.index), 1)
+        self.assertNotIn("brake", self.index._terms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from analysis.service import (
+    LOAD_ERROR,
+    METHOD_NOT_FOUND,
+    AnalysisService,
+    HttpClient,
+    LocalClient,
+    ServiceError,
+    serve_http,
+)
+from project_fixture import model
+
+
+class AnalysisServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = AnalysisService(max_projects=2)
+        self.client = LocalClient(self.service)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+
+    def test_queries_and_lru(self):
+        a = self.write("a.json", model(0.001))
+        b = self.write("b.json", model(100.0))
+        c = self.write("c.json", model(1.0))
+        self.assertTrue(self.client.call("pmhf", path=a)["ok"])
+        self.assertFalse(self.client.call("pmhf", path=b)["ok"])
+        project = self.service.project(a)
+        self.assertEqual(self.client.call("cut_sets", path=a)["top_events"][0]["cut_sets"], [[3, 4], [5]])
+        self.assertIs(self.service.project(a), project)
+        trace = self.client.call("requirement_trace", path=a, requirement="R1")
+        self.assertEqual(trace["allocations"], ["Valve"])
+        self.assertEqual(trace["goals"], ["Loss of braking"])
+        self.client.call("load", path=c)
+        self.assertEqual(self.client.call("status")["projects"], [a, c])
+        self.assertTrue(self.client.call("unload", path=a))
+        self.assertEqual(self.client.call("status")["projects"], [c])
+
+    def test_reload_after_file_change(self):
+        path = self.write("m.json", model(0.001))
+        self.assertTrue(self.client.call("analyze", path=path, checks=["pmhf"])["pmhf"]["ok"])
+        self.write("m.json", model(100.0))
+        self.assertFalse(self.client.call("pmhf", path=path)["ok"])
+
+    def test_errors(self):
+        with self.assertRaises(ServiceError) as cm:
+            self.client.call("pmhf", path=os.path.join(self.tmp.name, "missing.json"))
+        self.assertEqual(cm.exception.code, LOAD_ERROR)
+        with self.assertRaises(ServiceError) as cm:
+            self.client.call("shutdown")
+        self.assertEqual(cm.exception.code, METHOD_NOT_FOUND)
+        self.assertIn("error", json.loads(self.service.handle_text("{")))
+
+    def test_http(self):
+        server = serve_http(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = HttpClient(f"http://127.0.0.1:{server.server_address[1]}/")
+            path = self.write("a.json", model(0.001))
+            self.assertTrue(client.call("pmhf", path=path)["ok"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
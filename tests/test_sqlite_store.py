@@ -0,0 +1,122 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from analysis.archive import ArchiveReader, sidecar_path, write_archive
+from analysis.sqlite_store import (
+    SqliteProjectStore,
+    export_json,
+    import_json,
+    is_sqlite,
+    join_model,
+    split_model,
+)
+
+
+def node(uid, children=(), name=""):
+    return {"unique_id": uid, "user_name": name, "children": list(children)}
+
+
+def sample_model():
+    shared = node(4, [node(5)])
+    return {
+        "top_events": [node(1, [node(2, [shared]), node(3, [copy.deepcopy(shared)])])],
+        "fmeas": [{"name": "FMEA", "file": "f.csv", "entries": [node(10), node(11)]}],
+        "haras": [{"name": "HARA", "entries": [{"malfunction": "m"}], "approved": False}],
+        "global_requirements": {"R1": {"id": "R1", "text": "one"}, "R2": {"id": "R2", "text": "two"}},
+        "sysml_repository": {
+            "elements": [{"elem_id": "e1"}],
+            "relationships": [],
+            "diagrams": [{"diag_id": "d1"}],
+            "element_diagrams": {"e1": "d1"},
+        },
+        "reviews": [{"name": "Review 1", "comments": []}],
+        "project_properties": {"pdf_report_name": "Report"},
+    }
+
+
+class SqliteStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_split_join_round_trip(self):
+        data = sample_model()
+        rows = split_model(data)
+        # The subtree shared by nodes 2 and 3 is stored once.
+        self.assertEqual(sorted(rows["nodes"]), ["1", "2", "3", "4", "5"])
+        self.assertEqual(sorted(rows["document_rows"]), ["fmeas/FMEA/10", "fmeas/FMEA/11", "haras/HARA/0"])
+        self.assertEqual(join_model(rows), data)
+        self.assertEqual(list(join_model(rows)), list(data))
+
+    def test_diverging_copies_keep_their_rows(self):
+        data = {"top_events": [node(1, [node(2, name="a"), node(2, name="b")])]}
+        rows = split_model(data)
+        self.assertEqual(sorted(rows["nodes"]), ["1", "2", "2#1"])
+        self.assertEqual(join_model(rows), data)
+
+    def test_incremental_save(self):
+        data = sample_model()
+        store = SqliteProjectStore(self.path)
+        self.assertGreater(store.save(data, {"versions": b'{"format": "delta-v1"}'}), 10)
+        self.assertEqual(store.save(data, {"versions": b'{"format": "delta-v1"}'}), 0)
+        data["global_requirements"]["R2"]["text"] = "changed"
+        del data["fmeas"][0]["entries"][0]
+        # One requirement updated, one FMEA row removed and one moved.
+        self.assertEqual(store.save(data, {"versions": b'{"format": "delta-v1"}'}), 3)
+        archive = store.archive()
+        self.assertEqual(archive.load("versions"), {"format": "delta-v1"})
+        store.close()
+
+        reopened = SqliteProjectStore(self.path)
+        self.assertEqual(reopened.load(), data)
+        self.assertEqual(reopened.save(data, {"versions": b'{"format": "delta-v1"}'}), 0)
+        self.assertEqual(reopened.save(data), 1)
+        self.assertFalse(reopened.archive().has("versions"))
+        reopened.close()
+        self.assertTrue(is_sqlite(self.path))
+
+    def test_failed_save_is_retried(self):
+        data = sample_model()
+        store = SqliteProjectStore(self.path)
+        store.save(data)
+        data["global_requirements"]["R2"]["text"] = "changed"
+        with self.assertRaises(AttributeError):
+            store.save(data, {"versions": 5})
+        self.assertEqual(store.save(data), 1)
+        self.assertEqual(store.load(), data)
+        store.close()
+
+    def test_json_import_export(self):
+        src = os.path.join(self.tmp.name, "in.json")
+        out = os.path.join(self.tmp.name, "out.json")
+        with open(src, "w") as f:
+            json.dump(sample_model(), f)
+        import_json(src, self.path)
+        export_json(self.path, out)
+        with open(out) as f:
+            self.assertEqual(json.load(f), sample_model())
+        self.assertFalse(is_sqlite(src))
+
+    def test_json_conversion_keeps_archive(self):
+        src = os.path.join(self.tmp.name, "in.json")
+        out = os.path.join(self.tmp.name, "out.json")
+        with open(src, "w") as f:
+            json.dump(sample_model(), f)
+        write_archive(sidecar_path(src), {"versions": b'{"format":"delta-v1"}', "review:Review 1": b"[]"})
+        import_json(src, self.path)
+        store = SqliteProjectStore(self.path)
+        self.assertEqual(store.archive().names(), ["versions", "review:Review 1"])
+        store.close()
+        export_json(self.path, out)
+        archive = ArchiveReader(sidecar_path(out))
+        self.assertEqual(archive.load("versions"), {"format": "delta-v1"})
+        self.assertEqual(archive.load("review:Review 1"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
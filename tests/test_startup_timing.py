@@ -0,0 +1,55 @@
+import builtins
+import os
+import subprocess
+import sys
+import unittest
+
+from analysis.startup_timing import FLAG, StartupTimer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import tkinter  # noqa: F401
+except ImportError:
+    tkinter = None
+
+
+class StartupTimerTests(unittest.TestCase):
+    def test_records_imports_and_phases(self):
+        sys.modules.pop("colorsys", None)
+        original = builtins.__import__
+        argv = ["AutoML.py", FLAG]
+        timer = StartupTimer.from_argv(argv)
+        try:
+            self.assertEqual(argv, ["AutoML.py"])
+            import colorsys  # noqa: F401
+            timer.mark("imported")
+        finally:
+            timer.stop()
+        self.assertIs(builtins.__import__, original)
+        self.assertIn("colorsys", timer.imports)
+        cumulative, own = timer.imports["colorsys"]
+        self.assertGreaterEqual(cumulative, own)
+        report = timer.report()
+        self.assertIn("imported", report)
+        self.assertIn("colorsys", report)
+
+    def test_disabled_without_flag(self):
+        timer = StartupTimer.from_argv(["AutoML.py"])
+        self.assertFalse(timer.enabled)
+        timer.mark("ignored")
+        self.assertEqual(timer.phases, [])
+
+    @unittest.skipIf(tkinter is None, "tkinter is not available")
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        code = (
+            "import sys, AutoML, sysml.sysml_spec as spec\n"
+            "heavy = ['PIL', 'reportlab', 'matplotlib', 'networkx', 'smtplib', 'email.message']\n"
+            "print([m for m in heavy if m in sys.modules], spec.sysml_properties.cache_info().currsize)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(out.stdout.strip(), "[] 0", out.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
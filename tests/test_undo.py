@@ -0,0 +1,134 @@
+import unittest
+from analysis.undo import (
+    UndoStack,
+    SetAttributes,
+    MoveNodes,
+    LinkNodes,
+    UnlinkNodes,
+    ListInsert,
+    ListRemove,
+    CommandGroup,
+)
+
+
+class Node:
+    def __init__(self, name):
+        self.name = name
+        self.x = 0
+        self.y = 0
+        self.tags = []
+        self.children = []
+        self.parents = []
+
+
+class UndoStackTests(unittest.TestCase):
+    def test_set_attributes_stores_only_changes(self):
+        node = Node("a")
+        before = SetAttributes.capture(node)
+        self.assertNotIn("children", before)
+        node.name = "b"
+        node.tags.append("t")
+        cmd = SetAttributes.from_change(node, before)
+        self.assertEqual(set(cmd.changes), {"name", "tags"})
+        stack = UndoStack()
+        stack.push(cmd)
+        stack.undo()
+        self.assertEqual((node.name, node.tags), ("a", []))
+        stack.redo()
+        self.assertEqual((node.name, node.tags), ("b", ["t"]))
+        self.assertIsNone(SetAttributes.from_change(node, SetAttributes.capture(node)))
+
+    def test_requirements_stay_shared(self):
+        node = Node("a")
+        req = {"id": "R1", "text": "one"}
+        node.safety_requirements = [req]
+        before = SetAttributes.capture(node, ["safety_requirements"])
+        node.safety_requirements = [req, {"id": "R2"}]
+        stack = UndoStack()
+        stack.push(SetAttributes.from_change(node, before))
+        stack.undo()
+        self.assertIs(node.safety_requirements[0], req)
+        stack.redo()
+        self.assertIs(node.safety_requirements[0], req)
+        self.assertEqual(len(node.safety_requirements), 2)
+
+    def test_drag_moves_coalesce(self):
+        node = Node("a")
+        stack = UndoStack()
+        for step in range(1, 4):
+            old = (node.x, node.y)
+            node.x, node.y = step * 10, step * 5
+            stack.push(MoveNodes([(node, old, (node.x, node.y))]), coalesce=True)
+        stack.close()
+        stack.push(MoveNodes([(node, (30, 15), (40, 40))]), coalesce=True)
+        self.assertEqual(len(stack), 2)
+        stack.undo()
+        stack.undo()
+        self.assertEqual((node.x, node.y), (0, 0))
+        stack.redo()
+        self.assertEqual((node.x, node.y), (30, 15))
+
+    def test_unmoved_nodes_are_not_recorded(self):
+        node, child = Node("a"), Node("b")
+        self.assertIsNone(MoveNodes.from_positions([(node, (0, 0)), (child, (0, 0))]))
+        stack = UndoStack()
+        node.x = child.x = 10
+        stack.push(MoveNodes.from_positions([(node, (0, 0)), (child, (0, 0))]), coalesce=True)
+        # Snapping only moves the dragged node and still merges into the drag.
+        node.x = 20
+        stack.push(MoveNodes.from_positions([(node, (10, 0)), (child, (10, 0))]), coalesce=True)
+        self.assertEqual(len(stack), 1)
+        stack.undo()
+        self.assertEqual((node.x, child.x), (0, 0))
+        stack.redo()
+        self.assertEqual((node.x, child.x), (20, 10))
+
+    def test_link_and_unlink(self):
+        parent, other, child = Node("p"), Node("o"), Node("c")
+        for p in (parent, other):
+            p.children.append(child)
+            child.parents.append(p)
+        cmd = UnlinkNodes(child, UnlinkNodes.capture(child))
+        cmd.redo()
+        self.assertEqual((parent.children, child.parents), ([], []))
+        cmd.undo()
+        self.assertEqual(child.parents, [parent, other])
+        link = LinkNodes(parent, Node("n"), index=0)
+        link.redo()
+        self.assertEqual(parent.children[0].name, "n")
+        link.undo()
+        self.assertEqual(parent.children, [child])
+
+    def test_group_and_list_commands(self):
+        items = ["a", "b"]
+        new = "c"
+        items.insert(1, new)
+        group = CommandGroup([ListInsert(items, 1, new), ListRemove(items, 0, "a")], label="Edit")
+        items.pop(0)
+        group.undo()
+        self.assertEqual(items, ["a", "b"])
+        group.redo()
+        self.assertEqual(items, ["c", "b"])
+
+    def test_limit_and_redo_cleared(self):
+        node = Node("a")
+        stack = UndoStack(limit=3)
+        for i in range(5):
+            stack.push(SetAttributes(node, {"name": (str(i), str(i + 1))}))
+        self.assertEqual(len(stack), 3)
+        stack.undo()
+        self.assertTrue(stack.can_redo())
+        stack.push(SetAttributes(node, {"x": (0, 1)}))
+        self.assertFalse(stack.can_redo())
+
+    def test_on_apply_called(self):
+        node = Node("a")
+        seen = []
+        stack = UndoStack()
+        stack.push(SetAttributes(node, {"name": ("a", "b")}, on_apply=seen.append))
+        cmd = stack.undo()
+        self.assertEqual(seen, [cmd])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import unittest
+from analysis.version_history import VersionHistory
+
+
+def model(nodes, reqs, title="Project"):
+    return {
+        "top_events": [{"unique_id": i, "user_name": n} for i, n in nodes],
+        "global_requirements": {rid: {"id": rid, "text": t} for rid, t in reqs},
+        "project_properties": {"title": title},
+    }
+
+
+class VersionHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.history = VersionHistory()
+        self.v1 = model([(1, "A"), (2, "B"), (3, "C")], [("R1", "one"), ("R2", "two"), ("R3", "three")])
+        self.v2 = model([(1, "A"), (3, "C"), (2, "B2")], [("R1", "one"), ("R2", "two"), ("R3", "three")])
+        self.v3 = model([(3, "C"), (1, "A"), (4, "D")], [("R1", "one"), ("R2", "two"), ("R3", "new")], "Renamed")
+        for i, data in enumerate((self.v1, self.v2, self.v3), 1):
+            self.history.add(f"v{i}", data)
+
+    def test_reconstructs_every_version(self):
+        self.assertEqual(len(self.history), 3)
+        self.assertEqual([v["name"] for v in self.history], ["v1", "v2", "v3"])
+        self.assertEqual(self.history[0]["data"], self.v1)
+        self.assertEqual(self.history[1]["data"], self.v2)
+        self.assertEqual(self.history[-1]["data"], self.v3)
+        self.assertEqual(list(self.history[-1]["data"]["global_requirements"]), ["R1", "R2", "R3"])
+
+    def test_deltas_and_dedup(self):
+        sections = self.history._entries[1]["sections"]
+        self.assertEqual(sections["top_events"]["set"], [[2, sections["top_events"]["set"][0][1]]])
+        self.assertEqual(sections["global_requirements"], {"base": 0, "set": [], "drop": []})
+        self.assertEqual(sections["project_properties"], self.history._entries[0]["sections"]["project_properties"])
+        # One blob per distinct node, requirement and properties value.
+        self.assertEqual(len(self.history._blobs), 5 + 4 + 2)
+
+    def test_rebase(self):
+        history = VersionHistory()
+        history.REBASE_INTERVAL = 2
+        for i in range(5):
+            history.add(f"v{i}", model([(1, "A"), (2, "B"), (3, f"C{i}")], []))
+        kinds = ["items" in e["sections"]["top_events"] for e in history._entries]
+        self.assertEqual(kinds, [True, False, True, False, True])
+        self.assertEqual(history[3]["data"]["top_events"][2]["user_name"], "C3")
+
+    def test_tree_and_document_rows_are_deltas(self):
+        def tree(leaf_name):
+            leaves = [
+                {"unique_id": i, "user_name": f"L{i}", "description": "x" * 200, "children": []}
+                for i in range(10, 510)
+            ]
+            leaves[7]["user_name"] = leaf_name
+            shared = {"unique_id": 3, "user_name": "S", "children": leaves[:2]}
+            gate = {"unique_id": 2, "user_name": "G", "children": leaves[2:] + [shared]}
+            top = {"unique_id": 1, "user_name": "T", "children": [gate, dict(shared)]}
+            fmea = {"name": "F", "file": "f.csv", "entries": [{"unique_id": 1, "mode": leaf_name}, {"unique_id": 2}]}
+            return {"top_events": [top], "fmeas": [fmea]}
+
+        history = VersionHistory()
+        versions = [tree(f"renamed {i}") for i in range(5)]
+        for i, data in enumerate(versions):
+            history.add(f"v{i}", data)
+        for i, data in enumerate(versions):
+            self.assertEqual(history[i]["data"], data)
+        sections = history._entries[4]["sections"]
+        self.assertEqual(len(sections["top_events"]["set"]), 1)
+        self.assertEqual(len(sections["fmeas"]["set"]), 1)
+        # The history stays far below five snapshots of the tree.
+        size = len(json.dumps(history.to_json()))
+        self.assertLess(size, 2 * len(json.dumps(versions[0])))
+
+    def test_json_round_trip_and_legacy_list(self):
+        saved = json.loads(json.dumps(self.history.to_json()))
+        loaded = VersionHistory.from_json(saved)
+        self.assertEqual(loaded[1]["data"], self.v2)
+        self.assertEqual(loaded[2]["data"], self.v3)
+        loaded.add("v4", self.v1)
+        self.assertEqual(loaded[3]["data"], self.v1)
+        legacy = VersionHistory.from_json([{"name": "old", "data": self.v1}])
+        self.assertEqual(legacy[0]["data"], self.v1)
+        self.assertEqual(len(VersionHistory.from_json(None)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()